@@ -2,21 +2,28 @@
 from __future__ import annotations
 
 import io
+import logging
 import re
 import secrets
 import string
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
 
 from django.contrib.auth.models import Group
 from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
 
-from accounts.models import Campus, User
+from accounts.models import Campus, Profile, StaffUserImportJob, User
 from accounts.serializers import normalize_staff_id
-from accounts.tasks import celery_send_account_email
+from accounts.tasks import celery_send_account_emails
+
+logger = logging.getLogger(__name__)
 
 # Same essentials as Add User form (password is system-generated — not in the sheet).
 # Faculty is assigned later via Edit User when needed (Dean / Admin / HOD).
@@ -34,6 +41,14 @@ REQUIRED_FIELDS = ("first_name", "last_name", "email", "role")
 
 TEMPLATE_HEADERS = list(HEADER_MAP.keys())
 
+# Uploads above this many rows are imported by a worker (``StaffUserImportJob``).
+BULK_USER_SYNC_MAX_ROWS = 25
+USER_IMPORT_CHUNK_SIZE = 200
+# Hashing threads used by the import job (the request path hashes inline).
+PASSWORD_HASH_JOB_WORKERS = 4
+# Copied from the first user of a role to the other new users with that role.
+ROLE_FLAG_FIELDS = ("role", "is_staff", "is_lecturer", "is_student", "is_applicant", "portal_mode")
+
 TEMPLATE_INSTRUCTIONS = (
     "* = compulsory. Use ROLE and CAMPUS dropdowns only. "
     "Password is emailed automatically — user changes it on first login."
@@ -250,25 +265,12 @@ def parse_upload_file(upload) -> list[dict[str, Any]]:
     return rows
 
 
-def import_users_from_rows(rows: list[dict[str, Any]], *, send_email: bool = True) -> dict:
-    """
-    Create users quickly: one-shot lookup caches, single save per user,
-    direct group/campus assignment, lightweight staff profile create.
-    Emails are queued after create (Celery) so the HTTP response isn't blocked on SMTP.
-    """
-    from django.contrib.auth.hashers import make_password
-
-    from accounts.role_assignment import (
-        _promote_staff_portal_identity,
-        primary_staff_role,
-        sync_user_role_flags,
-    )
+def _plan_user_rows(rows: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], list[str]]:
+    """Validate every row against one-shot lookups; return (creatable rows, row errors)."""
     from hr.staff.models import StaffProfile
 
-    created: list[dict] = []
     errors: list[str] = []
-    emails_queued = 0
-    pending_emails: list[tuple[int, str]] = []  # (user_id, password)
+    plans: list[dict[str, Any]] = []
 
     # Prefetch lookups once (avoids N queries per row).
     groups_by_name = {
@@ -281,18 +283,27 @@ def import_users_from_rows(rows: list[dict[str, Any]], *, send_email: bool = Tru
         if c.code:
             campuses_by_key[c.code.lower()] = c
 
+    file_emails = {str(item.get("email") or "").strip().lower() for item in rows} - {""}
+    file_staff_ids = {normalize_staff_id(item.get("staff_id")) for item in rows} - {"", None}
     existing_emails = {
-        e.lower()
-        for e in User.objects.exclude(email__isnull=True)
-        .exclude(email="")
-        .values_list("email", flat=True)
+        value.lower()
+        for pair in User.objects.annotate(_email=Lower("email"))
+        .filter(Q(_email__in=file_emails) | Q(username__in=file_emails))
+        .values_list("email", "username")
+        for value in pair
+        if value
     }
-    existing_staff_ids = {
-        s
-        for s in User.objects.exclude(staff_id__isnull=True)
-        .exclude(staff_id="")
-        .values_list("staff_id", flat=True)
+    existing_emails |= {
+        e.lower()
+        for e in StaffProfile.objects.filter(university_email__in=file_emails)
+        .values_list("university_email", flat=True)
     }
+    existing_staff_ids = set(
+        User.objects.filter(staff_id__in=file_staff_ids).values_list("staff_id", flat=True)
+    )
+    existing_staff_ids |= set(
+        StaffProfile.objects.filter(staff_no__in=file_staff_ids).values_list("staff_no", flat=True)
+    )
     # Also reserve emails within this upload file
     seen_in_file: set[str] = set()
     seen_staff_in_file: set[str] = set()
@@ -342,78 +353,255 @@ def import_users_from_rows(rows: list[dict[str, Any]], *, send_email: bool = Tru
             errors.append(f"Row {row_no}: {'; '.join(row_errors)}")
             continue
 
-        password = generate_temp_password()
-        try:
-            with transaction.atomic():
-                user = User(
-                    email=email,
-                    username=email,
-                    first_name=first_name,
-                    last_name=last_name,
-                    phone=phone or None,
-                    staff_id=staff_id or None,
-                    role=group.name if group else role_raw,
-                    is_staff=True,
-                    is_active=True,
-                    must_change_password=True,
-                    password=make_password(password),
-                )
-                user.save()
-
-                if campus:
-                    user.campuses.set([campus])
-                if group:
-                    user.groups.set([group])
-                    sync_user_role_flags(user, save=False)
-                    primary = primary_staff_role(user)
-                    if primary:
-                        user.role = primary
-                    update_fields = ["role", "is_staff", "is_lecturer"]
-                    update_fields.extend(_promote_staff_portal_identity(user))
-                    user.save(update_fields=list(dict.fromkeys(update_fields)))
-
-                # Fast path: new ERP user → create StaffProfile without extra lookups.
-                staff = StaffProfile.objects.create(
-                    user=user,
-                    first_name=first_name,
-                    last_name=last_name,
-                    university_email=email,
-                    staff_no=staff_id or "",
-                    system_login=True,
-                )
-                if campus:
-                    staff.campus.set([campus])
-        except Exception as exc:
-            errors.append(f"Row {row_no}: could not create user — {exc}")
-            continue
-
         seen_in_file.add(email)
-        existing_emails.add(email)
         if staff_id:
             seen_staff_in_file.add(staff_id)
-            existing_staff_ids.add(staff_id)
-
-        pending_emails.append((user.pk, password))
-        created.append(
+        plans.append(
             {
-                "id": user.pk,
+                "row": row_no,
+                "first_name": first_name,
+                "last_name": last_name,
                 "email": email,
-                "name": f"{first_name} {last_name}".strip(),
-                "role": group.name if group else role_raw,
-                "email_queued": False,
+                "staff_id": staff_id or "",
+                "phone": phone,
+                "group": group,
+                "campus": campus,
             }
         )
+    return plans, errors
 
-    if send_email and pending_emails:
-        for i, (user_id, password) in enumerate(pending_emails):
+
+def hash_passwords(passwords: list[str], *, workers: int = 1) -> list[str]:
+    """
+    Hash with the default password hasher, on ``workers`` threads when more
+    than one (PBKDF2 / bcrypt / argon2 release the GIL while hashing).
+    """
+    from django.contrib.auth.hashers import make_password
+
+    if workers <= 1 or len(passwords) <= 1:
+        return [make_password(p) for p in passwords]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="user-import-hash") as pool:
+        return list(pool.map(make_password, passwords))
+
+
+def _new_user(plan: dict[str, Any], password_hash: str, **flags) -> User:
+    group = plan["group"]
+    return User(
+        email=plan["email"],
+        username=plan["email"],
+        first_name=plan["first_name"],
+        last_name=plan["last_name"],
+        phone=plan["phone"] or None,
+        staff_id=plan["staff_id"] or None,
+        role=group.name if group else "",
+        is_staff=True,
+        is_active=True,
+        must_change_password=True,
+        password=password_hash,
+        **flags,
+    )
+
+
+def _create_user(plan: dict[str, Any], password_hash: str) -> User:
+    """One user through the regular save path (signals, role-flag sync, staff profile)."""
+    from accounts.role_assignment import (
+        _promote_staff_portal_identity,
+        primary_staff_role,
+        sync_user_role_flags,
+    )
+    from hr.staff.models import StaffProfile
+
+    group, campus = plan["group"], plan["campus"]
+    with transaction.atomic():
+        user = _new_user(plan, password_hash)
+        user.save()
+
+        if campus:
+            user.campuses.set([campus])
+        if group:
+            user.groups.set([group])
+            sync_user_role_flags(user, save=False)
+            primary = primary_staff_role(user)
+            if primary:
+                user.role = primary
+            update_fields = ["role", "is_staff", "is_lecturer"]
+            update_fields.extend(_promote_staff_portal_identity(user))
+            user.save(update_fields=list(dict.fromkeys(update_fields)))
+
+        # Fast path: new ERP user → create StaffProfile without extra lookups.
+        staff = StaffProfile.objects.create(
+            user=user,
+            first_name=plan["first_name"],
+            last_name=plan["last_name"],
+            university_email=plan["email"],
+            staff_no=plan["staff_id"],
+            system_login=True,
+        )
+        if campus:
+            staff.campus.set([campus])
+    return user
+
+
+def _new_staff_numbers(count: int) -> list[str]:
+    """``count`` unused generated staff numbers (what ``StaffProfile.save`` assigns one at a time)."""
+    from hr.staff.models import StaffProfile
+    from hr.staff.utils.staff_no import generate_number
+
+    numbers: set[str] = set()
+    while len(numbers) < count:
+        candidates = {generate_number() for _ in range(count - len(numbers))} - numbers
+        taken = set(StaffProfile.objects.filter(staff_no__in=candidates).values_list("staff_no", flat=True))
+        numbers |= candidates - taken
+    return list(numbers)
+
+
+def _bulk_create_users(items: list[tuple[dict[str, Any], str]], flags_by_group: dict) -> list[User]:
+    """
+    Insert a chunk of users with the side effects of ``_create_user`` done set-wise:
+    profiles (normally the ``create_profile`` signal), group / campus memberships,
+    role flags copied from a same-role user created through the regular path,
+    staff profiles with generated staff numbers.
+    """
+    from hr.staff.models import StaffProfile
+
+    with transaction.atomic():
+        users = User.objects.bulk_create(
+            [_new_user(plan, hashed, **flags_by_group[plan["group"].pk]) for plan, hashed in items]
+        )
+        Profile.objects.bulk_create(
+            [
+                Profile(
+                    user=user,
+                    first_name=user.first_name or "",
+                    last_name=user.last_name or "",
+                    date_joined=user.date_joined,
+                    is_staff=user.is_staff,
+                    is_applicant=user.is_applicant,
+                    email=user.email or "",
+                    phone=user.phone or None,
+                )
+                for user in users
+            ]
+        )
+        User.groups.through.objects.bulk_create(
+            [User.groups.through(user_id=user.pk, group_id=plan["group"].pk) for user, (plan, _) in zip(users, items)]
+        )
+        User.campuses.through.objects.bulk_create(
+            [
+                User.campuses.through(user_id=user.pk, campus_id=plan["campus"].pk)
+                for user, (plan, _) in zip(users, items)
+                if plan["campus"]
+            ]
+        )
+        staff_numbers = iter(_new_staff_numbers(sum(1 for plan, _ in items if not plan["staff_id"])))
+        staff = StaffProfile.objects.bulk_create(
+            [
+                StaffProfile(
+                    user=user,
+                    first_name=plan["first_name"],
+                    last_name=plan["last_name"],
+                    university_email=plan["email"],
+                    staff_no=plan["staff_id"] or next(staff_numbers),
+                    system_login=True,
+                )
+                for user, (plan, _) in zip(users, items)
+            ]
+        )
+        StaffProfile.campus.through.objects.bulk_create(
+            [
+                StaffProfile.campus.through(staffprofile_id=profile.pk, campus_id=plan["campus"].pk)
+                for profile, (plan, _) in zip(staff, items)
+                if plan["campus"]
+            ]
+        )
+    return users
+
+
+def import_users_from_rows(
+    rows: list[dict[str, Any]],
+    *,
+    send_email: bool = True,
+    on_progress: Callable[[int, int, int], None] | None = None,
+    hash_workers: int = 1,
+) -> dict:
+    """
+    Create users set-wise: rows are validated against one-shot lookups,
+    passwords hashed up front (``hash_workers`` threads; the import job uses
+    several, requests hash inline), and users
+    inserted in chunks with ``bulk_create`` plus bulk group / campus / profile
+    rows. The first user of each role goes through the regular save path and
+    its role / portal flags are copied to the rest of that role. A chunk whose
+    insert fails is retried row by row so one bad row only fails itself.
+    Credential emails are queued as one batched Celery task.
+
+    ``on_progress(processed_rows, created, failed)`` is called after each chunk.
+    """
+    plans, errors = _plan_user_rows(rows)
+    passwords = [generate_temp_password() for _ in plans]
+    hashes = hash_passwords(passwords, workers=hash_workers)
+
+    created: list[dict] = []
+    pending_emails: list[tuple[int, str]] = []  # (user_id, password)
+    flags_by_group: dict[int, dict[str, Any]] = {}
+    processed = len(rows) - len(plans)
+
+    for start in range(0, len(plans), USER_IMPORT_CHUNK_SIZE):
+        chunk = list(range(start, min(start + USER_IMPORT_CHUNK_SIZE, len(plans))))
+        users: dict[int, User] = {}
+        bulk: list[int] = []
+        for i in chunk:
+            group_id = plans[i]["group"].pk
+            if group_id in flags_by_group:
+                bulk.append(i)
+                continue
             try:
-                celery_send_account_email.delay(user_id, password, True)
-                emails_queued += 1
-                created[i]["email_queued"] = True
+                users[i] = _create_user(plans[i], hashes[i])
+            except Exception as exc:
+                errors.append(f"Row {plans[i]['row']}: could not create user — {exc}")
+                continue
+            flags_by_group[group_id] = {f: getattr(users[i], f) for f in ROLE_FLAG_FIELDS}
+
+        if bulk:
+            try:
+                inserted = _bulk_create_users([(plans[i], hashes[i]) for i in bulk], flags_by_group)
+                users.update(zip(bulk, inserted))
             except Exception:
-                errors.append(
-                    f"User id {user_id}: created but email queue failed"
-                )
+                logger.warning("Bulk user insert failed; retrying %s rows one by one", len(bulk), exc_info=True)
+                for i in bulk:
+                    try:
+                        users[i] = _create_user(plans[i], hashes[i])
+                    except Exception as exc:
+                        errors.append(f"Row {plans[i]['row']}: could not create user — {exc}")
+
+        for i in chunk:
+            user = users.get(i)
+            if user is None:
+                continue
+            plan = plans[i]
+            pending_emails.append((user.pk, passwords[i]))
+            created.append(
+                {
+                    "id": user.pk,
+                    "email": plan["email"],
+                    "name": f"{plan['first_name']} {plan['last_name']}".strip(),
+                    "role": user.role,
+                    "email_queued": False,
+                }
+            )
+        processed += len(chunk)
+        if on_progress:
+            on_progress(processed, len(created), len(errors))
+
+    emails_queued = 0
+    if send_email and pending_emails:
+        try:
+            celery_send_account_emails.delay(pending_emails, True)
+            emails_queued = len(pending_emails)
+            for item in created:
+                item["email_queued"] = True
+        except Exception:
+            logger.exception("Could not queue %s account emails", len(pending_emails))
+            errors.append(f"{len(pending_emails)} user(s) created but the email queue failed")
 
     return {
         "created": len(created),
@@ -421,3 +609,75 @@ def import_users_from_rows(rows: list[dict[str, Any]], *, send_email: bool = Tru
         "created_users": created,
         "errors": errors,
     }
+
+
+def start_staff_user_import_job(
+    *, uploaded_file, user, total_rows: int = 0, send_email: bool = True
+) -> StaffUserImportJob:
+    """Store the upload and run the import on a worker after commit."""
+    job = StaffUserImportJob(
+        send_email=send_email,
+        total_rows=total_rows,
+        created_by=user if getattr(user, "is_authenticated", False) else None,
+    )
+    uploaded_file.seek(0)
+    job.upload.save(getattr(uploaded_file, "name", "") or "users.xlsx", uploaded_file, save=False)
+    job.save()
+
+    def _enqueue():
+        from accounts.tasks import celery_run_staff_user_import
+
+        celery_run_staff_user_import.delay(job.pk)
+
+    transaction.on_commit(_enqueue)
+    return job
+
+
+def run_staff_user_import_job(job_id: int) -> dict:
+    """Parse and import one stored upload (worker side)."""
+    from audit.utils import log_audit_event
+
+    job = StaffUserImportJob.objects.select_related("created_by").get(pk=job_id)
+    jobs = StaffUserImportJob.objects.filter(pk=job.pk)
+    jobs.update(status=StaffUserImportJob.STATUS_RUNNING, started_at=timezone.now(), error="")
+    try:
+        with job.upload.open("rb") as fh:
+            rows = parse_upload_file(fh)
+        jobs.update(total_rows=len(rows))
+
+        def _progress(processed, created, failed):
+            jobs.update(processed_rows=processed, created_count=created, failed_count=failed)
+
+        result = import_users_from_rows(
+            rows,
+            send_email=job.send_email,
+            on_progress=_progress,
+            hash_workers=PASSWORD_HASH_JOB_WORKERS,
+        )
+    except Exception as exc:
+        if not isinstance(exc, ValueError):
+            logger.exception("staff user import job %s failed", job.pk)
+        jobs.update(
+            status=StaffUserImportJob.STATUS_FAILED,
+            error=str(exc)[:2000],
+            finished_at=timezone.now(),
+        )
+        return {"job_id": job.pk, "status": StaffUserImportJob.STATUS_FAILED}
+
+    jobs.update(
+        status=StaffUserImportJob.STATUS_DONE,
+        processed_rows=len(rows),
+        created_count=result["created"],
+        failed_count=len(result["errors"]),
+        emails_queued=result["emails_queued"],
+        result=result,
+        finished_at=timezone.now(),
+    )
+    if job.created_by_id:
+        log_audit_event(
+            job.created_by,
+            "bulk_user_upload",
+            None,
+            f"Bulk user upload job #{job.pk}: created={result['created']} errors={len(result['errors'])}",
+        )
+    return {"job_id": job.pk, "status": StaffUserImportJob.STATUS_DONE}
@@ -1,7 +1,11 @@
+import logging
+
 from celery import shared_task
 from django.apps import apps
 from .utils.emails import send_account_email, send_reset_password_link, send_horizon_reset_password_link
 
+logger = logging.getLogger(__name__)
+
 @shared_task
 def celery_send_account_email(user_id, password, use_erp_portal=None, subject=None):
    User = apps.get_model('accounts', 'User')
@@ -31,3 +35,28 @@ def celery_send_reminder_email(user_id):
    User = apps.get_model('accounts', 'User')
    user = User.objects.get(id=user_id)
    send_application_reminder(user)
+
+@shared_task
+def celery_send_account_emails(items, use_erp_portal=None, subject=None):
+   """Credential emails for a bulk import: ``items`` is ``[(user_id, password), ...]``."""
+   User = apps.get_model('accounts', 'User')
+   passwords = {int(user_id): password for user_id, password in items}
+   sent = 0
+   for user in User.objects.filter(id__in=passwords):
+      try:
+         send_account_email(
+          user,
+          passwords[user.id],
+          subject=subject or "Account Created Successfully",
+          use_erp_portal=use_erp_portal,
+         )
+         sent += 1
+      except Exception:
+         logger.exception("Account email failed for user %s", user.id)
+   return sent
+
+@shared_task(bind=True, max_retries=0)
+def celery_run_staff_user_import(self, job_id):
+   """Import a stored bulk staff user upload."""
+   from .bulk_user_import import run_staff_user_import_job
+   return run_staff_user_import_job(job_id)
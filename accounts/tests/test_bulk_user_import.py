@@ -0,0 +1,125 @@
+"""Bulk staff user import — password hashing and set-wise chunk handling."""
+
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.hashers import check_password
+from django.test import SimpleTestCase
+
+from accounts import bulk_user_import
+
+
+def _plan(row, group_id=1):
+    return {
+        "row": row,
+        "first_name": f"First{row}",
+        "last_name": "Last",
+        "email": f"user{row}@example.com",
+        "staff_id": "",
+        "phone": "",
+        "group": SimpleNamespace(pk=group_id, name=f"Role {group_id}"),
+        "campus": None,
+    }
+
+
+class HashPasswordsTests(SimpleTestCase):
+    def test_threaded_hashes_verify_in_order(self):
+        passwords = [f"Secret{i}x" for i in range(6)]
+        hashes = bulk_user_import.hash_passwords(passwords, workers=3)
+        self.assertEqual(len(hashes), len(passwords))
+        self.assertTrue(check_password(passwords[3], hashes[3]))
+        self.assertFalse(check_password(passwords[3], hashes[4]))
+
+    def test_single_worker_hashes_inline(self):
+        with mock.patch.object(bulk_user_import, "ThreadPoolExecutor") as pool:
+            hashes = bulk_user_import.hash_passwords(["Secret1x", "Secret2x"])
+        pool.assert_not_called()
+        self.assertTrue(check_password("Secret2x", hashes[1]))
+
+
+class ImportUsersFromRowsTests(SimpleTestCase):
+    def _run(self, plans, *, bulk_side_effect=None):
+        created_ids = iter(range(100, 200))
+
+        def _create_user(plan, _hash):
+            return SimpleNamespace(
+                pk=next(created_ids), role=plan["group"].name, is_staff=True, is_lecturer=False,
+                is_student=False, is_applicant=False, portal_mode="admin",
+            )
+
+        def _bulk(items, flags_by_group):
+            return [SimpleNamespace(pk=next(created_ids), role=flags_by_group[p["group"].pk]["role"]) for p, _ in items]
+
+        with mock.patch.object(bulk_user_import, "_plan_user_rows", return_value=(plans, [])), \
+                mock.patch.object(bulk_user_import, "hash_passwords", side_effect=lambda pws, **kw: pws), \
+                mock.patch.object(bulk_user_import, "_create_user", side_effect=_create_user) as create, \
+                mock.patch.object(
+                    bulk_user_import, "_bulk_create_users", side_effect=bulk_side_effect or _bulk
+                ) as bulk, \
+                mock.patch.object(bulk_user_import.celery_send_account_emails, "delay") as delay:
+            progress = []
+            result = bulk_user_import.import_users_from_rows(
+                [{}] * len(plans), on_progress=lambda *args: progress.append(args)
+            )
+        return result, create, bulk, delay, progress
+
+    def test_first_user_per_role_saved_rest_bulk_inserted(self):
+        plans = [_plan(1, 1), _plan(2, 1), _plan(3, 2), _plan(4, 1)]
+        result, create, bulk, delay, progress = self._run(plans)
+
+        self.assertEqual(create.call_count, 2)
+        bulk_rows = [p["row"] for p, _ in bulk.call_args.args[0]]
+        self.assertEqual(bulk_rows, [2, 4])
+        self.assertEqual(result["created"], 4)
+        self.assertEqual([u["email"] for u in result["created_users"]], [p["email"] for p in plans])
+        delay.assert_called_once()
+        self.assertEqual(len(delay.call_args.args[0]), 4)
+        self.assertEqual(result["emails_queued"], 4)
+        self.assertEqual(progress, [(4, 4, 0)])
+
+    def test_failed_bulk_chunk_retried_row_by_row(self):
+        plans = [_plan(1), _plan(2), _plan(3)]
+        result, create, _bulk, _delay, _progress = self._run(
+            plans, bulk_side_effect=RuntimeError("duplicate key")
+        )
+        self.assertEqual(create.call_count, 3)
+        self.assertEqual(result["created"], 3)
+        self.assertEqual(result["errors"], [])
+
+
+class StaffUserImportJobTests(SimpleTestCase):
+    def test_job_hashes_on_threads_and_creates_users(self):
+        plans = [_plan(1, 1), _plan(2, 1), _plan(3, 1)]
+        job = SimpleNamespace(pk=5, send_email=False, created_by_id=None, upload=mock.MagicMock())
+        jobs = mock.MagicMock()
+        jobs.select_related.return_value.get.return_value = job
+        seen_hashes = []
+        ids = iter(range(100, 200))
+
+        def _create_user(plan, password_hash):
+            seen_hashes.append(password_hash)
+            return SimpleNamespace(
+                pk=next(ids), role=plan["group"].name, is_staff=True, is_lecturer=False,
+                is_student=False, is_applicant=False, portal_mode="admin",
+            )
+
+        def _bulk(items, flags_by_group):
+            seen_hashes.extend(h for _, h in items)
+            return [SimpleNamespace(pk=next(ids), role=flags_by_group[p["group"].pk]["role"]) for p, _ in items]
+
+        with mock.patch.object(bulk_user_import.StaffUserImportJob, "objects", jobs), \
+                mock.patch.object(bulk_user_import, "parse_upload_file", return_value=[{}] * 3), \
+                mock.patch.object(bulk_user_import, "_plan_user_rows", return_value=(plans, [])), \
+                mock.patch.object(bulk_user_import, "_create_user", side_effect=_create_user), \
+                mock.patch.object(bulk_user_import, "_bulk_create_users", side_effect=_bulk), \
+                mock.patch.object(
+                    bulk_user_import, "ThreadPoolExecutor", wraps=bulk_user_import.ThreadPoolExecutor
+                ) as pool:
+            outcome = bulk_user_import.run_staff_user_import_job(5)
+
+        self.assertEqual(outcome["status"], bulk_user_import.StaffUserImportJob.STATUS_DONE)
+        self.assertEqual(pool.call_args.kwargs["max_workers"], bulk_user_import.PASSWORD_HASH_JOB_WORKERS)
+        self.assertEqual(len(seen_hashes), 3)
+        self.assertTrue(all(h.startswith(("pbkdf2", "argon2", "bcrypt")) for h in seen_hashes))
+        done = jobs.filter.return_value.update.call_args.kwargs
+        self.assertEqual((done["created_count"], done["failed_count"]), (3, 0))
@@ -62,4 +62,5 @@ urlpatterns = [
 
     path('users/bulk/template/', BulkUserTemplateDownload.as_view()),
     path('users/bulk/upload/', BulkUserUpload.as_view()),
+    path('users/bulk/jobs/<int:job_id>/', BulkUserImportJobView.as_view()),
 ]
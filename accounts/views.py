@@ -1422,13 +1422,24 @@ class BulkUserTemplateDownload(APIView):
 
 
 class BulkUserUpload(APIView):
-    """Upload filled template; create staff users + email temp passwords."""
+    """
+    Upload filled template; create staff users + email temp passwords.
+
+    Files with more than ``BULK_USER_SYNC_MAX_ROWS`` rows (or background=true) are
+    queued as a ``StaffUserImportJob`` and answered with 202 + job_id; poll
+    GET /api/accounts/users/bulk/jobs/<job_id>/ for progress and the result.
+    """
 
     permission_classes = [IsAuthenticated, CanManageErpUsers]
     parser_classes = [MultiPartParser, FormParser]
 
     def post(self, request):
-        from accounts.bulk_user_import import import_users_from_rows, parse_upload_file
+        from accounts.bulk_user_import import (
+            BULK_USER_SYNC_MAX_ROWS,
+            import_users_from_rows,
+            parse_upload_file,
+            start_staff_user_import_job,
+        )
 
         upload = request.FILES.get("file") or request.FILES.get("file_path")
         if not upload:
@@ -1458,6 +1469,27 @@ class BulkUserUpload(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        background = str(request.data.get("background", "false")).lower() in ("1", "true", "yes", "on")
+        if background or len(rows) > BULK_USER_SYNC_MAX_ROWS:
+            job = start_staff_user_import_job(
+                uploaded_file=upload, user=request.user, total_rows=len(rows)
+            )
+            log_audit_event(
+                request.user,
+                "bulk_user_upload",
+                None,
+                f"Bulk user upload queued: job #{job.pk}, rows={len(rows)}",
+                request,
+            )
+            return Response(
+                {
+                    "ok": True,
+                    "message": f"Import of {len(rows)} row(s) queued.",
+                    **_staff_user_import_job_payload(job),
+                },
+                status=status.HTTP_202_ACCEPTED,
+            )
+
         result = import_users_from_rows(rows, send_email=True)
         log_audit_event(
             request.user,
@@ -1479,6 +1511,35 @@ class BulkUserUpload(APIView):
         )
 
 
+def _staff_user_import_job_payload(job) -> dict:
+    return {
+        "job_id": job.pk,
+        "status": job.status,
+        "total_rows": job.total_rows,
+        "processed_rows": job.processed_rows,
+        "created": job.created_count,
+        "failed": job.failed_count,
+        "emails_queued": job.emails_queued,
+        "result": job.result or {},
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+class BulkUserImportJobView(APIView):
+    """GET /api/accounts/users/bulk/jobs/<job_id>/ — progress of a queued bulk user import."""
+
+    permission_classes = [IsAuthenticated, CanManageErpUsers]
+
+    def get(self, request, job_id):
+        job = get_object_or_404(StaffUserImportJob, pk=job_id)
+        if job.created_by_id != request.user.id and not user_is_super_admin(request.user):
+            return Response({"detail": "Import job not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(_staff_user_import_job_payload(job))
+
+
 
 
 
@@ -0,0 +1,301 @@
+"""
+Admissions analytics rollup (``AdmissionsDailyRollup``).
+
+The analytics dashboard answers its KPI, status / source / gender / nationality,
+campus / level / batch and monthly-trend figures from this table with one
+grouped query instead of a run of ``.count()`` scans over ``Application``.
+
+Rows are rebuilt per application day: Application / AdmittedStudent signals mark
+the day dirty and ``celery_refresh_admissions_rollup`` regroups just that day
+after commit. ``celery_rebuild_admissions_rollup`` rebuilds everything nightly
+to pick up queryset ``update()`` calls that bypass signals.
+"""
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from datetime import date
+from typing import Any, Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import BooleanField, Case, CharField, Count, F, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, Lower, TruncDate, TruncMonth, Trim
+from django.utils import timezone
+
+from .models import AcademicLevel, AdmissionsDailyRollup, AdmittedStudent, Application, Batch
+from accounts.models import Campus
+
+logger = logging.getLogger(__name__)
+
+LOCAL_NATIONALITIES = {"Uganda", "Kenya", "Tanzania", "Rwanda", "Burundi", "South Sudan"}
+
+# A dirty day is regrouped once per this window however many saves touch it.
+ROLLUP_DEBOUNCE_SECONDS = 30
+_DIRTY_KEY = "admissions:rollup:dirty:{}"
+
+
+def gender_key_expression():
+    """Case-insensitive gender bucket: F/female/FEMALE → female, M/male → male."""
+    return Case(
+        When(_gender_raw__in=["f", "female"], then=Value("female")),
+        When(_gender_raw__in=["m", "male"], then=Value("male")),
+        When(_gender_raw="other", then=Value("other")),
+        default=F("_gender_raw"),
+        output_field=CharField(),
+    )
+
+
+def _application_rows(days: list[date] | None) -> list[AdmissionsDailyRollup]:
+    qs = Application.objects.all()
+    if days is not None:
+        qs = qs.filter(created_at__date__in=days)
+    grouped = (
+        qs.annotate(
+            day=TruncDate("created_at"),
+            _gender_raw=Lower(Trim(Coalesce(F("gender"), Value("")))),
+        )
+        .annotate(
+            _gender_key=gender_key_expression(),
+            _local=Case(
+                When(nationality__in=LOCAL_NATIONALITIES, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+        )
+        .values("day", "batch_id", "campus_id", "academic_level_id", "status", "source", "_gender_key", "_local")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    return [
+        AdmissionsDailyRollup(
+            kind=AdmissionsDailyRollup.KIND_APPLICATION,
+            day=r["day"],
+            batch_id=r["batch_id"],
+            campus_id=r["campus_id"],
+            academic_level_id=r["academic_level_id"],
+            status=(r["status"] or "")[:20],
+            source=(r["source"] or "")[:30],
+            gender_key=(r["_gender_key"] or "")[:20],
+            is_local=r["_local"],
+            applications=r["n"],
+        )
+        for r in grouped
+        if r["day"] is not None
+    ]
+
+
+def _admitted_rows(days: list[date] | None) -> list[AdmissionsDailyRollup]:
+    qs = AdmittedStudent.objects.all()
+    if days is not None:
+        qs = qs.filter(application__created_at__date__in=days)
+    grouped = (
+        qs.annotate(day=TruncDate("application__created_at"))
+        .values(
+            "day",
+            "admitted_batch_id",
+            "admitted_campus_id",
+            level_id=F("admitted_program__academic_level_id"),
+        )
+        .annotate(
+            admitted=Count("id", filter=Q(is_admitted=True)),
+            registered=Count("id", filter=Q(is_registered=True)),
+        )
+        .order_by()
+    )
+    return [
+        AdmissionsDailyRollup(
+            kind=AdmissionsDailyRollup.KIND_ADMITTED,
+            day=r["day"],
+            batch_id=r["admitted_batch_id"],
+            campus_id=r["admitted_campus_id"],
+            academic_level_id=r["level_id"],
+            admitted=r["admitted"],
+            registered=r["registered"],
+        )
+        for r in grouped
+        if r["day"] is not None and (r["admitted"] or r["registered"])
+    ]
+
+
+def rebuild_admissions_rollup(days: Iterable[date] | None = None) -> int:
+    """Regroup the given application days (or everything when ``days`` is None)."""
+    day_list = None if days is None else sorted(set(days))
+    if day_list == []:
+        return 0
+    rows = _application_rows(day_list) + _admitted_rows(day_list)
+    with transaction.atomic():
+        stale = AdmissionsDailyRollup.objects.all()
+        if day_list is not None:
+            stale = stale.filter(day__in=day_list)
+        stale.delete()
+        AdmissionsDailyRollup.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def ensure_admissions_rollup() -> None:
+    """First use on an existing database: build the table once."""
+    if not AdmissionsDailyRollup.objects.exists():
+        rebuild_admissions_rollup()
+
+
+def mark_admissions_rollup_dirty(day: date | None) -> None:
+    """Queue a regroup of one application day after the current transaction commits."""
+    if day is None:
+        return
+
+    def _enqueue():
+        try:
+            if not cache.add(_DIRTY_KEY.format(day.isoformat()), 1, timeout=ROLLUP_DEBOUNCE_SECONDS):
+                return
+            from admissions.tasks import celery_refresh_admissions_rollup
+
+            celery_refresh_admissions_rollup.apply_async(
+                args=[day.isoformat()], countdown=ROLLUP_DEBOUNCE_SECONDS // 3
+            )
+        except Exception:
+            logger.exception("failed to queue admissions rollup refresh for %s", day)
+
+    transaction.on_commit(_enqueue)
+
+
+def refresh_admissions_rollup_day(day: date) -> int:
+    # Clear the marker first so changes committed while we regroup queue another pass.
+    cache.delete(_DIRTY_KEY.format(day.isoformat()))
+    return rebuild_admissions_rollup([day])
+
+
+def mark_admissions_rollup_dirty_for_applications(application_ids: Iterable[int]) -> None:
+    """For callers that change applications with ``update()`` (no signals)."""
+    for created_at in Application.objects.filter(pk__in=list(application_ids)).values_list(
+        "created_at", flat=True
+    ):
+        mark_admissions_rollup_dirty(timezone.localdate(created_at) if created_at else None)
+
+
+def admissions_rollup_summary(
+    *,
+    batch_id=None,
+    campus_id=None,
+    academic_level_id=None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> dict[str, Any]:
+    """Dashboard figures for a filter combination from one grouped rollup query."""
+    ensure_admissions_rollup()
+    qs = AdmissionsDailyRollup.objects.exclude(
+        kind=AdmissionsDailyRollup.KIND_APPLICATION, status="draft"
+    )
+    if batch_id:
+        qs = qs.filter(batch_id=batch_id)
+    if campus_id:
+        qs = qs.filter(campus_id=campus_id)
+    if academic_level_id:
+        qs = qs.filter(academic_level_id=academic_level_id)
+    if date_from:
+        qs = qs.filter(day__gte=date_from)
+    if date_to:
+        qs = qs.filter(day__lte=date_to)
+
+    rows = (
+        qs.annotate(month=TruncMonth("day"))
+        .values(
+            "kind",
+            "month",
+            "batch_id",
+            "campus_id",
+            "academic_level_id",
+            "status",
+            "source",
+            "gender_key",
+            "is_local",
+        )
+        .annotate(
+            n_applications=Sum("applications"),
+            n_admitted=Sum("admitted"),
+            n_registered=Sum("registered"),
+        )
+        .order_by()
+    )
+
+    status_counts: dict[str, int] = defaultdict(int)
+    source_counts: dict[str, int] = defaultdict(int)
+    gender_counts: dict[str, int] = defaultdict(int)
+    month_counts: dict[date, int] = defaultdict(int)
+    campus_counts: dict[Any, int] = defaultdict(int)
+    level_counts: dict[Any, int] = defaultdict(int)
+    batch_counts: dict[Any, dict[str, int]] = defaultdict(
+        lambda: {"total": 0, "admitted": 0, "rejected": 0, "pending": 0}
+    )
+    local = admitted_students = registered = 0
+    for r in rows:
+        if r["kind"] == AdmissionsDailyRollup.KIND_ADMITTED:
+            admitted_students += r["n_admitted"] or 0
+            registered += r["n_registered"] or 0
+            continue
+        n = r["n_applications"] or 0
+        status_counts[r["status"]] += n
+        source_counts[r["source"]] += n
+        gender_counts[r["gender_key"]] += n
+        if r["month"]:
+            month_counts[r["month"]] += n
+        campus_counts[r["campus_id"]] += n
+        level_counts[r["academic_level_id"]] += n
+        if r["is_local"]:
+            local += n
+        bucket = batch_counts[r["batch_id"]]
+        bucket["total"] += n
+        bucket["admitted"] += n if r["status"] == "accepted" else 0
+        bucket["rejected"] += n if r["status"] == "rejected" else 0
+        bucket["pending"] += n if r["status"] == "submitted" else 0
+
+    campus_names = dict(Campus.objects.filter(pk__in=[k for k in campus_counts if k]).values_list("id", "name"))
+    level_names = dict(
+        AcademicLevel.objects.filter(pk__in=[k for k in level_counts if k]).values_list("id", "name")
+    )
+    batch_info = {
+        b["id"]: b
+        for b in Batch.objects.filter(pk__in=[k for k in batch_counts if k]).values(
+            "id", "name", "academic_year"
+        )
+    }
+
+    def _desc(counts: dict, key: str, label=lambda k: k) -> list[dict]:
+        merged: dict[Any, int] = defaultdict(int)
+        for k, n in counts.items():
+            merged[label(k)] += n
+        return [
+            {key: k, "count": n}
+            for k, n in sorted(merged.items(), key=lambda item: -item[1])
+            if n
+        ]
+
+    total_submitted = sum(status_counts.values())
+    return {
+        "total_submitted": total_submitted,
+        "status_counts": dict(status_counts),
+        "total_admitted_students": admitted_students,
+        "total_registered": registered,
+        "applications_by_source": _desc(source_counts, "source"),
+        "status_breakdown": _desc(status_counts, "status"),
+        "monthly_trend": [
+            {"month": month.strftime("%b %Y"), "count": month_counts[month]}
+            for month in sorted(month_counts)
+        ],
+        "by_campus": _desc(campus_counts, "campus_name", lambda k: campus_names.get(k)),
+        "by_academic_level": _desc(level_counts, "level", lambda k: level_names.get(k)),
+        "gender_counts": dict(gender_counts),
+        "local_count": local,
+        "by_batch": sorted(
+            (
+                {
+                    "batch_name": batch_info.get(k, {}).get("name"),
+                    "academic_year": batch_info.get(k, {}).get("academic_year"),
+                    **counts,
+                }
+                for k, counts in batch_counts.items()
+                if counts["total"]
+            ),
+            key=lambda row: -row["total"],
+        ),
+    }
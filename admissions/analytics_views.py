@@ -4,9 +4,10 @@ GET /api/admissions/analytics/dashboard
 Query params: batch_id, campus_id, academic_level_id, date_from, date_to
 
 AdmittedStudent breakdowns also respect academic_level_id and application created_at dates.
+KPI / status / source / gender / nationality / campus / level / batch / monthly figures are
+read from ``AdmissionsDailyRollup`` (see ``admissions.analytics_rollup``).
 """
-from django.db.models import Count, Q, F, Value, Max, Case, When, CharField
-from django.db.models.functions import TruncMonth, Trim, Lower, Coalesce
+from django.db.models import Count, F
 from django.utils.dateparse import parse_date
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -14,6 +15,7 @@ from rest_framework.permissions import IsAuthenticated
 
 from accounts.erp_drf_permissions import CanViewAdmissionsAnalytics
 
+from .analytics_rollup import admissions_rollup_summary
 from .models import Application, AdmittedStudent, Batch, AcademicLevel
 from .utils.batch_offer_filters import batch_offer_window_q
 from .utils.school_name_normalize import aggregate_top_schools
@@ -28,9 +30,6 @@ except (ImportError, ProgrammingError):
     _HAS_ENROLLMENT = False
 
 
-LOCAL_NATIONALITIES = {"Uganda", "Kenya", "Tanzania", "Rwanda", "Burundi", "South Sudan"}
-
-
 def _display_gender_label(group_key: str) -> str:
     """Readable chart/CSV label from a normalized gender bucket key."""
     gk = (group_key or "").strip().lower()
@@ -76,22 +75,29 @@ class AnalyticsDashboardView(APIView):
         # Exclude drafts from most metrics
         submitted_qs = qs.exclude(status="draft")
 
+        # Counts / breakdowns come from the pre-aggregated rollup (one grouped query).
+        rollup = admissions_rollup_summary(
+            batch_id=batch_id,
+            campus_id=campus_id,
+            academic_level_id=academic_level_id,
+            date_from=parse_date(date_from) if date_from else None,
+            date_to=parse_date(date_to) if date_to else None,
+        )
+        status_counts = rollup["status_counts"]
+        source_counts = {r["source"]: r["count"] for r in rollup["applications_by_source"]}
+
         # ── KPI Cards ─────────────────────────────────────────────────────────
-        total_submitted   = submitted_qs.count()
-        total_admitted    = submitted_qs.filter(status="accepted").count()
-        total_rejected    = submitted_qs.filter(status="rejected").count()
-        total_pending     = submitted_qs.filter(status="submitted").count()
-        total_under_review = submitted_qs.filter(status="under_review").count()
+        total_submitted   = rollup["total_submitted"]
+        total_admitted    = status_counts.get("accepted", 0)
+        total_rejected    = status_counts.get("rejected", 0)
+        total_pending     = status_counts.get("submitted", 0)
+        total_under_review = status_counts.get("under_review", 0)
 
         # Online vs direct vs legacy (Application.source — same filters as other app metrics)
-        apps_portal = submitted_qs.filter(source=Application.SOURCE_PORTAL).count()
-        apps_direct_entry = submitted_qs.filter(source=Application.SOURCE_DIRECT).count()
-        apps_legacy_import = submitted_qs.filter(source=Application.SOURCE_LEGACY).count()
-        applications_by_source = list(
-            submitted_qs.values("source")
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
+        apps_portal = source_counts.get(Application.SOURCE_PORTAL, 0)
+        apps_direct_entry = source_counts.get(Application.SOURCE_DIRECT, 0)
+        apps_legacy_import = source_counts.get(Application.SOURCE_LEGACY, 0)
+        applications_by_source = rollup["applications_by_source"]
 
         admitted_qs = AdmittedStudent.objects.all()
         if batch_id:
@@ -108,8 +114,8 @@ class AnalyticsDashboardView(APIView):
             d = parse_date(date_to)
             if d:
                 admitted_qs = admitted_qs.filter(application__created_at__date__lte=d)
-        total_registered = admitted_qs.filter(is_registered=True).count()
-        total_admitted_students = admitted_qs.filter(is_admitted=True).count()
+        total_registered = rollup["total_registered"]
+        total_admitted_students = rollup["total_admitted_students"]
 
         active_batches = Batch.objects.filter(is_active=True).filter(batch_offer_window_q()).count()
 
@@ -122,38 +128,16 @@ class AnalyticsDashboardView(APIView):
         ]
 
         # ── Status Breakdown (pie) ────────────────────────────────────────────
-        status_breakdown = list(
-            submitted_qs.values("status")
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
+        status_breakdown = rollup["status_breakdown"]
 
         # ── Monthly Trend (line chart) ────────────────────────────────────────
-        monthly_trend = list(
-            submitted_qs
-            .annotate(month=TruncMonth("created_at"))
-            .values("month")
-            .annotate(count=Count("id"))
-            .order_by("month")
-        )
-        monthly_trend_clean = [
-            {"month": r["month"].strftime("%b %Y"), "count": r["count"]}
-            for r in monthly_trend if r["month"]
-        ]
+        monthly_trend_clean = rollup["monthly_trend"]
 
         # ── Applications by Campus (bar) ──────────────────────────────────────
-        by_campus = list(
-            submitted_qs.values(campus_name=F("campus__name"))
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
+        by_campus = rollup["by_campus"]
 
         # ── Applications by Academic Level (bar) ──────────────────────────────
-        by_level = list(
-            submitted_qs.values(level=F("academic_level__name"))
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
+        by_level = rollup["by_academic_level"]
 
         # ── Faculty: accepted applications vs admitted students ───────────────
         # Accepted = Application with status accepted; faculty via ApplicationProgramChoice.
@@ -187,32 +171,19 @@ class AnalyticsDashboardView(APIView):
         top_schools = aggregate_top_schools(submitted_qs, limit=10)
 
         # ── Gender Breakdown (pie) ────────────────────────────────────────────
-        # Group case-insensitively; merge F/female/FEMALE and M/male/MALE.
-        gender_breakdown_rows = list(
-            submitted_qs.annotate(
-                _gender_raw=Lower(Trim(Coalesce(F("gender"), Value("")))),
-            )
-            .annotate(
-                gender_key=Case(
-                    When(_gender_raw__in=["f", "female"], then=Value("female")),
-                    When(_gender_raw__in=["m", "male"], then=Value("male")),
-                    When(_gender_raw="other", then=Value("other")),
-                    default=F("_gender_raw"),
-                    output_field=CharField(),
-                ),
-            )
-            .values("gender_key")
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
+        # Grouped case-insensitively in the rollup; F/female/FEMALE and M/male/MALE merged.
+        gender_totals = {}
+        for key, count in rollup["gender_counts"].items():
+            label = _display_gender_label(key)
+            gender_totals[label] = gender_totals.get(label, 0) + count
         gender_breakdown = [
-            {"gender": _display_gender_label(r["gender_key"]), "count": r["count"]}
-            for r in gender_breakdown_rows
+            {"gender": label, "count": count}
+            for label, count in sorted(gender_totals.items(), key=lambda item: -item[1])
+            if count
         ]
 
         # ── Nationality Type: Local vs International ───────────────────────────
-        local_count = submitted_qs.filter(
-            nationality__in=LOCAL_NATIONALITIES).count()
+        local_count = rollup["local_count"]
         intl_count  = total_submitted - local_count
         nationality_split = [
             {"type": "Local",         "count": local_count},
@@ -235,19 +206,7 @@ class AnalyticsDashboardView(APIView):
                 enrollment_breakdown = []
 
         # ── Admission by Batch ────────────────────────────────────────────────
-        by_batch = list(
-            submitted_qs.values(
-                batch_name=F("batch__name"),
-                academic_year=F("batch__academic_year"),
-            )
-            .annotate(
-                total=Count("id"),
-                admitted=Count("id", filter=Q(status="accepted")),
-                rejected=Count("id", filter=Q(status="rejected")),
-                pending=Count("id", filter=Q(status="submitted")),
-            )
-            .order_by("-total")
-        )
+        by_batch = rollup["by_batch"]
 
         # ── Filter Options (for the UI dropdowns) ─────────────────────────────
         batches = list(
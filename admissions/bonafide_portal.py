@@ -205,11 +205,9 @@ def build_bonafide_portal_snapshot(student: AdmittedStudent, request=None) -> di
         tuition_gate = {}
         try:
             from payments.models import RegistrationSettings
-            from payments.registration_eligibility import _compute_tuition_eligibility
+            from payments.registration_eligibility import tuition_eligibility
 
-            tuition_gate = _compute_tuition_eligibility(
-                student, RegistrationSettings.get_settings()
-            )
+            tuition_gate = tuition_eligibility(student, RegistrationSettings.get_settings())
         except Exception:
             tuition_gate = {}
 
@@ -0,0 +1,225 @@
+"""
+Prebuilt curriculum match index for exemption review.
+
+``CurriculumMatchIndex`` holds the active curriculum lines of one curriculum
+version (as the review rows used by the exemption pickers) together with the
+lookup structures ``suggest_curriculum_match`` needs:
+
+* normalized code → line ids (exact match) and code substring → line ids
+  (soft match, both directions);
+* digit-tail buckets (``MHR4103`` → ``4103``);
+* year/term buckets;
+* a token index over lower-cased course names.
+
+Matching a paper is then a handful of dict lookups instead of several passes
+over the whole curriculum. Indexes are cached per (curriculum version,
+programme) under a generation bumped by curriculum line / catalog edits.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from collections import Counter, defaultdict
+from typing import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+MATCH_INDEX_TTL_SECONDS = 60 * 30
+_GENERATION_KEY = "exemption:curriculum_match:generation"
+
+_NAME_TOKEN_MIN = 4
+_DIGIT_TAIL_MIN = 3
+_NAME_MIN = 6
+
+
+def norm_course_code(code: str) -> str:
+    """Normalize course codes for fuzzy matching (ignore spaces/punctuation/case)."""
+    return re.sub(r"[^A-Z0-9]", "", (code or "").upper())
+
+
+def code_digit_tail(code: str) -> str:
+    """Trailing digit run from a course code (e.g. MHR4103 → 4103)."""
+    m = re.search(r"(\d+)\s*$", (code or "").strip())
+    return m.group(1) if m else ""
+
+
+def name_tokens(name: str) -> set[str]:
+    return {t for t in name.replace("/", " ").split() if len(t) >= _NAME_TOKEN_MIN}
+
+
+def _substrings(value: str) -> set[str]:
+    return {value[i:j] for i in range(len(value)) for j in range(i + 1, len(value) + 1)}
+
+
+class CurriculumMatchIndex:
+    """Lookup structures over curriculum review rows (``id``, ``course_code``, ``course_name``, ...)."""
+
+    def __init__(self, rows: Iterable[dict]):
+        self.rows: list[dict] = [dict(r) for r in rows]
+        self.position: dict[int, int] = {}
+        self.by_code: dict[str, list[int]] = defaultdict(list)
+        self.by_code_part: dict[str, set[int]] = defaultdict(set)
+        self.by_digit_tail: dict[str, set[int]] = defaultdict(set)
+        self.by_term: dict[tuple, set[int]] = defaultdict(set)
+        self.by_token: dict[str, set[int]] = defaultdict(set)
+        self.lower_name: dict[int, str] = {}
+        for pos, row in enumerate(self.rows):
+            line_id = row["id"]
+            self.position[line_id] = pos
+            code = norm_course_code(row.get("course_code") or "")
+            self.by_code[code].append(line_id)
+            for part in _substrings(code):
+                self.by_code_part[part].add(line_id)
+            self.by_digit_tail[code_digit_tail(row.get("course_code") or "")].add(line_id)
+            self.by_term[(row.get("year_of_study"), row.get("term_number"))].add(line_id)
+            name = (row.get("course_name") or "").strip().lower()
+            self.lower_name[line_id] = name
+            for token in name_tokens(name):
+                self.by_token[token].add(line_id)
+        self.by_code = dict(self.by_code)
+        self.by_code_part = dict(self.by_code_part)
+        self.by_digit_tail = dict(self.by_digit_tail)
+        self.by_term = dict(self.by_term)
+        self.by_token = dict(self.by_token)
+
+    def _ordered(self, ids: Iterable[int]) -> list[int]:
+        return sorted(ids, key=self.position.__getitem__)
+
+    def review_rows(self, exempted_ids: Iterable[int] = ()) -> list[dict]:
+        exempted = set(exempted_ids)
+        return [{**row, "already_exempted": row["id"] in exempted} for row in self.rows]
+
+    def code_matches(self, paper_code: str, allowed: set[int] | None = None) -> tuple[list[int], list[int]]:
+        """``(exact, soft)`` line ids for a typed code, in curriculum order."""
+        target = norm_course_code(paper_code)
+        if not target:
+            return [], []
+        exact = [i for i in self.by_code.get(target, ()) if allowed is None or i in allowed]
+        # target inside the line code, or the line code (even blank) inside the target
+        soft = set(self.by_code_part.get(target, ())) | set(self.by_code.get("", ()))
+        for part in _substrings(target):
+            soft.update(self.by_code.get(part, ()))
+        if allowed is not None:
+            soft &= allowed
+        return exact, self._ordered(soft)
+
+    def codes_containing(self, paper_code: str, allowed: set[int] | None = None) -> list[int]:
+        """Line ids whose normalized code contains the typed code, in curriculum order."""
+        target = norm_course_code(paper_code)
+        if not target:
+            return []
+        hits = self.by_code_part.get(target, set())
+        return self._ordered(hits if allowed is None else hits & allowed)
+
+    def open_line_ids(self, exempted_ids: Iterable[int] = ()) -> set[int]:
+        """Lines still available for matching (not exempted / flagged ``already_exempted``)."""
+        exempted = set(exempted_ids)
+        return {
+            row["id"]
+            for row in self.rows
+            if row["id"] not in exempted and not row.get("already_exempted")
+        }
+
+    def suggest(
+        self,
+        paper_code: str,
+        *,
+        course_name: str | None = None,
+        year_of_study: int | None = None,
+        term_number: int | None = None,
+        open_ids: set[int] | None = None,
+    ) -> int | None:
+        """Best open line id for a typed paper (see ``suggest_curriculum_match``)."""
+        if open_ids is None:
+            open_ids = self.open_line_ids()
+        if not open_ids:
+            return None
+
+        exact, soft = self.code_matches(paper_code, open_ids)
+        if len(exact) == 1:
+            return exact[0]
+        if len(soft) == 1:
+            return soft[0]
+
+        pool = open_ids
+        if year_of_study is not None and term_number is not None:
+            pool = (self.by_term.get((year_of_study, term_number)) or set()) & open_ids or open_ids
+
+        digits = code_digit_tail(paper_code or "")
+        if digits and len(digits) >= _DIGIT_TAIL_MIN:
+            digit_hits = (self.by_digit_tail.get(digits) or set()) & pool
+            if len(digit_hits) == 1:
+                return next(iter(digit_hits))
+
+        name = (course_name or "").strip().lower()
+        if name and len(name) >= _NAME_MIN:
+            name_hits = [
+                i for i in pool if name in self.lower_name[i] or self.lower_name[i] in name
+            ]
+            if len(name_hits) == 1:
+                return name_hits[0]
+            # Token overlap (e.g. "Research Methods" vs "Research Methods in …")
+            tokens = name_tokens(name)
+            if tokens:
+                overlap = Counter(
+                    i for token in tokens for i in self.by_token.get(token, ()) if i in pool
+                )
+                scored = [
+                    (n, i)
+                    for i, n in overlap.items()
+                    if n >= 2 or (n == 1 and len(tokens) == 1)
+                ]
+                if scored:
+                    best = max(n for n, _ in scored)
+                    top = [i for n, i in scored if n == best]
+                    if len(top) == 1:
+                        return top[0]
+        return None
+
+
+def _generation() -> int:
+    try:
+        value = cache.get(_GENERATION_KEY)
+        if value is None:
+            cache.add(_GENERATION_KEY, 1, timeout=None)
+            value = cache.get(_GENERATION_KEY) or 1
+        return int(value)
+    except Exception:
+        return 0
+
+
+def invalidate_curriculum_match_indexes() -> None:
+    """Drop every cached index after the current transaction commits."""
+
+    def _bump():
+        try:
+            try:
+                cache.incr(_GENERATION_KEY)
+            except ValueError:
+                cache.set(_GENERATION_KEY, 2, timeout=None)
+        except Exception as exc:
+            logger.warning("Cache unavailable; skipped curriculum match index bump: %s", exc)
+
+    transaction.on_commit(_bump)
+
+
+def cached_curriculum_match_index(version_id, program_id, build_rows) -> CurriculumMatchIndex:
+    """Index for one (curriculum version, programme), built from ``build_rows()`` on a miss."""
+    generation = _generation()
+    if not generation:
+        return CurriculumMatchIndex(build_rows())
+    key = f"exemption:curriculum_match:{generation}:{version_id or 0}:{program_id or 0}"
+    try:
+        index = cache.get(key)
+    except Exception:
+        index = None
+    if index is None:
+        index = CurriculumMatchIndex(build_rows())
+        try:
+            cache.set(key, index, timeout=MATCH_INDEX_TTL_SECONDS)
+        except Exception:
+            logger.debug("curriculum match index %s not cached", key, exc_info=True)
+    return index
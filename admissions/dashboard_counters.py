@@ -0,0 +1,231 @@
+"""
+Cached landing-dashboard counters (``AdminDashboardStats``, ``UniversityHeadcountView``).
+
+Admitted-student figures come from one grouped query over the whole register
+(faculty × campus × intake × legacy × commitment flag × cohort × programme),
+cached as "scope buckets". Each request keeps the buckets inside the user's
+faculty / campus scope (see ``admitted_student_scope``) and sums them, so no
+user triggers its own aggregate over ``AdmittedStudent``.
+
+Application counts are cached per faculty scope instead: an application
+belongs to every faculty among its programme choices, so per-faculty buckets
+cannot be summed.
+
+Every key carries a counters version bumped after commit by Application /
+AdmittedStudent / Batch / programme-structure signals; the short TTL covers
+queryset ``update()`` calls that bypass signals.
+"""
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from typing import Any, Callable, NamedTuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import BooleanField, Case, Count, Q, Value, When
+from django.db.models.functions import Coalesce
+
+from .models import AdmittedStudent, Application, Batch
+
+logger = logging.getLogger(__name__)
+
+COUNTER_TTL_SECONDS = 120
+_VERSION_KEY = "dashboard:counters:version"
+
+# Same QA-batch exclusion convention used by GetActiveAdmissionBatch.
+_QA_BATCH_EXCLUDE = Q(code__istartswith="QA-") | Q(name__icontains="[QA-INTAKE-BATCH]")
+
+PENDING_APPLICATION_STATUSES = ["submitted", "under_review", "pending", "revoked", "approved", "accepted"]
+
+
+class AdmittedBucket(NamedTuple):
+    faculty_id: int | None
+    campus_id: int | None
+    faculty: str | None
+    campus: str | None
+    intake: str | None
+    intake_active: bool | None
+    legacy: bool
+    paid: bool
+    cohort: str | None
+    program: str | None
+    count: int
+
+
+def _counters_version() -> int:
+    try:
+        version = cache.get(_VERSION_KEY)
+        if version is None:
+            cache.add(_VERSION_KEY, 1, timeout=None)
+            version = cache.get(_VERSION_KEY) or 1
+        return int(version)
+    except Exception:
+        return 0
+
+
+def invalidate_dashboard_counters() -> None:
+    """Drop every cached counter (after the current transaction commits)."""
+
+    def _bump():
+        try:
+            try:
+                cache.incr(_VERSION_KEY)
+            except ValueError:
+                cache.set(_VERSION_KEY, 2, timeout=None)
+        except Exception as exc:
+            logger.warning("Cache unavailable; skipped dashboard counter bump: %s", exc)
+
+    transaction.on_commit(_bump)
+
+
+def _cached(name: str, build: Callable[[], Any]) -> Any:
+    version = _counters_version()
+    if not version:
+        return build()
+    key = f"dashboard:counters:{version}:{name}"
+    try:
+        value = cache.get(key)
+    except Exception:
+        value = None
+    if value is None:
+        value = build()
+        try:
+            cache.set(key, value, timeout=COUNTER_TTL_SECONDS)
+        except Exception:
+            logger.debug("dashboard counter %s not cached", key, exc_info=True)
+    return value
+
+
+def _build_admitted_buckets() -> list[tuple]:
+    rows = (
+        AdmittedStudent.objects.filter(is_admitted=True)
+        .annotate(
+            _legacy=Case(
+                When(application__source=Application.SOURCE_LEGACY, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+            # Fall back to the enrollment batch when intended_program_batch was never stamped.
+            _cohort=Coalesce("intended_program_batch__name", "programme_enrollment__program_batch__name"),
+        )
+        .values(
+            "admitted_program__faculty_id",
+            "admitted_campus_id",
+            "admitted_program__faculty__name",
+            "admitted_campus__name",
+            "admitted_batch__name",
+            "admitted_batch__is_active",
+            "_legacy",
+            "admission_fee_paid",
+            "_cohort",
+            "admitted_program__name",
+        )
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    return [
+        (
+            r["admitted_program__faculty_id"],
+            r["admitted_campus_id"],
+            r["admitted_program__faculty__name"],
+            r["admitted_campus__name"],
+            r["admitted_batch__name"],
+            r["admitted_batch__is_active"],
+            bool(r["_legacy"]),
+            bool(r["admission_fee_paid"]),
+            r["_cohort"],
+            r["admitted_program__name"],
+            r["n"],
+        )
+        for r in rows
+    ]
+
+
+def admitted_buckets_for_user(user) -> list[AdmittedBucket]:
+    """Cached register buckets restricted to the admitted students ``user`` may see."""
+    from .faculty_scope import admitted_student_scope
+
+    faculty_ids, campus_ids = admitted_student_scope(user)
+    if faculty_ids is not None and not faculty_ids:
+        return []
+    faculties = set(faculty_ids) if faculty_ids is not None else None
+    campuses = set(campus_ids) if campus_ids else None
+    return [
+        bucket
+        for bucket in map(AdmittedBucket._make, _cached("admitted", _build_admitted_buckets))
+        if (faculties is None or bucket.faculty_id in faculties)
+        and (campuses is None or bucket.campus_id in campuses)
+    ]
+
+
+def _is_current_intake(b: AdmittedBucket) -> bool:
+    return b.intake_active is True and not b.legacy
+
+
+def _is_continuing(b: AdmittedBucket) -> bool:
+    return b.intake_active is False or b.legacy
+
+
+def intake_split(buckets: list[AdmittedBucket]) -> dict[str, int]:
+    """Current intake (active batch, not a legacy import) vs continuing vs imported."""
+    return {
+        "total": sum(b.count for b in buckets),
+        "current_intake_new": sum(b.count for b in buckets if _is_current_intake(b)),
+        "continuing_total": sum(b.count for b in buckets if _is_continuing(b)),
+        "legacy_imported": sum(b.count for b in buckets if b.legacy),
+    }
+
+
+def count_by(buckets, key: Callable[[AdmittedBucket], Any]) -> list[tuple[Any, int]]:
+    """``[(key, count)]`` largest first (ties by key for a stable order)."""
+    counts: dict[Any, int] = defaultdict(int)
+    for b in buckets:
+        counts[key(b)] += b.count
+    return sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+
+
+def application_counters_for_user(user) -> dict[str, int]:
+    """Application KPIs for the user's admissions faculty scope (cached per scope)."""
+    from .faculty_scope import user_faculty_ids
+
+    faculty_ids = user_faculty_ids(user, context="admissions")
+    if faculty_ids is not None and not faculty_ids:
+        return {
+            "total_applications": 0,
+            "online_applications": 0,
+            "direct_applications": 0,
+            "rejected_students": 0,
+            "pending_applications": 0,
+        }
+    scope = "all" if faculty_ids is None else "-".join(str(i) for i in sorted(faculty_ids))
+
+    def _build():
+        qs = Application.objects.all()
+        if faculty_ids is not None:
+            qs = qs.filter(program_choices__program__faculty_id__in=faculty_ids).distinct()
+        return qs.aggregate(
+            total_applications=Count("id"),
+            online_applications=Count("id", filter=Q(is_direct_entry=False)),
+            direct_applications=Count("id", filter=Q(is_direct_entry=True)),
+            rejected_students=Count("id", filter=Q(status__iexact="rejected")),
+            pending_applications=Count("id", filter=Q(status__in=PENDING_APPLICATION_STATUSES)),
+        )
+
+    return _cached(f"applications:{scope}", _build)
+
+
+def batch_counters() -> dict[str, Any]:
+    """Batch totals and the real (non-QA) active intakes."""
+
+    def _build():
+        stats = Batch.objects.aggregate(
+            total_batches=Count("id"),
+            active_batches=Count("id", filter=Q(is_active=True)),
+        )
+        stats["active_intakes"] = list(
+            Batch.objects.filter(is_active=True).exclude(_QA_BATCH_EXCLUDE).values("id", "name")
+        )
+        return stats
+
+    return _cached("batches", _build)
@@ -0,0 +1,256 @@
+"""
+Exemption form-fee follow-up report (Accounts), resolved in the database.
+
+One queryset over the form-fee charges carries the student columns, the
+exemption request linked to each charge (else the student's latest one) via
+correlated subqueries, status filtering and search, so the API pages with
+LIMIT/OFFSET and exports stream with ``.iterator()`` instead of loading every
+charge and request ever raised. Draft summaries are only read for the rows
+actually returned.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+from django.db.models import CharField, Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Lower, Replace, Trim
+from django.utils import timezone
+
+from admissions.models import AdmissionChangeRequest
+from payments.models import StudentTuitionPayment
+
+FEE_REPORT_STATUSES = ("pending", "completed", "paid_unsubmitted")
+FEE_REPORT_CHUNK_SIZE = 1000
+
+_VALUE_FIELDS = (
+    "id",
+    "student_id",
+    "amount",
+    "currency",
+    "status",
+    "is_waived",
+    "created_at",
+    "r_student_id",
+    "r_reg_no",
+    "r_student_name",
+    "r_programme",
+    "r_request_id",
+    "r_request_status",
+    "r_draft",
+    "r_draft_updated_at",
+)
+
+
+def _full_name(prefix: str):
+    """"first middle last" (single-spaced when there is no middle name)."""
+    return Trim(
+        Replace(
+            Concat(
+                F(f"{prefix}first_name"),
+                Value(" "),
+                F(f"{prefix}middle_name"),
+                Value(" "),
+                F(f"{prefix}last_name"),
+                output_field=CharField(),
+            ),
+            Value("  "),
+            Value(" "),
+        )
+    )
+
+
+def _latest_request(**match):
+    return (
+        AdmissionChangeRequest.objects.filter(change_type="exemption", **match)
+        .order_by("-created_at", "-id")
+    )
+
+
+def exemption_fee_charges_qs(status_filter: str | None = None, search: str = ""):
+    """Form-fee charges annotated with student / request columns, newest first."""
+    from admissions.exemption_services import ensure_exemption_fee_heads
+
+    form_head, _ = ensure_exemption_fee_heads()
+    by_charge = _latest_request(form_fee_charge_id=OuterRef("pk"))
+    by_student = _latest_request(admitted_student_id=OuterRef("student_id"))
+    qs = (
+        StudentTuitionPayment.objects.filter(source="ad_hoc", fee_head=form_head)
+        .annotate(
+            r_student_id=Coalesce(F("student__student_id"), Value(""), output_field=CharField()),
+            r_reg_no=Coalesce(F("student__reg_no"), Value(""), output_field=CharField()),
+            r_student_name=_full_name("student__application__"),
+            r_programme=F("student__admitted_program__name"),
+            # Request raised for this charge, else the student's latest exemption request.
+            r_request_id=Coalesce(
+                Subquery(by_charge.values("id")[:1]),
+                Subquery(by_student.values("id")[:1]),
+                output_field=IntegerField(),
+            ),
+            r_request_status=Coalesce(
+                Subquery(by_charge.values("status")[:1]),
+                Subquery(by_student.values("status")[:1]),
+                output_field=CharField(),
+            ),
+            r_draft=F("student__exemption_form_draft"),
+            r_draft_updated_at=F("student__exemption_form_draft_updated_at"),
+        )
+        .order_by("-created_at", "-id")
+    )
+    if status_filter == "pending":
+        qs = qs.filter(status="pending", is_waived=False)
+    elif status_filter == "completed":
+        qs = qs.filter(status="completed")
+    elif status_filter == "paid_unsubmitted":
+        qs = qs.filter(status="completed", is_waived=False, r_request_id__isnull=True)
+    return filter_exemption_fee_charges_by_search(qs, search)
+
+
+def filter_exemption_fee_charges_by_search(qs, search: str):
+    """Substring match over "name reg_no student_id programme" (``_`` also matches ``/``)."""
+    q = (search or "").strip().lower()
+    if not q:
+        return qs
+    qs = qs.annotate(
+        _search_hay=Lower(
+            Concat(
+                F("r_student_name"),
+                Value(" "),
+                F("r_reg_no"),
+                Value(" "),
+                F("r_student_id"),
+                Value(" "),
+                Coalesce(F("r_programme"), Value("")),
+                output_field=CharField(),
+            )
+        )
+    )
+    match = Q(_search_hay__contains=q)
+    if "_" in q:
+        match |= Q(_search_hay__contains=q.replace("_", "/"))
+    return qs.filter(match)
+
+
+def exemption_fee_report_counts(qs) -> dict[str, int]:
+    """Total / pending / paid-not-submitted counts for a charge queryset in one query."""
+    return qs.order_by().aggregate(
+        total=Count("id"),
+        pending=Count("id", filter=Q(status="pending", is_waived=False)),
+        paid_unsubmitted=Count(
+            "id", filter=Q(status="completed", is_waived=False, r_request_id__isnull=True)
+        ),
+    )
+
+
+def _row(values: dict, now) -> dict:
+    from admissions.exemption_services import exemption_draft_summary
+
+    created_at = values["created_at"]
+    open_charge = values["status"] == "pending" and not values["is_waived"]
+    summary = exemption_draft_summary(values["r_draft"]) if values["student_id"] else None
+    draft_updated_at = values["r_draft_updated_at"]
+    return {
+        "charge_id": values["id"],
+        "student_pk": values["student_id"],
+        "student_id": values["r_student_id"] if values["student_id"] else "",
+        "reg_no": values["r_reg_no"] if values["student_id"] else "",
+        "student_name": (values["r_student_name"] or "") if values["student_id"] else "",
+        "programme": values["r_programme"],
+        "amount": float(values["amount"]),
+        "currency": values["currency"],
+        "status": values["status"],
+        "is_waived": values["is_waived"],
+        "charged_at": created_at.isoformat() if created_at else None,
+        "days_pending": (now - created_at).days if open_charge and created_at else None,
+        "change_request_id": values["r_request_id"],
+        "change_request_status": values["r_request_status"],
+        "has_draft": bool(summary and summary["has_draft"]),
+        "draft_paper_count": summary["paper_count"] if summary else 0,
+        "draft_updated_at": draft_updated_at.isoformat() if draft_updated_at else None,
+        "form_ready": bool(
+            summary
+            and summary["ready"]
+            and values["status"] == "completed"
+            and not values["r_request_id"]
+        ),
+    }
+
+
+def exemption_fee_values(qs):
+    """``values()`` rows for ``exemption_fee_rows`` (e.g. one paginated page)."""
+    return qs.values(*_VALUE_FIELDS)
+
+
+def exemption_fee_rows(values: Iterable[dict]) -> list[dict]:
+    now = timezone.now()
+    return [_row(v, now) for v in values]
+
+
+def iter_exemption_fee_rows(qs) -> Iterator[dict]:
+    """Report rows for a charge queryset, read in chunks (exports / full reports)."""
+    now = timezone.now()
+    for values in qs.values(*_VALUE_FIELDS).iterator(chunk_size=FEE_REPORT_CHUNK_SIZE):
+        yield _row(values, now)
+
+
+EXPORT_HEADERS = (
+    "Student",
+    "Student ID",
+    "Reg no",
+    "Programme",
+    "Amount",
+    "Currency",
+    "Status",
+    "Waived",
+    "Charged at",
+    "Days pending",
+    "Exemption request",
+    "Request status",
+    "Draft papers",
+    "Form ready",
+)
+
+
+def exemption_fee_report_export(params: dict):
+    """Streaming export of the fee report (``payments.report_exports`` spec)."""
+    from payments.report_exports import ExportSpec
+
+    qs = exemption_fee_charges_qs(params.get("status") or None, params.get("search") or "")
+
+    def _rows():
+        for r in iter_exemption_fee_rows(qs):
+            yield (
+                r["student_name"],
+                r["student_id"],
+                r["reg_no"],
+                r["programme"] or "",
+                r["amount"],
+                r["currency"],
+                r["status"],
+                "Yes" if r["is_waived"] else "No",
+                (r["charged_at"] or "")[:19].replace("T", " "),
+                r["days_pending"] if r["days_pending"] is not None else "",
+                r["change_request_id"] or "",
+                r["change_request_status"] or "",
+                r["draft_paper_count"],
+                "Yes" if r["form_ready"] else "No",
+            )
+
+    return ExportSpec(
+        filename_stem="exemption_form_fees",
+        title="Exemption form fees",
+        headers=EXPORT_HEADERS,
+        rows=_rows(),
+    )
+
+
+def unpaid_submissions_qs(search: str = ""):
+    """Exemption requests submitted without a paid form fee, with the search columns."""
+    from admissions.exemption_services import unpaid_exemption_submissions_qs
+
+    qs = unpaid_exemption_submissions_qs().annotate(
+        r_student_id=Coalesce(F("admitted_student__student_id"), Value(""), output_field=CharField()),
+        r_reg_no=Coalesce(F("admitted_student__reg_no"), Value(""), output_field=CharField()),
+        r_student_name=_full_name("admitted_student__application__"),
+        r_programme=F("admitted_student__admitted_program__name"),
+    )
+    return filter_exemption_fee_charges_by_search(qs, search)
@@ -30,6 +30,7 @@ from admissions.exemption_services import (
 )
 from payments.adhoc_payment_reasons import schoolpay_adhoc_reason
 from admissions.models import AdmissionChangeRequest
+from payments.finance_snapshot import invalidate_finance_snapshots
 from payments.models import StudentTuitionPayment
 from payments.student_portal_finance import get_admitted_student_for_user
 from payments.student_tuition_payment_views import (
@@ -74,6 +75,7 @@ def clear_exemption_form_stk_attempt(payment: StudentTuitionPayment) -> None:
         ),
         updated_at=timezone.now(),
     )
+    invalidate_finance_snapshots([payment.student_id])
 
 
 def sync_exemption_form_fee_paid_at(payment: StudentTuitionPayment) -> None:
@@ -120,6 +122,7 @@ def manually_complete_exemption_form_fee(payment: StudentTuitionPayment, *, acto
         verified_at=now,
         notes=notes,
     )
+    invalidate_finance_snapshots([payment.student_id])
     payment.refresh_from_db()
     sync_exemption_form_fee_paid_at(payment)
     return payment
@@ -191,6 +194,7 @@ class InitiateExemptionFormFeePaymentView(APIView):
                 payment_reference="",
                 transaction_id=None,
             )
+            invalidate_finance_snapshots([student.pk])
             charge.refresh_from_db()
             AdmissionChangeRequest.objects.filter(
                 change_type="exemption",
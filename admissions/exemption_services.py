@@ -9,6 +9,11 @@ from django.db import OperationalError, transaction
 from django.db.models import Q
 from django.utils import timezone
 
+from admissions.curriculum_match_index import (
+    CurriculumMatchIndex,
+    cached_curriculum_match_index,
+    norm_course_code as _norm_course_code,
+)
 from admissions.models import AdmittedStudent, AdmissionChangeRequest
 from payments.models import FeeHead, StudentTuitionPayment
 from payments.student_payment_allocation import build_finance_allocation
@@ -828,113 +833,11 @@ def exemption_form_fee_report(status_filter: str | None = None) -> list[dict]:
 
     status_filter: 'pending' (unpaid), 'completed' (paid),
     'paid_unsubmitted' (paid, no exemption request yet), or None for all.
+    The API pages ``exemption_fee_charges_qs`` instead of building this list.
     """
-    form_head, _ = ensure_exemption_fee_heads()
-    qs = (
-        StudentTuitionPayment.objects.filter(
-            source="ad_hoc",
-            fee_head=form_head,
-        )
-        .select_related("student", "student__admitted_program")
-        .order_by("-created_at")
-    )
-    if status_filter == "pending":
-        qs = qs.filter(status="pending", is_waived=False)
-    elif status_filter == "completed":
-        qs = qs.filter(status="completed")
-    elif status_filter == "paid_unsubmitted":
-        qs = qs.filter(status="completed", is_waived=False)
-
-    charges = list(qs)
-    charge_ids = [c.id for c in charges]
-    student_pks = [c.student_id for c in charges if c.student_id]
-
-    requests_by_charge = {}
-    latest_req_by_student: dict[int, AdmissionChangeRequest] = {}
-    if charge_ids or student_pks:
-        req_filter = Q()
-        if charge_ids:
-            req_filter |= Q(form_fee_charge_id__in=charge_ids)
-        if student_pks:
-            req_filter |= Q(admitted_student_id__in=student_pks)
-        req_qs = AdmissionChangeRequest.objects.filter(change_type="exemption").filter(req_filter).order_by(
-            "created_at"
-        )
-        for r in req_qs:
-            if r.form_fee_charge_id:
-                requests_by_charge[r.form_fee_charge_id] = r
-            if r.admitted_student_id:
-                latest_req_by_student[r.admitted_student_id] = r
-
-    now = timezone.now()
-    rows = []
-    for charge in charges:
-        student = charge.student
-        req = requests_by_charge.get(charge.id)
-        if req is None and student:
-            req = latest_req_by_student.get(student.pk)
-        rows.append(
-            {
-                "charge_id": charge.id,
-                "student_pk": student.pk if student else None,
-                "student_id": student.student_id if student else "",
-                "reg_no": student.reg_no if student else "",
-                "student_name": student.full_name if student else "",
-                "programme": (
-                    student.admitted_program.name
-                    if student and student.admitted_program_id
-                    else None
-                ),
-                "amount": float(charge.amount),
-                "currency": charge.currency,
-                "status": charge.status,
-                "is_waived": charge.is_waived,
-                "charged_at": charge.created_at.isoformat() if charge.created_at else None,
-                "days_pending": (
-                    (now - charge.created_at).days
-                    if charge.status == "pending" and not charge.is_waived and charge.created_at
-                    else None
-                ),
-                "change_request_id": req.id if req else None,
-                "change_request_status": req.status if req else None,
-                "has_draft": False,
-                "draft_paper_count": 0,
-                "draft_updated_at": None,
-                "form_ready": False,
-            }
-        )
+    from admissions.exemption_fee_report import exemption_fee_charges_qs, iter_exemption_fee_rows
 
-    student_ids = [r["student_pk"] for r in rows if r.get("student_pk")]
-    drafts = {
-        s.pk: s
-        for s in AdmittedStudent.objects.filter(pk__in=student_ids).only(
-            "id", "exemption_form_draft", "exemption_form_draft_updated_at"
-        )
-    }
-    for row in rows:
-        student = drafts.get(row.get("student_pk"))
-        summary = exemption_draft_summary(student.exemption_form_draft if student else None)
-        row["has_draft"] = summary["has_draft"]
-        row["draft_paper_count"] = summary["paper_count"]
-        row["draft_updated_at"] = (
-            student.exemption_form_draft_updated_at.isoformat()
-            if student and student.exemption_form_draft_updated_at
-            else None
-        )
-        row["form_ready"] = bool(
-            summary["ready"]
-            and row.get("status") == "completed"
-            and not row.get("change_request_id")
-        )
-    if status_filter == "paid_unsubmitted":
-        rows = [
-            r
-            for r in rows
-            if r.get("status") == "completed"
-            and not r.get("is_waived")
-            and not r.get("change_request_id")
-        ]
-    return rows
+    return list(iter_exemption_fee_rows(exemption_fee_charges_qs(status_filter)))
 
 
 def _compose_draft_score(paper: dict) -> str:
@@ -1201,13 +1104,6 @@ def submit_exemption_from_draft(student: AdmittedStudent, *, requested_by, staff
     return obj, access
 
 
-def _norm_course_code(code: str) -> str:
-    """Normalize course codes for fuzzy matching (ignore spaces/punctuation/case)."""
-    import re
-
-    return re.sub(r"[^A-Z0-9]", "", (code or "").upper())
-
-
 def _student_curriculum_program(student: AdmittedStudent):
     """Programme row to read curriculum from (enrollment first, else admission)."""
     try:
@@ -1308,19 +1204,61 @@ def _curriculum_line_program_id(enrollment) -> int | None:
     return owner.pk if owner else enrollment.program_id
 
 
-def list_eligible_exemption_courses(student: AdmittedStudent) -> list[dict]:
-    """Curriculum lines for the student's pinned/default version, excluding existing exemptions."""
-    from Programs.models import StudentCurriculumOverride
+def _curriculum_review_row(line) -> dict:
+    course = line.catalog_course
+    return {
+        "id": line.id,
+        "course_code": course.code if course else "",
+        # CourseCatalogUnit uses `title`, not `name`.
+        "course_name": (course.title if course else "") or "",
+        "year_of_study": line.year_of_study,
+        "term_number": line.term_number,
+        "course_type": line.course_type,
+    }
 
+
+def curriculum_match_index(student: AdmittedStudent):
+    """
+    Return (enrollment, CurriculumMatchIndex) for the student's effective
+    curriculum. The index is cached per curriculum version / programme and
+    shared by every student on it.
+    """
     enrollment, version = _resolve_enrollment_curriculum_version(student)
-    existing = set()
-    if enrollment is not None:
-        existing = set(
-            StudentCurriculumOverride.objects.filter(
-                enrollment=enrollment,
-                override_type__in=("exempted", "transferred"),
-            ).values_list("curriculum_line_id", flat=True)
+    _enrollment, program = _student_curriculum_program(student)
+
+    def _rows():
+        lines = _active_curriculum_lines_qs(student, version).order_by(
+            "year_of_study", "term_number", "sort_order", "catalog_course__code"
         )
+        return [_curriculum_review_row(line) for line in lines]
+
+    index = cached_curriculum_match_index(
+        getattr(version, "pk", None), getattr(program, "pk", None), _rows
+    )
+    return enrollment, index
+
+
+def exempted_curriculum_line_ids(enrollment) -> set[int]:
+    from Programs.models import StudentCurriculumOverride
+
+    if enrollment is None:
+        return set()
+    return set(
+        StudentCurriculumOverride.objects.filter(
+            enrollment=enrollment,
+            override_type__in=("exempted", "transferred"),
+        ).values_list("curriculum_line_id", flat=True)
+    )
+
+
+def list_eligible_exemption_courses(student: AdmittedStudent) -> list[dict]:
+    """Curriculum lines for the student's pinned/default version, excluding existing exemptions."""
+    enrollment, index = curriculum_match_index(student)
+    return _eligible_exemption_rows(student, enrollment, index)
+
+
+def _eligible_exemption_rows(student: AdmittedStudent, enrollment, index: CurriculumMatchIndex) -> list[dict]:
+    existing = exempted_curriculum_line_ids(enrollment)
     # Also exclude lines already on a pending exemption request
     pending_line_ids = set(
         AdmissionChangeRequest.objects.filter(
@@ -1332,32 +1270,13 @@ def list_eligible_exemption_courses(student: AdmittedStudent) -> list[dict]:
     existing |= {i for i in pending_line_ids if i}
 
     used_terms = exemption_terms_already_committed(student)
-    lines = (
-        _active_curriculum_lines_qs(student, version)
-        .filter(year_of_study__in=EXEMPTION_ELIGIBLE_YEARS)
-        .order_by("year_of_study", "term_number", "sort_order", "catalog_course__code")
-    )
-    out = []
-    for line in lines:
-        if line.id in existing:
-            continue
-        if not is_exemption_eligible_year(line.year_of_study):
-            continue
-        if not term_open_for_new_exemption(used_terms, line.year_of_study, line.term_number):
-            continue
-        course = line.catalog_course
-        out.append(
-            {
-                "id": line.id,
-                "course_code": course.code if course else "",
-                # CourseCatalogUnit uses `title`, not `name`.
-                "course_name": (course.title if course else "") or "",
-                "year_of_study": line.year_of_study,
-                "term_number": line.term_number,
-                "course_type": line.course_type,
-            }
-        )
-    return out
+    return [
+        dict(row)
+        for row in index.rows
+        if row["id"] not in existing
+        and is_exemption_eligible_year(row["year_of_study"])
+        and term_open_for_new_exemption(used_terms, row["year_of_study"], row["term_number"])
+    ]
 
 
 def list_programme_curriculum_for_review(student: AdmittedStudent) -> list[dict]:
@@ -1365,44 +1284,8 @@ def list_programme_curriculum_for_review(student: AdmittedStudent) -> list[dict]
     Full active curriculum for HOD/Dean review — includes already-exempted rows
     so reviewers can see the whole programme when matching student papers.
     """
-    from Programs.models import StudentCurriculumOverride
-
-    enrollment, version = _resolve_enrollment_curriculum_version(student)
-    existing = set()
-    if enrollment is not None:
-        existing = set(
-            StudentCurriculumOverride.objects.filter(
-                enrollment=enrollment,
-                override_type__in=("exempted", "transferred"),
-            ).values_list("curriculum_line_id", flat=True)
-        )
-
-    lines = _active_curriculum_lines_qs(student, version).order_by(
-        "year_of_study", "term_number", "sort_order", "catalog_course__code"
-    )
-    out = []
-    for line in lines:
-        course = line.catalog_course
-        out.append(
-            {
-                "id": line.id,
-                "course_code": course.code if course else "",
-                "course_name": (course.title if course else "") or "",
-                "year_of_study": line.year_of_study,
-                "term_number": line.term_number,
-                "course_type": line.course_type,
-                "already_exempted": line.id in existing,
-            }
-        )
-    return out
-
-
-def _code_digit_tail(code: str) -> str:
-    """Trailing digit run from a course code (e.g. MHR4103 → 4103)."""
-    import re
-
-    m = re.search(r"(\d+)\s*$", (code or "").strip())
-    return m.group(1) if m else ""
+    enrollment, index = curriculum_match_index(student)
+    return index.review_rows(exempted_curriculum_line_ids(enrollment))
 
 
 def suggest_curriculum_match(
@@ -1412,75 +1295,24 @@ def suggest_curriculum_match(
     course_name: str | None = None,
     year_of_study: int | None = None,
     term_number: int | None = None,
+    index: CurriculumMatchIndex | None = None,
 ) -> int | None:
     """
     Best curriculum line id for a typed student paper.
 
     Tries exact/soft code match, then same year/term + digit tail / name overlap
-    so HOD review can prefill units the student already identified.
+    so HOD review can prefill units the student already identified. Pass a
+    prebuilt ``index`` (see ``curriculum_match_index``) when matching many papers.
     """
-    open_rows = [c for c in curriculum if not c.get("already_exempted")]
-    if not open_rows:
-        return None
-
-    target = _norm_course_code(paper_code)
-    if target:
-        exact = [
-            c for c in open_rows
-            if _norm_course_code(c.get("course_code") or "") == target
-        ]
-        if len(exact) == 1:
-            return exact[0]["id"]
-        soft = [
-            c for c in open_rows
-            if target in _norm_course_code(c.get("course_code") or "")
-            or _norm_course_code(c.get("course_code") or "") in target
-        ]
-        if len(soft) == 1:
-            return soft[0]["id"]
-
-    pool = open_rows
-    if year_of_study is not None and term_number is not None:
-        yt = [
-            c for c in open_rows
-            if c.get("year_of_study") == year_of_study
-            and c.get("term_number") == term_number
-        ]
-        if yt:
-            pool = yt
-
-    digits = _code_digit_tail(paper_code or "")
-    if digits and len(digits) >= 3:
-        digit_hits = [
-            c for c in pool
-            if _code_digit_tail(c.get("course_code") or "") == digits
-        ]
-        if len(digit_hits) == 1:
-            return digit_hits[0]["id"]
-
-    name = (course_name or "").strip().lower()
-    if name and len(name) >= 6:
-        name_hits = [
-            c for c in pool
-            if name in (c.get("course_name") or "").strip().lower()
-            or (c.get("course_name") or "").strip().lower() in name
-        ]
-        if len(name_hits) == 1:
-            return name_hits[0]["id"]
-        # Token overlap (e.g. "Research Methods" vs "Research Methods in …")
-        tokens = {t for t in name.replace("/", " ").split() if len(t) >= 4}
-        if tokens:
-            scored: list[tuple[int, dict]] = []
-            for c in pool:
-                other = (c.get("course_name") or "").strip().lower()
-                other_tokens = {t for t in other.replace("/", " ").split() if len(t) >= 4}
-                overlap = len(tokens & other_tokens)
-                if overlap >= 2 or (overlap == 1 and len(tokens) == 1):
-                    scored.append((overlap, c))
-            scored.sort(key=lambda x: -x[0])
-            if len(scored) == 1 or (len(scored) >= 2 and scored[0][0] > scored[1][0]):
-                return scored[0][1]["id"]
-    return None
+    if index is None:
+        index = CurriculumMatchIndex(curriculum)
+    return index.suggest(
+        paper_code,
+        course_name=course_name,
+        year_of_study=year_of_study,
+        term_number=term_number,
+        open_ids={c["id"] for c in curriculum if not c.get("already_exempted")},
+    )
 
 
 def lookup_exemption_paper_by_code(student: AdmittedStudent, paper_code: str) -> dict | None:
@@ -1494,26 +1326,14 @@ def lookup_exemption_paper_by_code(student: AdmittedStudent, paper_code: str) ->
         return None
 
     try:
-        eligible = list_eligible_exemption_courses(student)
+        enrollment, index = curriculum_match_index(student)
+        eligible = {c["id"]: c for c in _eligible_exemption_rows(student, enrollment, index)}
     except Exception:
-        eligible = []
-    for c in eligible:
-        if _norm_course_code(c.get("course_code") or "") == target:
-            return {
-                "curriculum_line_id": c.get("id"),
-                "course_code": c.get("course_code") or paper_code.strip(),
-                "course_name": c.get("course_name") or "",
-                "year_of_study": c.get("year_of_study"),
-                "term_number": c.get("term_number"),
-                "source": "curriculum",
-            }
-    soft = [
-        c
-        for c in eligible
-        if target and target in _norm_course_code(c.get("course_code") or "")
-    ]
-    if len(soft) == 1:
-        c = soft[0]
+        eligible, index = {}, CurriculumMatchIndex(())
+    exact, _soft = index.code_matches(paper_code, set(eligible))
+    soft = index.codes_containing(paper_code, set(eligible))
+    if exact or len(soft) == 1:
+        c = eligible[(exact or soft)[0]]
         return {
             "curriculum_line_id": c.get("id"),
             "course_code": c.get("course_code") or paper_code.strip(),
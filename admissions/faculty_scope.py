@@ -96,12 +96,15 @@ def filter_applications_for_user(queryset: QuerySet, user) -> QuerySet:
     ).distinct()
 
 
-def filter_admitted_students_for_user(queryset: QuerySet, user) -> QuerySet:
+def admitted_student_scope(user) -> tuple[list[int] | None, list[int] | None]:
+    """
+    ``(faculty_ids, campus_ids)`` limiting the admitted students ``user`` may see.
+
+    ``None`` = unrestricted on that axis; ``faculty_ids == []`` = no access.
+    """
     faculty_ids = user_faculty_ids(user, context="admissions")
-    if faculty_ids is not None:
-        if not faculty_ids:
-            return queryset.none()
-        queryset = queryset.filter(admitted_program__faculty_id__in=faculty_ids)
+    if faculty_ids is not None and not faculty_ids:
+        return [], None
 
     # Campus scope for non-finance staff who have campuses assigned.
     # Bursar / Finance see every campus; faculty-scoped staff may also be
@@ -110,14 +113,23 @@ def filter_admitted_students_for_user(queryset: QuerySet, user) -> QuerySet:
     from accounts.super_admin import user_is_super_admin as _is_sa
 
     if _is_sa(user) or user_is_finance_directory_unscoped(user):
-        return queryset
+        return faculty_ids, None
     if user_has_institution_wide_admissions_access(user):
-        return queryset
+        return faculty_ids, None
 
     try:
         campus_ids = list(user.campuses.values_list("pk", flat=True))
     except Exception:
         campus_ids = []
+    return faculty_ids, (campus_ids or None)
+
+
+def filter_admitted_students_for_user(queryset: QuerySet, user) -> QuerySet:
+    faculty_ids, campus_ids = admitted_student_scope(user)
+    if faculty_ids is not None:
+        if not faculty_ids:
+            return queryset.none()
+        queryset = queryset.filter(admitted_program__faculty_id__in=faculty_ids)
     if campus_ids:
         queryset = queryset.filter(admitted_campus_id__in=campus_ids)
     return queryset
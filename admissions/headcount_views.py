@@ -3,23 +3,18 @@ from __future__ import annotations
 
 from collections import defaultdict
 
-from django.db.models import Count, Q
-from django.db.models.functions import Coalesce
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from admissions.faculty_scope import filter_admitted_students_for_user
-from admissions.models import AdmittedStudent, Application, Batch
-from payments.commitment_queryset import filter_by_commitment_met
+from admissions.dashboard_counters import (
+    admitted_buckets_for_user,
+    batch_counters,
+    count_by,
+    intake_split,
+)
 from payments.student_payment_allocation import COMMITMENT_FEE_THRESHOLD
 
-# Same QA-batch exclusion convention used by GetActiveAdmissionBatch, so
-# smoke-test intakes never pollute the real headcount or trigger a false
-# "multiple active intakes" warning.
-_QA_BATCH_EXCLUDE = Q(code__istartswith="QA-") | Q(name__icontains="[QA-INTAKE-BATCH]")
-
-
 def _nest_cohorts_by_faculty(by_cohort: list[dict]) -> list[dict]:
     """Group flat batch×programme rows into faculty -> programme -> batches."""
     # grouped[faculty][program][batch] = count
@@ -105,23 +100,15 @@ class UniversityHeadcountView(APIView):
 
         can_finance = user_can_view_student_finance(request.user)
 
-        base = filter_admitted_students_for_user(
-            AdmittedStudent.objects.filter(is_admitted=True).select_related(
-                "admitted_campus",
-                "admitted_program__faculty",
-                "intended_program_batch",
-            ),
-            request.user,
-        )
-
-        total = base.count()
+        # Cached register buckets in the user's faculty / campus scope
+        # (admissions.dashboard_counters) — no per-request aggregates.
+        buckets = admitted_buckets_for_user(request.user)
+        split = intake_split(buckets)
+        total = split["total"]
         if can_finance:
-            met_qs = filter_by_commitment_met(base, True, strict=False)
-            unpaid_qs = filter_by_commitment_met(base, False, strict=False)
-            commitment_met = met_qs.count()
-            commitment_unpaid = unpaid_qs.count()
+            commitment_met = sum(b.count for b in buckets if b.paid)
+            commitment_unpaid = total - commitment_met
         else:
-            met_qs = unpaid_qs = None
             commitment_met = commitment_unpaid = None
 
         # Intake split. Legacy imports are identified by application source,
@@ -130,60 +117,37 @@ class UniversityHeadcountView(APIView):
         # "Continuing" = everyone not admitted through the current intake —
         # prior real intakes AND bulk-imported continuing students; the
         # legacy_imported figure is the "of which imported" subset.
-        legacy_q = Q(application__source=Application.SOURCE_LEGACY)
-        intake_split = base.aggregate(
-            current_intake_new=Count(
-                "id", filter=Q(admitted_batch__is_active=True) & ~legacy_q
-            ),
-            continuing_total=Count(
-                "id", filter=Q(admitted_batch__is_active=False) | legacy_q
-            ),
-            legacy_imported=Count("id", filter=legacy_q),
+        intakes: dict[tuple, dict[str, int]] = defaultdict(
+            lambda: {"count": 0, "new_admits": 0, "legacy_imported": 0}
         )
-
-        by_intake = list(
-            base.values("admitted_batch__name", "admitted_batch__is_active")
-            .annotate(
-                count=Count("id"),
-                new_admits=Count("id", filter=~legacy_q),
-                legacy_imported=Count("id", filter=legacy_q),
-            )
-            .order_by("-admitted_batch__is_active", "-count")
+        for b in buckets:
+            row = intakes[(b.intake, b.intake_active)]
+            row["count"] += b.count
+            row["legacy_imported" if b.legacy else "new_admits"] += b.count
+        by_intake = sorted(
+            intakes.items(), key=lambda item: (item[0][1] is not True, -item[1]["count"], str(item[0][0]))
         )
 
-        by_campus = list(
-            base.values("admitted_campus__name")
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
-        by_faculty = list(
-            base.values("admitted_program__faculty__name")
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
-        # Fall back to the student's actual academic enrollment batch when
-        # intended_program_batch was never stamped on the admission record
-        # (a data-entry gap, not a real "no cohort" student) so they show up
-        # under their real class instead of silently vanishing into "—".
+        by_campus = count_by(buckets, lambda b: b.campus)
+        by_faculty = count_by(buckets, lambda b: b.faculty)
+        # Students without intended_program_batch fall back to their actual
+        # enrollment batch (see the bucket query) so they show up under their
+        # real class instead of silently vanishing into "—".
         #
         # Finance staff: cohort drill-down among commitment-paid students.
         # Academics: same structure over the full census (no payment overlay).
-        cohort_qs = met_qs if can_finance and met_qs is not None else base
-        by_cohort = list(
-            cohort_qs.annotate(
-                effective_batch=Coalesce(
-                    "intended_program_batch__name",
-                    "programme_enrollment__program_batch__name",
-                )
-            )
-            .values(
-                "effective_batch",
-                "admitted_program__name",
-                "admitted_program__faculty__name",
+        cohort_buckets = [b for b in buckets if b.paid] if can_finance else buckets
+        by_cohort = [
+            {
+                "effective_batch": cohort,
+                "admitted_program__name": program,
+                "admitted_program__faculty__name": faculty,
+                "count": count,
+            }
+            for (cohort, program, faculty), count in count_by(
+                cohort_buckets, lambda b: (b.cohort, b.program, b.faculty)
             )
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
+        ]
         by_batch = _nest_cohorts_by_batch(by_cohort)
         by_faculty_batch = _nest_cohorts_by_faculty(by_cohort)
 
@@ -191,17 +155,11 @@ class UniversityHeadcountView(APIView):
         # intake is active at once - that would double-count "current
         # intake" figures. QA/smoke-test batches are excluded since they
         # are deliberately allowed to coexist with the real active intake.
-        active_intakes = list(
-            Batch.objects.filter(is_active=True).exclude(_QA_BATCH_EXCLUDE).values("id", "name")
-        )
+        active_intakes = batch_counters()["active_intakes"]
         multiple_active_intakes = len(active_intakes) > 1
 
-        if can_finance and unpaid_qs is not None:
-            unpaid_by_campus = list(
-                unpaid_qs.values("admitted_campus__name")
-                .annotate(count=Count("id"))
-                .order_by("-count")
-            )
+        if can_finance:
+            unpaid_by_campus = count_by([b for b in buckets if not b.paid], lambda b: b.campus)
             commitment_met_pct = round((100.0 * commitment_met / total) if total else 0.0, 1)
             threshold = float(COMMITMENT_FEE_THRESHOLD)
             notes = (
@@ -222,38 +180,26 @@ class UniversityHeadcountView(APIView):
                 "total_admitted": total,
                 "can_view_finance": can_finance,
                 "intake_split": {
-                    "current_intake_new": intake_split["current_intake_new"],
-                    "continuing_total": intake_split["continuing_total"],
-                    "legacy_imported": intake_split["legacy_imported"],
+                    "current_intake_new": split["current_intake_new"],
+                    "continuing_total": split["continuing_total"],
+                    "legacy_imported": split["legacy_imported"],
                 },
                 "by_intake": [
                     {
-                        "intake": r["admitted_batch__name"] or "—",
-                        "is_active": bool(r["admitted_batch__is_active"]),
+                        "intake": name or "—",
+                        "is_active": bool(is_active),
                         "count": r["count"],
                         "new_admits": r["new_admits"],
                         "legacy_imported": r["legacy_imported"],
                     }
-                    for r in by_intake
+                    for (name, is_active), r in by_intake
                 ],
                 "commitment_met": commitment_met,
                 "commitment_unpaid": commitment_unpaid,
                 "commitment_threshold_ugx": threshold,
                 "commitment_met_pct": commitment_met_pct,
-                "by_campus": [
-                    {
-                        "name": r["admitted_campus__name"] or "—",
-                        "count": r["count"],
-                    }
-                    for r in by_campus
-                ],
-                "by_faculty": [
-                    {
-                        "name": r["admitted_program__faculty__name"] or "—",
-                        "count": r["count"],
-                    }
-                    for r in by_faculty
-                ],
+                "by_campus": [{"name": name or "—", "count": count} for name, count in by_campus],
+                "by_faculty": [{"name": name or "—", "count": count} for name, count in by_faculty],
                 "by_cohort": [
                     {
                         "batch": r["effective_batch"] or "Unplaced (no batch on record)",
@@ -270,11 +216,7 @@ class UniversityHeadcountView(APIView):
                     {"id": r["id"], "name": r["name"]} for r in active_intakes
                 ],
                 "unpaid_by_campus": [
-                    {
-                        "name": r["admitted_campus__name"] or "—",
-                        "count": r["count"],
-                    }
-                    for r in unpaid_by_campus
+                    {"name": name or "—", "count": count} for name, count in unpaid_by_campus
                 ],
                 "notes": notes,
             }
@@ -0,0 +1,122 @@
+"""
+Benchmark the applicant / student portal APIs against a synthetic university.
+
+Seeds applicants, admitted students, programmes, course units and payments,
+replays a request mix in-process and writes latency percentiles and query
+counts per endpoint to a JSON report. Seed data is rolled back afterwards
+unless --keep is passed. Refuses to run unless DEBUG is on or
+--i-know-this-is-not-production is passed.
+
+Usage:
+    python manage.py benchmark_portal_apis --students 2000 --requests 1000
+    python manage.py benchmark_portal_apis --mix portal.payment_status=3,ledger.students=1
+    python manage.py benchmark_portal_apis --output after.json --baseline before.json
+"""
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from admissions.portal_benchmark import (
+    DEFAULT_MIX,
+    benchmark_portal_apis,
+    compare_reports,
+    parse_mix,
+    write_report,
+)
+
+
+class Command(BaseCommand):
+    help = "Seed a synthetic university and record latency / query counts for the portal APIs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--applicants", type=int, default=50, help="Applicants available to submit.")
+        parser.add_argument("--students", type=int, default=200, help="Admitted, enrolled students.")
+        parser.add_argument("--programs", type=int, default=4)
+        parser.add_argument("--course-units", type=int, default=8, help="Course units per programme.")
+        parser.add_argument("--payments-per-student", type=int, default=2)
+        parser.add_argument("--requests", type=int, default=200, help="Measured requests across the mix.")
+        parser.add_argument("--warmup", type=int, default=1, help="Unmeasured calls per endpoint first.")
+        parser.add_argument(
+            "--mix",
+            default="",
+            help=f"Comma-separated endpoint=weight pairs (endpoints: {', '.join(DEFAULT_MIX)}).",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for data and request order.")
+        parser.add_argument("--output", default="", help="Report path (default portal-benchmark-<commit>.json).")
+        parser.add_argument("--baseline", default="", help="Earlier report to compare against.")
+        parser.add_argument("--keep", action="store_true", help="Commit the seeded data instead of rolling back.")
+        parser.add_argument(
+            "--i-know-this-is-not-production",
+            action="store_true",
+            dest="not_production",
+            help="Allow running with DEBUG off (never against a production database).",
+        )
+
+    def handle(self, *args, **options):
+        if not (settings.DEBUG or options["not_production"]):
+            raise CommandError(
+                "Refusing to seed benchmark data with DEBUG off; pass --i-know-this-is-not-production "
+                "if this database is disposable."
+            )
+        for name in ("applicants", "students", "programs", "course_units", "payments_per_student"):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be at least 1")
+        try:
+            mix = parse_mix(options["mix"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        baseline = None
+        if options["baseline"]:
+            with open(options["baseline"]) as fh:
+                baseline = json.load(fh)
+
+        report = benchmark_portal_apis(
+            applicants=options["applicants"],
+            students=options["students"],
+            programs=options["programs"],
+            course_units=options["course_units"],
+            payments_per_student=options["payments_per_student"],
+            requests=options["requests"],
+            warmup=options["warmup"],
+            mix=mix,
+            seed=options["seed"],
+            keep=options["keep"],
+            not_production=options["not_production"],
+        )
+        output = options["output"] or (
+            f"portal-benchmark-{report['git_commit'] or timezone.now().strftime('%Y%m%d%H%M%S')}.json"
+        )
+        path = write_report(report, output)
+
+        seed = report["seed"]
+        self.stdout.write(
+            f"Seeded {seed['students']} students / {seed['applicants']} applicants in {seed['seconds']}s "
+            f"({'kept as ' + seed['tag'] if options['keep'] else 'rolled back'})."
+        )
+        self.stdout.write(f"{'endpoint':<34}{'n':>5}{'err':>5}{'p50':>10}{'p95':>10}{'p99':>10}{'queries':>9}")
+        for name, row in report["endpoints"].items():
+            lat = row["latency_ms"]
+            self.stdout.write(
+                f"{name:<34}{row['requests']:>5}{row['errors']:>5}"
+                f"{_fmt(lat['p50']):>10}{_fmt(lat['p95']):>10}{_fmt(lat['p99']):>10}{_fmt(row['queries']['mean']):>9}"
+            )
+        if baseline is not None:
+            self.stdout.write("")
+            self.stdout.write(f"Compared with {options['baseline']} ({baseline.get('git_commit') or 'unknown commit'}):")
+            for row in compare_reports(baseline, report):
+                p95, queries = row["p95_ms"], row["queries"]
+                self.stdout.write(
+                    f"  {row['endpoint']:<32} p95 {_fmt(p95['baseline'])} -> {_fmt(p95['current'])} ms "
+                    f"({_pct(p95['change_pct'])}), queries {_fmt(queries['baseline'])} -> {_fmt(queries['current'])}"
+                )
+        self.stdout.write(self.style.SUCCESS(f"Report written to {path}"))
+
+
+def _fmt(value):
+    return "-" if value is None else f"{value:g}"
+
+
+def _pct(value):
+    return "n/a" if value is None else f"{value:+.1f}%"
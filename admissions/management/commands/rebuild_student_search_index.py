@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from admissions.student_search import rebuild_student_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the student search index (StudentSearchDocument) for every admitted student."
+
+    def handle(self, *args, **options):
+        written = rebuild_student_search_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {written} students."))
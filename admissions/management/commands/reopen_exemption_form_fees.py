@@ -17,6 +17,7 @@ from django.db.models import Q
 
 from admissions.exemption_services import EXEMPTION_FORM_FEE_CODE
 from admissions.models import AdmissionChangeRequest, AdmittedStudent
+from payments.finance_snapshot import invalidate_finance_snapshots
 from payments.models import FeeHead, StudentTuitionPayment
 
 
@@ -94,6 +95,7 @@ class Command(BaseCommand):
             change_type="exemption",
             form_fee_charge_id__in=ids,
         ).update(form_fee_paid_at=None)
+        invalidate_finance_snapshots(c.student_id for c in charges)
         self.stdout.write(self.style.SUCCESS(f"Reopened {n} exemption form-fee charge(s)."))
         self.stdout.write(
             "SchoolPay credit will sit on tuition again the next time finance loads. "
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0050_active_staff_id_card_template'),
+        ('admissions', '0069_student_import_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdmissionsDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('application', 'Application'), ('admitted', 'Admitted student')], max_length=20)),
+                ('day', models.DateField()),
+                ('status', models.CharField(blank=True, default='', max_length=20)),
+                ('source', models.CharField(blank=True, default='', max_length=30)),
+                ('gender_key', models.CharField(blank=True, default='', max_length=20)),
+                ('is_local', models.BooleanField(default=False)),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('admitted', models.PositiveIntegerField(default=0)),
+                ('registered', models.PositiveIntegerField(default=0)),
+                ('academic_level', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='admissions.academiclevel')),
+                ('batch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='admissions.batch')),
+                ('campus', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='accounts.campus')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='admissions__day_7ab027_idx'), models.Index(fields=['batch', 'day'], name='admissions__batch_i_4e6b9a_idx')],
+            },
+        ),
+    ]
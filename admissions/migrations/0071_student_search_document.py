@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:52
+
+# Trigram + full-text indexes only exist on Postgres; SQLite dev searches the
+# same column with LIKE (see admissions.student_search).
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+        cursor.execute(
+            'CREATE INDEX IF NOT EXISTS "student_search_doc_trgm_idx" '
+            'ON "admissions_studentsearchdocument" USING gin ("document" gin_trgm_ops);'
+        )
+        cursor.execute(
+            'CREATE INDEX IF NOT EXISTS "student_search_doc_fts_idx" '
+            'ON "admissions_studentsearchdocument" '
+            "USING gin (to_tsvector('simple', \"document\"));"
+        )
+
+
+def _drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('DROP INDEX IF EXISTS "student_search_doc_trgm_idx";')
+        cursor.execute('DROP INDEX IF EXISTS "student_search_doc_fts_idx";')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0070_admissions_daily_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentSearchDocument',
+            fields=[
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='admissions.admittedstudent')),
+                ('full_name', models.CharField(blank=True, default='', max_length=255)),
+                ('reg_no', models.CharField(blank=True, default='', max_length=100)),
+                ('payment_code', models.CharField(blank=True, default='', max_length=255)),
+                ('program_name', models.CharField(blank=True, default='', max_length=200)),
+                ('faculty_name', models.CharField(blank=True, default='', max_length=200)),
+                ('document', models.TextField(blank=True, default='')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(_create_search_indexes, _drop_search_indexes),
+    ]
@@ -1378,3 +1378,167 @@ class TemporaryAccessPass(models.Model):
             self.sponsor_label = self.get_sponsor_type_display()
         super().save(*args, **kwargs)
 
+
+
+class StudentImportJob(models.Model):
+    """Background continuing-student bulk import (see ``admissions.student_bulk_import``)."""
+
+    STATUS_PENDING = "pending"
+    STATUS_VALIDATING = "validating"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_VALIDATING, "Validating"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    params = models.JSONField(default=dict, blank=True)
+    validate_only = models.BooleanField(default=False)
+    upload = models.FileField(upload_to="student_imports/%Y/%m/")
+    report = models.FileField(upload_to="student_imports/reports/%Y/%m/", blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    result = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True, default="")
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="student_import_jobs",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Student import #{self.pk} ({self.status})"
+
+
+class ApplicationSubmissionEvent(models.Model):
+    """
+    Outbox row for a side effect of an application submission (see
+    ``admissions.submission_outbox``). Written in the submit transaction and
+    carried out by a worker after commit, so the request only pays for the insert.
+    """
+
+    KIND_SUBMITTED_EMAIL = "submitted_email"
+    KIND_NOTIFICATION = "notification"
+    KIND_ASSIST_AUDIT = "assist_audit"
+    KIND_DRAFT_CLEANUP = "draft_cleanup"
+    KIND_REPORTING = "reporting"
+    KIND_CHOICES = [
+        (KIND_SUBMITTED_EMAIL, "Submission email"),
+        (KIND_NOTIFICATION, "Portal notification"),
+        (KIND_ASSIST_AUDIT, "Assisted submission audit entry"),
+        (KIND_DRAFT_CLEANUP, "Draft cleanup"),
+        (KIND_REPORTING, "Reporting counters"),
+    ]
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    application = models.ForeignKey(
+        Application, on_delete=models.CASCADE, related_name="submission_events"
+    )
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"{self.kind} for application #{self.application_id} ({self.status})"
+
+
+class AdmissionsDailyRollup(models.Model):
+    """
+    Pre-aggregated admissions counts for the analytics dashboard
+    (see ``admissions.analytics_rollup``). One row per
+    batch × campus × academic level × application day × status × source × gender × local.
+
+    ``application`` rows count applications by their own batch/campus/level;
+    ``admitted`` rows count AdmittedStudent by admitted batch/campus/programme level,
+    dated by the application's created day (same as the live dashboard filters).
+    """
+
+    KIND_APPLICATION = "application"
+    KIND_ADMITTED = "admitted"
+    KIND_CHOICES = [(KIND_APPLICATION, "Application"), (KIND_ADMITTED, "Admitted student")]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    day = models.DateField()
+    batch = models.ForeignKey(Batch, on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    campus = models.ForeignKey(Campus, on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    academic_level = models.ForeignKey(
+        AcademicLevel, on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+    )
+    status = models.CharField(max_length=20, blank=True, default="")
+    source = models.CharField(max_length=30, blank=True, default="")
+    gender_key = models.CharField(max_length=20, blank=True, default="")
+    is_local = models.BooleanField(default=False)
+    applications = models.PositiveIntegerField(default=0)
+    admitted = models.PositiveIntegerField(default=0)
+    registered = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["day"]),
+            models.Index(fields=["batch", "day"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.day} batch={self.batch_id} ({self.applications}/{self.admitted})"
+
+
+class StudentSearchDocument(models.Model):
+    """
+    Denormalized search text per admitted student (see ``admissions.student_search``).
+
+    ``document`` is lower-cased names, identifiers, phone digits, email, programme
+    and faculty; Postgres indexes it with pg_trgm and a ``simple`` tsvector.
+    """
+
+    student = models.OneToOneField(
+        AdmittedStudent,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    full_name = models.CharField(max_length=255, blank=True, default="")
+    reg_no = models.CharField(max_length=100, blank=True, default="")
+    payment_code = models.CharField(max_length=255, blank=True, default="")
+    program_name = models.CharField(max_length=200, blank=True, default="")
+    faculty_name = models.CharField(max_length=200, blank=True, default="")
+    document = models.TextField(blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.reg_no} {self.full_name}"
@@ -0,0 +1,790 @@
+"""
+In-process load benchmark for the applicant and student portal APIs.
+
+``seed_synthetic_university`` bulk-inserts a throwaway university: one open
+intake, programmes with an active cohort, semesters, catalogue courses,
+curriculum lines and course units, N applicants, and N admitted students with
+programme enrolments, admin-assigned course units and tuition payments.
+``run_portal_benchmark`` replays a weighted request mix against the DRF views
+in-process (``APIRequestFactory``, no HTTP server or URL routing) and records
+latency percentiles, SQL query counts and status codes per endpoint.
+
+``benchmark_portal_apis`` runs both inside one transaction that is rolled back
+unless ``keep=True``, so ``transaction.on_commit`` work (submission outbox,
+emails, Celery tasks) is never triggered and only the request path is timed.
+It refuses to run unless ``DEBUG`` is on or ``not_production=True``. Seeded users
+have unusable passwords; the staff user holds only the finance / admitted-student
+view permissions the replayed admin endpoints need. ``RegistrationSettings`` is
+opened for the run and put back before a kept run commits.
+Reports are plain JSON; ``compare_reports`` diffs two of them (e.g. a baseline
+from ``main`` against a branch).
+"""
+from __future__ import annotations
+
+import io
+import json
+import logging
+import math
+import random
+import subprocess
+import tempfile
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# (app_label, codename) granted to the seeded staff user.
+BENCHMARK_STAFF_PERMISSIONS = (
+    ("accounts", "access_finance"),
+    ("admissions", "view_admittedstudent"),
+)
+TUITION_PER_SEMESTER = Decimal("2000000.00")
+DEFAULT_MIX = {
+    "applications.submit": 1,
+    "students.bonafide_list": 2,
+    "portal.payment_status": 3,
+    "portal.registration_eligibility": 2,
+    "portal.available_courses": 2,
+    "portal.register_courses": 1,
+    "ledger.students": 2,
+}
+REPORT_VERSION = 1
+
+
+@dataclass
+class SeededProgram:
+    program: object
+    cohort: object
+    curriculum_version: object
+    current_semester: object
+    tuition_rule: object
+    # Course units offered in the students' current term (Y1T1).
+    current_unit_ids: list
+
+
+@dataclass
+class SyntheticUniversity:
+    tag: str
+    staff: object
+    batch: object
+    campus: object
+    academic_level: object
+    programs: list
+    applicants: list
+    # (user, AdmittedStudent, SeededProgram) per student.
+    students: list
+    olevel_subject_ids: list
+    counts: dict = field(default_factory=dict)
+    # RegistrationSettings field values before seeding opened registration.
+    registration_settings: dict = field(default_factory=dict)
+
+
+# ---------------------------------------------------------------- seeding
+
+
+def _bulk_users(tag: str, kind: str, n: int, password_hash: str, **flags) -> list:
+    from accounts.models import User
+
+    users = [
+        User(
+            username=f"{tag.lower()}.{kind}{i}@bench.test",
+            email=f"{tag.lower()}.{kind}{i}@bench.test",
+            first_name=kind.title(),
+            last_name=f"{tag} {i}",
+            password=password_hash,
+            **flags,
+        )
+        for i in range(n)
+    ]
+    return User.objects.bulk_create(users, batch_size=500)
+
+
+def _seed_programs(tag, n_programs, units_per_program, campus, level, faculty, today):
+    from Programs.models import (
+        CourseCatalogUnit,
+        CourseUnit,
+        Program,
+        ProgramBatch,
+        ProgramCurriculumLine,
+        ProgramCurriculumVersion,
+        Semester,
+    )
+    from payments.batch_semester_fee_helpers import get_or_create_tuition_fee_plan, tuition_head, upsert_rule
+
+    head = tuition_head()
+    seeded = []
+    for p in range(n_programs):
+        program = Program.objects.create(
+            name=f"{tag} Programme {p + 1}",
+            short_form=f"B{p + 1}",
+            code=f"{tag}-P{p + 1}",
+            faculty=faculty,
+            academic_level=level,
+            min_years=3,
+            max_years=3,
+            calendar_type="semester",
+            is_active=True,
+        )
+        program.campuses.add(campus)
+        cohort = ProgramBatch.objects.create(
+            program=program,
+            name=f"{tag} Cohort",
+            academic_year=f"{today.year}/{today.year + 1}",
+            start_date=today - timedelta(days=30),
+            is_active=True,
+        )
+        version = ProgramCurriculumVersion.objects.create(program=program, name=f"{tag} v1", is_default=True)
+        semesters = [
+            Semester.objects.create(
+                program_batch=cohort,
+                name=f"Semester {term}",
+                order=term,
+                year_of_study=1,
+                term_number=term,
+                start_date=today - timedelta(days=30) + timedelta(days=130 * (term - 1)),
+                end_date=today + timedelta(days=90) + timedelta(days=130 * (term - 1)),
+            )
+            for term in (1, 2)
+        ]
+        catalog = CourseCatalogUnit.objects.bulk_create(
+            [
+                CourseCatalogUnit(
+                    code=f"{tag}-P{p + 1}-{u + 101}",
+                    title=f"{tag} Course {p + 1}.{u + 1}",
+                    credit_units=Decimal("3"),
+                    is_active=True,
+                )
+                for u in range(units_per_program)
+            ]
+        )
+        # First half of the units run in term 1 (the students' current term), the rest in term 2.
+        terms = [1 if u < (units_per_program + 1) // 2 else 2 for u in range(units_per_program)]
+        lines = ProgramCurriculumLine.objects.bulk_create(
+            [
+                ProgramCurriculumLine(
+                    program=program,
+                    curriculum_version=version,
+                    catalog_course=cat,
+                    year_of_study=1,
+                    term_number=term,
+                    course_type="mandatory",
+                    sort_order=u + 1,
+                    is_active=True,
+                )
+                for u, (cat, term) in enumerate(zip(catalog, terms))
+            ]
+        )
+        units = CourseUnit.objects.bulk_create(
+            [
+                CourseUnit(
+                    catalog_unit=cat,
+                    curriculum_line=line,
+                    semester=semesters[term - 1],
+                    program_batch=cohort,
+                    name=cat.title,
+                    code=cat.code,
+                    credit_units=cat.credit_units,
+                    is_active=True,
+                )
+                for cat, line, term in zip(catalog, lines, terms)
+            ]
+        )
+        plan = get_or_create_tuition_fee_plan(program)
+        rules = [upsert_rule(plan, program, cohort, sem, head, TUITION_PER_SEMESTER, "UGX") for sem in semesters]
+        seeded.append(
+            SeededProgram(
+                program=program,
+                cohort=cohort,
+                curriculum_version=version,
+                current_semester=semesters[0],
+                tuition_rule=rules[0],
+                current_unit_ids=[cu.pk for cu, term in zip(units, terms) if term == 1],
+            )
+        )
+    return seeded
+
+
+def _application(tag, user, i, batch, campus, level, status):
+    from admissions.models import Application
+
+    return Application(
+        applicant=user,
+        batch=batch,
+        campus=campus,
+        academic_level=level,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        date_of_birth=timezone.localdate() - timedelta(days=365 * 20),
+        gender="Female" if i % 2 else "Male",
+        nationality="Ugandan",
+        phone=f"07{i:08d}"[:20],
+        email=user.email,
+        next_of_kin_name=f"{tag} Guardian {i}",
+        next_of_kin_contact="0700000000",
+        next_of_kin_relationship="Parent",
+        status=status,
+        application_fee_paid=True,
+    )
+
+
+def seed_synthetic_university(
+    *,
+    applicants: int = 50,
+    students: int = 200,
+    programs: int = 4,
+    course_units: int = 8,
+    payments_per_student: int = 2,
+    seed: int = 0,
+) -> SyntheticUniversity:
+    """Bulk-insert a self-contained synthetic university tagged with a unique prefix."""
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import Permission
+    from django.db.models import Q
+
+    from accounts.models import Campus, User
+    from admissions.models import (
+        AcademicLevel,
+        AdmittedStudent,
+        Application,
+        ApplicationProgramChoice,
+        Batch,
+        Faculty,
+        OLevelSubject,
+    )
+    from payments.models import RegistrationSettings, StudentTuitionPayment
+    from Programs.models import StudentCourseUnitEnrollment, StudentProgrammeEnrollment
+
+    rng = random.Random(seed)
+    tag = f"BENCH{uuid.uuid4().hex[:6].upper()}"
+    today = timezone.localdate()
+    now = timezone.now()
+    # Requests are force-authenticated; nobody can log in as a seeded user.
+    password_hash = make_password(None)
+
+    staff = User.objects.create(
+        username=f"{tag.lower()}.admin@bench.test",
+        email=f"{tag.lower()}.admin@bench.test",
+        first_name="Bench",
+        last_name="Admin",
+        password=password_hash,
+        is_staff=True,
+    )
+    perm_q = Q(pk__in=[])
+    for app_label, codename in BENCHMARK_STAFF_PERMISSIONS:
+        perm_q |= Q(content_type__app_label=app_label, codename=codename)
+    staff.user_permissions.set(Permission.objects.filter(perm_q))
+    campus = Campus.objects.create(name=f"{tag} Campus", code=f"{tag}-C")
+    level = AcademicLevel.objects.create(name=f"{tag} Undergraduate")
+    faculty = Faculty.objects.create(name=f"{tag} Faculty", code=f"{tag}-F", is_active=True)
+    faculty.campuses.add(campus)
+    seeded = _seed_programs(tag, programs, course_units, campus, level, faculty, today)
+
+    batch = Batch.objects.create(
+        name=f"{tag} Intake",
+        code=f"{tag}-INTAKE",
+        academic_year=f"{today.year}/{today.year + 1}",
+        application_start_date=today - timedelta(days=30),
+        application_end_date=today + timedelta(days=60),
+        admission_start_date=today - timedelta(days=30),
+        admission_end_date=today + timedelta(days=90),
+        is_active=True,
+        created_by=staff,
+    )
+    batch.programs.set([sp.program for sp in seeded])
+    subjects = OLevelSubject.objects.bulk_create(
+        [OLevelSubject(name=f"{tag} Subject {s}", code=f"{tag}-S{s}") for s in range(8)]
+    )
+
+    applicant_users = _bulk_users(tag, "applicant", applicants, password_hash, is_applicant=True)
+    student_users = _bulk_users(tag, "student", students, password_hash, is_applicant=True, is_student=True)
+    applications = Application.objects.bulk_create(
+        [_application(tag, user, i, batch, campus, level, "admitted") for i, user in enumerate(student_users)],
+        batch_size=500,
+    )
+    student_programs = [seeded[i % len(seeded)] for i in range(students)]
+    # Roughly three in four students have paid enough of term 1 and been cleared to register.
+    paid_up = [rng.random() < 0.75 for _ in range(students)]
+    ApplicationProgramChoice.objects.bulk_create(
+        [
+            ApplicationProgramChoice(application=app, program=sp.program, choice_order=1)
+            for app, sp in zip(applications, student_programs)
+        ],
+        batch_size=500,
+    )
+    admitted = AdmittedStudent.objects.bulk_create(
+        [
+            AdmittedStudent(
+                application=app,
+                student_user=user,
+                student_id=f"{tag}-{i:06d}",
+                reg_no=f"{today.year}/{tag}/{i:06d}",
+                study_mode="Day",
+                admitted_program=sp.program,
+                admitted_batch=batch,
+                admitted_campus=campus,
+                intended_program_batch=sp.cohort,
+                is_admitted=True,
+                admission_date=now,
+                # The bonafide list defaults to commitment-paid students.
+                admission_fee_paid=cleared or i % 3 == 0,
+                accounts_registration_cleared=cleared,
+                physical_documents_verified=cleared,
+                admitted_by=staff,
+            )
+            for i, (app, user, sp, cleared) in enumerate(
+                zip(applications, student_users, student_programs, paid_up)
+            )
+        ],
+        batch_size=500,
+    )
+    StudentProgrammeEnrollment.objects.bulk_create(
+        [
+            StudentProgrammeEnrollment(
+                student=student,
+                program=sp.program,
+                program_batch=sp.cohort,
+                curriculum_version=sp.curriculum_version,
+                current_year_of_study=1,
+                current_term_number=1,
+                status="enrolled",
+                enrolled_at=now,
+                enrolled_by=staff,
+            )
+            for student, sp in zip(admitted, student_programs)
+        ],
+        batch_size=500,
+    )
+    StudentCourseUnitEnrollment.objects.bulk_create(
+        [
+            StudentCourseUnitEnrollment(student=student, course_unit_id=cu_id, source="admin_assigned")
+            for student, sp in zip(admitted, student_programs)
+            for cu_id in sp.current_unit_ids
+        ],
+        batch_size=1000,
+    )
+    payments = []
+    for student, sp, cleared in zip(admitted, student_programs, paid_up):
+        share = Decimal("0.7") if cleared else Decimal("0.2")
+        for k in range(payments_per_student):
+            payments.append(
+                StudentTuitionPayment(
+                    student=student,
+                    fee_plan_rule=sp.tuition_rule,
+                    semester=sp.current_semester,
+                    amount=(TUITION_PER_SEMESTER * share / payments_per_student).quantize(Decimal("1")),
+                    currency="UGX",
+                    payment_method="bank_transfer",
+                    status="completed",
+                    transaction_id=f"{tag}-{student.pk}-{k}",
+                    paid_at=now - timedelta(days=rng.randint(1, 60)),
+                )
+            )
+    StudentTuitionPayment.objects.bulk_create(payments, batch_size=1000)
+
+    reg_settings = RegistrationSettings.get_settings()
+    registration_settings = {
+        "is_active": reg_settings.is_active,
+        "registration_start_date": reg_settings.registration_start_date,
+        "registration_end_date": reg_settings.registration_end_date,
+    }
+    RegistrationSettings.objects.filter(pk=reg_settings.pk).update(
+        is_active=True, registration_start_date=None, registration_end_date=None
+    )
+
+    return SyntheticUniversity(
+        tag=tag,
+        staff=staff,
+        batch=batch,
+        campus=campus,
+        academic_level=level,
+        programs=seeded,
+        applicants=applicant_users,
+        students=list(zip(student_users, admitted, student_programs)),
+        olevel_subject_ids=[s.pk for s in subjects],
+        counts={
+            "applicants": applicants,
+            "students": students,
+            "programs": programs,
+            "course_units": programs * course_units,
+            "payments": len(payments),
+        },
+        registration_settings=registration_settings,
+    )
+
+
+def restore_registration_settings(uni: SyntheticUniversity) -> None:
+    """Put back the registration window ``seed_synthetic_university`` opened."""
+    from payments.models import RegistrationSettings
+
+    if uni.registration_settings:
+        RegistrationSettings.objects.filter(pk=RegistrationSettings.get_settings().pk).update(
+            **uni.registration_settings
+        )
+
+
+# ---------------------------------------------------------------- request mix
+
+
+@dataclass
+class Scenario:
+    name: str
+    view: object
+    # (factory, university, index) -> authenticated request, or None once the pool is used up.
+    build: object
+
+
+def _authenticated(request, user):
+    from rest_framework.test import force_authenticate
+
+    force_authenticate(request, user=user)
+    return request
+
+
+def _passport_photo():
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 80), (200, 200, 200)).save(buf, "JPEG")
+    return SimpleUploadedFile("passport.jpg", buf.getvalue(), content_type="image/jpeg")
+
+
+def _build_submit(factory, uni, i):
+    if i >= len(uni.applicants):
+        return None
+    user = uni.applicants[i]
+    subjects = uni.olevel_subject_ids
+    data = {
+        "batch": uni.batch.pk,
+        "campus": uni.campus.pk,
+        "academic_level": uni.academic_level.pk,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "date_of_birth": "2005-01-01",
+        "gender": "Female" if i % 2 else "Male",
+        "nationality": "Ugandan",
+        "phone": "0700000000",
+        "email": user.email,
+        "next_of_kin_name": "Bench Guardian",
+        "next_of_kin_contact": "0700000001",
+        "next_of_kin_relationship": "Parent",
+        "programs": json.dumps([uni.programs[i % len(uni.programs)].program.pk]),
+        "has_olevel": "true",
+        "olevel_results": json.dumps([{"subject": sid, "grade": "D1"} for sid in subjects]),
+        "passport_photo": _passport_photo(),
+    }
+    return _authenticated(factory.post("/api/admissions/applications/", data, format="multipart"), user)
+
+
+_BONAFIDE_VARIANTS = ({}, {"bonafide": "all"}, {"ordering": "work_queue"})
+_LEDGER_VARIANTS = ({}, {"include_finance_summary": "true"}, {"commitment_met": "true"})
+
+
+def _build_bonafide_list(factory, uni, i):
+    params = {"page_size": 25, **_BONAFIDE_VARIANTS[i % len(_BONAFIDE_VARIANTS)]}
+    return _authenticated(factory.get("/api/admissions/bonafide-students/", params), uni.staff)
+
+
+def _build_ledger_students(factory, uni, i):
+    params = {"page_size": 25, **_LEDGER_VARIANTS[i % len(_LEDGER_VARIANTS)]}
+    return _authenticated(factory.get("/api/payments/admin/tuition_ledger/students", params), uni.staff)
+
+
+def _student_get(path):
+    def build(factory, uni, i):
+        user, _student, _program = uni.students[i % len(uni.students)]
+        return _authenticated(factory.get(path), user)
+
+    return build
+
+
+def _build_register_courses(factory, uni, i):
+    # Registration is a write: every student registers once.
+    if i >= len(uni.students):
+        return None
+    user, _student, seeded = uni.students[i]
+    return _authenticated(
+        factory.post(
+            "/api/payments/register-courses/", {"course_unit_ids": seeded.current_unit_ids}, format="json"
+        ),
+        user,
+    )
+
+
+def portal_scenarios() -> dict[str, Scenario]:
+    from admissions.views import ListBonafideStudents, create_applications
+    from payments.admin_ledger_views import AdminTuitionLedgerStudentsView
+    from payments.semester_registration_views import (
+        CheckRegistrationEligibility,
+        GetStudentPaymentStatus,
+        RegisterForCourses,
+    )
+    from Programs.course_enrollment_views import GetAvailableCoursesForRegistration
+
+    scenarios = [
+        Scenario("applications.submit", create_applications, _build_submit),
+        Scenario("students.bonafide_list", ListBonafideStudents.as_view(), _build_bonafide_list),
+        Scenario(
+            "portal.payment_status",
+            GetStudentPaymentStatus.as_view(),
+            _student_get("/api/payments/student/payment-status/"),
+        ),
+        Scenario(
+            "portal.registration_eligibility",
+            CheckRegistrationEligibility.as_view(),
+            _student_get("/api/payments/registration-eligibility/"),
+        ),
+        Scenario(
+            "portal.available_courses",
+            GetAvailableCoursesForRegistration.as_view(),
+            _student_get("/api/programs/available-courses/"),
+        ),
+        Scenario("portal.register_courses", RegisterForCourses.as_view(), _build_register_courses),
+        Scenario("ledger.students", AdminTuitionLedgerStudentsView.as_view(), _build_ledger_students),
+    ]
+    return {s.name: s for s in scenarios}
+
+
+def parse_mix(value: str | None) -> dict[str, int]:
+    """``"portal.payment_status=3,ledger.students=1"`` -> weights (default mix when empty)."""
+    if not value:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"unknown endpoint {name!r}; choose from {', '.join(DEFAULT_MIX)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+# ---------------------------------------------------------------- measuring
+
+
+def _call(scenario: Scenario, request) -> dict:
+    """Time one request; each runs in a savepoint so a failing request cannot break the rest."""
+    started = time.perf_counter()
+    queries = None
+    try:
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as captured:
+                response = scenario.view(request)
+                if hasattr(response, "render"):
+                    response.render()
+            queries = len(captured)
+        status_code = response.status_code
+    except Exception:
+        logger.warning("benchmark request %s raised", scenario.name, exc_info=True)
+        status_code = "exception"
+    return {
+        "ms": (time.perf_counter() - started) * 1000,
+        "queries": queries,
+        "status": status_code,
+    }
+
+
+def percentile(values: list, q: float):
+    """Nearest-rank percentile of an already sorted list (None when empty)."""
+    if not values:
+        return None
+    rank = math.ceil(round(q * len(values), 6))
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+def summarize_samples(samples: list[dict], *, skipped: int = 0) -> dict:
+    ms = sorted(s["ms"] for s in samples)
+    queries = sorted(s["queries"] for s in samples if s["queries"] is not None)
+    statuses = Counter(str(s["status"]) for s in samples)
+    errors = sum(n for code, n in statuses.items() if not code.isdigit() or int(code) >= 500)
+
+    def _ms(value):
+        return round(value, 2) if value is not None else None
+
+    return {
+        "requests": len(samples),
+        "skipped": skipped,
+        "errors": errors,
+        "status_codes": dict(sorted(statuses.items())),
+        "latency_ms": {
+            "mean": _ms(sum(ms) / len(ms)) if ms else None,
+            "p50": _ms(percentile(ms, 0.50)),
+            "p95": _ms(percentile(ms, 0.95)),
+            "p99": _ms(percentile(ms, 0.99)),
+            "max": _ms(ms[-1]) if ms else None,
+        },
+        "queries": {
+            "mean": round(sum(queries) / len(queries), 1) if queries else None,
+            "p95": percentile(queries, 0.95),
+            "max": queries[-1] if queries else None,
+        },
+    }
+
+
+def run_portal_benchmark(
+    uni: SyntheticUniversity,
+    *,
+    requests: int = 200,
+    mix: dict[str, int] | None = None,
+    warmup: int = 1,
+    seed: int = 0,
+) -> dict[str, dict]:
+    """Replay ``requests`` calls split by ``mix`` weights (shuffled) and summarise each endpoint."""
+    from rest_framework.test import APIRequestFactory
+
+    factory = APIRequestFactory()
+    mix = {name: weight for name, weight in (mix or DEFAULT_MIX).items() if weight > 0}
+    scenarios = portal_scenarios()
+    total_weight = sum(mix.values())
+    plan = []
+    for name, weight in mix.items():
+        plan.extend([name] * max(1, round(requests * weight / total_weight)))
+    random.Random(seed).shuffle(plan)
+
+    next_index = Counter()
+    samples = {name: [] for name in mix}
+    skipped = Counter()
+
+    def _next_request(name):
+        request = scenarios[name].build(factory, uni, next_index[name])
+        next_index[name] += 1
+        return request
+
+    # Warm-up calls (import paths, first-hit caches) are not recorded.
+    for name in mix:
+        for _ in range(warmup):
+            request = _next_request(name)
+            if request is not None:
+                _call(scenarios[name], request)
+
+    for name in plan:
+        request = _next_request(name)
+        if request is None:
+            skipped[name] += 1
+            continue
+        samples[name].append(_call(scenarios[name], request))
+
+    return {name: summarize_samples(samples[name], skipped=skipped[name]) for name in mix}
+
+
+# ---------------------------------------------------------------- reports
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=str(settings.BASE_DIR),
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def benchmark_portal_apis(
+    *,
+    applicants: int = 50,
+    students: int = 200,
+    programs: int = 4,
+    course_units: int = 8,
+    payments_per_student: int = 2,
+    requests: int = 200,
+    warmup: int = 1,
+    mix: dict[str, int] | None = None,
+    seed: int = 0,
+    keep: bool = False,
+    not_production: bool = False,
+) -> dict:
+    """Seed, replay and return the JSON-ready report (seed data rolled back unless ``keep``)."""
+    if not (settings.DEBUG or not_production):
+        raise RuntimeError(
+            "The portal benchmark writes synthetic users and data; run it with DEBUG on "
+            "or confirm the database is not production."
+        )
+    isolated = {
+        # A private cache so runs start cold and never touch the shared Redis keys.
+        "CACHES": {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "portal-benchmark"}},
+        "EMAIL_BACKEND": "django.core.mail.backends.locmem.EmailBackend",
+    }
+    media_dir = None
+    if not keep:
+        media_dir = tempfile.TemporaryDirectory(prefix="portal-benchmark-")
+        isolated["MEDIA_ROOT"] = media_dir.name
+    try:
+        with override_settings(**isolated), transaction.atomic():
+            started = time.perf_counter()
+            uni = seed_synthetic_university(
+                applicants=applicants,
+                students=students,
+                programs=programs,
+                course_units=course_units,
+                payments_per_student=payments_per_student,
+                seed=seed,
+            )
+            seed_seconds = time.perf_counter() - started
+            endpoints = run_portal_benchmark(uni, requests=requests, mix=mix, warmup=warmup, seed=seed)
+            if keep:
+                restore_registration_settings(uni)
+            else:
+                transaction.set_rollback(True)
+    finally:
+        if media_dir is not None:
+            media_dir.cleanup()
+
+    return {
+        "version": REPORT_VERSION,
+        "generated_at": timezone.now().isoformat(),
+        "git_commit": _git_commit(),
+        "database": connection.vendor,
+        "params": {
+            "requests": requests,
+            "warmup": warmup,
+            "seed": seed,
+            "mix": mix or dict(DEFAULT_MIX),
+            "kept_seed_data": keep,
+        },
+        "seed": {"tag": uni.tag, "seconds": round(seed_seconds, 2), **uni.counts},
+        "endpoints": endpoints,
+    }
+
+
+def write_report(report: dict, path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True))
+    return path
+
+
+def compare_reports(baseline: dict, current: dict) -> list[dict]:
+    """Per-endpoint p50 / p95 latency and mean query deltas of ``current`` against ``baseline``."""
+    rows = []
+    for name, now in current.get("endpoints", {}).items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before:
+            continue
+        row = {"endpoint": name}
+        for label, section, key in (
+            ("p50_ms", "latency_ms", "p50"),
+            ("p95_ms", "latency_ms", "p95"),
+            ("queries", "queries", "mean"),
+        ):
+            old, new = before[section].get(key), now[section].get(key)
+            row[label] = {
+                "baseline": old,
+                "current": new,
+                "change_pct": round((new - old) / old * 100, 1) if old and new is not None else None,
+            }
+        rows.append(row)
+    return rows
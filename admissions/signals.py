@@ -4,7 +4,22 @@ import logging
 from django.core.cache import cache
 from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
-from .models import Batch, AcademicLevel, ALevelSubject, OLevelSubject
+from django.utils import timezone
+from accounts.models import Campus
+from Programs.models import (
+    CourseCatalogUnit,
+    Program,
+    ProgramBatch,
+    ProgramCurriculumLine,
+    ProgramCurriculumVersion,
+    StudentProgrammeEnrollment,
+)
+
+from .analytics_rollup import mark_admissions_rollup_dirty
+from .curriculum_match_index import invalidate_curriculum_match_indexes
+from .dashboard_counters import invalidate_dashboard_counters
+from .models import AcademicLevel, AdmittedStudent, ALevelSubject, Application, Batch, Faculty, OLevelSubject
+from .student_search import queue_student_search_refresh
 
 logger = logging.getLogger(__name__)
 
@@ -33,18 +48,10 @@ def invalidate_on_batch_change(sender, instance, **kwargs):
     bump_batch_version()
 
 
-def _connect_program_batch_cache_invalidation():
-    try:
-        from Programs.models import ProgramBatch
-    except ImportError:
-        return
-
-    @receiver([post_save, post_delete], sender=ProgramBatch)
-    def invalidate_on_program_batch_change(sender, instance, **kwargs):
-        bump_batch_version()
-
+@receiver([post_save, post_delete], sender=ProgramBatch)
+def invalidate_on_program_batch_change(sender, instance, **kwargs):
+    bump_batch_version()
 
-_connect_program_batch_cache_invalidation()
 
 @receiver(m2m_changed, sender=Batch.programs.through)
 def invalidate_on_programs_change(sender, instance, action, **kwargs):
@@ -63,4 +70,83 @@ def invalidate_alevel_subjects_cache(sender, instance, **kwargs):
 
 @receiver([post_save, post_delete], sender=OLevelSubject)
 def invalidate_olevel_subjects_cache(sender, instance, **kwargs):
-    _safe_cache_delete("all_olevel_subjects_list")
\ No newline at end of file
+    _safe_cache_delete("all_olevel_subjects_list")
+
+# analytics rollup (regroup the application's created day after commit)
+@receiver([post_save, post_delete], sender=Application)
+def refresh_rollup_on_application_change(sender, instance, **kwargs):
+    # Submissions refresh reporting from the outbox (admissions.submission_outbox).
+    if getattr(instance, "_defer_reporting", False):
+        return
+    if instance.created_at:
+        mark_admissions_rollup_dirty(timezone.localdate(instance.created_at))
+
+
+@receiver([post_save, post_delete], sender=AdmittedStudent)
+def refresh_rollup_on_admission_change(sender, instance, **kwargs):
+    created_at = (
+        Application.objects.filter(pk=instance.application_id)
+        .values_list("created_at", flat=True)
+        .first()
+    )
+    if created_at:
+        mark_admissions_rollup_dirty(timezone.localdate(created_at))
+
+
+# student search index
+@receiver(post_save, sender=AdmittedStudent)
+def refresh_search_on_student_save(sender, instance, **kwargs):
+    queue_student_search_refresh([instance.pk])
+
+
+@receiver(post_save, sender=Application)
+def refresh_search_on_application_save(sender, instance, created, **kwargs):
+    if created:
+        return  # no admitted student can point at a brand-new application yet
+    queue_student_search_refresh(
+        AdmittedStudent.objects.filter(application_id=instance.pk).values_list("id", flat=True)
+    )
+
+
+@receiver(post_save, sender=Program)
+def refresh_search_on_program_save(sender, instance, created, **kwargs):
+    if not created:
+        queue_student_search_refresh(
+            AdmittedStudent.objects.filter(admitted_program_id=instance.pk).values_list("id", flat=True)
+        )
+
+
+@receiver(post_save, sender=Faculty)
+def refresh_search_on_faculty_save(sender, instance, created, **kwargs):
+    if not created:
+        queue_student_search_refresh(
+            AdmittedStudent.objects.filter(admitted_program__faculty_id=instance.pk).values_list(
+                "id", flat=True
+            )
+        )
+
+
+# landing dashboard counters (AdminDashboardStats / UniversityHeadcountView)
+@receiver([post_save, post_delete], sender=Application)
+@receiver([post_save, post_delete], sender=AdmittedStudent)
+@receiver([post_save, post_delete], sender=Batch)
+@receiver([post_save, post_delete], sender=Program)
+@receiver([post_save, post_delete], sender=Faculty)
+@receiver([post_save, post_delete], sender=Campus)
+@receiver([post_save, post_delete], sender=ProgramBatch)
+@receiver([post_save, post_delete], sender=StudentProgrammeEnrollment)
+def invalidate_dashboard_counters_on_change(sender, instance, **kwargs):
+    # Submissions refresh reporting from the outbox (admissions.submission_outbox).
+    if getattr(instance, "_defer_reporting", False):
+        return
+    invalidate_dashboard_counters()
+
+
+# exemption curriculum match indexes (cached per curriculum version)
+@receiver([post_save, post_delete], sender=ProgramCurriculumLine)
+@receiver([post_save, post_delete], sender=ProgramCurriculumVersion)
+@receiver([post_save, post_delete], sender=CourseCatalogUnit)
+@receiver([post_save, post_delete], sender=Program)
+def invalidate_curriculum_match_on_change(sender, instance, **kwargs):
+    # Program: curriculum_mode / curriculum_source_program decide whose lines are read.
+    invalidate_curriculum_match_indexes()
@@ -5,13 +5,18 @@ import csv
 import io
 import logging
 import re
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta
+from typing import Any, Callable
+
+from django.core.files.base import ContentFile
 from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError as DRFValidationError
 
 from accounts.models import Campus, User
-from admissions.models import AcademicLevel, AdmittedStudent, Application, Batch
+from admissions.models import AcademicLevel, AdmittedStudent, Application, Batch, StudentImportJob
 from admissions.serializers import AdmittedStudentSerializer
 from admissions.utils.program_choices import sync_application_program_choices
 from admissions.utils.reference import generate_reference
@@ -60,6 +65,11 @@ STUDENT_IMPORT_TEMPLATE_HEADERS = (
 
 STUDY_MODES = frozenset({"W", "D", "DL", "DJ", "WJ"})
 
+# Rows committed per transaction by the import pipeline.
+STUDENT_IMPORT_CHUNK_SIZE = 25
+# Larger uploads are always imported by a worker (``StudentImportJob``).
+STUDENT_IMPORT_SYNC_MAX_ROWS = 150
+
 
 def _parse_optional_position(row: dict, program: Program) -> tuple[int, int] | None:
     """Parse continuing-student year/term; both columns required when either is set."""
@@ -593,18 +603,8 @@ def _ensure_schoolpay_protection(
     return paycode
 
 
-def _import_one_row(
-    *,
-    row: dict,
-    program: Program,
-    program_batch: ProgramBatch,
-    admission_batch: Batch,
-    campus: Campus,
-    academic_level: AcademicLevel,
-    admitted_by,
-    register_schoolpay: bool,
-    require_academic_position: bool = False,
-) -> AdmittedStudent:
+def _clean_new_row(row: dict, program: Program, spec_cache: dict | None = None) -> dict:
+    """Validate the student columns of a row to be created (no database access)."""
     first_name = row.get("first_name", "").strip()
     last_name = row.get("last_name", "").strip()
     email = row.get("email", "").strip().lower()
@@ -627,43 +627,141 @@ def _import_one_row(
         raise ValueError("reg_no is required.")
     if study_mode not in STUDY_MODES:
         raise ValueError(f"study_mode must be one of: {', '.join(sorted(STUDY_MODES))}.")
-    if AdmittedStudent.objects.filter(reg_no=reg_no).exists():
-        raise ValueError(f"reg_no '{reg_no}' is already in use.")
 
-    try:
-        dob_date = _parse_date_of_birth(row.get("date_of_birth", ""))
-    except ValueError as exc:
-        raise ValueError(str(exc)) from exc
+    dob_date = _parse_date_of_birth(row.get("date_of_birth", ""))
+    return {
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": email,
+        "phone": phone,
+        "reg_no": reg_no,
+        "study_mode": study_mode,
+        "date_of_birth": dob_date,
+        "specialization": _clean_specialization(row, program, spec_cache),
+    }
+
 
-    specialization = None
+def _clean_specialization(row: dict, program: Program, spec_cache: dict | None = None) -> str | None:
     spec_raw = row.get("specialization", "").strip()
-    if spec_raw:
+    if not spec_raw:
+        return None
+    if spec_cache is not None and spec_raw in spec_cache:
+        matched, spec_err = spec_cache[spec_raw]
+    else:
         matched, spec_err = resolve_specialization_for_program(program, spec_raw)
-        if spec_err:
-            raise ValueError(spec_err)
-        specialization = matched
+        if spec_cache is not None:
+            spec_cache[spec_raw] = (matched, spec_err)
+    if spec_err:
+        raise ValueError(spec_err)
+    return matched
+
 
+def _applicant_user_for_import(
+    email: str, *, first_name: str, last_name: str, campus: Campus
+) -> tuple[User, bool]:
+    """Existing applicant account for ``email`` or a new one, as ``(user, created)``."""
     applicant_user = User.objects.filter(email=email, is_applicant=True).first()
-    if not applicant_user:
-        base_username = email.split("@")[0]
-        username = base_username
-        counter = 1
-        while User.objects.filter(username=username).exists():
-            username = f"{base_username}_{counter}"
-            counter += 1
-        applicant_user = User.objects.create_user(
-            username=username,
-            first_name=first_name,
-            last_name=last_name,
-            email=email,
-            password="NDU@1234",
-            is_applicant=True,
-            allow_multi_campus_per_day=False,
-            primary_campus=campus,
+    if applicant_user:
+        return applicant_user, False
+    base_username = email.split("@")[0]
+    username = base_username
+    counter = 1
+    while User.objects.filter(username=username).exists():
+        username = f"{base_username}_{counter}"
+        counter += 1
+    applicant_user = User.objects.create_user(
+        username=username,
+        first_name=first_name,
+        last_name=last_name,
+        email=email,
+        password="NDU@1234",
+        is_applicant=True,
+        allow_multi_campus_per_day=False,
+        primary_campus=campus,
+    )
+    return applicant_user, True
+
+
+def _import_one_row(
+    *,
+    row: dict,
+    program: Program,
+    program_batch: ProgramBatch,
+    admission_batch: Batch,
+    campus: Campus,
+    academic_level: AcademicLevel,
+    admitted_by,
+    register_schoolpay: bool,
+    require_academic_position: bool = False,
+    cleaned: dict | None = None,
+    applicant_user_id: int | None = None,
+) -> AdmittedStudent:
+    """
+    Create one student. ``cleaned`` / ``applicant_user_id`` come from the
+    preflight pass; without them the row is validated and looked up here.
+    """
+    admitted = _create_imported_student(
+        row=row,
+        program=program,
+        program_batch=program_batch,
+        admission_batch=admission_batch,
+        campus=campus,
+        academic_level=academic_level,
+        admitted_by=admitted_by,
+        cleaned=cleaned,
+        applicant_user_id=applicant_user_id,
+    )
+    paycode = _ensure_schoolpay_protection(
+        admitted,
+        row,
+        register_schoolpay=register_schoolpay,
+    )
+    _finish_imported_student(
+        admitted,
+        paycode,
+        row=row,
+        program=program,
+        program_batch=program_batch,
+        admitted_by=admitted_by,
+        specialization=admitted._import_specialization,  # noqa: SLF001
+        require_academic_position=require_academic_position,
+    )
+    return admitted
+
+
+def _create_imported_student(
+    *,
+    row: dict,
+    program: Program,
+    program_batch: ProgramBatch,
+    admission_batch: Batch,
+    campus: Campus,
+    academic_level: AcademicLevel,
+    admitted_by,
+    cleaned: dict | None = None,
+    applicant_user_id: int | None = None,
+) -> AdmittedStudent:
+    """Application, admission and programme enrolment rows for one new student (local writes only)."""
+    if cleaned is None:
+        cleaned = _clean_new_row(row, program)
+        if AdmittedStudent.objects.filter(reg_no=cleaned["reg_no"]).exists():
+            raise ValueError(f"reg_no '{cleaned['reg_no']}' is already in use.")
+    first_name = cleaned["first_name"]
+    last_name = cleaned["last_name"]
+    email = cleaned["email"]
+    phone = cleaned["phone"]
+    reg_no = cleaned["reg_no"]
+    specialization = cleaned["specialization"]
+
+    applicant_created = False
+    if applicant_user_id is None:
+        applicant_user, applicant_created = _applicant_user_for_import(
+            email, first_name=first_name, last_name=last_name, campus=campus
         )
+        applicant_user_id = applicant_user.pk
 
     application = Application.objects.create(
-        applicant=applicant_user,
+        applicant_id=applicant_user_id,
         batch=admission_batch,
         campus=campus,
         academic_level=academic_level,
@@ -673,7 +771,7 @@ def _import_one_row(
         first_name=first_name,
         last_name=last_name,
         middle_name=row.get("middle_name", "").strip(),
-        date_of_birth=dob_date,
+        date_of_birth=cleaned["date_of_birth"],
         gender=row.get("gender", "").strip(),
         nationality=row.get("nationality", "").strip(),
         phone=phone,
@@ -696,7 +794,7 @@ def _import_one_row(
         "admitted_program": program.pk,
         "admitted_batch": admission_batch.pk,
         "admitted_campus": campus.pk,
-        "study_mode": study_mode,
+        "study_mode": cleaned["study_mode"],
         "is_admitted": True,
         "admission_date": timezone.now(),
         "admitted_by": admitted_by.pk if admitted_by else None,
@@ -714,13 +812,23 @@ def _import_one_row(
             spe.save(update_fields=["specialization", "updated_at"])
         except Exception:
             pass
+    admitted._import_specialization = specialization  # noqa: SLF001
+    admitted._import_applicant_created = applicant_created  # noqa: SLF001
+    return admitted
 
-    paycode = _ensure_schoolpay_protection(
-        admitted,
-        row,
-        register_schoolpay=register_schoolpay,
-    )
 
+def _finish_imported_student(
+    admitted: AdmittedStudent,
+    paycode: str,
+    *,
+    row: dict,
+    program: Program,
+    program_batch: ProgramBatch,
+    admitted_by,
+    specialization: str | None,
+    require_academic_position: bool,
+) -> None:
+    """Ledger linking, import columns and portal account once the payment code is known."""
     try:
         from payments.utils.tuition_ledger_linking import relink_tuition_ledgers_for_student
 
@@ -747,13 +855,12 @@ def _import_one_row(
         raise ValueError(str(exc)) from exc
 
     transaction.on_commit(
-        lambda aid=admitted.id, app_id=application.id: queue_admission_notification_emails(
+        lambda aid=admitted.id, app_id=admitted.application_id: queue_admission_notification_emails(
             aid, app_id
         )
     )
     admitted._import_paycode = paycode  # noqa: SLF001
     admitted._import_extensions = ext  # noqa: SLF001
-    return admitted
 
 
 def _tally_extension_counters(ext: dict, counters: dict) -> None:
@@ -775,9 +882,21 @@ def _tally_extension_counters(ext: dict, counters: dict) -> None:
         counters["enrollment_activated_rows"] += 1
 
 
-def process_student_batch_import(
+@dataclass
+class StudentImportContext:
+    program: Program
+    program_batch: ProgramBatch
+    admission_batch: Batch
+    campus: Campus
+    academic_level: AcademicLevel
+    admitted_by: Any
+    register_schoolpay: bool = True
+    skip_existing_reg_no: bool = False
+    require_academic_position: bool = False
+
+
+def resolve_student_import_context(
     *,
-    uploaded_file,
     program_batch_id: int,
     campus_id: int,
     admitted_by,
@@ -785,7 +904,8 @@ def process_student_batch_import(
     register_schoolpay: bool = True,
     skip_existing_reg_no: bool = False,
     require_academic_position: bool = False,
-) -> dict:
+) -> StudentImportContext:
+    """Look up the cohort, intake and campus for an import; ``ValueError`` when unusable."""
     try:
         program_batch = ProgramBatch.objects.select_related("program").get(pk=program_batch_id)
     except ProgramBatch.DoesNotExist:
@@ -813,7 +933,20 @@ def process_student_batch_import(
     if require_academic_position:
         _preflight_continuing_import(program, program_batch)
 
-    headers, rows = _parse_upload_file(uploaded_file)
+    return StudentImportContext(
+        program=program,
+        program_batch=program_batch,
+        admission_batch=admission_batch,
+        campus=campus,
+        academic_level=academic_level,
+        admitted_by=admitted_by,
+        register_schoolpay=register_schoolpay,
+        skip_existing_reg_no=skip_existing_reg_no,
+        require_academic_position=require_academic_position,
+    )
+
+
+def _check_import_headers(headers: list[str], rows: list[dict], *, require_academic_position: bool) -> None:
     missing = _require_columns(headers)
     if missing:
         raise ValueError(f"Missing required columns: {', '.join(missing)}")
@@ -827,14 +960,299 @@ def process_student_batch_import(
     if not rows:
         raise ValueError("No data rows found in file.")
 
-    created = 0
-    updated = 0
-    skipped = 0
-    failed = 0
-    errors: list[str] = []
-    created_students: list[dict] = []
-    updated_students: list[dict] = []
-    skipped_students: list[dict] = []
+
+def preflight_student_rows(rows: list[dict], ctx: StudentImportContext) -> list[dict]:
+    """
+    Validate every row before anything is written.
+
+    Existing reg_nos, applicant emails and SchoolPay payment codes are resolved
+    for the whole file in three queries; duplicates inside the file are caught
+    too. Returns one plan per row with ``action`` ``create`` / ``update`` /
+    ``fail`` (and ``error`` for failures).
+    """
+    reg_nos = {r.get("reg_no", "").strip() for r in rows} - {""}
+    emails = {r.get("email", "").strip().lower() for r in rows} - {""}
+    codes = {r.get("student_id", "").strip() for r in rows} - {""}
+
+    existing_by_reg = dict(
+        AdmittedStudent.objects.filter(reg_no__in=reg_nos).values_list("reg_no", "id")
+    )
+    applicant_by_email: dict[str, int] = {}
+    for email, uid in (
+        User.objects.filter(email__in=emails, is_applicant=True)
+        .order_by("pk")
+        .values_list("email", "id")
+    ):
+        applicant_by_email.setdefault(email, uid)
+    codes_in_use: dict[str, str] = {}
+    if codes:
+        for student_id, schoolpay_code in AdmittedStudent.objects.filter(
+            Q(student_id__in=codes) | Q(schoolpay_code__in=codes)
+        ).values_list("student_id", "schoolpay_code"):
+            if student_id in codes:
+                codes_in_use[student_id] = f"SchoolPay payment code '{student_id}' is already linked to another student."
+            if schoolpay_code in codes:
+                codes_in_use.setdefault(schoolpay_code, f"SchoolPay payment code '{schoolpay_code}' is already in use.")
+
+    program = ctx.program
+    spec_cache: dict = {}
+    seen_reg: set[str] = set()
+    seen_codes: set[str] = set()
+    plans: list[dict] = []
+    for row in rows:
+        reg_no = row.get("reg_no", "").strip()
+        plan = {
+            "row": row,
+            "row_num": row.get("__row__", "?"),
+            "reg_no": reg_no,
+            "name": f"{row.get('first_name', '')} {row.get('last_name', '')}".strip(),
+            "action": "create",
+            "error": "",
+        }
+        plans.append(plan)
+        try:
+            if reg_no and reg_no in seen_reg:
+                raise ValueError(f"reg_no '{reg_no}' appears more than once in the file.")
+            if reg_no:
+                seen_reg.add(reg_no)
+
+            if reg_no in existing_by_reg:
+                if not ctx.skip_existing_reg_no:
+                    raise ValueError(f"reg_no '{reg_no}' is already in use.")
+                plan["action"] = "update"
+                plan["existing_id"] = existing_by_reg[reg_no]
+                plan["specialization"] = _clean_specialization(row, program, spec_cache)
+                _parse_optional_position(row, program)
+                continue
+
+            cleaned = _clean_new_row(row, program, spec_cache)
+            position = _parse_optional_position(row, program)
+            if ctx.require_academic_position and position is None:
+                raise ValueError(
+                    "current_year_of_study and current_term_number are required "
+                    "for continuing-student import."
+                )
+            code = row.get("student_id", "").strip()
+            if code:
+                if code in seen_codes:
+                    raise ValueError(f"SchoolPay payment code '{code}' appears more than once in the file.")
+                seen_codes.add(code)
+                if code in codes_in_use:
+                    raise ValueError(codes_in_use[code])
+            elif not ctx.register_schoolpay:
+                raise ValueError(
+                    "SchoolPay registration is required when student_id is not provided. "
+                    "Add the legacy payment code in the student_id column, or allow SchoolPay registration."
+                )
+            plan["cleaned"] = cleaned
+            plan["applicant_user_id"] = applicant_by_email.get(cleaned["email"])
+        except ValueError as exc:
+            plan["action"] = "fail"
+            plan["error"] = str(exc)
+    return plans
+
+
+def _row_error_message(exc: Exception) -> str:
+    if isinstance(exc, DRFValidationError):
+        detail = exc.detail
+        return str(detail) if not isinstance(detail, dict) else "; ".join(
+            f"{k}: {v}" for k, v in detail.items()
+        )
+    return str(exc)
+
+
+def _apply_existing_row(plan: dict, existing: AdmittedStudent, ctx: StudentImportContext, counters: dict) -> dict:
+    row = plan["row"]
+    batch_changed = False
+    if existing.intended_program_batch_id != ctx.program_batch.id:
+        existing.intended_program_batch = ctx.program_batch
+        existing.save(update_fields=["intended_program_batch", "updated_at"])
+        AdmittedStudentSerializer._sync_programme_enrollment_batch(existing)
+        batch_changed = True
+
+    ext = _apply_import_extensions(
+        existing,
+        program=ctx.program,
+        program_batch=ctx.program_batch,
+        row=row,
+        admitted_by=ctx.admitted_by,
+        specialization=plan.get("specialization"),
+        require_academic_position=ctx.require_academic_position,
+    )
+    student_row = {
+        "id": existing.id,
+        "reg_no": existing.reg_no,
+        "student_id": existing.student_id,
+        "name": existing.full_name,
+        **ext,
+    }
+    if ext.get("extensions_applied"):
+        _tally_extension_counters({**ext, "reg_no": existing.reg_no}, counters)
+        if batch_changed:
+            student_row["note"] = "Already in system — batch and import columns updated."
+        student_row["status"] = "updated"
+    else:
+        student_row["note"] = (
+            "Already in system — batch updated if needed."
+            if batch_changed
+            else "Already in system — no optional columns to apply."
+        )
+        student_row["status"] = "skipped"
+    return student_row
+
+
+def _registers_with_schoolpay(plan: dict, ctx: StudentImportContext) -> bool:
+    """New rows without a legacy payment code get one from the SchoolPay API."""
+    return plan["action"] == "create" and ctx.register_schoolpay and not plan["row"].get("student_id", "").strip()
+
+
+def _apply_new_row(plan: dict, ctx: StudentImportContext, counters: dict, applicant_ids: dict) -> dict:
+    row = plan["row"]
+    cleaned = plan["cleaned"]
+    admitted = _import_one_row(
+        row=row,
+        program=ctx.program,
+        program_batch=ctx.program_batch,
+        admission_batch=ctx.admission_batch,
+        campus=ctx.campus,
+        academic_level=ctx.academic_level,
+        admitted_by=ctx.admitted_by,
+        register_schoolpay=ctx.register_schoolpay,
+        require_academic_position=ctx.require_academic_position,
+        cleaned=cleaned,
+        applicant_user_id=applicant_ids.get(cleaned["email"]),
+    )
+    return _new_row_outcome(plan, admitted, counters, applicant_ids)
+
+
+def _apply_schoolpay_row(plan: dict, ctx: StudentImportContext, counters: dict, applicant_ids: dict) -> dict:
+    """
+    New row registered with SchoolPay over HTTP. The local rows commit before
+    the call and the rest of the row runs after it, so a failure elsewhere can
+    never roll back a student whose SchoolPay wallet already exists.
+    """
+    row = plan["row"]
+    cleaned = plan["cleaned"]
+    with transaction.atomic():
+        admitted = _create_imported_student(
+            row=row,
+            program=ctx.program,
+            program_batch=ctx.program_batch,
+            admission_batch=ctx.admission_batch,
+            campus=ctx.campus,
+            academic_level=ctx.academic_level,
+            admitted_by=ctx.admitted_by,
+            cleaned=cleaned,
+            applicant_user_id=applicant_ids.get(cleaned["email"]),
+        )
+    try:
+        paycode = _ensure_schoolpay_protection(admitted, row, register_schoolpay=True)
+    except Exception:
+        # No wallet was linked: drop the student again, as a rolled-back row
+        # would be, including the applicant account this row created.
+        applicant_id = admitted.application.applicant_id
+        with transaction.atomic():
+            Application.objects.filter(pk=admitted.application_id).delete()
+            if admitted._import_applicant_created:  # noqa: SLF001
+                User.objects.filter(pk=applicant_id, is_applicant=True).delete()
+        raise
+    try:
+        with transaction.atomic():
+            _finish_imported_student(
+                admitted,
+                paycode,
+                row=row,
+                program=ctx.program,
+                program_batch=ctx.program_batch,
+                admitted_by=ctx.admitted_by,
+                specialization=admitted._import_specialization,  # noqa: SLF001
+                require_academic_position=ctx.require_academic_position,
+            )
+    except Exception as exc:
+        raise ValueError(
+            f"Student {admitted.reg_no} was created and registered with SchoolPay ({paycode}), "
+            f"but the import could not finish: {_row_error_message(exc)}"
+        ) from exc
+    return _new_row_outcome(plan, admitted, counters, applicant_ids)
+
+
+def _new_row_outcome(plan: dict, admitted: AdmittedStudent, counters: dict, applicant_ids: dict) -> dict:
+    # Later rows with the same email reuse the applicant account created here.
+    applicant_ids[plan["cleaned"]["email"]] = admitted.application.applicant_id
+    paycode = getattr(admitted, "_import_paycode", None) or admitted.student_id
+    ext = getattr(admitted, "_import_extensions", {}) or {}
+    _tally_extension_counters({**ext, "reg_no": admitted.reg_no}, counters)
+    return {
+        "id": admitted.id,
+        "reg_no": admitted.reg_no,
+        "student_id": paycode,
+        "schoolpay_registered": bool(admitted.is_registered_with_schoolpay),
+        "name": plan["name"],
+        "status": "created",
+        **ext,
+    }
+
+
+def _run_plan(plan: dict, counts: dict, apply: Callable[..., dict], *args, savepoint: bool = True) -> None:
+    """Apply one plan and record its outcome (or failure) on the plan and in ``counts``."""
+    try:
+        if savepoint:
+            with transaction.atomic():
+                outcome = apply(plan, *args)
+        else:
+            outcome = apply(plan, *args)
+    except (ValueError, DRFValidationError) as exc:
+        plan["status"] = "failed"
+        plan["message"] = _row_error_message(exc)
+        counts["failed"] += 1
+        return
+    except Exception as exc:
+        logger.exception("Bulk import row %s failed", plan["row_num"])
+        plan["status"] = "failed"
+        plan["message"] = str(exc)
+        counts["failed"] += 1
+        return
+    plan["status"] = outcome["status"]
+    plan["message"] = outcome.get("note", "")
+    plan["student"] = outcome
+    plan["student_id"] = outcome.get("student_id") or ""
+    counts[outcome["status"]] += 1
+
+
+def _run_local_plans(
+    plans: list[dict],
+    existing: dict[int, AdmittedStudent],
+    ctx: StudentImportContext,
+    counts: dict,
+    counters: dict,
+    applicant_ids: dict,
+) -> None:
+    """Rows that only write locally, in one transaction."""
+    if not plans:
+        return
+    with transaction.atomic():
+        for plan in plans:
+            if plan["action"] == "update":
+                _run_plan(plan, counts, _apply_existing_row, existing[plan["existing_id"]], ctx, counters)
+            else:
+                _run_plan(plan, counts, _apply_new_row, ctx, counters, applicant_ids)
+
+
+def run_student_import_plans(
+    plans: list[dict],
+    ctx: StudentImportContext,
+    *,
+    chunk_size: int = STUDENT_IMPORT_CHUNK_SIZE,
+    on_chunk: Callable[[int, dict], None] | None = None,
+) -> dict:
+    """
+    Write the rows that passed preflight in file order, ``chunk_size`` rows
+    per transaction (each row in its own savepoint so one bad row does not
+    undo its chunk). A row registered with SchoolPay commits the rows before
+    it and runs in its own transactions around the HTTP call (see
+    ``_apply_schoolpay_row``); the chunk's remaining rows continue in a new
+    transaction. ``on_chunk(processed, counts)`` is called after every chunk.
+    """
     counters = {
         "enrollment_set_rows": 0,
         "fees_imported_rows": 0,
@@ -842,138 +1260,219 @@ def process_student_batch_import(
         "enrollment_pending_rows": 0,
         "warnings": [],
     }
+    counts = {"created": 0, "updated": 0, "skipped": 0, "failed": 0}
+    applicant_ids = {
+        p["cleaned"]["email"]: p["applicant_user_id"]
+        for p in plans
+        if p["action"] == "create" and p.get("applicant_user_id")
+    }
 
-    for row in rows:
-        row_num = row.get("__row__", "?")
-        reg_no = row.get("reg_no", "").strip()
-        try:
-            if skip_existing_reg_no and reg_no:
-                existing = (
-                    AdmittedStudent.objects.filter(reg_no=reg_no)
-                    .select_related("application", "programme_enrollment")
-                    .first()
-                )
-                if existing is not None:
-                    batch_changed = False
-                    if existing.intended_program_batch_id != program_batch.id:
-                        existing.intended_program_batch = program_batch
-                        existing.save(
-                            update_fields=["intended_program_batch", "updated_at"]
-                        )
-                        AdmittedStudentSerializer._sync_programme_enrollment_batch(existing)
-                        batch_changed = True
-
-                    spec_raw = row.get("specialization", "").strip()
-                    specialization = None
-                    if spec_raw:
-                        matched, spec_err = resolve_specialization_for_program(
-                            program, spec_raw
-                        )
-                        if spec_err:
-                            raise ValueError(spec_err)
-                        specialization = matched
-
-                    with transaction.atomic():
-                        ext = _apply_import_extensions(
-                            existing,
-                            program=program,
-                            program_batch=program_batch,
-                            row=row,
-                            admitted_by=admitted_by,
-                            specialization=specialization,
-                            require_academic_position=require_academic_position,
-                        )
-
-                    student_row = {
-                        "id": existing.id,
-                        "reg_no": existing.reg_no,
-                        "student_id": existing.student_id,
-                        "name": existing.full_name,
-                        **ext,
-                    }
-                    if ext.get("extensions_applied"):
-                        updated += 1
-                        ext_for_tally = {**ext, "reg_no": existing.reg_no}
-                        _tally_extension_counters(ext_for_tally, counters)
-                        if batch_changed:
-                            student_row["note"] = (
-                                "Already in system — batch and import columns updated."
-                            )
-                        updated_students.append(student_row)
-                    else:
-                        skipped += 1
-                        student_row["note"] = (
-                            "Already in system — batch updated if needed."
-                            if batch_changed
-                            else "Already in system — no optional columns to apply."
-                        )
-                        skipped_students.append(student_row)
-                    continue
+    for plan in plans:
+        if plan["action"] == "fail":
+            counts["failed"] += 1
+            plan["status"] = "failed"
+            plan["message"] = plan["error"]
+
+    todo = [p for p in plans if p["action"] != "fail"]
+    processed = len(plans) - len(todo)
+    for start in range(0, len(todo), max(1, chunk_size)):
+        chunk = todo[start : start + chunk_size]
+        existing = AdmittedStudent.objects.select_related(
+            "application", "programme_enrollment"
+        ).in_bulk([p["existing_id"] for p in chunk if p["action"] == "update"])
+        local: list[dict] = []
+        for plan in chunk:
+            if not _registers_with_schoolpay(plan, ctx):
+                local.append(plan)
+                continue
+            _run_local_plans(local, existing, ctx, counts, counters, applicant_ids)
+            local = []
+            _run_plan(plan, counts, _apply_schoolpay_row, ctx, counters, applicant_ids, savepoint=False)
+        _run_local_plans(local, existing, ctx, counts, counters, applicant_ids)
+        processed += len(chunk)
+        if on_chunk is not None:
+            on_chunk(processed, counts)
+
+    return {"counts": counts, "counters": counters}
 
-            with transaction.atomic():
-                admitted = _import_one_row(
-                    row=row,
-                    program=program,
-                    program_batch=program_batch,
-                    admission_batch=admission_batch,
-                    campus=campus,
-                    academic_level=academic_level,
-                    admitted_by=admitted_by,
-                    register_schoolpay=register_schoolpay,
-                    require_academic_position=require_academic_position,
-                )
-            created += 1
-            paycode = getattr(admitted, "_import_paycode", None) or admitted.student_id
-            ext = getattr(admitted, "_import_extensions", {}) or {}
-            _tally_extension_counters({**ext, "reg_no": admitted.reg_no}, counters)
-            created_students.append(
-                {
-                    "id": admitted.id,
-                    "reg_no": admitted.reg_no,
-                    "student_id": paycode,
-                    "schoolpay_registered": bool(admitted.is_registered_with_schoolpay),
-                    "name": f"{row.get('first_name', '')} {row.get('last_name', '')}".strip(),
-                    **ext,
-                }
-            )
-        except (ValueError, DRFValidationError) as exc:
-            failed += 1
-            if isinstance(exc, DRFValidationError):
-                detail = exc.detail
-                msg = str(detail) if not isinstance(detail, dict) else "; ".join(
-                    f"{k}: {v}" for k, v in detail.items()
-                )
-            else:
-                msg = str(exc)
-            errors.append(f"Row {row_num}: {msg}")
-        except Exception as exc:
-            failed += 1
-            logger.exception("Bulk import row %s failed", row_num)
-            errors.append(f"Row {row_num}: {exc}")
+
+def _import_summary(ctx: StudentImportContext, plans: list[dict], outcome: dict) -> dict:
+    counts, counters = outcome["counts"], outcome["counters"]
+
+    def _students(status):
+        rows = []
+        for p in plans:
+            if p.get("status") == status and p.get("student"):
+                student = {k: v for k, v in p["student"].items() if k != "status"}
+                rows.append(student)
+        return rows[:50]
 
     return {
-        "program_batch_id": program_batch.id,
-        "program_batch_name": program_batch.name,
-        "program_name": program.name,
-        "admission_batch_id": admission_batch.id,
-        "admission_batch_name": admission_batch.name,
-        "created": created,
-        "updated": updated,
-        "skipped": skipped,
-        "failed": failed,
+        "program_batch_id": ctx.program_batch.id,
+        "program_batch_name": ctx.program_batch.name,
+        "program_name": ctx.program.name,
+        "admission_batch_id": ctx.admission_batch.id,
+        "admission_batch_name": ctx.admission_batch.name,
+        "created": counts["created"],
+        "updated": counts["updated"],
+        "skipped": counts["skipped"],
+        "failed": counts["failed"],
+        "preflight_failed": sum(1 for p in plans if p["action"] == "fail"),
         "enrollment_set_rows": counters["enrollment_set_rows"],
         "fees_imported_rows": counters["fees_imported_rows"],
         "enrollment_activated_rows": counters["enrollment_activated_rows"],
         "enrollment_pending_rows": counters["enrollment_pending_rows"],
         "warnings": counters["warnings"][:20],
-        "require_academic_position": require_academic_position,
-        "errors": errors[:100],
-        "created_students": created_students[:50],
-        "updated_students": updated_students[:50],
-        "skipped_students": skipped_students[:50],
+        "require_academic_position": ctx.require_academic_position,
+        "errors": [
+            f"Row {p['row_num']}: {p['message']}" for p in plans if p.get("status") == "failed"
+        ][:100],
+        "created_students": _students("created"),
+        "updated_students": _students("updated"),
+        "skipped_students": _students("skipped"),
     }
 
 
+def process_student_batch_import(
+    *,
+    uploaded_file,
+    program_batch_id: int,
+    campus_id: int,
+    admitted_by,
+    admission_batch_id: int | None = None,
+    register_schoolpay: bool = True,
+    skip_existing_reg_no: bool = False,
+    require_academic_position: bool = False,
+) -> dict:
+    """Synchronous import (small files); large files go through ``StudentImportJob``."""
+    ctx = resolve_student_import_context(
+        program_batch_id=program_batch_id,
+        campus_id=campus_id,
+        admitted_by=admitted_by,
+        admission_batch_id=admission_batch_id,
+        register_schoolpay=register_schoolpay,
+        skip_existing_reg_no=skip_existing_reg_no,
+        require_academic_position=require_academic_position,
+    )
+    headers, rows = _parse_upload_file(uploaded_file)
+    _check_import_headers(headers, rows, require_academic_position=require_academic_position)
+    plans = preflight_student_rows(rows, ctx)
+    return _import_summary(ctx, plans, run_student_import_plans(plans, ctx))
+
+
+def count_upload_rows(uploaded_file) -> int:
+    """Data rows in an upload (file position is restored for the real read)."""
+    try:
+        _headers, rows = _parse_upload_file(uploaded_file)
+    finally:
+        uploaded_file.seek(0)
+    return len(rows)
+
+
+REPORT_HEADERS = ("row", "reg_no", "name", "status", "student_id", "message")
+
+
+def build_student_import_report_csv(plans: list[dict]) -> str:
+    """Per-row result of an import (or of its preflight when nothing was written)."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(REPORT_HEADERS)
+    for p in plans:
+        status = p.get("status") or ("invalid" if p["action"] == "fail" else "valid")
+        writer.writerow(
+            [
+                p["row_num"],
+                p["reg_no"],
+                p["name"],
+                status,
+                p.get("student_id", ""),
+                p.get("message") or p.get("error") or "",
+            ]
+        )
+    return buf.getvalue()
+
+
+def start_student_import_job(
+    *,
+    uploaded_file,
+    params: dict,
+    user,
+    validate_only: bool = False,
+) -> StudentImportJob:
+    """Store the upload and run the import on a worker after commit."""
+    # Same lookups as the worker: bad cohort / campus / intake fails the request.
+    resolve_student_import_context(admitted_by=user, **params)
+    job = StudentImportJob(
+        params=params,
+        validate_only=validate_only,
+        created_by=user if getattr(user, "is_authenticated", False) else None,
+    )
+    job.upload.save(getattr(uploaded_file, "name", "") or "students.csv", uploaded_file, save=False)
+    job.save()
+
+    def _enqueue():
+        from admissions.tasks import celery_run_student_import
+
+        celery_run_student_import.delay(job.pk)
+
+    transaction.on_commit(_enqueue)
+    return job
+
+
+def run_student_import_job(job_id: int) -> dict:
+    """Preflight then (unless ``validate_only``) import one stored upload (worker side)."""
+    job = StudentImportJob.objects.select_related("created_by").get(pk=job_id)
+    jobs = StudentImportJob.objects.filter(pk=job.pk)
+    jobs.update(status=StudentImportJob.STATUS_VALIDATING, started_at=timezone.now(), error="")
+    try:
+        ctx = resolve_student_import_context(admitted_by=job.created_by, **(job.params or {}))
+        with job.upload.open("rb") as fh:
+            headers, rows = _parse_upload_file(fh)
+        _check_import_headers(headers, rows, require_academic_position=ctx.require_academic_position)
+        plans = preflight_student_rows(rows, ctx)
+        invalid = sum(1 for p in plans if p["action"] == "fail")
+        jobs.update(total_rows=len(plans), failed_count=invalid)
+
+        if job.validate_only:
+            result = {"total_rows": len(plans), "valid_rows": len(plans) - invalid, "invalid_rows": invalid}
+        else:
+            jobs.update(status=StudentImportJob.STATUS_RUNNING)
+
+            def _progress(processed, counts):
+                jobs.update(
+                    processed_rows=processed,
+                    created_count=counts["created"],
+                    updated_count=counts["updated"],
+                    skipped_count=counts["skipped"],
+                    failed_count=counts["failed"],
+                )
+
+            result = _import_summary(ctx, plans, run_student_import_plans(plans, ctx, on_chunk=_progress))
+        job.report.save(
+            f"student_import_{job.pk}_report.csv",
+            ContentFile(build_student_import_report_csv(plans).encode("utf-8")),
+            save=False,
+        )
+    except Exception as exc:
+        if not isinstance(exc, ValueError):
+            logger.exception("student import job %s failed", job.pk)
+        jobs.update(
+            status=StudentImportJob.STATUS_FAILED,
+            error=str(exc)[:2000],
+            finished_at=timezone.now(),
+        )
+        return {"job_id": job.pk, "status": StudentImportJob.STATUS_FAILED}
+
+    jobs.update(
+        status=StudentImportJob.STATUS_DONE,
+        processed_rows=len(plans),
+        result=result,
+        report=job.report.name,
+        finished_at=timezone.now(),
+    )
+    return {"job_id": job.pk, "status": StudentImportJob.STATUS_DONE}
+
+
 def build_student_import_template_csv() -> str:
     buf = io.StringIO()
     writer = csv.writer(buf)
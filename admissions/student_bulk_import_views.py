@@ -1,16 +1,22 @@
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
+from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from accounts.super_admin import user_is_super_admin
+from admissions.models import StudentImportJob
 from admissions.permissions import user_can_admit_applicant
 from admissions.student_bulk_import import (
     build_student_import_template_csv,
+    count_upload_rows,
     process_student_batch_import,
+    start_student_import_job,
     STUDENT_IMPORT_OPTIONAL_HEADERS,
     STUDENT_IMPORT_REQUIRED_HEADERS,
+    STUDENT_IMPORT_SYNC_MAX_ROWS,
 )
 
 
@@ -44,6 +50,12 @@ class StudentBulkImportView(APIView):
     Pass require_academic_position=true to require year/term on every row and run
     curriculum + semester-fee preflight (used by Horizon continuing import).
 
+    Every row is validated (preflight) before anything is written. Files with more
+    than ``STUDENT_IMPORT_SYNC_MAX_ROWS`` rows, or background=true / validate_only=true,
+    are queued as a ``StudentImportJob`` and answered with 202 + job_id; poll
+    GET /api/admissions/students/bulk_import/jobs/<job_id> and download the per-row
+    report from .../report.
+
     Legacy-only fee import remains available at
     POST /api/admissions/students/fee_balance_import.
     """
@@ -95,7 +107,31 @@ class StudentBulkImportView(APIView):
         ).lower()
         require_academic_position = raw_position in ("1", "true", "yes", "on")
 
+        raw_validate = str(request.data.get("validate_only", "false")).lower()
+        validate_only = raw_validate in ("1", "true", "yes", "on")
+
+        raw_background = str(request.data.get("background", "false")).lower()
+        background = raw_background in ("1", "true", "yes", "on")
+
         try:
+            if not (background or validate_only):
+                background = count_upload_rows(uploaded) > STUDENT_IMPORT_SYNC_MAX_ROWS
+            if background or validate_only:
+                job = start_student_import_job(
+                    uploaded_file=uploaded,
+                    params={
+                        "program_batch_id": program_batch_id,
+                        "admission_batch_id": admission_batch_id,
+                        "campus_id": campus_id,
+                        "register_schoolpay": register_schoolpay,
+                        "skip_existing_reg_no": skip_existing_reg_no,
+                        "require_academic_position": require_academic_position,
+                    },
+                    user=request.user,
+                    validate_only=validate_only,
+                )
+                return Response(_job_payload(job), status=status.HTTP_202_ACCEPTED)
+
             result = process_student_batch_import(
                 uploaded_file=uploaded,
                 program_batch_id=program_batch_id,
@@ -117,3 +153,66 @@ class StudentBulkImportView(APIView):
             },
             status=status.HTTP_200_OK if result["failed"] == 0 else status.HTTP_207_MULTI_STATUS,
         )
+
+
+def _job_payload(job: StudentImportJob) -> dict:
+    return {
+        "job_id": job.pk,
+        "status": job.status,
+        "validate_only": job.validate_only,
+        "total_rows": job.total_rows,
+        "processed_rows": job.processed_rows,
+        "created": job.created_count,
+        "updated": job.updated_count,
+        "skipped": job.skipped_count,
+        "failed": job.failed_count,
+        "result": job.result or {},
+        "error": job.error,
+        "report_ready": bool(job.report),
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def _job_for_request(request, job_id: int) -> StudentImportJob | None:
+    job = get_object_or_404(StudentImportJob, pk=job_id)
+    if not user_can_admit_applicant(request.user):
+        return None
+    if job.created_by_id != request.user.id and not user_is_super_admin(request.user):
+        return None
+    return job
+
+
+class StudentBulkImportJobView(APIView):
+    """GET /api/admissions/students/bulk_import/jobs/<job_id> — progress of a queued import."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = _job_for_request(request, job_id)
+        if job is None:
+            return Response({"detail": "Import job not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(_job_payload(job))
+
+
+class StudentBulkImportReportView(APIView):
+    """GET /api/admissions/students/bulk_import/jobs/<job_id>/report — per-row result CSV."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = _job_for_request(request, job_id)
+        if job is None:
+            return Response({"detail": "Import job not found."}, status=status.HTTP_404_NOT_FOUND)
+        if not job.report:
+            return Response(
+                {"detail": "Report is not ready yet.", "status": job.status},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return FileResponse(
+            job.report.open("rb"),
+            as_attachment=True,
+            filename=f"student_import_{job.pk}_report.csv",
+            content_type="text/csv",
+        )
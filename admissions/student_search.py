@@ -0,0 +1,245 @@
+"""
+Student search index (``StudentSearchDocument``).
+
+One denormalized, lower-cased text document per admitted student (names,
+reg_no / payment codes, phone, email, programme, faculty) replaces the wide
+OR of ``icontains`` across joined tables in the student directories.
+
+* Postgres: every search token must appear in the document (``ILIKE``, served by
+  the pg_trgm GIN index) or the tokens must prefix-match words of the document
+  (``to_tsvector('simple', …)`` GIN index). Results are ranked by trigram word
+  similarity plus an exact / prefix identifier boost.
+* SQLite (dev): the same token filter with ``LIKE``; ranked by the identifier
+  boost only.
+
+Documents are refreshed after commit by signals (student, application,
+programme and faculty edits) and rebuilt nightly / on demand with
+``rebuild_student_search_index``.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from typing import Iterable
+
+from django.db import connection, transaction
+from django.db.models import BooleanField, Case, F, FloatField, Func, Q, Value, When
+
+from .models import AdmittedStudent, StudentSearchDocument
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_CHUNK_SIZE = 1000
+SEARCH_MAX_TOKENS = 6
+SEARCH_API_MAX_RESULTS = 50
+
+_DOCUMENT_FIELDS = (
+    "id",
+    "reg_no",
+    "student_id",
+    "schoolpay_code",
+    "application__first_name",
+    "application__middle_name",
+    "application__last_name",
+    "application__phone",
+    "application__email",
+    "admitted_program__name",
+    "admitted_program__faculty__name",
+)
+_UPDATE_FIELDS = [
+    "full_name",
+    "reg_no",
+    "payment_code",
+    "program_name",
+    "faculty_name",
+    "document",
+    "updated_at",
+]
+
+
+def _clean(value) -> str:
+    return " ".join(str(value or "").split())
+
+
+def _document_from_row(row: dict) -> StudentSearchDocument:
+    first = _clean(row["application__first_name"])
+    middle = _clean(row["application__middle_name"])
+    last = _clean(row["application__last_name"])
+    full_name = " ".join(p for p in (first, middle, last) if p)
+    phone = _clean(row["application__phone"])
+    phone_digits = re.sub(r"\D", "", phone)
+    parts = [
+        full_name,
+        # "last first" so reversed-order queries still match as a phrase
+        f"{last} {first}" if middle else "",
+        row["reg_no"],
+        row["student_id"],
+        row["schoolpay_code"] if row["schoolpay_code"] != row["student_id"] else "",
+        phone,
+        phone_digits if phone_digits != phone else "",
+        row["application__email"],
+        row["admitted_program__name"],
+        row["admitted_program__faculty__name"],
+    ]
+    return StudentSearchDocument(
+        student_id=row["id"],
+        full_name=full_name[:255],
+        reg_no=_clean(row["reg_no"])[:100],
+        payment_code=_clean(row["student_id"] or row["schoolpay_code"])[:255],
+        program_name=_clean(row["admitted_program__name"])[:200],
+        faculty_name=_clean(row["admitted_program__faculty__name"])[:200],
+        document=" ".join(_clean(p) for p in parts if p).lower(),
+    )
+
+
+def _upsert(docs: list[StudentSearchDocument]) -> None:
+    StudentSearchDocument.objects.bulk_create(
+        docs,
+        update_conflicts=True,
+        unique_fields=["student"],
+        update_fields=_UPDATE_FIELDS,
+        batch_size=SEARCH_INDEX_CHUNK_SIZE,
+    )
+
+
+def refresh_student_search_documents(student_ids: Iterable[int] | None = None) -> int:
+    """(Re)build documents for these students, or for everyone when ``student_ids`` is None."""
+    qs = AdmittedStudent.objects.order_by("id")
+    if student_ids is not None:
+        ids = sorted({int(i) for i in student_ids if i})
+        if not ids:
+            return 0
+        qs = qs.filter(pk__in=ids)
+    written = 0
+    chunk: list[StudentSearchDocument] = []
+    for row in qs.values(*_DOCUMENT_FIELDS).iterator(chunk_size=SEARCH_INDEX_CHUNK_SIZE):
+        chunk.append(_document_from_row(row))
+        if len(chunk) >= SEARCH_INDEX_CHUNK_SIZE:
+            _upsert(chunk)
+            written += len(chunk)
+            chunk = []
+    if chunk:
+        _upsert(chunk)
+        written += len(chunk)
+    return written
+
+
+def rebuild_student_search_index() -> int:
+    return refresh_student_search_documents(None)
+
+
+def ensure_student_search_index() -> None:
+    """First use on an existing database: index everyone once."""
+    if not StudentSearchDocument.objects.exists() and AdmittedStudent.objects.exists():
+        rebuild_student_search_index()
+
+
+def queue_student_search_refresh(student_ids: Iterable[int]) -> None:
+    """Refresh after commit: inline for a few students, on a worker for many."""
+    ids = sorted({int(i) for i in student_ids if i})
+    if not ids:
+        return
+
+    def _run():
+        try:
+            if len(ids) <= 50:
+                refresh_student_search_documents(ids)
+                return
+            from admissions.tasks import celery_refresh_student_search_documents
+
+            celery_refresh_student_search_documents.delay(ids)
+        except Exception:
+            logger.exception("student search refresh failed for %s students", len(ids))
+
+    transaction.on_commit(_run)
+
+
+def search_tokens(search: str) -> list[str]:
+    return [t for t in (search or "").lower().split() if t][:SEARCH_MAX_TOKENS]
+
+
+class _TsPrefixMatch(Func):
+    """``to_tsvector('simple', document) @@ to_tsquery('simple', 'a:* & b:*')`` (matches the GIN index)."""
+
+    template = "to_tsvector('simple', %(expressions)s)"
+    arg_joiner = ") @@ to_tsquery('simple', "
+    output_field = BooleanField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql, params = super().as_sql(compiler, connection, **extra_context)
+        return f"{sql})", params
+
+    @staticmethod
+    def tsquery(tokens: list[str]) -> str:
+        words = [re.sub(r"[^\w]", "", t) for t in tokens]
+        return " & ".join(f"{w}:*" for w in words if w)
+
+
+def _identity_q(search: str) -> Q:
+    q = Q(student_id__iexact=search) | Q(reg_no__iexact=search) | Q(schoolpay_code__iexact=search)
+    if len(search) >= 2:
+        q |= (
+            Q(student_id__istartswith=search)
+            | Q(reg_no__istartswith=search)
+            | Q(schoolpay_code__istartswith=search)
+        )
+    return q
+
+
+def apply_student_search(queryset, search: str):
+    """
+    Filter an ``AdmittedStudent`` queryset by ``search`` via the search index and
+    annotate ``search_rank`` (higher is better). Exact / prefix identifier
+    matches work even for students not indexed yet.
+    """
+    search = (search or "").strip()
+    tokens = search_tokens(search)
+    if not tokens:
+        return queryset
+    ensure_student_search_index()
+
+    doc = "search_document__document"
+    # Documents and tokens are lower-case: plain LIKE keeps the pg_trgm index usable.
+    token_q = Q()
+    for token in tokens:
+        token_q &= Q(**{f"{doc}__contains": token})
+    identity = _identity_q(search)
+    boost = Case(
+        When(Q(student_id__iexact=search) | Q(reg_no__iexact=search) | Q(schoolpay_code__iexact=search), then=Value(3.0)),
+        When(identity, then=Value(2.0)),
+        When(Q(**{f"{doc}__startswith": tokens[0]}), then=Value(1.0)),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        tsquery = _TsPrefixMatch.tsquery(tokens)
+        match = identity | token_q
+        if tsquery:
+            queryset = queryset.alias(_ts_match=_TsPrefixMatch(F(doc), Value(tsquery)))
+            match |= Q(_ts_match=True)
+        return queryset.filter(match).annotate(
+            search_rank=boost + TrigramWordSimilarity(Value(search.lower()), doc)
+        )
+    return queryset.filter(identity | token_q).annotate(search_rank=boost)
+
+
+def search_students(queryset, search: str, *, limit: int = 20) -> list[dict]:
+    """Ranked matches for search-as-you-type, read from the index columns only."""
+    limit = max(1, min(int(limit or 20), SEARCH_API_MAX_RESULTS))
+    rows = (
+        apply_student_search(queryset, search)
+        .order_by("-search_rank", "search_document__full_name", "id")
+        .values(
+            "id",
+            "search_rank",
+            "reg_no",
+            "student_id",
+            full_name=F("search_document__full_name"),
+            program=F("search_document__program_name"),
+            faculty=F("search_document__faculty_name"),
+        )[:limit]
+    )
+    return [{**row, "search_rank": round(float(row["search_rank"] or 0), 3)} for row in rows]
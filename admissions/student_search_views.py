@@ -0,0 +1,36 @@
+"""Search-as-you-type over admitted students (``StudentSearchDocument`` index)."""
+from __future__ import annotations
+
+from rest_framework import status
+from rest_framework.permissions import DjangoModelPermissions, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .faculty_scope import filter_admitted_students_for_user
+from .models import AdmittedStudent
+from .student_search import search_students
+
+MIN_QUERY_LENGTH = 2
+
+
+class StudentSearchView(APIView):
+    """GET /api/admissions/students/search?q=<text>&limit=20 (best matches first)."""
+
+    permission_classes = [IsAuthenticated, DjangoModelPermissions]
+    queryset = AdmittedStudent.objects.all()
+
+    def get(self, request):
+        q = (request.query_params.get("q") or "").strip()
+        if len(q) < MIN_QUERY_LENGTH:
+            return Response(
+                {"error": f"q must be at least {MIN_QUERY_LENGTH} characters"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = int(request.query_params.get("limit") or 20)
+        except (TypeError, ValueError):
+            return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        base = filter_admitted_students_for_user(
+            AdmittedStudent.objects.filter(is_admitted=True), request.user
+        )
+        return Response({"query": q, "results": search_students(base, q, limit=limit)})
@@ -0,0 +1,31 @@
+"""Monitoring endpoint for application submission (latency percentiles / outbox backlog)."""
+from __future__ import annotations
+
+from django.utils.dateparse import parse_date
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.erp_drf_permissions import CanViewAdmissionsAnalytics
+
+from .submission_outbox import SUBMIT_ENDPOINT, submission_outbox_backlog
+from .utils.endpoint_latency import latency_summary
+
+
+class ApplicationSubmitMetricsView(APIView):
+    """GET /api/admissions/applications/submit_metrics?day=YYYY-MM-DD (defaults to today)."""
+
+    permission_classes = [IsAuthenticated, CanViewAdmissionsAnalytics]
+
+    def get(self, request):
+        raw = request.query_params.get("day")
+        day = parse_date(raw) if raw else None
+        if raw and day is None:
+            return Response({"detail": "day must be YYYY-MM-DD"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {
+                "latency": latency_summary(SUBMIT_ENDPOINT, day),
+                "outbox": submission_outbox_backlog(),
+            }
+        )
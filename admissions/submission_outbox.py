@@ -0,0 +1,238 @@
+"""
+Outbox for application submission side effects.
+
+``create_applications`` only validates and persists the application. The
+confirmation email, portal notification, assisted-submit audit entry, draft
+cleanup and reporting-counter refresh are written as
+``ApplicationSubmissionEvent`` rows in the same transaction (one INSERT) and
+carried out by ``drain_submission_outbox`` on a worker: queued right after
+commit, and swept every minute by Celery beat for anything the broker missed.
+Failed events are retried up to ``OUTBOX_MAX_ATTEMPTS`` times.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from .models import ApplicationSubmissionEvent
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = 200
+OUTBOX_MAX_ATTEMPTS = 5
+# A worker that died mid-event leaves it "running"; reclaim it after this long.
+OUTBOX_STALE_CLAIM_SECONDS = 10 * 60
+SUBMIT_ENDPOINT = "applications.submit"
+
+Event = ApplicationSubmissionEvent
+
+
+def queue_submission_side_effects(application, *, applicant, staff_user=None, draft=None, request=None) -> None:
+    """Record the post-submit work for ``application`` (call inside the submit transaction)."""
+    events = [
+        Event(application=application, kind=Event.KIND_SUBMITTED_EMAIL),
+        Event(
+            application=application,
+            kind=Event.KIND_NOTIFICATION,
+            payload={
+                "user_id": applicant.pk,
+                "title": "Application Submitted",
+                "message": "Your application was successfully submitted",
+            },
+        ),
+        Event(application=application, kind=Event.KIND_REPORTING),
+    ]
+    if staff_user:
+        from audit.utils import get_client_ip
+
+        events.append(
+            Event(
+                application=application,
+                kind=Event.KIND_ASSIST_AUDIT,
+                payload={
+                    "staff_user_id": staff_user.pk,
+                    "applicant_id": applicant.pk,
+                    "description": f"Staff submitted application on behalf of {applicant.email}",
+                    "ip_address": get_client_ip(request) if request is not None else "",
+                    "user_agent": request.META.get("HTTP_USER_AGENT", "") if request is not None else "",
+                },
+            )
+        )
+    if draft is not None and draft.pk:
+        events.append(
+            Event(
+                application=application,
+                kind=Event.KIND_DRAFT_CLEANUP,
+                payload={
+                    "draft_id": draft.pk,
+                    # Keep the draft if the applicant edits it again before cleanup runs.
+                    "updated_at": draft.updated_at.isoformat() if draft.updated_at else None,
+                },
+            )
+        )
+    Event.objects.bulk_create(events)
+    event_ids = [e.pk for e in events if e.pk]
+
+    def _enqueue():
+        try:
+            from admissions.tasks import celery_drain_submission_outbox
+
+            celery_drain_submission_outbox.delay(event_ids or None)
+        except Exception:
+            # Rows stay pending; the beat sweep picks them up.
+            logger.warning("could not queue submission outbox drain for application %s", application.pk, exc_info=True)
+
+    transaction.on_commit(_enqueue)
+
+
+# ---------------------------------------------------------------- handlers
+
+
+def _send_submitted_email(event) -> None:
+    from .utils.email import send_application_email
+
+    send_application_email(event.application)
+
+
+def _create_notification(event) -> None:
+    from accounts.models import User
+
+    from .utils.notification import create_notification
+
+    payload = event.payload or {}
+    user = User.objects.get(pk=payload.get("user_id") or event.application.applicant_id)
+    create_notification(user, payload.get("title", ""), payload.get("message", ""))
+
+
+def _log_assisted_submit(event) -> None:
+    from accounts.models import User
+    from audit.utils import log_audit_event
+
+    payload = event.payload or {}
+    users = User.objects.in_bulk([payload.get("staff_user_id"), payload.get("applicant_id")])
+    # Replays the submit request's client address / agent into the audit row.
+    request = SimpleNamespace(
+        META={
+            "REMOTE_ADDR": payload.get("ip_address") or "127.0.0.1",
+            "HTTP_USER_AGENT": payload.get("user_agent") or "",
+        }
+    )
+    log_audit_event(
+        users.get(payload.get("staff_user_id")),
+        "assist_application_submit",
+        users.get(payload.get("applicant_id")),
+        payload.get("description", ""),
+        request,
+    )
+
+
+def _clean_up_draft(event) -> None:
+    from django.utils.dateparse import parse_datetime
+
+    from Drafts.models import DraftApplication
+
+    payload = event.payload or {}
+    drafts = DraftApplication.objects.filter(pk=payload.get("draft_id"))
+    updated_at = parse_datetime(payload["updated_at"]) if payload.get("updated_at") else None
+    if updated_at is not None:
+        drafts = drafts.filter(updated_at__lte=updated_at)
+    drafts.delete()
+
+
+def _refresh_reporting(event) -> None:
+    from .analytics_rollup import mark_admissions_rollup_dirty
+    from .dashboard_counters import invalidate_dashboard_counters
+
+    created_at = event.application.created_at
+    if created_at:
+        mark_admissions_rollup_dirty(timezone.localdate(created_at))
+    invalidate_dashboard_counters()
+
+
+HANDLERS = {
+    Event.KIND_SUBMITTED_EMAIL: _send_submitted_email,
+    Event.KIND_NOTIFICATION: _create_notification,
+    Event.KIND_ASSIST_AUDIT: _log_assisted_submit,
+    Event.KIND_DRAFT_CLEANUP: _clean_up_draft,
+    Event.KIND_REPORTING: _refresh_reporting,
+}
+
+
+# ---------------------------------------------------------------- draining
+
+
+def _claimable(now) -> Q:
+    return (
+        Q(status=Event.STATUS_PENDING)
+        | Q(status=Event.STATUS_FAILED, attempts__lt=OUTBOX_MAX_ATTEMPTS)
+        | Q(status=Event.STATUS_RUNNING, claimed_at__lt=now - timedelta(seconds=OUTBOX_STALE_CLAIM_SECONDS))
+    )
+
+
+def _claim(event_ids: Iterable[int] | None, limit: int) -> list[int]:
+    now = timezone.now()
+    with transaction.atomic():
+        qs = Event.objects.filter(_claimable(now))
+        if event_ids is not None:
+            qs = qs.filter(pk__in=list(event_ids))
+        ids = list(qs.order_by("id").select_for_update(skip_locked=True).values_list("id", flat=True)[:limit])
+        if ids:
+            Event.objects.filter(pk__in=ids).update(
+                status=Event.STATUS_RUNNING, claimed_at=now, attempts=F("attempts") + 1
+            )
+    return ids
+
+
+def drain_submission_outbox(event_ids: Iterable[int] | None = None, *, limit: int = OUTBOX_BATCH_SIZE) -> dict:
+    """Run claimable events (these ids only, or the oldest ``limit``); returns done / failed counts."""
+    ids = _claim(event_ids, limit)
+    done = failed = 0
+    for event in Event.objects.filter(pk__in=ids).select_related("application").order_by("id"):
+        events = Event.objects.filter(pk=event.pk)
+        handler = HANDLERS.get(event.kind)
+        try:
+            if handler is None:
+                raise ValueError(f"unknown outbox event kind {event.kind!r}")
+            with transaction.atomic():
+                handler(event)
+        except Exception as exc:
+            failed += 1
+            logger.warning(
+                "submission outbox event %s (%s) failed on attempt %s",
+                event.pk,
+                event.kind,
+                event.attempts,
+                exc_info=True,
+            )
+            events.update(status=Event.STATUS_FAILED, last_error=str(exc)[:2000])
+            continue
+        done += 1
+        events.update(status=Event.STATUS_DONE, last_error="", processed_at=timezone.now())
+    return {"claimed": len(ids), "done": done, "failed": failed}
+
+
+def submission_outbox_backlog() -> dict:
+    """Pending / failed event counts and the age of the oldest unprocessed event."""
+    stats = Event.objects.exclude(status=Event.STATUS_DONE).aggregate(
+        pending=Count("id", filter=Q(status=Event.STATUS_PENDING)),
+        running=Count("id", filter=Q(status=Event.STATUS_RUNNING)),
+        retrying=Count("id", filter=Q(status=Event.STATUS_FAILED, attempts__lt=OUTBOX_MAX_ATTEMPTS)),
+        dead=Count("id", filter=Q(status=Event.STATUS_FAILED, attempts__gte=OUTBOX_MAX_ATTEMPTS)),
+        oldest=Min("created_at", filter=~Q(status=Event.STATUS_FAILED, attempts__gte=OUTBOX_MAX_ATTEMPTS)),
+    )
+    oldest = stats.pop("oldest")
+    stats["oldest_pending_seconds"] = int((timezone.now() - oldest).total_seconds()) if oldest else 0
+    return stats
+
+
+def purge_processed_submission_events(days: int = 30) -> int:
+    deleted, _ = Event.objects.filter(
+        status=Event.STATUS_DONE, processed_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()
+    return deleted
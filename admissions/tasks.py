@@ -197,3 +197,57 @@ def celery_send_accounts_registration_cleared_email(self, student_id):
             "Accounts clearance email task failed for student %s", student_id
         )
         raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=0)
+def celery_run_student_import(self, job_id):
+    """Preflight and import a stored continuing-student upload."""
+    from admissions.student_bulk_import import run_student_import_job
+
+    return run_student_import_job(job_id)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def celery_refresh_admissions_rollup(self, day):
+    """Regroup one application day of the admissions analytics rollup."""
+    from datetime import date
+
+    from admissions.analytics_rollup import refresh_admissions_rollup_day
+
+    try:
+        return refresh_admissions_rollup_day(date.fromisoformat(day))
+    except Exception as exc:
+        logger.exception("admissions rollup refresh failed for %s", day)
+        raise self.retry(exc=exc)
+
+
+@shared_task
+def celery_rebuild_admissions_rollup():
+    """Full rebuild (catches queryset updates that bypass signals)."""
+    from admissions.analytics_rollup import rebuild_admissions_rollup
+
+    return rebuild_admissions_rollup()
+
+
+@shared_task
+def celery_refresh_student_search_documents(student_ids=None):
+    """Rebuild search documents for these students (all when ``student_ids`` is None)."""
+    from admissions.student_search import refresh_student_search_documents
+
+    return refresh_student_search_documents(student_ids)
+
+
+@shared_task(bind=True, max_retries=0)
+def celery_drain_submission_outbox(self, event_ids=None):
+    """Run application-submission side effects (these events, or the oldest pending batch)."""
+    from admissions.submission_outbox import drain_submission_outbox
+
+    return drain_submission_outbox(event_ids)
+
+
+@shared_task
+def celery_purge_submission_outbox(days=30):
+    """Delete processed submission outbox rows older than ``days``."""
+    from admissions.submission_outbox import purge_processed_submission_events
+
+    return purge_processed_submission_events(days)
@@ -0,0 +1,134 @@
+"""Dashboard figures assembled from admissions rollup rows."""
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from admissions import analytics_rollup
+from admissions.models import AcademicLevel, AdmissionsDailyRollup, Application, Batch, Campus
+
+User = get_user_model()
+
+
+def _chain(result):
+    qs = mock.MagicMock()
+    for name in ("exclude", "filter", "annotate", "values", "order_by"):
+        getattr(qs, name).return_value = qs
+    qs.values_list.return_value = result
+    qs.__iter__.side_effect = lambda: iter(result)
+    return qs
+
+
+def _app_row(status, source="portal", gender="female", local=True, n=1, campus=1):
+    return {
+        "kind": "application",
+        "month": date(2026, 3, 1),
+        "batch_id": 5,
+        "campus_id": campus,
+        "academic_level_id": 2,
+        "status": status,
+        "source": source,
+        "gender_key": gender,
+        "is_local": local,
+        "n_applications": n,
+        "n_admitted": 0,
+        "n_registered": 0,
+    }
+
+
+class AdmissionsRollupSummaryTests(SimpleTestCase):
+    def test_summary_merges_rollup_rows(self):
+        rows = [
+            _app_row("submitted", n=3),
+            _app_row("accepted", source="direct", gender="male", local=False, n=2, campus=2),
+            _app_row("accepted", n=1),
+            {**_app_row("", n=0), "kind": "admitted", "n_admitted": 4, "n_registered": 1},
+        ]
+        batch_values = _chain([])
+        batch_values.__iter__.side_effect = lambda: iter(
+            [{"id": 5, "name": "Aug 2026", "academic_year": "2026/2027"}]
+        )
+        with mock.patch.object(analytics_rollup, "ensure_admissions_rollup"), mock.patch.object(
+            analytics_rollup.AdmissionsDailyRollup, "objects", _chain(rows)
+        ), mock.patch.object(
+            analytics_rollup.Campus, "objects", _chain([(1, "Main"), (2, "City")])
+        ), mock.patch.object(
+            analytics_rollup.AcademicLevel, "objects", _chain([(2, "Degree")])
+        ), mock.patch.object(analytics_rollup.Batch, "objects", batch_values):
+            summary = analytics_rollup.admissions_rollup_summary(batch_id=5)
+
+        self.assertEqual(summary["total_submitted"], 6)
+        self.assertEqual(summary["status_counts"], {"submitted": 3, "accepted": 3})
+        self.assertEqual((summary["total_admitted_students"], summary["total_registered"]), (4, 1))
+        self.assertEqual(summary["local_count"], 4)
+        self.assertEqual(summary["by_campus"], [{"campus_name": "Main", "count": 4}, {"campus_name": "City", "count": 2}])
+        self.assertEqual(summary["monthly_trend"], [{"month": "Mar 2026", "count": 6}])
+        self.assertEqual(
+            summary["by_batch"],
+            [{"batch_name": "Aug 2026", "academic_year": "2026/2027", "total": 6, "admitted": 3, "rejected": 0, "pending": 3}],
+        )
+
+
+def _refresh_inline(args, countdown=None):
+    return analytics_rollup.refresh_admissions_rollup_day(date.fromisoformat(args[0]))
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class AdmissionsRollupSignalTests(TestCase):
+    """Application saves regroup their created day once the transaction commits."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="rollup@example.com", email="rollup@example.com", password="x")
+        self.campus = Campus.objects.create(name="Main Campus", code="MAIN")
+        today = timezone.now().date()
+        self.batch = Batch.objects.create(
+            name="Rollup Intake 2026",
+            code="ROLL2026",
+            application_start_date=today,
+            application_end_date=today + timedelta(days=90),
+            admission_start_date=today,
+            admission_end_date=today + timedelta(days=120),
+            created_by=self.user,
+        )
+        self.level = AcademicLevel.objects.create(name="Undergraduate")
+        patcher = mock.patch(
+            "admissions.tasks.celery_refresh_admissions_rollup.apply_async", side_effect=_refresh_inline
+        )
+        self.apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _counts(self):
+        return dict(
+            AdmissionsDailyRollup.objects.filter(
+                kind=AdmissionsDailyRollup.KIND_APPLICATION, day=timezone.localdate()
+            ).values_list("status", "applications")
+        )
+
+    def test_application_save_updates_rollup(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            application = Application.objects.create(
+                applicant=self.user,
+                batch=self.batch,
+                campus=self.campus,
+                academic_level=self.level,
+                first_name="Test",
+                last_name="Applicant",
+                date_of_birth="2000-01-01",
+                gender="F",
+                nationality="Uganda",
+                phone="256700000000",
+                email="rollup@example.com",
+                next_of_kin_name="Kin",
+                next_of_kin_contact="256700000001",
+                next_of_kin_relationship="Parent",
+                status="submitted",
+            )
+        self.assertEqual(self._counts(), {"submitted": 1})
+
+        application.status = "accepted"
+        with self.captureOnCommitCallbacks(execute=True):
+            application.save()
+        self.assertEqual(self._counts(), {"accepted": 1})
+        self.assertEqual(self.apply_async.call_count, 2)
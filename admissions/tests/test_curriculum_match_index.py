@@ -0,0 +1,54 @@
+"""Curriculum match index used to prefill exemption review."""
+from unittest import mock
+
+from django.db.models.signals import post_delete, post_save
+from django.test import SimpleTestCase
+
+from Programs.models import CourseCatalogUnit, Program, ProgramCurriculumLine, ProgramCurriculumVersion
+from admissions.curriculum_match_index import CurriculumMatchIndex
+from admissions.exemption_services import suggest_curriculum_match
+
+_CURRICULUM = [
+    {"id": 1, "course_code": "MHR 4103", "course_name": "Human Resource Planning", "year_of_study": 1, "term_number": 1},
+    {"id": 2, "course_code": "ACC1101", "course_name": "Principles of Accounting", "year_of_study": 1, "term_number": 1},
+    {"id": 3, "course_code": "ACC1102", "course_name": "Research Methods in Business", "year_of_study": 1, "term_number": 2},
+    {"id": 4, "course_code": "BIT2101", "course_name": "Business Statistics", "year_of_study": 2, "term_number": 1},
+]
+
+
+class CurriculumMatchIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = CurriculumMatchIndex(_CURRICULUM)
+
+    def test_exact_and_soft_code_match(self):
+        self.assertEqual(self.index.suggest("mhr-4103"), 1)
+        self.assertEqual(self.index.suggest("BIT21"), 4)
+        self.assertEqual(self.index.code_matches("ACC11"), ([], [2, 3]))
+
+    def test_digit_tail_within_year_term(self):
+        self.assertEqual(self.index.suggest("XYZ 1102", year_of_study=1, term_number=2), 3)
+
+    def test_name_token_overlap(self):
+        self.assertEqual(self.index.suggest("ZZ9", course_name="Business Research Methods"), 3)
+        self.assertIsNone(self.index.suggest("ZZ9", course_name="Business"))
+
+    def test_exempted_lines_are_skipped(self):
+        self.assertIsNone(self.index.suggest("MHR4103", open_ids=self.index.open_line_ids({1})))
+        curriculum = self.index.review_rows({2})
+        self.assertTrue(curriculum[1]["already_exempted"])
+        self.assertIsNone(suggest_curriculum_match("ACC1101", curriculum))
+
+
+class CurriculumMatchInvalidationTests(SimpleTestCase):
+    def test_curriculum_and_programme_edits_invalidate_indexes(self):
+        models = (ProgramCurriculumLine, ProgramCurriculumVersion, CourseCatalogUnit, Program)
+        # Program also feeds the dashboard counters; keep that receiver off the database.
+        with mock.patch("admissions.signals.invalidate_curriculum_match_indexes") as invalidate, mock.patch(
+            "admissions.signals.invalidate_dashboard_counters"
+        ):
+            for model in models:
+                post_save.send(
+                    sender=model, instance=model(), created=True, raw=False, using="default", update_fields=None
+                )
+                post_delete.send(sender=model, instance=model(), using="default", origin=None)
+        self.assertEqual(invalidate.call_count, 2 * len(models))
@@ -0,0 +1,54 @@
+"""Scope-aware composition of cached dashboard counter buckets."""
+from unittest import mock
+
+from django.db.models.signals import post_delete
+from django.test import SimpleTestCase
+
+from accounts.models import Campus
+from admissions import dashboard_counters
+from admissions.models import Batch, Faculty
+from Programs.models import ProgramBatch
+
+# faculty_id, campus_id, faculty, campus, intake, intake_active, legacy, paid, cohort, program, count
+_BUCKETS = [
+    (1, 10, "Science", "Main", "2026 Intake", True, False, True, "BSc 26", "BSc", 5),
+    (1, 20, "Science", "City", "2026 Intake", True, True, False, "BSc 26", "BSc", 2),
+    (2, 10, "Arts", "Main", "2025 Intake", False, False, False, None, "BA", 3),
+    (None, None, None, None, None, None, False, True, None, None, 1),
+]
+
+
+class DashboardCounterTests(SimpleTestCase):
+    def _buckets(self, scope):
+        with mock.patch.object(dashboard_counters, "_cached", return_value=_BUCKETS), mock.patch(
+            "admissions.faculty_scope.admitted_student_scope", return_value=scope
+        ):
+            return dashboard_counters.admitted_buckets_for_user(object())
+
+    def test_unscoped_user_sees_every_bucket(self):
+        split = dashboard_counters.intake_split(self._buckets((None, None)))
+        self.assertEqual(
+            split,
+            {"total": 11, "current_intake_new": 5, "continuing_total": 5, "legacy_imported": 2},
+        )
+
+    def test_faculty_and_campus_scope_filter_buckets(self):
+        self.assertEqual(sum(b.count for b in self._buckets(([1], None))), 7)
+        self.assertEqual(sum(b.count for b in self._buckets(([1, 2], [10]))), 8)
+        self.assertEqual(self._buckets(([], None)), [])
+
+    def test_count_by_orders_largest_first(self):
+        buckets = self._buckets((None, None))
+        self.assertEqual(
+            dashboard_counters.count_by(buckets, lambda b: b.campus),
+            [("Main", 8), ("City", 2), (None, 1)],
+        )
+
+
+class DashboardCounterInvalidationTests(SimpleTestCase):
+    def test_structure_deletes_bump_counters(self):
+        models = (Batch, Faculty, Campus, ProgramBatch)
+        with mock.patch("admissions.signals.invalidate_dashboard_counters") as invalidate:
+            for model in models:
+                post_delete.send(sender=model, instance=model(), using="default", origin=None)
+        self.assertEqual(invalidate.call_count, len(models))
@@ -0,0 +1,60 @@
+"""Exemption form-fee report rows built from annotated charge values."""
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from admissions.exemption_fee_report import exemption_fee_rows
+
+_NOW = datetime(2026, 3, 10, 12, 0, tzinfo=dt_timezone.utc)
+
+
+def _values(**overrides):
+    values = {
+        "id": 11,
+        "student_id": 7,
+        "amount": Decimal("50000.00"),
+        "currency": "UGX",
+        "status": "completed",
+        "is_waived": False,
+        "created_at": _NOW - timedelta(days=3),
+        "r_student_id": "1002003",
+        "r_reg_no": "NDU/2026/001",
+        "r_student_name": "Grace Nakato",
+        "r_programme": "Bachelor of Nursing",
+        "r_request_id": None,
+        "r_request_status": None,
+        "r_draft": {
+            "papers": [{"curriculum_line_id": 5, "grade_letter": "A"}],
+            "attainedAt": "2024",
+            "reason": "Diploma",
+        },
+        "r_draft_updated_at": None,
+    }
+    values.update(overrides)
+    return values
+
+
+class ExemptionFeeRowTests(SimpleTestCase):
+    def test_paid_charge_with_ready_draft_and_no_request_is_form_ready(self):
+        (row,) = exemption_fee_rows([_values()])
+        self.assertEqual(row["student_name"], "Grace Nakato")
+        self.assertEqual(row["amount"], 50000.0)
+        self.assertTrue(row["has_draft"])
+        self.assertEqual(row["draft_paper_count"], 1)
+        self.assertTrue(row["form_ready"])
+        self.assertIsNone(row["days_pending"])
+
+    def test_submitted_or_pending_charges_are_not_form_ready(self):
+        submitted, pending = exemption_fee_rows(
+            [_values(r_request_id=4, r_request_status="pending"), _values(status="pending")]
+        )
+        self.assertFalse(submitted["form_ready"])
+        self.assertEqual(submitted["change_request_status"], "pending")
+        self.assertFalse(pending["form_ready"])
+        self.assertIsNotNone(pending["days_pending"])
+
+    def test_charge_without_student(self):
+        (row,) = exemption_fee_rows([_values(student_id=None, r_student_name="", r_draft=None)])
+        self.assertEqual((row["student_id"], row["reg_no"], row["student_name"]), ("", "", ""))
+        self.assertFalse(row["has_draft"])
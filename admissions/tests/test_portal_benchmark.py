@@ -0,0 +1,64 @@
+"""Portal API benchmark — request mix parsing, percentiles and report comparison."""
+from django.test import SimpleTestCase, override_settings
+
+from admissions import portal_benchmark
+
+
+class BenchmarkSummaryTests(SimpleTestCase):
+    def test_nearest_rank_percentiles(self):
+        values = list(range(1, 101))
+        self.assertEqual(portal_benchmark.percentile(values, 0.50), 50)
+        self.assertEqual(portal_benchmark.percentile(values, 0.95), 95)
+        self.assertEqual(portal_benchmark.percentile(values, 0.99), 99)
+        self.assertEqual(portal_benchmark.percentile([7], 0.99), 7)
+        self.assertIsNone(portal_benchmark.percentile([], 0.5))
+
+    def test_summary_counts_server_errors_and_exceptions(self):
+        samples = [
+            {"ms": 10.0, "queries": 4, "status": 200},
+            {"ms": 30.0, "queries": 6, "status": 403},
+            {"ms": 20.0, "queries": 5, "status": 500},
+            {"ms": 90.0, "queries": None, "status": "exception"},
+        ]
+        summary = portal_benchmark.summarize_samples(samples, skipped=2)
+        self.assertEqual(summary["requests"], 4)
+        self.assertEqual(summary["skipped"], 2)
+        self.assertEqual(summary["errors"], 2)
+        self.assertEqual(summary["status_codes"], {"200": 1, "403": 1, "500": 1, "exception": 1})
+        self.assertEqual(summary["latency_ms"]["p50"], 20.0)
+        self.assertEqual(summary["latency_ms"]["max"], 90.0)
+        self.assertEqual(summary["queries"], {"mean": 5.0, "p95": 6, "max": 6})
+
+
+class BenchmarkOptionsTests(SimpleTestCase):
+    def test_parse_mix(self):
+        self.assertEqual(portal_benchmark.parse_mix(""), portal_benchmark.DEFAULT_MIX)
+        self.assertEqual(
+            portal_benchmark.parse_mix("portal.payment_status=3, ledger.students"),
+            {"portal.payment_status": 3, "ledger.students": 1},
+        )
+        with self.assertRaises(ValueError):
+            portal_benchmark.parse_mix("portal.unknown=1")
+
+    def test_compare_reports(self):
+        def report(p95, queries):
+            return {
+                "endpoints": {
+                    "portal.payment_status": {
+                        "latency_ms": {"p50": 10.0, "p95": p95},
+                        "queries": {"mean": queries},
+                    }
+                }
+            }
+
+        (row,) = portal_benchmark.compare_reports(report(40.0, 30.0), report(50.0, 12.0))
+        self.assertEqual(row["endpoint"], "portal.payment_status")
+        self.assertEqual(row["p95_ms"], {"baseline": 40.0, "current": 50.0, "change_pct": 25.0})
+        self.assertEqual(row["queries"]["change_pct"], -60.0)
+
+
+class BenchmarkGuardTests(SimpleTestCase):
+    @override_settings(DEBUG=False)
+    def test_refuses_without_debug_or_confirmation(self):
+        with self.assertRaises(RuntimeError):
+            portal_benchmark.benchmark_portal_apis()
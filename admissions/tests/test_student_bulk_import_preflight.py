@@ -0,0 +1,184 @@
+"""Preflight pass of the continuing-student bulk import."""
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from admissions import student_bulk_import as sbi
+
+
+def _row(n, **overrides):
+    row = {
+        "__row__": n,
+        "first_name": "Jane",
+        "last_name": "Doe",
+        "email": f"s{n}@example.com",
+        "phone": "0701234567",
+        "date_of_birth": "2000-05-15",
+        "study_mode": "D",
+        "reg_no": f"26/X/{n:03d}",
+        "student_id": f"555{n}",
+    }
+    row.update(overrides)
+    return row
+
+
+def _manager(rows):
+    qs = mock.MagicMock()
+    qs.filter.return_value = qs
+    qs.order_by.return_value = qs
+    qs.values_list.side_effect = lambda *a, **k: list(rows.pop(0))
+    return qs
+
+
+class StudentImportPreflightTests(SimpleTestCase):
+    def _preflight(self, rows, *, existing_reg=(), used_codes=(), skip_existing=False):
+        ctx = SimpleNamespace(
+            program=SimpleNamespace(max_years=4, max_terms_per_year=2, calendar_type="semester"),
+            skip_existing_reg_no=skip_existing,
+            register_schoolpay=False,
+            require_academic_position=False,
+        )
+        students = _manager([list(existing_reg), list(used_codes)])
+        users = _manager([[("s1@example.com", 7)]])
+        with mock.patch.object(sbi.AdmittedStudent, "objects", students), mock.patch.object(
+            sbi.User, "objects", users
+        ):
+            return sbi.preflight_student_rows(rows, ctx)
+
+    def test_flags_duplicates_conflicts_and_bad_rows_before_writing(self):
+        plans = self._preflight(
+            [
+                _row(1),
+                _row(2, reg_no="26/X/001"),
+                _row(3, phone="12"),
+                _row(4, student_id="1000"),
+                _row(5, student_id=""),
+            ],
+            used_codes=[("1000", None)],
+        )
+        self.assertEqual([p["action"] for p in plans], ["create", "fail", "fail", "fail", "fail"])
+        self.assertEqual(plans[0]["applicant_user_id"], 7)
+        self.assertIn("more than once", plans[1]["error"])
+        self.assertIn("already linked", plans[3]["error"])
+        self.assertIn("SchoolPay registration is required", plans[4]["error"])
+
+    def test_existing_reg_no_is_update_only_when_skipping(self):
+        rows = [_row(1)]
+        self.assertEqual(
+            self._preflight(rows, existing_reg=[("26/X/001", 42)])[0]["action"], "fail"
+        )
+        plan = self._preflight(rows, existing_reg=[("26/X/001", 42)], skip_existing=True)[0]
+        self.assertEqual((plan["action"], plan["existing_id"]), ("update", 42))
+
+    def test_report_lists_every_row(self):
+        plans = self._preflight([_row(1), _row(2, phone="12")])
+        lines = sbi.build_student_import_report_csv(plans).strip().splitlines()
+        self.assertEqual(lines[0], "row,reg_no,name,status,student_id,message")
+        self.assertTrue(lines[1].startswith("1,26/X/001,Jane Doe,valid"))
+        self.assertIn("invalid", lines[2])
+
+
+class StudentImportSchoolPayTests(SimpleTestCase):
+    """SchoolPay registration runs outside any open transaction."""
+
+    def setUp(self):
+        self.depth = 0
+        self.depth_at_call = []
+
+        @contextmanager
+        def atomic():
+            self.depth += 1
+            try:
+                yield
+            finally:
+                self.depth -= 1
+
+        for patcher in (
+            mock.patch.object(sbi.transaction, "atomic", atomic),
+            mock.patch.object(sbi, "_create_imported_student", side_effect=self._student),
+            mock.patch.object(sbi, "_finish_imported_student"),
+            mock.patch.object(sbi, "_import_one_row", side_effect=lambda **kw: self._student(**kw)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.events = []
+        self.ctx = sbi.StudentImportContext(
+            program=SimpleNamespace(id=1, name="BSc"),
+            program_batch=SimpleNamespace(id=2, name="BSc 2026"),
+            admission_batch=SimpleNamespace(id=3, name="Continuing"),
+            campus=SimpleNamespace(id=4),
+            academic_level=SimpleNamespace(id=5),
+            admitted_by=None,
+            register_schoolpay=True,
+        )
+
+    def _student(self, **kwargs):
+        n = kwargs["row"]["__row__"]
+        self.events.append(("create", n, self.depth))
+        return SimpleNamespace(
+            id=n,
+            application_id=100 + n,
+            application=SimpleNamespace(applicant_id=7),
+            reg_no=kwargs["row"]["reg_no"],
+            student_id=kwargs["row"]["student_id"] or f"100{n}",
+            is_registered_with_schoolpay=True,
+            _import_specialization=None,
+            _import_applicant_created=kwargs.get("applicant_user_id") is None,
+        )
+
+    def _plan(self, n, **overrides):
+        row = _row(n, **overrides)
+        return {"action": "create", "row": row, "row_num": n, "name": "Jane Doe", "cleaned": {"email": row["email"]}}
+
+    def _register(self, admitted, row, *, register_schoolpay):
+        self.depth_at_call.append(self.depth)
+        self.events.append(("register", admitted.id, self.depth))
+        return admitted.student_id
+
+    def test_registration_happens_after_the_chunk_commits(self):
+        plans = [self._plan(1, student_id=""), self._plan(2)]
+        with mock.patch.object(sbi, "_ensure_schoolpay_protection", side_effect=self._register):
+            outcome = sbi.run_student_import_plans(plans, self.ctx, chunk_size=25)
+        self.assertEqual(self.depth_at_call, [0])
+        self.assertEqual(outcome["counts"]["created"], 2)
+        self.assertEqual([p["student_id"] for p in plans], ["1001", "5552"])
+
+    def test_rows_are_written_in_file_order(self):
+        plans = [self._plan(1), self._plan(2, student_id=""), self._plan(3)]
+        with mock.patch.object(sbi, "_ensure_schoolpay_protection", side_effect=self._register):
+            sbi.run_student_import_plans(plans, self.ctx, chunk_size=25)
+        # Row 1 commits before row 2 calls SchoolPay; row 3 follows in a new transaction.
+        self.assertEqual(
+            self.events, [("create", 1, 2), ("create", 2, 1), ("register", 2, 0), ("create", 3, 2)]
+        )
+        self.assertEqual([p["status"] for p in plans], ["created"] * 3)
+
+    def test_failed_registration_removes_the_committed_student(self):
+        applications = mock.MagicMock()
+        with mock.patch.object(
+            sbi, "_ensure_schoolpay_protection", side_effect=ValueError("SchoolPay registration failed: down")
+        ), mock.patch.object(sbi.Application, "objects", applications), mock.patch.object(sbi.User, "objects"):
+            outcome = sbi.run_student_import_plans([self._plan(1, student_id="")], self.ctx)
+        applications.filter.assert_called_once_with(pk=101)
+        applications.filter.return_value.delete.assert_called_once_with()
+        self.assertEqual(outcome["counts"]["failed"], 1)
+
+    def test_failed_registration_removes_the_applicant_account_it_created(self):
+        users = mock.MagicMock()
+        plan = self._plan(1, student_id="")
+        with mock.patch.object(
+            sbi, "_ensure_schoolpay_protection", side_effect=ValueError("SchoolPay registration failed: down")
+        ), mock.patch.object(sbi.Application, "objects"), mock.patch.object(sbi.User, "objects", users):
+            sbi.run_student_import_plans([plan], self.ctx)
+        users.filter.assert_called_once_with(pk=7, is_applicant=True)
+        users.filter.return_value.delete.assert_called_once_with()
+
+        users.reset_mock()
+        plan = {**self._plan(2, student_id=""), "applicant_user_id": 7}
+        with mock.patch.object(
+            sbi, "_ensure_schoolpay_protection", side_effect=ValueError("SchoolPay registration failed: down")
+        ), mock.patch.object(sbi.Application, "objects"), mock.patch.object(sbi.User, "objects", users):
+            sbi.run_student_import_plans([plan], self.ctx)
+        users.filter.assert_not_called()
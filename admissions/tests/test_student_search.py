@@ -0,0 +1,124 @@
+"""Student search documents and query tokenisation."""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from admissions.models import AcademicLevel, AdmittedStudent, Application, Batch, Campus, StudentSearchDocument
+from admissions.student_search import _TsPrefixMatch, _document_from_row, apply_student_search, search_tokens
+from Programs.models import Program
+
+User = get_user_model()
+
+
+def _row(**overrides):
+    row = {
+        "id": 7,
+        "reg_no": "NDU/2026/001",
+        "student_id": "1002003",
+        "schoolpay_code": "1002003",
+        "application__first_name": " Grace ",
+        "application__middle_name": "A.",
+        "application__last_name": "Nakato",
+        "application__phone": "+256 700 123456",
+        "application__email": "Grace@Example.com",
+        "admitted_program__name": "Bachelor of Nursing",
+        "admitted_program__faculty__name": "Health Sciences",
+    }
+    row.update(overrides)
+    return row
+
+
+class StudentSearchDocumentTests(SimpleTestCase):
+    def test_document_is_lower_case_and_covers_identity_fields(self):
+        doc = _document_from_row(_row())
+        self.assertEqual(doc.student_id, 7)
+        self.assertEqual(doc.full_name, "Grace A. Nakato")
+        self.assertEqual(doc.payment_code, "1002003")
+        for part in ("grace a. nakato", "nakato grace", "ndu/2026/001", "256700123456", "grace@example.com", "nursing"):
+            self.assertIn(part, doc.document)
+        # schoolpay code equal to student_id is not duplicated
+        self.assertEqual(doc.document.count("1002003"), 1)
+
+    def test_missing_values_are_skipped(self):
+        doc = _document_from_row(
+            _row(reg_no=None, application__middle_name=None, application__phone=None, admitted_program__name=None)
+        )
+        self.assertEqual(doc.full_name, "Grace Nakato")
+        self.assertNotIn("none", doc.document)
+
+
+class SearchTokenTests(SimpleTestCase):
+    def test_tokens_are_lower_cased_and_capped(self):
+        self.assertEqual(search_tokens("  Nakato  GRACE "), ["nakato", "grace"])
+        self.assertEqual(len(search_tokens("a b c d e f g h")), 6)
+        self.assertEqual(search_tokens(""), [])
+
+    def test_tsquery_strips_operators(self):
+        self.assertEqual(_TsPrefixMatch.tsquery(["nak&", "gr:ace", "!!"]), "nak:* & grace:*")
+
+
+class StudentSearchSyncTests(TestCase):
+    """Saving a student or its application refreshes the search document after commit."""
+
+    def setUp(self):
+        user = User.objects.create_user(username="search@example.com", email="search@example.com", password="x")
+        self.campus = Campus.objects.create(name="Main Campus", code="MAIN")
+        today = timezone.now().date()
+        self.batch = Batch.objects.create(
+            name="Search Intake 2026",
+            code="SRCH2026",
+            application_start_date=today,
+            application_end_date=today + timedelta(days=90),
+            admission_start_date=today,
+            admission_end_date=today + timedelta(days=120),
+            created_by=user,
+        )
+        level = AcademicLevel.objects.create(name="Undergraduate")
+        self.program = Program.objects.create(
+            name="Bachelor of Nursing", short_form="BNS", code="BNS", academic_level=level, min_years=3, max_years=5
+        )
+        self.application = Application.objects.create(
+            applicant=user,
+            batch=self.batch,
+            campus=self.campus,
+            academic_level=level,
+            first_name="Grace",
+            last_name="Nakato",
+            date_of_birth="2000-01-01",
+            gender="female",
+            nationality="Ugandan",
+            phone="256700000000",
+            email="search@example.com",
+            next_of_kin_name="Kin",
+            next_of_kin_contact="256700000001",
+            next_of_kin_relationship="Parent",
+            status="accepted",
+        )
+
+    def _admit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return AdmittedStudent.objects.create(
+                application=self.application,
+                study_mode="day",
+                reg_no="NDU/2026/SRCH/001",
+                admitted_program=self.program,
+                admitted_batch=self.batch,
+                admitted_campus=self.campus,
+            )
+
+    def test_new_student_is_found_by_name(self):
+        student = self._admit()
+        self.assertTrue(StudentSearchDocument.objects.filter(student=student).exists())
+        found = apply_student_search(AdmittedStudent.objects.all(), "nakato grace")
+        self.assertEqual(list(found.values_list("id", flat=True)), [student.id])
+
+    def test_renamed_student_is_found_by_new_name(self):
+        student = self._admit()
+        self.application.last_name = "Auma"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.application.save()
+        found = apply_student_search(AdmittedStudent.objects.all(), "auma")
+        self.assertEqual(list(found.values_list("id", flat=True)), [student.id])
+        self.assertFalse(apply_student_search(AdmittedStudent.objects.all(), "nakato").exists())
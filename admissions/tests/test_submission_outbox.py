@@ -0,0 +1,93 @@
+"""Application submission outbox events and submit latency percentiles."""
+from datetime import datetime, timezone as dt_timezone
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from admissions import submission_outbox
+from admissions.models import Application, ApplicationSubmissionEvent as Event
+from admissions.utils import endpoint_latency
+
+
+class QueueSubmissionSideEffectsTests(SimpleTestCase):
+    def _queue(self, **kwargs):
+        application = Application(pk=7)
+        applicant = SimpleNamespace(pk=3, email="applicant@example.com")
+        with mock.patch.object(Event.objects, "bulk_create") as bulk_create, mock.patch(
+            "admissions.submission_outbox.transaction.on_commit"
+        ) as on_commit:
+            submission_outbox.queue_submission_side_effects(application, applicant=applicant, **kwargs)
+        on_commit.assert_called_once()
+        return bulk_create.call_args.args[0]
+
+    def test_self_service_submit_queues_email_notification_and_reporting(self):
+        events = self._queue()
+        self.assertEqual(
+            [e.kind for e in events],
+            [Event.KIND_SUBMITTED_EMAIL, Event.KIND_NOTIFICATION, Event.KIND_REPORTING],
+        )
+        self.assertEqual(events[1].payload["user_id"], 3)
+
+    def test_assisted_submit_with_draft_adds_audit_and_cleanup(self):
+        request = SimpleNamespace(META={"REMOTE_ADDR": "10.0.0.5", "HTTP_USER_AGENT": "Firefox"})
+        draft = SimpleNamespace(pk=11, updated_at=datetime(2026, 10, 1, tzinfo=dt_timezone.utc))
+        events = self._queue(staff_user=SimpleNamespace(pk=9), draft=draft, request=request)
+        by_kind = {e.kind: e.payload for e in events}
+        self.assertEqual(by_kind[Event.KIND_ASSIST_AUDIT]["staff_user_id"], 9)
+        self.assertEqual(by_kind[Event.KIND_ASSIST_AUDIT]["ip_address"], "10.0.0.5")
+        self.assertEqual(by_kind[Event.KIND_DRAFT_CLEANUP]["draft_id"], 11)
+
+
+class DrainSubmissionOutboxTests(SimpleTestCase):
+    def test_failing_handler_marks_event_failed_and_others_done(self):
+        events = [SimpleNamespace(pk=1, kind="boom", attempts=1), SimpleNamespace(pk=2, kind="ok", attempts=1)]
+        updates = {}
+
+        def _filter(**kwargs):
+            qs = mock.MagicMock()
+            if "pk__in" in kwargs:
+                qs.select_related.return_value.order_by.return_value = events
+            else:
+                qs.update.side_effect = lambda **fields: updates.__setitem__(kwargs["pk"], fields["status"])
+            return qs
+
+        handlers = {"boom": mock.Mock(side_effect=RuntimeError("smtp down")), "ok": mock.Mock()}
+        with mock.patch.object(submission_outbox, "_claim", return_value=[1, 2]), mock.patch.object(
+            Event.objects, "filter", side_effect=_filter
+        ), mock.patch.dict(submission_outbox.HANDLERS, handlers, clear=True), mock.patch(
+            "admissions.submission_outbox.transaction.atomic"
+        ):
+            result = submission_outbox.drain_submission_outbox()
+
+        self.assertEqual(result, {"claimed": 2, "done": 1, "failed": 1})
+        self.assertEqual(updates, {1: Event.STATUS_FAILED, 2: Event.STATUS_DONE})
+
+
+class EndpointLatencyTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_percentiles_from_buckets(self):
+        for ms in [10] * 90 + [180] * 8 + [4000, 45000]:
+            endpoint_latency.record_latency("test.submit", ms, status_code=201)
+        endpoint_latency.record_latency("test.submit", 20, status_code=500)
+
+        summary = endpoint_latency.latency_summary("test.submit")
+        self.assertEqual(summary["count"], 101)
+        self.assertEqual(summary["errors"], 1)
+        self.assertEqual(summary["p50_ms"], 25)
+        self.assertEqual(summary["p95_ms"], 200)
+        self.assertEqual(summary["p99_ms"], 5000)
+        self.assertEqual(summary["max_ms"], 45000)
+
+    def test_timed_endpoint_records_failures(self):
+        @endpoint_latency.timed_endpoint("test.view")
+        def view(request):
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            view(None)
+        summary = endpoint_latency.latency_summary("test.view")
+        self.assertEqual((summary["count"], summary["errors"]), (1, 1))
@@ -42,9 +42,13 @@ from admissions.weekly_report_views import (
 from admissions.announcement_views import SendAnnouncementView, TestAnnouncementView
 from admissions.student_notify_views import StudentNotifyPreviewView, StudentNotifySendView
 from admissions.student_bulk_import_views import (
+    StudentBulkImportJobView,
+    StudentBulkImportReportView,
     StudentBulkImportTemplateView,
     StudentBulkImportView,
 )
+from admissions.student_search_views import StudentSearchView
+from admissions.submission_metrics_views import ApplicationSubmitMetricsView
 from admissions.student_fee_balance_import_views import (
     StudentFeeBalanceImportTemplateView,
     StudentFeeBalanceImportView,
@@ -66,6 +70,7 @@ urlpatterns = [
     # # Application URLs
     path('applications', views.ListApplications.as_view()),
     path('create_applications', views.create_applications),
+    path('applications/submit_metrics', ApplicationSubmitMetricsView.as_view()),
     path('create_direct_applications', views.create_direct_applications),
     path('direct_entry_applications', views.ListDirectEntryApplications.as_view()),
     path('all_applications_report/', views.AllApplicationsReport.as_view()),
@@ -174,6 +179,7 @@ urlpatterns = [
     ),
     path('update_admission/<int:pk>/', views.UpdateAdmittedStudent.as_view()),
     path('list_admitted_students/',  views.ListAdmittedStudents.as_view()),
+    path('students/search', StudentSearchView.as_view(), name='student_search'),
     path('list_bonafide_students/', views.ListBonafideStudents.as_view()),
     path(
         'university_headcount/',
@@ -382,6 +388,11 @@ urlpatterns = [
         views.ExemptionFormFeeReportView.as_view(),
         name='exemption_form_fee_report',
     ),
+    path(
+        'change_requests/exemption/fee_report/export',
+        views.ExemptionFormFeeReportExportView.as_view(),
+        name='exemption_form_fee_report_export',
+    ),
     path(
         'change_requests/exemption/draft',
         views.StudentExemptionDraftView.as_view(),
@@ -402,6 +413,16 @@ urlpatterns = [
         name='student_bulk_import_template',
     ),
     path('students/bulk_import', StudentBulkImportView.as_view(), name='student_bulk_import'),
+    path(
+        'students/bulk_import/jobs/<int:job_id>',
+        StudentBulkImportJobView.as_view(),
+        name='student_bulk_import_job',
+    ),
+    path(
+        'students/bulk_import/jobs/<int:job_id>/report',
+        StudentBulkImportReportView.as_view(),
+        name='student_bulk_import_report',
+    ),
     path(
         'students/fee_balance_import_template',
         StudentFeeBalanceImportTemplateView.as_view(),
@@ -0,0 +1,118 @@
+"""
+Per-endpoint request latency histograms kept in the Django cache.
+
+Each request bumps one fixed latency bucket for its local day (plus count /
+total / max), so recording costs a few cache ``incr`` calls and p50 / p95 / p99
+are read back as bucket upper bounds by ``latency_summary``. Wrap a view with
+``timed_endpoint("name")`` to record it.
+"""
+import functools
+import logging
+import time
+
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS_MS = (25, 50, 100, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000, 30000)
+METRICS_TTL = 60 * 60 * 24 * 8
+_OVERFLOW = "inf"
+
+
+def _key(endpoint: str, field: str, day=None) -> str:
+    day = day or timezone.localdate()
+    return f"latency:{endpoint}:{day.isoformat()}:{field}"
+
+
+def _incr(key: str, delta: int = 1) -> None:
+    try:
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            if not cache.add(key, delta, timeout=METRICS_TTL):
+                cache.incr(key, delta)
+    except Exception:
+        # Metrics must never break the request being measured.
+        logger.debug("latency metric %s not recorded", key, exc_info=True)
+
+
+def _bucket(elapsed_ms: int) -> str:
+    for bound in LATENCY_BUCKETS_MS:
+        if elapsed_ms <= bound:
+            return str(bound)
+    return _OVERFLOW
+
+
+def record_latency(endpoint: str, elapsed_ms: int, *, status_code: int | None = None) -> None:
+    _incr(_key(endpoint, f"le_{_bucket(elapsed_ms)}"))
+    _incr(_key(endpoint, "count"))
+    _incr(_key(endpoint, "total_ms"), max(0, elapsed_ms))
+    if status_code is not None and status_code >= 500:
+        _incr(_key(endpoint, "errors"))
+    key = _key(endpoint, "max_ms")
+    try:
+        if elapsed_ms > int(cache.get(key) or 0):
+            cache.set(key, elapsed_ms, timeout=METRICS_TTL)
+    except Exception:
+        logger.debug("latency metric %s not recorded", key, exc_info=True)
+
+
+def _percentile(buckets: list[tuple[str, int]], count: int, q: float, max_ms: int) -> int | None:
+    if not count:
+        return None
+    target = q * count
+    seen = 0
+    for bound, n in buckets:
+        seen += n
+        if seen >= target:
+            return max_ms if bound == _OVERFLOW else min(int(bound), max_ms or int(bound))
+    return max_ms
+
+
+def latency_summary(endpoint: str, day=None) -> dict:
+    """Count, average, max and p50 / p95 / p99 (bucket upper bounds, ms) for one local day."""
+    day = day or timezone.localdate()
+    bounds = [str(b) for b in LATENCY_BUCKETS_MS] + [_OVERFLOW]
+    fields = [f"le_{b}" for b in bounds] + ["count", "total_ms", "max_ms", "errors"]
+    keys = {field: _key(endpoint, field, day) for field in fields}
+    values = cache.get_many(list(keys.values()))
+    row = {field: int(values.get(key) or 0) for field, key in keys.items()}
+    buckets = [(b, row[f"le_{b}"]) for b in bounds]
+    count, max_ms = row["count"], row["max_ms"]
+    return {
+        "endpoint": endpoint,
+        "day": day.isoformat(),
+        "count": count,
+        "errors": row["errors"],
+        "avg_ms": round(row["total_ms"] / count, 1) if count else 0.0,
+        "max_ms": max_ms,
+        "p50_ms": _percentile(buckets, count, 0.50, max_ms),
+        "p95_ms": _percentile(buckets, count, 0.95, max_ms),
+        "p99_ms": _percentile(buckets, count, 0.99, max_ms),
+        "buckets": {f"<={b}" if b != _OVERFLOW else f">{LATENCY_BUCKETS_MS[-1]}": n for b, n in buckets if n},
+    }
+
+
+def timed_endpoint(endpoint: str):
+    """Record the wall-clock latency of every call to the wrapped view."""
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            status_code = 500
+            try:
+                response = view(*args, **kwargs)
+                status_code = getattr(response, "status_code", 200)
+                return response
+            finally:
+                record_latency(
+                    endpoint,
+                    int((time.perf_counter() - started) * 1000),
+                    status_code=status_code,
+                )
+
+        return wrapper
+
+    return decorator
@@ -41,9 +41,19 @@ from django.db import IntegrityError, transaction
 from django.db.models.deletion import ProtectedError
 from django.db.utils import OperationalError
 # from .utils.validate_photo import validate_passport_photo
-from .tasks import celery_send_application_email, celery_application_notification, celery_admission_email, celery_admission_update, celery_create_student_account, celery_send_rejection_email, celery_update_student_account, celery_send_accounts_registration_cleared_email
+from .tasks import celery_application_notification, celery_admission_email, celery_admission_update, celery_create_student_account, celery_send_rejection_email, celery_update_student_account, celery_send_accounts_registration_cleared_email
 from accounts.tasks import celery_send_account_email
 from payments.utils.school_pay_code import register_student_with_schoolpay
+from .analytics_rollup import mark_admissions_rollup_dirty_for_applications
+from .student_search import apply_student_search
+from .dashboard_counters import (
+    admitted_buckets_for_user,
+    application_counters_for_user,
+    batch_counters,
+    intake_split,
+)
+from .submission_outbox import SUBMIT_ENDPOINT, queue_submission_side_effects
+from .utils.endpoint_latency import timed_endpoint
 from .utils.trigger_background_tasks import queue_admission_notification_emails
 from .utils.student_portal_provisioning import (
     StudentPortalProvisioningError,
@@ -68,7 +78,6 @@ from payments.models import ApplicationPayment
 from payments.utils.application_payment_status import confirmed_application_fee_payment
 from Drafts.models import DraftApplication
 from django.db.models import Q, Prefetch, Count, Value
-from django.db.models.functions import Concat
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from datetime import datetime
@@ -185,8 +194,8 @@ def _clear_unsubmitted_application_reference(reference, *, exclude_pk=None):
     )
     if exclude_pk is not None:
         qs = qs.exclude(pk=exclude_pk)
-    if qs.exists():
-        cleared = qs.update(application_reference=None)
+    cleared = qs.update(application_reference=None)
+    if cleared:
         logger.info(
             "Cleared application_reference=%s from %s unsubmitted application(s)",
             ref,
@@ -224,6 +233,25 @@ def _release_stale_payment_application_link(payment, *, staff_user):
 
 
 # ===========================applications ===========================================
+def _parse_subject_results(raw, subject_model, label):
+    """``[{"subject", "grade"}]`` from the submitted JSON, subjects fetched in one query."""
+    results = json.loads(raw or "[]")
+    ids = []
+    for item in results:
+        sid = int(item["subject"])
+        if sid in ids:
+            raise DRFValidationError({"detail": f"Duplicate {label} subject"})
+        ids.append(sid)
+    subjects = subject_model.objects.in_bulk(ids)
+    if len(subjects) != len(ids):
+        raise subject_model.DoesNotExist
+    return [
+        {"subject": subjects[sid], "grade": item["grade"].upper()}
+        for sid, item in zip(ids, results)
+    ]
+
+
+@timed_endpoint(SUBMIT_ENDPOINT)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_applications(request):
@@ -287,15 +315,11 @@ def create_applications(request):
     olevel_validated = []
     if request.data.get('has_olevel'):
         try:
-            results = json.loads(request.data.get("olevel_results", "[]"))
-            _seen = set()
-            for item in results:
-                sid = int(item["subject"])
-                if sid in _seen:
-                    return Response({"detail": "Duplicate O-Level subject"}, status=400)
-                _seen.add(sid)
-                subject = OLevelSubject.objects.get(id=sid)
-                olevel_validated.append({"subject": subject, "grade": item["grade"].upper()})
+            olevel_validated = _parse_subject_results(
+                request.data.get("olevel_results", "[]"), OLevelSubject, "O-Level"
+            )
+        except DRFValidationError as exc:
+            return Response(exc.detail, status=400)
         except (ValueError, TypeError, KeyError, json.JSONDecodeError):
             return Response({"detail": "Invalid O-Level results format"}, status=400)
         except OLevelSubject.DoesNotExist:
@@ -304,15 +328,11 @@ def create_applications(request):
     alevel_validated = []
     if request.data.get('has_alevel'):
         try:
-            results = json.loads(request.data.get("alevel_results", "[]"))
-            _seen = set()
-            for item in results:
-                sid = int(item["subject"])
-                if sid in _seen:
-                    return Response({"detail": "Duplicate A-Level subject"}, status=400)
-                _seen.add(sid)
-                subject = ALevelSubject.objects.get(id=sid)
-                alevel_validated.append({"subject": subject, "grade": item["grade"].upper()})
+            alevel_validated = _parse_subject_results(
+                request.data.get("alevel_results", "[]"), ALevelSubject, "A-Level"
+            )
+        except DRFValidationError as exc:
+            return Response(exc.detail, status=400)
         except (ValueError, TypeError, KeyError, json.JSONDecodeError):
             return Response({"detail": "Invalid A-Level results format"}, status=400)
         except ALevelSubject.DoesNotExist:
@@ -441,6 +461,8 @@ def create_applications(request):
             # Save the main application first (so it gets an ID)
             if application.application_reference:
                 _clear_unsubmitted_application_reference(application.application_reference)
+            # Rollup / dashboard counters are refreshed from the submission outbox.
+            application._defer_reporting = True
             application.save()
 
             choice_objects = [
@@ -466,37 +488,32 @@ def create_applications(request):
             # manage draft documents
             if not request.FILES.getlist('documents') and draft:
                 try:
-                    if draft.olevel_document:
-                        ApplicationDocument.objects.create(
-                            application=application,
-                            file=draft.olevel_document,
-                            name=draft.olevel_document.name.split('/')[-1],
-                            document_type="OLevel"
-                        )
-
-                    if draft.alevel_document:
-                        ApplicationDocument.objects.create(
+                    draft_docs = [
+                        ApplicationDocument(
                             application=application,
-                            file=draft.alevel_document,
-                            name=draft.alevel_document.name.split('/')[-1],
-                            document_type="ALevel"
+                            file=draft_file,
+                            name=draft_file.name.split('/')[-1],
+                            document_type=doc_type,
                         )
-
-                    if draft.other_documents:
-                        ApplicationDocument.objects.create(
-                            application=application,
-                            file=draft.other_documents,
-                            name=draft.other_documents.name.split('/')[-1],
-                            document_type="Others"
+                        for draft_file, doc_type in (
+                            (draft.olevel_document, "OLevel"),
+                            (draft.alevel_document, "ALevel"),
+                            (draft.other_documents, "Others"),
                         )
-
-                    for other_doc in draft.other_document_files.all():
-                        ApplicationDocument.objects.create(
+                        if draft_file
+                    ]
+                    draft_docs.extend(
+                        ApplicationDocument(
                             application=application,
                             file=other_doc.file,
                             name=(other_doc.original_name or other_doc.file.name.split('/')[-1])[:50],
                             document_type="Others",
                         )
+                        for other_doc in draft.other_document_files.all()
+                    )
+                    if draft_docs:
+                        with transaction.atomic():
+                            ApplicationDocument.objects.bulk_create(draft_docs)
 
                 except Exception as copy_error:
                     logger.warning(f"Failed to copy some documents from draft: {copy_error}")
@@ -553,33 +570,14 @@ def create_applications(request):
                 if qual_bulk:
                     AdditionalQualifications.objects.bulk_create(qual_bulk, batch_size=20)
 
-            # === Queue background tasks after successful commit ===
-            def _queue_submission_tasks():
-                try:
-                    celery_send_application_email.delay(application.id)
-                    celery_application_notification.delay(
-                        applicant_user.id,
-                        "Application Submitted",
-                        "Your application was successfully submitted"
-                    )
-                    if staff_user:
-                        from audit.utils import log_audit_event
-
-                        log_audit_event(
-                            staff_user,
-                            "assist_application_submit",
-                            applicant_user,
-                            f"Staff submitted application on behalf of {applicant_user.email}",
-                            request,
-                        )
-                except Exception as task_error:
-                    logger.exception(
-                        "Application %s saved but post-submit tasks failed: %s",
-                        application.id,
-                        task_error
-                    )
-
-            transaction.on_commit(_queue_submission_tasks)
+            # === Email, notification, audit, draft cleanup, counters: outbox (after commit) ===
+            queue_submission_side_effects(
+                application,
+                applicant=applicant_user,
+                staff_user=staff_user,
+                draft=draft,
+                request=request,
+            )
 
             return Response({
                 "detail": "Application submitted successfully!",
@@ -3082,6 +3080,7 @@ class AdmitStudent(generics.CreateAPIView):
                     revoked_by_id=None,
                     revocation_reason="",
                 )
+                mark_admissions_rollup_dirty_for_applications([application.id])
                 admission_pk = admission.id
                 application_pk = application.id
 
@@ -3304,6 +3303,12 @@ class ListAdmittedStudents(generics.ListAPIView):
         }
         return [enriched[pk] for pk in page_ids if pk in enriched]
 
+    def filter_queryset(self, queryset):
+        # Best matches first when searching without an explicit ordering.
+        if self.request.query_params.get("search", "").strip() and not self.request.query_params.get("ordering"):
+            return queryset.order_by("-search_rank", "-created_at")
+        return super().filter_queryset(queryset)
+
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
@@ -3334,38 +3339,10 @@ class ListAdmittedStudents(generics.ListAPIView):
         date_from = self.request.query_params.get('date_from')
         date_to = self.request.query_params.get('date_to')
         commitment_met = self.request.query_params.get('commitment_met')
-        needs_distinct = False
 
-        # Prefer exact/prefix identity matches before broad OR-icontains.
+        # Student search index (one row per student, no joins / DISTINCT).
         if search:
-            identity = (
-                Q(student_id__iexact=search)
-                | Q(reg_no__iexact=search)
-                | Q(schoolpay_code__iexact=search)
-            )
-            if len(search) >= 2:
-                identity |= (
-                    Q(student_id__istartswith=search)
-                    | Q(reg_no__istartswith=search)
-                    | Q(schoolpay_code__istartswith=search)
-                )
-            name_q = (
-                Q(application__first_name__icontains=search)
-                | Q(application__last_name__icontains=search)
-                | Q(admitted_program__name__icontains=search)
-                | Q(admitted_program__faculty__name__icontains=search)
-            )
-            if " " in search:
-                queryset = queryset.annotate(
-                    applicant_full_name=Concat(
-                        "application__first_name",
-                        Value(" "),
-                        "application__last_name",
-                    )
-                )
-                name_q |= Q(applicant_full_name__icontains=search)
-            queryset = queryset.filter(identity | name_q)
-            needs_distinct = True
+            queryset = apply_student_search(queryset, search)
 
         # Exact filters
         if batch and batch != "all":
@@ -3440,8 +3417,6 @@ class ListAdmittedStudents(generics.ListAPIView):
                 queryset = filter_by_commitment_met(queryset, False, strict=strict)
 
         queryset = filter_admitted_students_for_user(queryset, self.request.user)
-        if needs_distinct:
-            return queryset.distinct()
         return queryset
 
 
@@ -3470,6 +3445,8 @@ class ListBonafideStudents(generics.ListAPIView):
 
     def filter_queryset(self, queryset):
         ordering = (self.request.query_params.get("ordering") or "").strip()
+        if not ordering and self.request.query_params.get("search", "").strip():
+            return queryset.order_by("-search_rank", "-created_at")
         if ordering in ("work_queue", "-work_queue"):
             from django.db.models import Case, F, IntegerField, Value, When
 
@@ -3584,36 +3561,8 @@ class ListBonafideStudents(generics.ListAPIView):
         admission_intake = (self.request.query_params.get("admission_intake") or "").strip()
 
         if search:
-            # Prefer exact/prefix matches on indexed identity fields before OR-icontains.
-            identity = (
-                Q(student_id__iexact=search)
-                | Q(reg_no__iexact=search)
-                | Q(schoolpay_code__iexact=search)
-            )
-            if len(search) >= 2:
-                identity |= (
-                    Q(student_id__istartswith=search)
-                    | Q(reg_no__istartswith=search)
-                    | Q(schoolpay_code__istartswith=search)
-                )
-            name_q = (
-                Q(application__first_name__icontains=search)
-                | Q(application__last_name__icontains=search)
-                | Q(application__phone__icontains=search)
-                | Q(application__email__icontains=search)
-                | Q(admitted_program__name__icontains=search)
-                | Q(admitted_program__faculty__name__icontains=search)
-            )
-            if " " in search:
-                queryset = queryset.annotate(
-                    applicant_full_name=Concat(
-                        "application__first_name",
-                        Value(" "),
-                        "application__last_name",
-                    )
-                )
-                name_q |= Q(applicant_full_name__icontains=search)
-            queryset = queryset.filter(identity | name_q).distinct()
+            # Student search index (names, ids, phone, email, programme, faculty).
+            queryset = apply_student_search(queryset, search)
 
         level = (self.request.query_params.get("level") or "").strip()
 
@@ -4242,10 +4191,10 @@ class MarkAccountsRegistrationCleared(APIView):
 
             # Enforce the configured semester fee threshold — same gate as course registration.
             from payments.models import RegistrationSettings
-            from payments.registration_eligibility import _compute_tuition_eligibility
+            from payments.registration_eligibility import tuition_eligibility
 
             reg_settings = RegistrationSettings.get_settings()
-            tuition = _compute_tuition_eligibility(student, reg_settings)
+            tuition = tuition_eligibility(student, reg_settings)
             if not tuition.get("tuition_eligible"):
                 shown = tuition.get("percentage_paid")
                 need = tuition.get("minimum_required")
@@ -4568,6 +4517,7 @@ class DeleteAdmittedStudent(generics.DestroyAPIView):
             admission.delete()
             # Keep application available in queue for fresh admission.
             Application.objects.filter(id=application_id).update(status="accepted")
+            mark_admissions_rollup_dirty_for_applications([application_id])
         return Response({"detail": "Admission deleted successfully."}, status=200)
 
 # Admin dashboard stats
@@ -4575,24 +4525,9 @@ class AdminDashboardStats(APIView):
     permission_classes = [CanViewAdmissionQueues]
 
     def get(self, request):
-        apps_base = filter_applications_for_user(Application.objects.all(), request.user)
-        admitted_base = filter_admitted_students_for_user(
-            AdmittedStudent.objects.filter(is_admitted=True),
-            request.user,
-        )
-
-        # Main applications stats in one query
-        apps_stats = apps_base.aggregate(
-            total_applications=Count('id'),
-            online_applications=Count('id', filter=Q(is_direct_entry=False)),
-            direct_applications=Count('id', filter=Q(is_direct_entry=True)),
-            rejected_students=Count('id', filter=Q(status__iexact='rejected')),
-            
-            # Better pending logic - adjust according to your actual business logic
-            pending_applications=Count('id', filter=Q(
-                status__in=['submitted', 'under_review', 'pending', 'revoked', 'approved', 'accepted']
-            )),
-        )
+        # Cached, scope-aware counters (admissions.dashboard_counters) instead
+        # of per-request aggregates over Application / AdmittedStudent.
+        apps_stats = application_counters_for_user(request.user)
 
         # Admitted students split so bulk-imported (legacy) rows can never
         # inflate the live-intake figure, even when mistagged onto an active
@@ -4601,26 +4536,10 @@ class AdminDashboardStats(APIView):
         #   - continuing: everyone else — prior intakes AND bulk-imported
         #     continuing students (imports are continuing students by nature)
         #   - legacy imported: the "of which imported" subset of continuing
-        legacy_q = Q(application__source=Application.SOURCE_LEGACY)
-        admitted_intake_stats = admitted_base.aggregate(
-            admitted_total=Count('id'),
-            admitted_current_intake=Count(
-                'id', filter=Q(admitted_batch__is_active=True) & ~legacy_q
-            ),
-            admitted_continuing=Count(
-                'id', filter=Q(admitted_batch__is_active=False) | legacy_q
-            ),
-            admitted_legacy_imported=Count('id', filter=legacy_q),
-        )
+        admitted_intake_stats = intake_split(admitted_buckets_for_user(request.user))
 
         # Batches stats
-        batches_stats = Batch.objects.aggregate(
-            total_batches=Count('id'),
-            active_batches=Count('id', filter=Q(
-                is_active=True,
-                # Add your batch_offer_window_q() condition here if needed
-            )),
-        )
+        batches_stats = batch_counters()
 
         return Response({
             "totalApplication": apps_stats['total_applications'],
@@ -4628,13 +4547,13 @@ class AdminDashboardStats(APIView):
             "directApplications": apps_stats['direct_applications'],
             "pendingApplications": apps_stats['pending_applications'],
             # Kept for backward compatibility — grand total across all batches.
-            "admittedStudents": admitted_intake_stats['admitted_total'],
+            "admittedStudents": admitted_intake_stats['total'],
             # Admitted in the current active intake(s), excluding legacy imports.
-            "admittedCurrentIntake": admitted_intake_stats['admitted_current_intake'],
+            "admittedCurrentIntake": admitted_intake_stats['current_intake_new'],
             # All continuing students: prior intakes + bulk-imported.
-            "admittedContinuing": admitted_intake_stats['admitted_continuing'],
+            "admittedContinuing": admitted_intake_stats['continuing_total'],
             # Of which bulk-imported from the old system (subset of continuing).
-            "admittedLegacyImported": admitted_intake_stats['admitted_legacy_imported'],
+            "admittedLegacyImported": admitted_intake_stats['legacy_imported'],
             "rejectedStudents": apps_stats['rejected_students'],
             "total_batches": batches_stats['total_batches'],
             "activeBatches": batches_stats['active_batches'],
@@ -5206,17 +5125,25 @@ class ExemptionFormFeeAccessView(APIView):
 
 
 class ExemptionFormFeeReportView(APIView):
-    """Finance only: every exemption-form-fee charge raised, for payment follow-up."""
+    """
+    Finance only: every exemption-form-fee charge raised, for payment follow-up.
+
+    Paginated (``?page=`` / ``?page_size=``); join, status filter and search run
+    in the database (admissions.exemption_fee_report).
+    """
 
     permission_classes = [IsAuthenticated, CanViewAdmissionChangeRequests]
 
     def get(self, request):
         from accounts.finance_access import user_can_view_student_finance
-        from admissions.exemption_services import (
-            EXEMPTION_FORM_FEE_UGX,
-            exemption_form_fee_report,
-            unpaid_exemption_submissions_qs,
+        from admissions.exemption_fee_report import (
+            exemption_fee_charges_qs,
+            exemption_fee_report_counts,
+            exemption_fee_rows,
+            exemption_fee_values,
+            unpaid_submissions_qs,
         )
+        from admissions.exemption_services import EXEMPTION_FORM_FEE_UGX
 
         if not user_can_view_student_finance(request.user):
             return Response(
@@ -5244,10 +5171,10 @@ class ExemptionFormFeeReportView(APIView):
                 },
                 status=400,
             )
+        paginator = StandardPagination()
         if status_filter == "submitted_unpaid":
-            from admissions.exemption_services import unpaid_exemption_submissions_qs
-
-            unpaid = unpaid_exemption_submissions_qs()
+            unpaid = unpaid_submissions_qs(search)
+            page = paginator.paginate_queryset(unpaid, request, view=self)
             rows = [
                 {
                     "charge_id": r.form_fee_charge_id,
@@ -5273,51 +5200,72 @@ class ExemptionFormFeeReportView(APIView):
                     "draft_updated_at": None,
                     "form_ready": True,
                 }
-                for r in unpaid
+                for r in page
             ]
-            rows = _filter_exemption_fee_rows_by_search(rows, search)
-            pending_count = len(exemption_form_fee_report("pending"))
-            paid_unsubmitted_count = len(exemption_form_fee_report("paid_unsubmitted"))
+            counts = exemption_fee_report_counts(exemption_fee_charges_qs(None))
+            total = paginator.page.paginator.count
             return Response(
                 {
                     "results": rows,
-                    "total": len(rows),
-                    "pending_count": pending_count,
-                    "paid_unsubmitted_count": paid_unsubmitted_count,
-                    "submitted_unpaid_count": len(rows),
+                    "total": total,
+                    "next": paginator.get_next_link(),
+                    "previous": paginator.get_previous_link(),
+                    "pending_count": counts["pending"],
+                    "paid_unsubmitted_count": counts["paid_unsubmitted"],
+                    "submitted_unpaid_count": total,
                 }
             )
-        rows = exemption_form_fee_report(status_filter or None)
-        rows = _filter_exemption_fee_rows_by_search(rows, search)
-        if status_filter == "paid_unsubmitted":
-            paid_unsubmitted_count = len(rows)
-            pending_count = 0
-        else:
-            pending_count = sum(
-                1 for r in rows if r["status"] == "pending" and not r["is_waived"]
-            )
-            paid_unsubmitted_count = sum(
-                1
-                for r in rows
-                if r["status"] == "completed"
-                and not r.get("is_waived")
-                and not r.get("change_request_id")
-            )
-            if status_filter == "pending":
-                paid_unsubmitted_count = len(exemption_form_fee_report("paid_unsubmitted"))
+
+        qs = exemption_fee_charges_qs(status_filter or None, search)
+        counts = exemption_fee_report_counts(qs)
+        page = paginator.paginate_queryset(exemption_fee_values(qs), request, view=self)
+        paid_unsubmitted_count = counts["paid_unsubmitted"]
+        if status_filter == "pending":
+            paid_unsubmitted_count = exemption_fee_report_counts(
+                exemption_fee_charges_qs("paid_unsubmitted")
+            )["total"]
         return Response(
             {
-                "results": rows,
-                "total": len(rows),
-                "pending_count": pending_count,
+                "results": exemption_fee_rows(page),
+                "total": counts["total"],
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
+                "pending_count": counts["pending"],
                 "paid_unsubmitted_count": paid_unsubmitted_count,
-                "submitted_unpaid_count": unpaid_exemption_submissions_qs().count()
-                if status_filter != "submitted_unpaid"
-                else len(rows),
+                "submitted_unpaid_count": unpaid_submissions_qs().count(),
             }
         )
 
 
+class ExemptionFormFeeReportExportView(APIView):
+    """Finance only: streamed CSV (or ``?export_format=xlsx``) of the form-fee report."""
+
+    permission_classes = [IsAuthenticated, CanViewAdmissionChangeRequests]
+
+    def get(self, request):
+        from accounts.finance_access import user_can_view_student_finance
+        from admissions.exemption_fee_report import FEE_REPORT_STATUSES, exemption_fee_report_export
+        from payments.report_exports import export_response
+
+        if not user_can_view_student_finance(request.user):
+            return Response(
+                {"detail": "Exemption fee reports are visible to Finance staff only."},
+                status=403,
+            )
+        status_filter = request.query_params.get("status") or ""
+        if status_filter and status_filter not in FEE_REPORT_STATUSES:
+            return Response(
+                {"detail": "status must be 'pending', 'completed', or 'paid_unsubmitted'."},
+                status=400,
+            )
+        params = {
+            "status": status_filter,
+            "search": (request.query_params.get("search") or request.query_params.get("q") or "").strip(),
+        }
+        fmt = (request.query_params.get("export_format") or "csv").strip().lower()
+        return export_response(exemption_fee_report_export(params), "xlsx" if fmt in ("xlsx", "excel") else "csv")
+
+
 class AdminReturnUnpaidExemptionView(APIView):
     """Finance / HOD: return an exemption that was submitted without the form fee."""
 
@@ -5716,26 +5664,6 @@ def _change_request_search_q(search: str) -> Q | None:
     )
 
 
-def _filter_exemption_fee_rows_by_search(rows: list[dict], search: str) -> list[dict]:
-    q = (search or "").strip().lower()
-    if not q:
-        return rows
-    q_alt = q.replace("_", "/")
-    filtered = []
-    for row in rows:
-        hay = " ".join(
-            [
-                str(row.get("student_name") or ""),
-                str(row.get("reg_no") or ""),
-                str(row.get("student_id") or ""),
-                str(row.get("programme") or ""),
-            ]
-        ).lower()
-        if q in hay or q_alt in hay:
-            filtered.append(row)
-    return filtered
-
-
 class AdminChangeRequestList(APIView):
     """Admin: list all requests with optional status filter."""
     permission_classes = [IsAuthenticated, CanViewAdmissionChangeRequests]
@@ -5819,8 +5747,8 @@ class AdminExemptionCurriculumView(APIView):
 
     def get(self, request, pk):
         from admissions.exemption_services import (
-            list_programme_curriculum_for_review,
-            suggest_curriculum_match,
+            exempted_curriculum_line_ids,
+            curriculum_match_index,
         )
 
         req_obj = get_object_or_404(
@@ -5837,15 +5765,19 @@ class AdminExemptionCurriculumView(APIView):
         if not qs.exists():
             return Response({"detail": "Not found."}, status=404)
 
-        curriculum = list_programme_curriculum_for_review(req_obj.admitted_student)
+        # One cached match index per curriculum version; each paper is a few lookups.
+        enrollment, index = curriculum_match_index(req_obj.admitted_student)
+        exempted = exempted_curriculum_line_ids(enrollment)
+        curriculum = index.review_rows(exempted)
+        open_ids = index.open_line_ids(exempted)
         papers = []
         for line in req_obj.exemption_lines.all():
-            suggested = line.curriculum_line_id or suggest_curriculum_match(
+            suggested = line.curriculum_line_id or index.suggest(
                 line.course_code,
-                curriculum,
                 course_name=line.course_name,
                 year_of_study=line.year_of_study,
                 term_number=line.term_number,
+                open_ids=open_ids,
             )
             papers.append(
                 {
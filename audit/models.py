@@ -15,6 +15,8 @@ class AuditLog(models.Model):
         ('passport_photo_update', 'Passport / ID photo updated at desk'),
         ('passport_photo_delete', 'Passport / ID photo removed at desk'),
         ('program_choice_admin_change', 'Programme choices updated by staff'),
+        ('results_verify', 'Examination results verified in bulk'),
+        ('results_publish', 'Examination results published in bulk'),
     ]
     
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
@@ -0,0 +1,32 @@
+"""CLI: rebuild materialized semester GPA / CGPA standings from published results."""
+from django.core.management.base import BaseCommand
+
+from examinations.models import CourseUnitResult
+from examinations.services.standing import refresh_student_standings
+
+
+class Command(BaseCommand):
+    help = "Rebuild StudentSemesterStanding rows for students with published results."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--student-id", type=int, action="append", dest="student_ids")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        student_ids = options["student_ids"]
+        if not student_ids:
+            student_ids = sorted(
+                set(
+                    CourseUnitResult.objects.filter(status=CourseUnitResult.STATUS_PUBLISHED).values_list(
+                        "enrollment__student_id", flat=True
+                    )
+                )
+            )
+        batch_size = max(1, options["batch_size"])
+        rows = 0
+        for start in range(0, len(student_ids), batch_size):
+            built = refresh_student_standings(student_ids[start : start + batch_size])
+            rows += sum(len(v) for v in built.values())
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {rows} standing row(s) for {len(student_ids)} student(s).")
+        )
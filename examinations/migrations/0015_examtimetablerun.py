@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-18 21:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examinations', '0014_retake_missed_paper_registration'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamTimetableRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('session_type', models.CharField(choices=[('regular', 'Regular'), ('retake', 'Retake'), ('supplementary', 'Supplementary')], default='regular', max_length=20)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('options', models.JSONField(blank=True, default=dict, help_text='Slots, venues, invigilator pool and course filters passed to the generator.')),
+                ('time_budget_seconds', models.PositiveIntegerField(default=60)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('sessions_created', models.PositiveIntegerField(default=0)),
+                ('report', models.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='exam_timetable_runs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='examsession',
+            name='timetable_run',
+            field=models.ForeignKey(blank=True, help_text='Generator run that drafted this session, if any.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='draft_sessions', to='examinations.examtimetablerun'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:10
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Programs', '0036_sharedteachingoffering_parent_course_unit'),
+        ('admissions', '0072_application_submission_event'),
+        ('examinations', '0015_examtimetablerun'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentSemesterStanding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sequence', models.PositiveIntegerField(default=0)),
+                ('published_count', models.PositiveIntegerField(default=0)),
+                ('failed_count', models.PositiveIntegerField(default=0)),
+                ('credits_attempted', models.DecimalField(decimal_places=1, default=Decimal('0'), max_digits=6)),
+                ('credits_graded', models.DecimalField(decimal_places=1, default=Decimal('0'), help_text='Credit units with a grade point (the GPA denominator).', max_digits=6)),
+                ('credits_earned', models.DecimalField(decimal_places=1, default=Decimal('0'), max_digits=6)),
+                ('weighted_points', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=8)),
+                ('gpa', models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True)),
+                ('cumulative_credits_graded', models.DecimalField(decimal_places=1, default=Decimal('0'), max_digits=7)),
+                ('cumulative_credits_earned', models.DecimalField(decimal_places=1, default=Decimal('0'), max_digits=7)),
+                ('cumulative_weighted_points', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=9)),
+                ('cumulative_failed_count', models.PositiveIntegerField(default=0)),
+                ('cgpa', models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True)),
+                ('award_class', models.CharField(blank=True, default='', max_length=80)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('semester', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='student_standings', to='Programs.semester')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='semester_standings', to='admissions.admittedstudent')),
+            ],
+            options={
+                'ordering': ['student', 'sequence'],
+                'constraints': [models.UniqueConstraint(fields=('student', 'semester'), name='uniq_student_semester_standing')],
+            },
+        ),
+    ]
@@ -316,7 +316,8 @@ class CourseUnitResult(models.Model):
             return self.OUTCOME_FAIL
         return ""
 
-    def recompute(self, *, grade_scale: GradeScale | None = None):
+    def recompute_marks(self):
+        """Final mark, exam eligibility, pass and outcome from CA / exam marks (no grade band)."""
         computed = compute_course_result(
             ca_mark=self.ca_mark,
             exam_mark=self.exam_mark,
@@ -329,6 +330,9 @@ class CourseUnitResult(models.Model):
         self.is_pass = computed.is_pass
         self.paper_outcome = self.derive_paper_outcome()
 
+    def recompute(self, *, grade_scale: GradeScale | None = None):
+        self.recompute_marks()
+
         if grade_scale is None:
             from .services.grade_scale_resolver import resolve_grade_scale
 
@@ -362,6 +366,62 @@ class CourseUnitResult(models.Model):
         )
 
 
+class StudentSemesterStanding(models.Model):
+    """
+    Materialized GPA / CGPA per student and semester from published results.
+
+    Rebuilt for a student whenever one of their results is published,
+    unpublished or changed (see ``examinations.services.standing``). Rows are
+    in cumulative order (``sequence``); results without a semester share one
+    row with ``semester`` empty, counted last.
+    """
+
+    student = models.ForeignKey(
+        "admissions.AdmittedStudent",
+        on_delete=models.CASCADE,
+        related_name="semester_standings",
+    )
+    semester = models.ForeignKey(
+        "Programs.Semester",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="student_standings",
+    )
+    sequence = models.PositiveIntegerField(default=0)
+    published_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    credits_attempted = models.DecimalField(max_digits=6, decimal_places=1, default=Decimal("0"))
+    credits_graded = models.DecimalField(
+        max_digits=6,
+        decimal_places=1,
+        default=Decimal("0"),
+        help_text="Credit units with a grade point (the GPA denominator).",
+    )
+    credits_earned = models.DecimalField(max_digits=6, decimal_places=1, default=Decimal("0"))
+    weighted_points = models.DecimalField(max_digits=8, decimal_places=2, default=Decimal("0"))
+    gpa = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+    cumulative_credits_graded = models.DecimalField(max_digits=7, decimal_places=1, default=Decimal("0"))
+    cumulative_credits_earned = models.DecimalField(max_digits=7, decimal_places=1, default=Decimal("0"))
+    cumulative_weighted_points = models.DecimalField(max_digits=9, decimal_places=2, default=Decimal("0"))
+    cumulative_failed_count = models.PositiveIntegerField(default=0)
+    cgpa = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+    award_class = models.CharField(max_length=80, blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["student", "sequence"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "semester"],
+                name="uniq_student_semester_standing",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} — semester {self.semester_id or '-'}: GPA {self.gpa}, CGPA {self.cgpa}"
+
+
 class ExamSession(models.Model):
     """Scheduled exam sitting for a course unit (regular, retake, or supplementary)."""
 
@@ -421,6 +481,14 @@ class ExamSession(models.Model):
         blank=True,
         related_name="created_exam_sessions",
     )
+    timetable_run = models.ForeignKey(
+        "ExamTimetableRun",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="draft_sessions",
+        help_text="Generator run that drafted this session, if any.",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -435,6 +503,55 @@ class ExamSession(models.Model):
         return f"{self.course_unit_id} — {label} ({self.exam_date})"
 
 
+class ExamTimetableRun(models.Model):
+    """Background exam timetable generation (see ``examinations.services.timetable_generator``)."""
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    session_type = models.CharField(
+        max_length=20,
+        choices=ExamSession.TYPE_CHOICES,
+        default=ExamSession.TYPE_REGULAR,
+    )
+    start_date = models.DateField()
+    end_date = models.DateField()
+    options = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Slots, venues, invigilator pool and course filters passed to the generator.",
+    )
+    time_budget_seconds = models.PositiveIntegerField(default=60)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    sessions_created = models.PositiveIntegerField(default=0)
+    report = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True, default="")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="exam_timetable_runs",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Exam timetable run #{self.pk} ({self.start_date}–{self.end_date}, {self.status})"
+
+
 class ExamRetakeRegistration(models.Model):
     """Student retake / supplementary registration for a course enrollment."""
 
@@ -4,24 +4,36 @@ import io
 
 from django.db import transaction
 from django.db.models import Count, Q
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from Programs.models import CourseUnit, ProgramBatch, StudentCourseUnitEnrollment, Venue
 
-from admissions.faculty_scope import assert_course_unit_access, assert_program_batch_access
+from admissions.faculty_scope import (
+    assert_course_unit_access,
+    assert_program_batch_access,
+    filter_exam_sessions_for_user,
+    user_faculty_ids,
+)
 
-from .models import CourseUnitResult, ExamRetakeRegistration, ExamSession
+from .models import CourseUnitResult, ExamRetakeRegistration, ExamSession, ExamTimetableRun
 from .permissions import CanManageExamSchedule, CanManageRetakes, CanViewAllResults
-from .serializers import ExamRetakeRegistrationSerializer, ExamSessionSerializer
+from .serializers import (
+    ExamRetakeRegistrationSerializer,
+    ExamSessionSerializer,
+    ExamTimetableRunRequestSerializer,
+    ExamTimetableRunSerializer,
+)
 from .services.clash import (
     evaluate_session_issues,
     wants_force,
 )
+from .services.clash_matrix import ExamClashIndex
 from .services.eligibility import evaluate_exam_eligibility, sitting_row_for_enrollment
 from .services.policy_resolver import resolve_assessment_policy
 from .views import _get_course_unit_or_404, _student_for_user
@@ -245,12 +257,18 @@ class ExamSessionBulkGenerateView(APIView):
         if semester_id:
             qs = qs.filter(semester_id=semester_id)
 
+        units = list(qs)
         existing_ids = set(
             ExamSession.objects.filter(
-                course_unit_id__in=qs.values_list("id", flat=True),
+                course_unit_id__in=[cu.id for cu in units],
                 session_type=session_type,
             ).values_list("course_unit_id", flat=True)
         )
+        # One index for the date: candidate lists for every unit and existing session load together.
+        clash_index = ExamClashIndex.for_period(
+            exam_date,
+            extra_keys=[(cu.id, session_type) for cu in units if cu.id not in existing_ids],
+        )
 
         force = wants_force(request.data)
         created_sessions = []
@@ -258,7 +276,7 @@ class ExamSessionBulkGenerateView(APIView):
         all_warnings = []
 
         # Pre-check shared venue capacity / room for first unit only as shared fields apply to all
-        sample = qs.exclude(id__in=existing_ids).first()
+        sample = next((cu for cu in units if cu.id not in existing_ids), None)
         if sample and not force:
             conflicts = evaluate_session_issues(
                 course_unit=sample,
@@ -267,6 +285,7 @@ class ExamSessionBulkGenerateView(APIView):
                 end_time=end_time,
                 venue=venue,
                 session_type=session_type,
+                clash_index=clash_index,
             )
             # Room-only conflicts matter for bulk shared venue; student clashes checked per unit below
             room_conflicts = [c for c in conflicts if c["type"] == "room"]
@@ -274,7 +293,7 @@ class ExamSessionBulkGenerateView(APIView):
                 return _conflict_response(room_conflicts)
 
         with transaction.atomic():
-            for cu in qs:
+            for cu in units:
                 if cu.id in existing_ids:
                     skipped.append(
                         {
@@ -291,6 +310,7 @@ class ExamSessionBulkGenerateView(APIView):
                     end_time=end_time,
                     venue=venue,
                     session_type=session_type,
+                    clash_index=clash_index,
                 )
                 if unit_conflicts and not force:
                     # Soft-skip capacity/student for bulk: collect and continue only if force
@@ -313,6 +333,7 @@ class ExamSessionBulkGenerateView(APIView):
                     is_published=is_published,
                     created_by=request.user,
                 )
+                clash_index.add_session(session)
                 created_sessions.append(session)
                 if unit_conflicts:
                     all_warnings.extend(
@@ -323,7 +344,9 @@ class ExamSessionBulkGenerateView(APIView):
         payload = {
             "created": len(created_sessions),
             "skipped": skipped,
-            "sessions": ExamSessionSerializer(created_sessions, many=True).data,
+            "sessions": ExamSessionSerializer(
+                created_sessions, many=True, context={"clash_index": clash_index}
+            ).data,
         }
         if all_warnings:
             payload["warnings"] = all_warnings
@@ -371,6 +394,81 @@ class ExamSessionListView(APIView):
         )
 
 
+class ExamPeriodClashReportView(APIView):
+    """Room, student, invigilator and capacity clashes across an exam period."""
+
+    permission_classes = [IsAuthenticated, CanManageExamSchedule]
+
+    def get(self, request):
+        start_date = parse_date(request.query_params.get("start_date") or "")
+        if not start_date:
+            return Response({"detail": "start_date is required (YYYY-MM-DD)."}, status=400)
+        end_raw = request.query_params.get("end_date")
+        end_date = parse_date(end_raw) if end_raw else start_date
+        if not end_date or end_date < start_date:
+            return Response({"detail": "end_date must be a date on or after start_date."}, status=400)
+
+        clash_index = ExamClashIndex.for_period(start_date, end_date)
+        visible = filter_exam_sessions_for_user(
+            ExamSession.objects.filter(exam_date__range=(start_date, end_date)), request.user
+        ).only("id")
+        report = clash_index.period_report(sessions=visible)
+        return Response({"start_date": start_date, "end_date": end_date, **report})
+
+
+def _timetable_run_or_404(request, run_id):
+    run = get_object_or_404(ExamTimetableRun, pk=run_id)
+    if run.created_by_id != request.user.id and user_faculty_ids(request.user) is not None:
+        raise Http404("Timetable run not found.")
+    return run
+
+
+class ExamTimetableRunListCreateView(APIView):
+    """Start a background timetable generation run, or list recent runs."""
+
+    permission_classes = [IsAuthenticated, CanManageExamSchedule]
+
+    def get(self, request):
+        runs = ExamTimetableRun.objects.all()
+        if user_faculty_ids(request.user) is not None:
+            runs = runs.filter(created_by=request.user)
+        return Response({"runs": ExamTimetableRunSerializer(runs[:20], many=True).data})
+
+    def post(self, request):
+        from .services.timetable_generator import start_exam_timetable_run
+
+        serializer = ExamTimetableRunRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        run = start_exam_timetable_run(
+            user=request.user,
+            start_date=data["start_date"],
+            end_date=data["end_date"],
+            session_type=data["session_type"],
+            options=serializer.options(),
+            time_budget_seconds=data["time_budget_seconds"],
+        )
+        return Response(ExamTimetableRunSerializer(run).data, status=202)
+
+
+class ExamTimetableRunDetailView(APIView):
+    """Poll a generation run; DELETE discards the run's unpublished draft sessions."""
+
+    permission_classes = [IsAuthenticated, CanManageExamSchedule]
+
+    def get(self, request, run_id):
+        run = _timetable_run_or_404(request, run_id)
+        return Response(ExamTimetableRunSerializer(run).data)
+
+    def delete(self, request, run_id):
+        run = _timetable_run_or_404(request, run_id)
+        if run.status in (ExamTimetableRun.STATUS_PENDING, ExamTimetableRun.STATUS_RUNNING):
+            return Response({"detail": "Run is still in progress."}, status=409)
+        # delete() also counts cascaded rows (invigilator links etc.); report sessions only.
+        _, per_model = ExamSession.objects.filter(timetable_run=run, is_published=False).delete()
+        return Response({"run_id": run.pk, "discarded": per_model.get(ExamSession._meta.label, 0)})
+
+
 class ExamSessionDetailView(APIView):
     permission_classes = [IsAuthenticated, CanManageExamSchedule]
 
@@ -1,6 +1,6 @@
 """Phase 3: verify workflow, bulk publish, import, transcript, reports."""
 from django.db import transaction
-from django.db.models import Count, Q
+from django.db.models import Avg, Count, Q
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
@@ -16,7 +16,7 @@ from admissions.faculty_scope import (
 from admissions.models import AdmittedStudent
 from Programs.models import CourseUnit, Semester, StudentCourseUnitEnrollment
 
-from .models import CourseUnitResult
+from .models import CourseUnitResult, StudentSemesterStanding
 from .permissions import (
     CanEnterMarksOrAssignedLecturer,
     CanPublishResults,
@@ -33,11 +33,12 @@ from .services.import_marks import (
 )
 from .services.mark_completeness import collect_incomplete_results
 from .services.marks_window import assert_marks_entry_allowed
-from .services.publish import publish_result, sync_enrollment_from_result, verify_result
+from .services.bulk_publish import bulk_publish_results, bulk_verify_results
 from .services.provisional_results_pdf import (
     render_provisional_results_html,
     render_provisional_results_pdf,
 )
+from .services.standing import ensure_semester_standings
 from .services.transcript import (
     TRANSCRIPT_REQUIRES_PUBLISHED_MARKS,
     build_student_transcript,
@@ -99,11 +100,7 @@ class VerifyCourseMarksView(APIView):
                 status=400,
             )
 
-        verified = 0
-        with transaction.atomic():
-            for result in drafts:
-                verify_result(result, user=request.user)
-                verified += 1
+        verified = bulk_verify_results(drafts, user=request.user, request=request, audit_obj=course_unit)
 
         return Response(
             {
@@ -155,9 +152,7 @@ class BulkPublishView(APIView):
                         },
                         status=400,
                     )
-                for result in draft_qs:
-                    verify_result(result, user=request.user)
-                    verified_count += 1
+                verified_count = bulk_verify_results(draft_qs, user=request.user, request=request)
 
             if not verify_only:
                 statuses = [CourseUnitResult.STATUS_VERIFIED]
@@ -175,11 +170,7 @@ class BulkPublishView(APIView):
                         },
                         status=400,
                     )
-                for result in publish_qs:
-                    if result.status == CourseUnitResult.STATUS_DRAFT:
-                        verify_result(result, user=request.user)
-                    publish_result(result, user=request.user)
-                    published_count += 1
+                published_count = bulk_publish_results(publish_qs, user=request.user, request=request)
 
         return Response(
             {
@@ -376,6 +367,23 @@ class ResultsReportView(APIView):
                     }
                 )
 
+        standing = None
+        if semester_id:
+            student_ids = set(published.values_list("enrollment__student_id", flat=True))
+            ensure_semester_standings(semester_id, student_ids)
+            standing = StudentSemesterStanding.objects.filter(
+                semester_id=semester_id,
+                student_id__in=student_ids,
+            ).aggregate(
+                students=Count("id"),
+                average_gpa=Avg("gpa"),
+                average_cgpa=Avg("cgpa"),
+                students_with_failures=Count("id", filter=Q(failed_count__gt=0)),
+            )
+            for key in ("average_gpa", "average_cgpa"):
+                if standing[key] is not None:
+                    standing[key] = round(float(standing[key]), 2)
+
         return Response(
             {
                 "by_status": by_status,
@@ -385,5 +393,6 @@ class ResultsReportView(APIView):
                 "pass_rate": pass_rate,
                 "grade_distribution": grade_distribution,
                 "courses": courses,
+                "semester_standing": standing,
             }
         )
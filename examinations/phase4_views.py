@@ -13,6 +13,7 @@ from .models import CourseUnitResult, ResultChangeRequest
 from .permissions import CanApproveResultChanges, user_can_manage_course_marks
 from .serializers import ResultChangeRequestSerializer
 from .services.publish import publish_result, sync_enrollment_from_result
+from .services.standing import refresh_student_standings
 
 
 def _apply_approved_change(change: ResultChangeRequest, *, reviewer) -> None:
@@ -26,6 +27,7 @@ def _apply_approved_change(change: ResultChangeRequest, *, reviewer) -> None:
     result.edit_unlocked = False
     result.save()
     sync_enrollment_from_result(result)
+    refresh_student_standings([result.enrollment.student_id])
     change.status = ResultChangeRequest.STATUS_APPROVED
     change.reviewed_by = reviewer
     change.reviewed_at = timezone.now()
@@ -164,6 +166,7 @@ class UnlockPublishedResultView(APIView):
         result.edit_unlocked = True
         result.status = CourseUnitResult.STATUS_VERIFIED
         result.save(update_fields=["edit_unlocked", "status", "updated_at"])
+        refresh_student_standings([result.enrollment.student_id])
         return Response(
             {
                 "detail": "Result unlocked for editing. Save marks then publish again.",
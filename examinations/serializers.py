@@ -7,6 +7,7 @@ from .models import (
     CourseUnitResult,
     ExamRetakeRegistration,
     ExamSession,
+    ExamTimetableRun,
     GradeBand,
     GradeScale,
     MarksEntryWindow,
@@ -508,6 +509,9 @@ class ExamSessionSerializer(serializers.ModelSerializer):
     def get_candidate_count(self, obj):
         from .services.clash import candidate_count
 
+        clash_index = self.context.get("clash_index")
+        if clash_index is not None:
+            return clash_index.candidate_count(obj.course_unit_id, obj.session_type)
         return candidate_count(obj.course_unit, obj.session_type)
 
     def get_invigilators(self, obj):
@@ -535,6 +539,81 @@ class ExamSessionSerializer(serializers.ModelSerializer):
         return session
 
 
+class ExamTimetableSlotSerializer(serializers.Serializer):
+    start_time = serializers.TimeField()
+    end_time = serializers.TimeField()
+
+    def validate(self, attrs):
+        if attrs["end_time"] <= attrs["start_time"]:
+            raise serializers.ValidationError("end_time must be after start_time.")
+        return attrs
+
+
+class ExamTimetableRunRequestSerializer(serializers.Serializer):
+    """Input for the timetable generator; everything but the dates is stored on ``options``."""
+
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    session_type = serializers.ChoiceField(choices=ExamSession.TYPE_CHOICES, default=ExamSession.TYPE_REGULAR)
+    slots = ExamTimetableSlotSerializer(many=True, required=False)
+    include_weekends = serializers.BooleanField(default=False)
+    excluded_dates = serializers.ListField(child=serializers.DateField(), required=False, default=list)
+    venue_ids = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    invigilator_ids = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    invigilators_per_session = serializers.IntegerField(min_value=0, max_value=20, default=1)
+    candidates_per_invigilator = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+    program_batch_ids = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    semester_id = serializers.IntegerField(required=False, allow_null=True)
+    course_unit_ids = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    time_budget_seconds = serializers.IntegerField(min_value=1, max_value=1800, default=60)
+
+    def validate(self, attrs):
+        if attrs["end_date"] < attrs["start_date"]:
+            raise serializers.ValidationError({"end_date": "end_date must be on or after start_date."})
+        if (attrs["end_date"] - attrs["start_date"]).days > 92:
+            raise serializers.ValidationError({"end_date": "An exam period cannot exceed 92 days."})
+        return attrs
+
+    def options(self) -> dict:
+        data = self.validated_data
+        return {
+            "slots": [
+                {"start_time": slot["start_time"].isoformat(), "end_time": slot["end_time"].isoformat()}
+                for slot in data.get("slots") or []
+            ],
+            "include_weekends": data["include_weekends"],
+            "excluded_dates": [d.isoformat() for d in data["excluded_dates"]],
+            "venue_ids": data["venue_ids"],
+            "invigilator_ids": data["invigilator_ids"],
+            "invigilators_per_session": data["invigilators_per_session"],
+            "candidates_per_invigilator": data.get("candidates_per_invigilator"),
+            "program_batch_ids": data["program_batch_ids"],
+            "semester_id": data.get("semester_id"),
+            "course_unit_ids": data["course_unit_ids"],
+        }
+
+
+class ExamTimetableRunSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ExamTimetableRun
+        fields = [
+            "id",
+            "session_type",
+            "start_date",
+            "end_date",
+            "options",
+            "time_budget_seconds",
+            "status",
+            "sessions_created",
+            "report",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+
 class MarksEntryWindowSerializer(serializers.ModelSerializer):
     program_batch_name = serializers.SerializerMethodField()
     semester_name = serializers.SerializerMethodField()
@@ -57,3 +57,17 @@ def resolve_award_class(
     if not bands:
         return ""
     return lookup_award_class(cgpa, bands)
+
+
+class AwardClassLookup:
+    """Award classes for many students, loading each academic level's scheme once."""
+
+    def __init__(self):
+        self._bands: dict[int | None, list[AwardClassBand]] = {}
+
+    def __call__(self, cgpa, academic_level_id: int | None) -> str:
+        if academic_level_id not in self._bands:
+            scheme = resolve_award_classification_scheme(academic_level_id=academic_level_id)
+            self._bands[academic_level_id] = list(scheme.bands.all()) if scheme else []
+        bands = self._bands[academic_level_id]
+        return lookup_award_class(cgpa, bands) if bands else ""
@@ -0,0 +1,238 @@
+"""
+Verify / publish many results at once.
+
+``bulk_verify_results`` and ``bulk_publish_results`` do what ``verify_result``
+and ``publish_result`` (plus ``sync_enrollment_from_result``) do per row, for
+a whole queryset: the grade scale is resolved once per academic level, final
+marks are mapped to grade bands with one sorted-array lookup per scale, and
+changed marks / grades are written with ``bulk_update`` and the shared status
+columns of results and enrollments with a few UPDATEs, all in one
+transaction. Each call also records one ``results_verify`` /
+``results_publish`` ``AuditLog`` entry once the transaction commits.
+"""
+from __future__ import annotations
+
+import logging
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+
+from Programs.models import StudentCourseUnitEnrollment
+
+from ..models import CourseUnitResult, GradeScale
+from .grade_scale_resolver import resolve_grade_scale
+from .scoring import lookup_grade_band
+from .standing import refresh_student_standings
+
+logger = logging.getLogger(__name__)
+
+BULK_PUBLISH_BATCH_SIZE = 500
+# Per-row values written with bulk_update; status / user / timestamp columns
+# are the same for every row and go out as plain UPDATEs.
+_RECOMPUTED_FIELDS = (
+    "ca_mark",
+    "exam_mark",
+    "final_mark",
+    "exam_sitting_allowed",
+    "is_pass",
+    "paper_outcome",
+    "grade_letter",
+    "grade_point",
+)
+
+
+def _hundredths(value: Decimal) -> int:
+    # Marks carry two decimal places and band limits one, so this is exact.
+    return int((value * 100).to_integral_value())
+
+
+class GradeBandTable:
+    """
+    Grade bands of one scale as sorted integer arrays.
+
+    ``lookup`` gives the same ``(letter, grade_point)`` as ``lookup_grade_band``
+    for every mark. When bands overlap, the first matching band in scale order
+    wins there, so the table falls back to that scan.
+    """
+
+    def __init__(self, bands):
+        self.bands = list(bands)
+        ordered = sorted(self.bands, key=lambda b: b.min_mark)
+        self._ordered = ordered
+        self._min = np.array([_hundredths(b.min_mark) for b in ordered], dtype=np.int64)
+        self._max = np.array([_hundredths(b.max_mark) for b in ordered], dtype=np.int64)
+        self._disjoint = bool(np.all(self._max[:-1] < self._min[1:])) if ordered else True
+
+    def lookup(self, final_marks: list[Decimal | None]) -> list[tuple[str, Decimal | None]]:
+        if not self._disjoint:
+            return [lookup_grade_band(mark, self.bands) for mark in final_marks]
+        if not self._ordered:
+            return [("", None)] * len(final_marks)
+        has_mark = np.fromiter((m is not None for m in final_marks), dtype=bool, count=len(final_marks))
+        marks = np.fromiter(
+            (_hundredths(m) if m is not None else 0 for m in final_marks), dtype=np.int64, count=len(final_marks)
+        )
+        idx = np.searchsorted(self._min, marks, side="right") - 1
+        safe = idx.clip(0)
+        hit = has_mark & (idx >= 0) & (marks <= self._max[safe])
+        out = []
+        for i, matched in zip(safe.tolist(), hit.tolist()):
+            if matched:
+                band = self._ordered[i]
+                out.append((band.letter, band.grade_point))
+            else:
+                out.append(("", None))
+        return out
+
+
+def _academic_level_id(course_unit) -> int | None:
+    if not course_unit.program_batch_id:
+        return None
+    program = getattr(course_unit.program_batch, "program", None)
+    return program.academic_level_id if program is not None else None
+
+
+def _recompute_all(results: list[CourseUnitResult]) -> tuple[list[CourseUnitResult], list[str]]:
+    """
+    ``recompute()`` for every result, resolving each level's grade scale once.
+    Returns the results whose marks or grade changed and the fields that did.
+    """
+    scales: dict[int | None, GradeScale | None] = {}
+    by_scale: dict[int, list[CourseUnitResult]] = {}
+    tables: dict[int, GradeBandTable] = {}
+    before = {}
+    for result in results:
+        before[result.pk] = tuple(getattr(result, f) for f in _RECOMPUTED_FIELDS)
+        result.recompute_marks()
+        level_id = _academic_level_id(result.enrollment.course_unit)
+        if level_id not in scales:
+            scale = resolve_grade_scale(academic_level_id=level_id) if level_id else GradeScale.get_active_default()
+            if scale is not None and scale.pk not in tables:
+                prefetch_related_objects([scale], "bands")
+                tables[scale.pk] = GradeBandTable(scale.bands.all())
+            scales[level_id] = scale
+        scale = scales[level_id]
+        if scale is None or result.final_mark is None:
+            result.grade_letter = ""
+            result.grade_point = None
+        else:
+            by_scale.setdefault(scale.pk, []).append(result)
+
+    for scale_id, group in by_scale.items():
+        grades = tables[scale_id].lookup([r.final_mark for r in group])
+        for result, (letter, gp) in zip(group, grades):
+            result.grade_letter = letter or ""
+            result.grade_point = gp
+
+    changed = []
+    changed_fields = set()
+    for result in results:
+        after = tuple(getattr(result, f) for f in _RECOMPUTED_FIELDS)
+        if after != before[result.pk]:
+            changed.append(result)
+            changed_fields.update(f for f, old, new in zip(_RECOMPUTED_FIELDS, before[result.pk], after) if old != new)
+    return changed, [f for f in _RECOMPUTED_FIELDS if f in changed_fields]
+
+
+def _update_by_pk(model, pks: list[int], **values) -> None:
+    for start in range(0, len(pks), BULK_PUBLISH_BATCH_SIZE):
+        model.objects.filter(pk__in=pks[start : start + BULK_PUBLISH_BATCH_SIZE]).update(**values)
+
+
+def _sync_enrollments(results: list[CourseUnitResult], now) -> None:
+    """
+    ``sync_enrollment_from_result`` for every result. Enrollments end up with
+    one of a handful of (grade, status) pairs, so there is one UPDATE per pair.
+    """
+    by_outcome: dict[tuple[str, str], list[int]] = {}
+    for result in results:
+        enr = result.enrollment
+        if result.grade_letter:
+            enr.grade = result.grade_letter
+        if result.is_pass is False:
+            enr.status = "failed"
+        elif result.is_pass is True:
+            enr.status = "completed"
+        enr.updated_at = now
+        by_outcome.setdefault((enr.grade, enr.status), []).append(enr.pk)
+    for (grade, status), pks in by_outcome.items():
+        _update_by_pk(StudentCourseUnitEnrollment, pks, grade=grade, status=status, updated_at=now)
+
+
+def _write(results: list[CourseUnitResult], changed: tuple[list[CourseUnitResult], list[str]], **values) -> None:
+    rows, fields = changed
+    if rows:
+        CourseUnitResult.objects.bulk_update(rows, fields, batch_size=BULK_PUBLISH_BATCH_SIZE)
+    _update_by_pk(CourseUnitResult, [r.pk for r in results], **values)
+
+
+def _load(results) -> list[CourseUnitResult]:
+    return list(
+        results.select_related(
+            "policy",
+            "enrollment",
+            "enrollment__course_unit__program_batch__program",
+        ).order_by("pk")
+    )
+
+
+def _audit(user, action: str, results: list[CourseUnitResult], *, request=None, obj=None) -> None:
+    from audit.utils import log_audit_event
+
+    course_ids = {r.enrollment.course_unit_id for r in results}
+    student_ids = {r.enrollment.student_id for r in results}
+    verb = "Published" if action == "results_publish" else "Verified"
+    description = (
+        f"{verb} {len(results)} result(s) across {len(course_ids)} course unit(s) "
+        f"for {len(student_ids)} student(s). Course unit ids: {sorted(course_ids)}."
+    )
+    transaction.on_commit(
+        lambda: log_audit_event(user, action, obj=obj, description=description, request=request)
+    )
+
+
+def bulk_verify_results(results, *, user, request=None, audit_obj=None) -> int:
+    """Verify (submit) every result in the queryset; returns the number verified."""
+    rows = _load(results)
+    if not rows:
+        return 0
+    now = timezone.now()
+    with transaction.atomic():
+        changed = _recompute_all(rows)
+        _write(rows, changed, status=CourseUnitResult.STATUS_VERIFIED, verified_at=now, verified_by=user, updated_at=now)
+        _audit(user, "results_verify", rows, request=request, obj=audit_obj)
+    logger.info("Bulk verified %s result(s)", len(rows))
+    return len(rows)
+
+
+def bulk_publish_results(results, *, user, request=None, audit_obj=None) -> int:
+    """
+    Publish every result in the queryset; drafts are verified on the way.
+    Enrollment grade / status and student standings are updated as well.
+    Returns the number published.
+    """
+    rows = _load(results)
+    if not rows:
+        return 0
+    now = timezone.now()
+    with transaction.atomic():
+        changed = _recompute_all(rows)
+        drafts = [r.pk for r in rows if r.status == CourseUnitResult.STATUS_DRAFT]
+        _update_by_pk(CourseUnitResult, drafts, verified_at=now, verified_by=user)
+        _write(
+            rows,
+            changed,
+            status=CourseUnitResult.STATUS_PUBLISHED,
+            published_at=now,
+            published_by=user,
+            edit_unlocked=False,
+            updated_at=now,
+        )
+        _sync_enrollments(rows, now)
+        refresh_student_standings({r.enrollment.student_id for r in rows})
+        _audit(user, "results_publish", rows, request=request, obj=audit_obj)
+    logger.info("Bulk published %s result(s)", len(rows))
+    return len(rows)
@@ -63,98 +63,29 @@ def evaluate_session_issues(
     session_type: str = ExamSession.TYPE_REGULAR,
     exclude_session_id: int | None = None,
     invigilator_ids: list[int] | None = None,
+    clash_index=None,
 ) -> list[dict[str, Any]]:
-    """Return list of conflict/capacity warning dicts (empty if clean)."""
-    conflicts: list[dict[str, Any]] = []
-
-    others = ExamSession.objects.filter(exam_date=exam_date).select_related(
-        "course_unit", "venue"
+    """
+    Return list of conflict/capacity warning dicts (empty if clean).
+
+    Pass ``clash_index`` when checking many sessions in the same period so the
+    candidate lists are loaded once; otherwise the exam date is indexed here.
+    """
+    from .clash_matrix import ExamClashIndex
+
+    if clash_index is None:
+        clash_index = ExamClashIndex.for_period(exam_date, extra_keys=[(course_unit.id, session_type)])
+    return clash_index.issues_for(
+        course_unit=course_unit,
+        exam_date=exam_date,
+        start_time=start_time,
+        end_time=end_time,
+        venue=venue,
+        max_candidates=max_candidates,
+        session_type=session_type,
+        exclude_session_id=exclude_session_id,
+        invigilator_ids=invigilator_ids,
     )
-    if exclude_session_id:
-        others = others.exclude(pk=exclude_session_id)
-    others = list(others)
-
-    # Room clashes
-    if venue is not None and not getattr(venue, "allows_parallel_sessions", False):
-        for other in others:
-            if other.venue_id != venue.pk:
-                continue
-            if _times_overlap(start_time, end_time, other.start_time, other.end_time):
-                conflicts.append(
-                    {
-                        "type": "room",
-                        "message": (
-                            f"Room clash with {other.course_unit.code} "
-                            f"({other.start_time or '—'}–{other.end_time or '—'})"
-                        ),
-                        "other_session_id": other.id,
-                        "other_course_code": other.course_unit.code,
-                    }
-                )
-
-    # Student clashes
-    my_students = candidate_student_ids(course_unit, session_type)
-    if my_students:
-        for other in others:
-            if other.course_unit_id == course_unit.id:
-                continue
-            if not _times_overlap(start_time, end_time, other.start_time, other.end_time):
-                continue
-            other_students = candidate_student_ids(other.course_unit, other.session_type)
-            overlap = my_students & other_students
-            if overlap:
-                conflicts.append(
-                    {
-                        "type": "student",
-                        "message": (
-                            f"{len(overlap)} student(s) also scheduled for "
-                            f"{other.course_unit.code} at overlapping time"
-                        ),
-                        "other_session_id": other.id,
-                        "other_course_code": other.course_unit.code,
-                        "overlap_count": len(overlap),
-                    }
-                )
-
-    # Invigilator overlaps
-    if invigilator_ids:
-        inv_set = set(invigilator_ids)
-        for other in others:
-            try:
-                other_ids = set(other.invigilators.values_list("id", flat=True))
-            except Exception:
-                other_ids = set()
-            shared = inv_set & other_ids
-            if not shared:
-                continue
-            if not _times_overlap(start_time, end_time, other.start_time, other.end_time):
-                continue
-            conflicts.append(
-                {
-                    "type": "invigilator",
-                    "message": (
-                        f"{len(shared)} invigilator(s) already assigned to "
-                        f"{other.course_unit.code} at overlapping time"
-                    ),
-                    "other_session_id": other.id,
-                    "other_course_code": other.course_unit.code,
-                }
-            )
-
-    # Capacity
-    cap = effective_capacity(venue=venue, max_candidates=max_candidates)
-    count = candidate_count(course_unit, session_type)
-    if cap is not None and count > cap:
-        conflicts.append(
-            {
-                "type": "capacity",
-                "message": f"Candidate count ({count}) exceeds effective capacity ({cap})",
-                "candidate_count": count,
-                "effective_capacity": cap,
-            }
-        )
-
-    return conflicts
 
 
 def wants_force(data) -> bool:
@@ -0,0 +1,383 @@
+"""
+Whole-period exam clash index.
+
+Loads the candidate lists for every course unit sitting in an exam period with
+two queries (regular and resit candidates), builds a sparse course × course
+co-enrolment table with NumPy and answers room, student, invigilator and
+capacity checks from memory. ``evaluate_session_issues`` and the bulk
+timetable generator use it instead of one candidate query per overlapping
+session; ``ExamClashIndex.period_report`` lists every clash in the period.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Iterable
+
+import numpy as np
+
+from Programs.models import StudentCourseUnitEnrollment
+
+from ..models import CourseUnitResult, ExamSession
+from .clash import _times_overlap, effective_capacity
+
+SITTING_REGULAR = "regular"
+SITTING_RESIT = "resit"
+
+_DAY_END_US = (24 * 3600) * 1_000_000
+
+
+def sitting_group(session_type: str) -> str:
+    """Retake and supplementary sittings share the resit candidate list."""
+    if session_type in (ExamSession.TYPE_RETAKE, ExamSession.TYPE_SUPPLEMENTARY):
+        return SITTING_RESIT
+    return SITTING_REGULAR
+
+
+def _time_us(value, default: int) -> int:
+    if value is None:
+        return default
+    return ((value.hour * 60 + value.minute) * 60 + value.second) * 1_000_000 + value.microsecond
+
+
+class CoEnrollmentMatrix:
+    """
+    Sparse symmetric table of shared candidates between sitting keys.
+
+    A key is ``(course_unit_id, sitting_group)``. Only key pairs that share at
+    least one student are stored, as sorted pair codes with their counts.
+    """
+
+    def __init__(self, keys: Iterable[tuple[int, str]], memberships: Iterable[tuple[int, int]] = ()):
+        self.keys = list(dict.fromkeys(keys))
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        n = len(self.keys)
+
+        pairs = np.asarray(list(memberships), dtype=np.int64).reshape(-1, 2)
+        if len(pairs):
+            # Rows of (student_id, key_index), deduplicated and sorted by student.
+            pairs = np.unique(pairs, axis=0)
+        students, cols = pairs[:, 0], pairs[:, 1]
+
+        self.counts = np.bincount(cols, minlength=n)
+        by_key = np.argsort(cols, kind="stable")
+        bounds = np.concatenate(([0], np.cumsum(self.counts)))
+        sorted_students = students[by_key]
+        self._members = [sorted_students[bounds[i]:bounds[i + 1]] for i in range(n)]
+
+        # Pair every row with the following rows of the same student; a student
+        # sitting k papers contributes k·(k-1)/2 pairs over k-1 passes.
+        codes = []
+        step = 1
+        while step < len(students):
+            same = students[step:] == students[:-step]
+            if not same.any():
+                break
+            a, b = cols[:-step][same], cols[step:][same]
+            codes.append(np.minimum(a, b) * n + np.maximum(a, b))
+            step += 1
+        if codes:
+            self._codes, self._shared = np.unique(np.concatenate(codes), return_counts=True)
+        else:
+            self._codes = np.empty(0, dtype=np.int64)
+            self._shared = np.empty(0, dtype=np.int64)
+
+    @classmethod
+    def load(cls, keys: Iterable[tuple[int, str]]) -> "CoEnrollmentMatrix":
+        keys = list(dict.fromkeys(keys))
+        index = {key: i for i, key in enumerate(keys)}
+        regular = [cu for cu, group in keys if group == SITTING_REGULAR]
+        resit = [cu for cu, group in keys if group == SITTING_RESIT]
+        memberships: list[tuple[int, int]] = []
+        if regular:
+            rows = StudentCourseUnitEnrollment.objects.filter(
+                course_unit_id__in=regular,
+                status="enrolled",
+                registration_date__isnull=False,
+            ).values_list("student_id", "course_unit_id")
+            memberships.extend((sid, index[(cu, SITTING_REGULAR)]) for sid, cu in rows)
+        if resit:
+            rows = StudentCourseUnitEnrollment.objects.filter(
+                course_unit_id__in=resit,
+                course_result__status=CourseUnitResult.STATUS_PUBLISHED,
+                course_result__is_pass=False,
+                registration_date__isnull=False,
+            ).values_list("student_id", "course_unit_id")
+            memberships.extend((sid, index[(cu, SITTING_RESIT)]) for sid, cu in rows)
+        return cls(keys, memberships)
+
+    def __contains__(self, key) -> bool:
+        return key in self.index
+
+    def candidate_count(self, key) -> int:
+        i = self.index.get(key)
+        return 0 if i is None else int(self.counts[i])
+
+    def candidate_ids(self, key) -> set[int]:
+        i = self.index.get(key)
+        return set() if i is None else set(self._members[i].tolist())
+
+    def overlap_counts(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Shared candidates for each (rows[i], cols[i]) key-index pair."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        n = len(self.keys)
+        codes = np.minimum(rows, cols) * n + np.maximum(rows, cols)
+        pos = np.searchsorted(self._codes, codes)
+        pos_ok = pos < len(self._codes)
+        found = np.zeros(len(codes), dtype=bool)
+        found[pos_ok] = self._codes[pos[pos_ok]] == codes[pos_ok]
+        out = np.zeros(len(codes), dtype=np.int64)
+        out[found] = self._shared[pos[found]]
+        same = rows == cols
+        out[same] = self.counts[rows[same]]
+        return out
+
+    def overlap(self, key_a, key_b) -> int:
+        a, b = self.index.get(key_a), self.index.get(key_b)
+        if a is None or b is None:
+            return 0
+        return int(self.overlap_counts(np.array([a]), np.array([b]))[0])
+
+    def pairs(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Key-index pairs (a < b) sharing candidates, with the shared counts."""
+        n = max(len(self.keys), 1)
+        return self._codes // n, self._codes % n, self._shared
+
+    def shared_ids(self, key_a, key_b) -> np.ndarray:
+        a, b = self.index.get(key_a), self.index.get(key_b)
+        if a is None or b is None:
+            return np.empty(0, dtype=np.int64)
+        return np.intersect1d(self._members[a], self._members[b], assume_unique=True)
+
+
+class ExamClashIndex:
+    """In-memory view of every session, candidate list and invigilator in an exam period."""
+
+    def __init__(self, sessions: Iterable[ExamSession], invigilators=None, extra_keys=(), matrix=None):
+        self.sessions = list(sessions)
+        self._by_date: dict[Any, list[ExamSession]] = defaultdict(list)
+        for session in self.sessions:
+            self._by_date[session.exam_date].append(session)
+        self._invigilators: dict[int, set[int]] = defaultdict(set, invigilators or {})
+        keys = [self.key_for(s.course_unit_id, s.session_type) for s in self.sessions]
+        keys += [self.key_for(cu, st) for cu, st in extra_keys]
+        self.matrix = matrix if matrix is not None else CoEnrollmentMatrix.load(keys)
+
+    @staticmethod
+    def key_for(course_unit_id: int, session_type: str) -> tuple[int, str]:
+        return (course_unit_id, sitting_group(session_type or ExamSession.TYPE_REGULAR))
+
+    @classmethod
+    def for_period(cls, start_date, end_date=None, *, extra_keys=()) -> "ExamClashIndex":
+        """
+        Load every session dated ``start_date``..``end_date`` (inclusive).
+
+        ``extra_keys`` are ``(course_unit_id, session_type)`` pairs about to be
+        scheduled so their candidates are loaded with the rest.
+        """
+        sessions = list(
+            ExamSession.objects.filter(exam_date__range=(start_date, end_date or start_date)).select_related(
+                "course_unit", "venue"
+            )
+        )
+        through = ExamSession.invigilators.through
+        field = ExamSession.invigilators.field
+        invigilators: dict[int, set[int]] = defaultdict(set)
+        if sessions:
+            rows = through.objects.filter(
+                **{f"{field.m2m_field_name()}_id__in": [s.pk for s in sessions]}
+            ).values_list(f"{field.m2m_field_name()}_id", f"{field.m2m_reverse_field_name()}_id")
+            for session_id, staff_id in rows:
+                invigilators[session_id].add(staff_id)
+        return cls(sessions, invigilators, extra_keys=extra_keys)
+
+    def add_session(self, session: ExamSession, invigilator_ids: Iterable[int] = ()) -> None:
+        """Register a session created after the index was built (bulk generation)."""
+        key = self.key_for(session.course_unit_id, session.session_type)
+        if key not in self.matrix:
+            self.matrix = CoEnrollmentMatrix.load(self.matrix.keys + [key])
+        self.sessions.append(session)
+        self._by_date[session.exam_date].append(session)
+        self._invigilators[session.pk] = set(invigilator_ids)
+
+    def invigilators_for(self, session_id: int) -> set[int]:
+        return set(self._invigilators.get(session_id, ()))
+
+    def candidate_count(self, course_unit_id: int, session_type: str) -> int:
+        key = self.key_for(course_unit_id, session_type)
+        if key not in self.matrix:
+            self.matrix = CoEnrollmentMatrix.load(self.matrix.keys + [key])
+        return self.matrix.candidate_count(key)
+
+    def issues_for(
+        self,
+        *,
+        course_unit,
+        exam_date,
+        start_time=None,
+        end_time=None,
+        venue=None,
+        max_candidates=None,
+        session_type: str = ExamSession.TYPE_REGULAR,
+        exclude_session_id: int | None = None,
+        invigilator_ids: list[int] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Same warnings as ``evaluate_session_issues``, answered from the index."""
+        conflicts: list[dict[str, Any]] = []
+        others = [
+            s for s in self._by_date.get(exam_date, ())
+            if not (exclude_session_id and s.pk == exclude_session_id)
+        ]
+        overlapping = [
+            s for s in others if _times_overlap(start_time, end_time, s.start_time, s.end_time)
+        ]
+
+        if venue is not None and not getattr(venue, "allows_parallel_sessions", False):
+            for other in overlapping:
+                if other.venue_id != venue.pk:
+                    continue
+                conflicts.append(
+                    {
+                        "type": "room",
+                        "message": (
+                            f"Room clash with {other.course_unit.code} "
+                            f"({other.start_time or '—'}–{other.end_time or '—'})"
+                        ),
+                        "other_session_id": other.id,
+                        "other_course_code": other.course_unit.code,
+                    }
+                )
+
+        count = self.candidate_count(course_unit.id, session_type)
+        my_key = self.key_for(course_unit.id, session_type)
+        if count:
+            for other in overlapping:
+                if other.course_unit_id == course_unit.id:
+                    continue
+                shared = self.matrix.overlap(my_key, self.key_for(other.course_unit_id, other.session_type))
+                if shared:
+                    conflicts.append(
+                        {
+                            "type": "student",
+                            "message": (
+                                f"{shared} student(s) also scheduled for "
+                                f"{other.course_unit.code} at overlapping time"
+                            ),
+                            "other_session_id": other.id,
+                            "other_course_code": other.course_unit.code,
+                            "overlap_count": shared,
+                        }
+                    )
+
+        if invigilator_ids:
+            inv_set = set(invigilator_ids)
+            for other in overlapping:
+                shared_staff = inv_set & self._invigilators.get(other.pk, set())
+                if not shared_staff:
+                    continue
+                conflicts.append(
+                    {
+                        "type": "invigilator",
+                        "message": (
+                            f"{len(shared_staff)} invigilator(s) already assigned to "
+                            f"{other.course_unit.code} at overlapping time"
+                        ),
+                        "other_session_id": other.id,
+                        "other_course_code": other.course_unit.code,
+                    }
+                )
+
+        cap = effective_capacity(venue=venue, max_candidates=max_candidates)
+        if cap is not None and count > cap:
+            conflicts.append(
+                {
+                    "type": "capacity",
+                    "message": f"Candidate count ({count}) exceeds effective capacity ({cap})",
+                    "candidate_count": count,
+                    "effective_capacity": cap,
+                }
+            )
+        return conflicts
+
+    def period_report(self, sessions: Iterable[ExamSession] | None = None) -> dict[str, Any]:
+        """
+        Every room, student, invigilator and capacity clash in the period.
+
+        Pairwise checks run per exam date as vectorised time-overlap masks;
+        ``sessions`` limits the report to clashes involving those sessions
+        (e.g. a faculty-scoped subset) while still checking them against all.
+        """
+        focus = None if sessions is None else {s.pk for s in sessions}
+        clashes: list[dict[str, Any]] = []
+        capacity: list[dict[str, Any]] = []
+        clashing_students: set[int] = set()
+
+        for exam_date in sorted(self._by_date):
+            day = self._by_date[exam_date]
+            starts = np.array([_time_us(s.start_time, 0) for s in day], dtype=np.int64)
+            ends = np.array([_time_us(s.end_time, _DAY_END_US) for s in day], dtype=np.int64)
+            overlaps = (starts[:, None] < ends[None, :]) & (starts[None, :] < ends[:, None])
+            ii, jj = np.nonzero(np.triu(overlaps, k=1))
+            if focus is not None and len(ii):
+                ids = np.array([s.pk for s in day])
+                keep = np.isin(ids[ii], list(focus)) | np.isin(ids[jj], list(focus))
+                ii, jj = ii[keep], jj[keep]
+
+            key_idx = np.array(
+                [self.matrix.index[self.key_for(s.course_unit_id, s.session_type)] for s in day],
+                dtype=np.int64,
+            )
+            shared_counts = self.matrix.overlap_counts(key_idx[ii], key_idx[jj]) if len(ii) else []
+
+            for i, j, shared in zip(ii.tolist(), jj.tolist(), list(shared_counts)):
+                a, b = day[i], day[j]
+                pair = {
+                    "exam_date": exam_date,
+                    "session_ids": [a.pk, b.pk],
+                    "course_codes": [a.course_unit.code, b.course_unit.code],
+                }
+                if (
+                    a.venue_id
+                    and a.venue_id == b.venue_id
+                    and not getattr(a.venue, "allows_parallel_sessions", False)
+                ):
+                    clashes.append({"type": "room", **pair})
+                if shared and a.course_unit_id != b.course_unit_id:
+                    clashes.append({"type": "student", **pair, "overlap_count": int(shared)})
+                    clashing_students.update(
+                        self.matrix.shared_ids(
+                            self.key_for(a.course_unit_id, a.session_type),
+                            self.key_for(b.course_unit_id, b.session_type),
+                        ).tolist()
+                    )
+                staff = self._invigilators.get(a.pk, set()) & self._invigilators.get(b.pk, set())
+                if staff:
+                    clashes.append({"type": "invigilator", **pair, "invigilator_count": len(staff)})
+
+            for session in day:
+                if focus is not None and session.pk not in focus:
+                    continue
+                cap = effective_capacity(session)
+                count = self.candidate_count(session.course_unit_id, session.session_type)
+                if cap is not None and count > cap:
+                    capacity.append(
+                        {
+                            "exam_date": exam_date,
+                            "session_id": session.pk,
+                            "course_code": session.course_unit.code,
+                            "candidate_count": count,
+                            "effective_capacity": cap,
+                        }
+                    )
+
+        by_type: dict[str, int] = defaultdict(int)
+        for clash in clashes:
+            by_type[clash["type"]] += 1
+        by_type["capacity"] = len(capacity)
+        return {
+            "session_count": len(self.sessions) if focus is None else len(focus),
+            "clash_counts": {t: by_type.get(t, 0) for t in ("room", "student", "invigilator", "capacity")},
+            "students_with_clashes": len(clashing_students),
+            "clashes": clashes,
+            "capacity": capacity,
+        }
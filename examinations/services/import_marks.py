@@ -1,19 +1,42 @@
 """Import CA and exam marks from Excel or CSV (reg_no, ca_mark, exam_mark)."""
 from __future__ import annotations
 
+import copy
 import csv
 import io
 from decimal import Decimal, InvalidOperation
 from io import BytesIO
 
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.db.models.functions import Lower
+from django.utils import timezone
 from openpyxl import load_workbook
 
 from Programs.models import StudentCourseUnitEnrollment
 
 from ..models import CourseUnitResult
+from .grade_scale_resolver import resolve_grade_scale
 from .policy_resolver import resolve_assessment_policy
 
+IMPORT_MARKS_BATCH_SIZE = 500
+_RESULT_UPDATE_FIELDS = (
+    "policy",
+    "ca_mark",
+    "exam_mark",
+    "final_mark",
+    "exam_sitting_allowed",
+    "is_pass",
+    "paper_outcome",
+    "grade_letter",
+    "grade_point",
+    "status",
+    "entered_by",
+    "updated_at",
+)
+_RESULT_RELATED_FIELDS = ("enrollment", "policy", "entered_by", "published_by", "verified_by")
+
 
 def _cell_value(cell):
     if cell is None:
@@ -181,75 +204,108 @@ def build_marks_entry_csv(course_unit) -> tuple[str, str]:
     return filename, "\ufeff" + buf.getvalue()
 
 
+def _enrollments_by_reg_no(course_unit, reg_nos) -> dict:
+    """Enrolled rows on ``course_unit`` keyed by lower-cased reg_no (one query, rows locked)."""
+    keys = {str(reg).lower() for reg in reg_nos if reg}
+    if not keys:
+        return {}
+    enrollments = (
+        StudentCourseUnitEnrollment.objects.filter(course_unit=course_unit, status="enrolled")
+        .annotate(_reg_key=Lower("student__reg_no"))
+        .filter(_reg_key__in=keys)
+        .select_related("student", "student__application", "course_result")
+        .select_for_update(of=("self",))
+        .order_by("pk")
+    )
+    by_reg: dict = {}
+    for enrollment in enrollments:
+        by_reg.setdefault(enrollment._reg_key, enrollment)
+    return by_reg
+
+
 def import_marks_for_course(course_unit, rows: list[dict], *, user) -> dict:
-    """Apply import rows; returns {saved, errors}."""
-    if not resolve_assessment_policy(course_unit=course_unit):
+    """Apply import rows; returns {saved, errors}.
+
+    The assessment policy and grade scale depend only on the course's academic
+    level, so both are resolved once. Reg numbers are matched to enrollments in
+    one query, results are computed and validated in memory, and new / changed
+    ``CourseUnitResult`` rows are written with ``bulk_create`` / ``bulk_update``
+    in a single transaction.
+    """
+    policy = resolve_assessment_policy(course_unit=course_unit)
+    if not policy:
         raise ValidationError("No assessment policy configured.")
+    grade_scale = resolve_grade_scale(course_unit=course_unit)
+    if grade_scale is not None:
+        prefetch_related_objects([grade_scale], "bands")
 
     saved = []
     errors = []
+    # enrollment_id -> result to write; a reg_no repeated in the file updates the same row.
+    pending: dict[int, CourseUnitResult] = {}
+
+    with transaction.atomic():
+        enrollments = _enrollments_by_reg_no(course_unit, [row.get("reg_no", "") for row in rows])
+        now = timezone.now()
+
+        for row in rows:
+            reg = row.get("reg_no", "")
+            enrollment = enrollments.get(str(reg).lower()) if reg else None
+            if enrollment is None:
+                errors.append({"reg_no": reg, "detail": "Student not enrolled on this course."})
+                continue
+
+            if enrollment.student.application and enrollment.student.application.is_revoked:
+                errors.append({"reg_no": reg, "detail": "Admission revoked."})
+                continue
+
+            if enrollment.registration_date is None:
+                errors.append(
+                    {"reg_no": reg, "detail": "Student has not registered for this course."}
+                )
+                continue
+
+            current = pending.get(enrollment.pk) or getattr(enrollment, "course_result", None)
+            if current is None:
+                current = CourseUnitResult(enrollment=enrollment, policy=policy, entered_by=user)
+
+            if current.status == CourseUnitResult.STATUS_PUBLISHED and not current.edit_unlocked:
+                errors.append(
+                    {"reg_no": reg, "detail": "Published — request a grade change or unlock first."}
+                )
+                continue
+
+            # Edit a copy so a row that fails validation leaves the last good values in place.
+            result = copy.copy(current)
+            result.policy = policy
+            if row.get("ca_mark") is not None:
+                result.ca_mark = row["ca_mark"]
+            if row.get("exam_mark") is not None:
+                result.exam_mark = row["exam_mark"]
+            result.entered_by = user
+            if result.status == CourseUnitResult.STATUS_PUBLISHED:
+                result.status = CourseUnitResult.STATUS_VERIFIED
+            elif result.status != CourseUnitResult.STATUS_VERIFIED:
+                result.status = CourseUnitResult.STATUS_DRAFT
+
+            try:
+                result.recompute(grade_scale=grade_scale)
+                # Foreign keys come from rows loaded above; the enrollment has at most one result.
+                result.full_clean(exclude=_RESULT_RELATED_FIELDS, validate_unique=False)
+            except Exception as exc:
+                errors.append({"reg_no": reg, "detail": str(exc)})
+                continue
+            result.updated_at = now
+            pending[enrollment.pk] = result
+            saved.append(reg)
 
-    for row in rows:
-        reg = row.get("reg_no", "")
-        try:
-            enrollment = StudentCourseUnitEnrollment.objects.select_related(
-                "student",
-                "student__application",
-                "course_result",
-                "course_unit",
-                "course_unit__program_batch__program__academic_level",
-            ).get(
-                course_unit=course_unit,
-                status="enrolled",
-                student__reg_no__iexact=reg,
-            )
-        except StudentCourseUnitEnrollment.DoesNotExist:
-            errors.append({"reg_no": reg, "detail": "Student not enrolled on this course."})
-            continue
-
-        if enrollment.student.application and enrollment.student.application.is_revoked:
-            errors.append({"reg_no": reg, "detail": "Admission revoked."})
-            continue
-
-        if enrollment.registration_date is None:
-            errors.append(
-                {"reg_no": reg, "detail": "Student has not registered for this course."}
-            )
-            continue
-
-        policy = resolve_assessment_policy(enrollment=enrollment)
-        if not policy:
-            errors.append({"reg_no": reg, "detail": "No assessment policy configured."})
-            continue
-
-        result, _ = CourseUnitResult.objects.get_or_create(
-            enrollment=enrollment,
-            defaults={"policy": policy, "entered_by": user},
+        CourseUnitResult.objects.bulk_create(
+            [r for r in pending.values() if r.pk is None], batch_size=IMPORT_MARKS_BATCH_SIZE
+        )
+        CourseUnitResult.objects.bulk_update(
+            [r for r in pending.values() if r.pk is not None],
+            _RESULT_UPDATE_FIELDS,
+            batch_size=IMPORT_MARKS_BATCH_SIZE,
         )
-
-        if result.status == CourseUnitResult.STATUS_PUBLISHED and not result.edit_unlocked:
-            errors.append(
-                {"reg_no": reg, "detail": "Published — request a grade change or unlock first."}
-            )
-            continue
-
-        result.policy = policy
-        if row.get("ca_mark") is not None:
-            result.ca_mark = row["ca_mark"]
-        if row.get("exam_mark") is not None:
-            result.exam_mark = row["exam_mark"]
-        result.entered_by = user
-        if result.status == CourseUnitResult.STATUS_PUBLISHED:
-            result.status = CourseUnitResult.STATUS_VERIFIED
-        elif result.status != CourseUnitResult.STATUS_VERIFIED:
-            result.status = CourseUnitResult.STATUS_DRAFT
-
-        try:
-            result.recompute()
-            result.full_clean()
-            result.save()
-            saved.append(reg)
-        except Exception as exc:
-            errors.append({"reg_no": reg, "detail": str(exc)})
 
     return {"saved_count": len(saved), "saved": saved, "errors": errors}
@@ -20,6 +20,7 @@ from .graduation_status import (
 )
 from .award_classification import resolve_award_class
 from .program_display import program_award_display_name
+from .standing import get_student_standings, overall_standing
 from .transcript import build_student_transcript
 
 PROVISIONAL_DISCLAIMER = (
@@ -303,20 +304,18 @@ def build_provisional_results_context(
             program_batch=program_batch, is_active=True
         ).order_by("year_of_study", "term_number", "order")
 
+    standings = get_student_standings(student)
+    standings_by_semester = {st.semester_id: st for st in standings}
+
     panels = []
     cumulative_credits = Decimal("0")
     cumulative_weighted = Decimal("0")
 
     for sem in semesters_qs:
         courses = by_semester_id.get(sem.id, [])
-        term_credits = Decimal("0")
-        term_weighted = Decimal("0")
-        for c in courses:
-            cu = Decimal(str(c["credit_units"] or 0))
-            gp = c.get("grade_point")
-            if cu and gp is not None:
-                term_credits += cu
-                term_weighted += cu * Decimal(str(gp))
+        standing = standings_by_semester.get(sem.id)
+        term_credits = standing.credits_graded if standing else Decimal("0")
+        term_weighted = standing.weighted_points if standing else Decimal("0")
 
         cumulative_credits += term_credits
         cumulative_weighted += term_weighted
@@ -393,8 +392,8 @@ def build_provisional_results_context(
         panels, max_years=max_years, academic_year_label=academic_year_label
     )
 
-    summary = build_student_transcript(student).get("summary", {})
-    cgpa_final = summary.get("cgpa")
+    overall = overall_standing(standings)
+    cgpa_final = float(overall.cgpa) if overall and overall.cgpa is not None else None
 
     assignment = _latest_graduation_assignment(student)
     class_of_award = (resolve_award_class(cgpa_final, student=student) or "").upper()
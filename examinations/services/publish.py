@@ -4,6 +4,7 @@ from django.utils import timezone
 from Programs.models import StudentCourseUnitEnrollment
 
 from ..models import CourseUnitResult
+from .standing import refresh_student_standings
 
 
 def sync_enrollment_from_result(result: CourseUnitResult) -> None:
@@ -17,10 +18,12 @@ def sync_enrollment_from_result(result: CourseUnitResult) -> None:
     enr.save(update_fields=["grade", "status", "updated_at"])
 
 
-def unpublish_result(result: CourseUnitResult, *, user=None) -> None:
+def unpublish_result(result: CourseUnitResult, *, user=None, refresh_standing: bool = True) -> None:
     """
     Hide result from students again (back to verified / submitted).
     Keeps marks; enrollment returns to enrolled so the row stays on Marks.
+    Pass ``refresh_standing=False`` when unpublishing many results and call
+    ``refresh_student_standings`` once afterwards.
     """
     result.status = CourseUnitResult.STATUS_VERIFIED
     result.published_at = None
@@ -45,9 +48,11 @@ def unpublish_result(result: CourseUnitResult, *, user=None) -> None:
     if enr.status in ("completed", "failed"):
         enr.status = "enrolled"
         enr.save(update_fields=["status", "updated_at"])
+    if refresh_standing:
+        refresh_student_standings([enr.student_id])
 
 
-def publish_result(result: CourseUnitResult, *, user, grade_scale=None) -> None:
+def publish_result(result: CourseUnitResult, *, user, grade_scale=None, refresh_standing: bool = True) -> None:
     result.recompute(grade_scale=grade_scale)
     result.status = CourseUnitResult.STATUS_PUBLISHED
     result.published_at = timezone.now()
@@ -55,6 +60,8 @@ def publish_result(result: CourseUnitResult, *, user, grade_scale=None) -> None:
     result.edit_unlocked = False
     result.save()
     sync_enrollment_from_result(result)
+    if refresh_standing:
+        refresh_student_standings([result.enrollment.student_id])
 
 
 def verify_result(result: CourseUnitResult, *, user, grade_scale=None) -> None:
@@ -0,0 +1,206 @@
+"""
+Materialized academic standing (semester GPA / CGPA) per student.
+
+``refresh_student_standings`` rebuilds the ``StudentSemesterStanding`` rows
+of the given students from their published results; the publish, unpublish,
+unlock and change-approval paths call it so readers (transcripts, results
+pages, provisional results PDF, graduation lists) never walk result rows
+for GPAs. Every other write that changes an input (result edits and deletes,
+course unit credit units / semester, programme or academic level) queues a
+rebuild after commit through ``queue_standing_refresh`` (see
+``examinations.signals``). Readers go through ``get_student_standings`` /
+``standings_for_students``, which build missing rows on first use.
+"""
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Callable, Iterable
+
+from django.db import transaction
+
+from admissions.models import AdmittedStudent
+
+from ..models import CourseUnitResult, StudentSemesterStanding
+from .award_classification import AwardClassLookup
+
+logger = logging.getLogger(__name__)
+
+# Rebuilds for more students than this run on a worker.
+STANDING_INLINE_MAX = 50
+ZERO = Decimal("0")
+TWO_PLACES = Decimal("0.01")
+
+
+def _ratio(points: Decimal, credits: Decimal) -> Decimal | None:
+    if not credits:
+        return None
+    return (points / credits).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
+
+
+def build_standings(
+    rows: Iterable[tuple],
+    award_class_for: Callable[[int, Decimal | None], str] | None = None,
+) -> dict[int, list[StudentSemesterStanding]]:
+    """
+    Unsaved standing rows per student from published result rows.
+
+    ``rows`` are ``(student_id, semester_id, semester_order, credit_units,
+    grade_point, is_pass)``. A result counts towards the GPA when it has both
+    credit units and a grade point, as on the transcript.
+    """
+    blocks: dict[int, dict] = defaultdict(dict)
+    for student_id, semester_id, semester_order, credit_units, grade_point, is_pass in rows:
+        block = blocks[student_id].setdefault(
+            semester_id,
+            {
+                "order": semester_order,
+                "published": 0,
+                "failed": 0,
+                "attempted": ZERO,
+                "graded": ZERO,
+                "earned": ZERO,
+                "points": ZERO,
+            },
+        )
+        credits = credit_units or ZERO
+        block["published"] += 1
+        block["attempted"] += credits
+        if is_pass is False:
+            block["failed"] += 1
+        if is_pass is True:
+            block["earned"] += credits
+        if credits and grade_point is not None:
+            block["graded"] += credits
+            block["points"] += credits * grade_point
+
+    standings: dict[int, list[StudentSemesterStanding]] = {}
+    for student_id, by_semester in blocks.items():
+        ordered = sorted(
+            by_semester.items(),
+            key=lambda item: (item[0] is None, item[1]["order"] or 0, item[0] or 0),
+        )
+        cum_graded = cum_earned = cum_points = ZERO
+        cum_failed = 0
+        rows_out = []
+        for sequence, (semester_id, block) in enumerate(ordered, start=1):
+            cum_graded += block["graded"]
+            cum_earned += block["earned"]
+            cum_points += block["points"]
+            cum_failed += block["failed"]
+            cgpa = _ratio(cum_points, cum_graded)
+            rows_out.append(
+                StudentSemesterStanding(
+                    student_id=student_id,
+                    semester_id=semester_id,
+                    sequence=sequence,
+                    published_count=block["published"],
+                    failed_count=block["failed"],
+                    credits_attempted=block["attempted"],
+                    credits_graded=block["graded"],
+                    credits_earned=block["earned"],
+                    weighted_points=block["points"],
+                    gpa=_ratio(block["points"], block["graded"]),
+                    cumulative_credits_graded=cum_graded,
+                    cumulative_credits_earned=cum_earned,
+                    cumulative_weighted_points=cum_points,
+                    cumulative_failed_count=cum_failed,
+                    cgpa=cgpa,
+                    award_class=award_class_for(student_id, cgpa) if award_class_for else "",
+                )
+            )
+        standings[student_id] = rows_out
+    return standings
+
+
+def refresh_student_standings(student_ids: Iterable[int]) -> dict[int, list[StudentSemesterStanding]]:
+    """Rebuild standing rows for these students from their published results."""
+    student_ids = sorted({int(sid) for sid in student_ids if sid})
+    if not student_ids:
+        return {}
+    rows = CourseUnitResult.objects.filter(
+        enrollment__student_id__in=student_ids,
+        status=CourseUnitResult.STATUS_PUBLISHED,
+    ).values_list(
+        "enrollment__student_id",
+        "enrollment__course_unit__semester_id",
+        "enrollment__course_unit__semester__order",
+        "enrollment__course_unit__credit_units",
+        "grade_point",
+        "is_pass",
+    )
+    levels = dict(
+        AdmittedStudent.objects.filter(pk__in=student_ids).values_list(
+            "id", "programme_enrollment__program__academic_level_id"
+        )
+    )
+    award_class = AwardClassLookup()
+    standings = build_standings(rows, lambda sid, cgpa: award_class(cgpa, levels.get(sid)))
+    with transaction.atomic():
+        StudentSemesterStanding.objects.filter(student_id__in=student_ids).delete()
+        StudentSemesterStanding.objects.bulk_create(
+            [row for sid in student_ids for row in standings.get(sid, [])],
+            batch_size=1000,
+        )
+    return {sid: standings.get(sid, []) for sid in student_ids}
+
+
+def queue_standing_refresh(student_ids: Iterable[int]) -> None:
+    """Rebuild after commit: inline for a few students, on a worker for many."""
+    ids = sorted({int(sid) for sid in student_ids if sid})
+    if not ids:
+        return
+
+    def _run():
+        try:
+            if len(ids) <= STANDING_INLINE_MAX:
+                refresh_student_standings(ids)
+                return
+            from examinations.tasks import celery_refresh_student_standings
+
+            celery_refresh_student_standings.delay(ids)
+        except Exception:
+            logger.exception("standing refresh failed for %s students", len(ids))
+
+    transaction.on_commit(_run)
+
+
+def ensure_semester_standings(semester_id, student_ids: Iterable[int]) -> None:
+    """Build standings for students with results in this semester but no row for it yet."""
+    student_ids = set(student_ids)
+    built = set(
+        StudentSemesterStanding.objects.filter(semester_id=semester_id, student_id__in=student_ids).values_list(
+            "student_id", flat=True
+        )
+    )
+    if student_ids - built:
+        refresh_student_standings(student_ids - built)
+
+
+def standings_for_students(student_ids: Iterable[int]) -> dict[int, list[StudentSemesterStanding]]:
+    """Standing rows per student in cumulative order; students never built are built now."""
+    student_ids = list(dict.fromkeys(student_ids))
+    out: dict[int, list[StudentSemesterStanding]] = {sid: [] for sid in student_ids}
+    for row in StudentSemesterStanding.objects.filter(student_id__in=student_ids).order_by("student_id", "sequence"):
+        out[row.student_id].append(row)
+    missing = [sid for sid, rows in out.items() if not rows]
+    if missing:
+        has_results = set(
+            CourseUnitResult.objects.filter(
+                enrollment__student_id__in=missing,
+                status=CourseUnitResult.STATUS_PUBLISHED,
+            ).values_list("enrollment__student_id", flat=True)
+        )
+        if has_results:
+            out.update(refresh_student_standings(has_results))
+    return out
+
+
+def get_student_standings(student: AdmittedStudent) -> list[StudentSemesterStanding]:
+    return standings_for_students([student.pk])[student.pk]
+
+
+def overall_standing(standings: list[StudentSemesterStanding]) -> StudentSemesterStanding | None:
+    """The last row carries the cumulative totals and CGPA."""
+    return standings[-1] if standings else None
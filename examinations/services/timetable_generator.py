@@ -0,0 +1,537 @@
+"""
+Automatic exam timetable generation on top of the period clash index.
+
+``generate_exam_timetable`` drafts one unpublished ``ExamSession`` per course
+unit with candidates into the slots of an exam period. Units are coloured
+greedily, most constrained first, against a running per-slot clash cost; a
+repair pass then moves units that still clash or overflow their room while
+the time budget lasts. Venues are picked best-fit by capacity and
+invigilators are spread over the pool. Sessions already in the period are
+fixed obstacles. Staff start a run with ``start_exam_timetable_run``; the
+worker calls ``run_exam_timetable_job``.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import time as _time
+from dataclasses import dataclass, field
+from datetime import date, time, timedelta
+from typing import Any, Iterable
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from Programs.models import CourseUnit, Venue
+
+from ..models import ExamSession, ExamTimetableRun
+from .clash_matrix import _DAY_END_US, CoEnrollmentMatrix, ExamClashIndex, _time_us
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOT_TIMES = (("09:00", "12:00"), ("14:00", "17:00"))
+# Cap on clash rows copied into a run report; counts always cover everything.
+REPORT_CLASH_LIMIT = 500
+
+
+@dataclass(frozen=True)
+class Slot:
+    exam_date: date
+    start_time: time
+    end_time: time
+
+
+@dataclass
+class FixedSession:
+    """A session already on the timetable that generated sessions must work around."""
+
+    key_index: int
+    exam_date: date
+    start_time: time | None
+    end_time: time | None
+    venue_id: int | None = None
+    candidates: int = 0
+    invigilator_ids: set[int] = field(default_factory=set)
+
+
+@dataclass
+class VenueOption:
+    id: int
+    capacity: int | None
+    allows_parallel_sessions: bool = False
+
+
+def _as_time(value) -> time:
+    return value if isinstance(value, time) else time.fromisoformat(str(value))
+
+
+def build_slots(
+    start_date: date,
+    end_date: date,
+    slot_times: Iterable = DEFAULT_SLOT_TIMES,
+    *,
+    include_weekends: bool = False,
+    excluded_dates: Iterable[date] = (),
+) -> list[Slot]:
+    """Every (date, start, end) slot in the period, weekends and excluded dates skipped."""
+    times = []
+    for start, end in slot_times:
+        start, end = _as_time(start), _as_time(end)
+        if end <= start:
+            raise ValueError(f"Slot {start}–{end} must end after it starts.")
+        times.append((start, end))
+    excluded = set(excluded_dates)
+    slots = []
+    day = start_date
+    while day <= end_date:
+        if day not in excluded and (include_weekends or day.weekday() < 5):
+            slots.extend(Slot(day, start, end) for start, end in times)
+        day += timedelta(days=1)
+    return slots
+
+
+class TimetableSolver:
+    """
+    Greedy colouring with repair over a co-enrolment matrix.
+
+    ``unit_keys`` index into ``matrix.keys``; each unit gets a slot and, when
+    venues are given, a venue. A placement is scored lexicographically by
+    students clashing, seats over capacity, students with another paper the
+    same day, then seats already in the slot (to spread the load).
+    """
+
+    def __init__(
+        self,
+        matrix: CoEnrollmentMatrix,
+        unit_keys: list[int],
+        slots: list[Slot],
+        *,
+        venues: list[VenueOption] = (),
+        fixed: list[FixedSession] = (),
+        invigilator_ids: list[int] = (),
+        invigilators_per_session: int = 0,
+        candidates_per_invigilator: int | None = None,
+    ):
+        if not slots:
+            raise ValueError("No exam slots in the period.")
+        self.slots = list(slots)
+        self.units = np.asarray(unit_keys, dtype=np.int64)
+        self.counts = matrix.counts[self.units] if len(self.units) else np.zeros(0, dtype=np.int64)
+        n, t = len(self.units), len(self.slots)
+
+        starts = np.array([_time_us(s.start_time, 0) for s in self.slots], dtype=np.int64)
+        ends = np.array([_time_us(s.end_time, _DAY_END_US) for s in self.slots], dtype=np.int64)
+        days = np.array([s.exam_date.toordinal() for s in self.slots], dtype=np.int64)
+        same_day = days[:, None] == days[None, :]
+        overlap = same_day & (starts[:, None] < ends[None, :]) & (starts[None, :] < ends[:, None])
+        self._overlapping = [np.flatnonzero(row) for row in overlap]
+        self._same_day = [np.flatnonzero(row) for row in same_day & ~overlap]
+
+        # Neighbour lists (CSR) over all matrix keys, both directions.
+        a, b, shared = matrix.pairs()
+        rows = np.concatenate((a, b))
+        order = np.argsort(rows, kind="stable")
+        self._nbr_keys = np.concatenate((b, a))[order]
+        self._nbr_weight = np.concatenate((shared, shared))[order]
+        self._indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=len(matrix.keys)))))
+        self._node_of_key = np.full(len(matrix.keys), -1, dtype=np.int64)
+        self._node_of_key[self.units] = np.arange(n)
+
+        self.clash = np.zeros((n, t), dtype=np.int64)
+        self.day = np.zeros((n, t), dtype=np.int64)
+        self.load = np.zeros(t, dtype=np.int64)
+        self.slot_of = np.full(n, -1, dtype=np.int64)
+        self.venue_of = np.full(n, -1, dtype=np.int64)
+        self.overflow_of = np.zeros(n, dtype=np.int64)
+
+        self.venues = list(venues)
+        big = np.iinfo(np.int64).max // 4
+        self._capacity = np.array([v.capacity or big for v in self.venues], dtype=np.int64)
+        self._parallel = np.array([v.allows_parallel_sessions for v in self.venues], dtype=bool)
+        self._venue_use = np.zeros((len(self.venues), t), dtype=np.int64)
+        self._seats_used = np.zeros((len(self.venues), t), dtype=np.int64)
+        venue_index = {v.id: i for i, v in enumerate(self.venues)}
+
+        self.invigilator_ids = list(invigilator_ids)
+        self.invigilators_per_session = invigilators_per_session
+        self.candidates_per_invigilator = candidates_per_invigilator
+        self._staff_use = np.zeros((len(self.invigilator_ids), t), dtype=np.int64)
+        staff_index = {s: i for i, s in enumerate(self.invigilator_ids)}
+
+        for f in fixed:
+            f_start, f_end = _time_us(f.start_time, 0), _time_us(f.end_time, _DAY_END_US)
+            on_day = days == f.exam_date.toordinal()
+            hit = np.flatnonzero(on_day & (starts < f_end) & (f_start < ends))
+            near = np.flatnonzero(on_day & ~((starts < f_end) & (f_start < ends)))
+            nodes, weights = self._neighbour_nodes(f.key_index)
+            if len(nodes):
+                self.clash[np.ix_(nodes, hit)] += weights[:, None]
+                self.day[np.ix_(nodes, near)] += weights[:, None]
+            v = venue_index.get(f.venue_id)
+            if v is not None:
+                if self._parallel[v]:
+                    self._seats_used[v, hit] += f.candidates
+                else:
+                    self._venue_use[v, hit] += 1
+            for staff_id in f.invigilator_ids:
+                if staff_id in staff_index:
+                    self._staff_use[staff_index[staff_id], hit] += 1
+
+        self.stats: dict[str, Any] = {}
+
+    def _neighbour_nodes(self, key_index: int) -> tuple[np.ndarray, np.ndarray]:
+        lo, hi = self._indptr[key_index], self._indptr[key_index + 1]
+        nodes = self._node_of_key[self._nbr_keys[lo:hi]]
+        keep = nodes >= 0
+        return nodes[keep], self._nbr_weight[lo:hi][keep]
+
+    def _available_seats(self) -> np.ndarray:
+        """Seats free per (venue, slot); -1 where a single-use venue is taken."""
+        free = np.where(self._venue_use == 0, self._capacity[:, None], -1)
+        return np.where(self._parallel[:, None], self._capacity[:, None] - self._seats_used, free)
+
+    def _venue_fit(self, u: int, avail: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Best-fit venue index and seat overflow for unit ``u`` in every slot."""
+        t = len(self.slots)
+        if not self.venues:
+            return np.full(t, -1), np.zeros(t, dtype=np.int64)
+        need = int(self.counts[u])
+        fits = avail >= need
+        best_fit = np.where(fits, avail, np.iinfo(np.int64).max).argmin(axis=0)
+        largest = avail.argmax(axis=0)
+        any_fit = fits.any(axis=0)
+        venue = np.where(any_fit, best_fit, largest)
+        largest_free = avail[largest, np.arange(t)]
+        venue = np.where(any_fit | (largest_free > 0), venue, -1)
+        overflow = np.where(any_fit, 0, need - np.clip(largest_free, 0, None))
+        return venue, overflow
+
+    def _score(self, u: int, slot: int, overflow: int) -> tuple[int, int, int]:
+        return int(self.clash[u, slot]), int(overflow), int(self.day[u, slot])
+
+    def _best_slot(self, u: int) -> tuple[int, int, int]:
+        venue, overflow = self._venue_fit(u, self._available_seats())
+        order = np.lexsort((self.load, self.day[u], overflow, self.clash[u]))
+        best = int(order[0])
+        return best, int(venue[best]), int(overflow[best])
+
+    def _apply(self, u: int, slot: int, venue: int, overflow: int, sign: int) -> None:
+        nodes, weights = self._neighbour_nodes(int(self.units[u]))
+        if len(nodes):
+            self.clash[np.ix_(nodes, self._overlapping[slot])] += sign * weights[:, None]
+            self.day[np.ix_(nodes, self._same_day[slot])] += sign * weights[:, None]
+        self.load[slot] += sign * int(self.counts[u])
+        if venue >= 0:
+            span = self._overlapping[slot]
+            if self._parallel[venue]:
+                self._seats_used[venue, span] += sign * int(self.counts[u])
+            else:
+                self._venue_use[venue, span] += sign
+        if sign > 0:
+            self.slot_of[u], self.venue_of[u], self.overflow_of[u] = slot, venue, overflow
+        else:
+            self.slot_of[u], self.venue_of[u], self.overflow_of[u] = -1, -1, 0
+
+    def _place(self, u: int, slot: int, venue: int, overflow: int) -> None:
+        self._apply(u, slot, venue, overflow, +1)
+
+    def _unplace(self, u: int) -> None:
+        self._apply(u, int(self.slot_of[u]), int(self.venue_of[u]), int(self.overflow_of[u]), -1)
+
+    def _totals(self) -> dict[str, int]:
+        # Clash cost counts each shared student once per paper, so a pair of
+        # generated sessions sharing 3 students adds 6.
+        placed = np.flatnonzero(self.slot_of >= 0)
+        clash = int(self.clash[placed, self.slot_of[placed]].sum()) if len(placed) else 0
+        return {
+            "student_clash_cost": clash,
+            "seats_over_capacity": int(self.overflow_of.sum()),
+            "units_without_venue": int((self.venue_of[placed] < 0).sum()) if self.venues else 0,
+        }
+
+    def solve(self, time_budget_seconds: float = 60) -> dict[str, Any]:
+        started = _time.monotonic()
+        deadline = started + max(time_budget_seconds, 0)
+        n = len(self.units)
+
+        # Largest weighted degree first (Welsh–Powell order), bigger papers first on ties.
+        degree = np.zeros(n, dtype=np.int64)
+        for u in range(n):
+            _, weights = self._neighbour_nodes(int(self.units[u]))
+            degree[u] = weights.sum()
+        for u in np.lexsort((-self.counts, -degree)):
+            self._place(int(u), *self._best_slot(int(u)))
+        greedy = self._totals()
+        greedy_seconds = _time.monotonic() - started
+
+        moves = passes = 0
+        exhausted = False
+        while True:
+            placed = np.arange(n)
+            current = self.clash[placed, self.slot_of] if n else np.zeros(0, dtype=np.int64)
+            troubled = np.flatnonzero((current > 0) | (self.overflow_of > 0))
+            if not len(troubled):
+                break
+            if _time.monotonic() >= deadline:
+                exhausted = True
+                break
+            passes += 1
+            improved = False
+            for u in troubled[np.argsort(-current[troubled], kind="stable")]:
+                if _time.monotonic() >= deadline:
+                    exhausted = True
+                    break
+                u = int(u)
+                slot, venue, overflow = int(self.slot_of[u]), int(self.venue_of[u]), int(self.overflow_of[u])
+                self._unplace(u)
+                before = self._score(u, slot, overflow)
+                best, best_venue, best_overflow = self._best_slot(u)
+                if self._score(u, best, best_overflow) < before:
+                    self._place(u, best, best_venue, best_overflow)
+                    moves += 1
+                    improved = True
+                else:
+                    self._place(u, slot, venue, overflow)
+            if exhausted or not improved:
+                break
+
+        staffing = self._assign_invigilators()
+        self.stats = {
+            "units": n,
+            "slots": len(self.slots),
+            "greedy": greedy,
+            "final": self._totals(),
+            "repair_passes": passes,
+            "repair_moves": moves,
+            "budget_exhausted": exhausted,
+            "greedy_seconds": round(greedy_seconds, 3),
+            "seconds": round(_time.monotonic() - started, 3),
+            **staffing,
+        }
+        return self.stats
+
+    def _invigilators_needed(self, u: int) -> int:
+        needed = self.invigilators_per_session
+        if self.candidates_per_invigilator:
+            needed = max(needed, math.ceil(int(self.counts[u]) / self.candidates_per_invigilator))
+        return needed
+
+    def _assign_invigilators(self) -> dict[str, int]:
+        self.staff_of: list[list[int]] = [[] for _ in range(len(self.units))]
+        if not self.invigilator_ids:
+            return {"invigilator_shortfall": 0}
+        assigned = np.zeros(len(self.invigilator_ids), dtype=np.int64)
+        shortfall = 0
+        for u in np.lexsort((-self.counts, self.slot_of)):
+            u, slot = int(u), int(self.slot_of[u])
+            needed = self._invigilators_needed(u)
+            free = np.flatnonzero(self._staff_use[:, slot] == 0)
+            chosen = free[np.argsort(assigned[free], kind="stable")][:needed]
+            shortfall += needed - len(chosen)
+            if len(chosen):
+                self._staff_use[np.ix_(chosen, self._overlapping[slot])] += 1
+                assigned[chosen] += 1
+            self.staff_of[u] = [self.invigilator_ids[i] for i in chosen]
+        return {"invigilator_shortfall": shortfall}
+
+
+def generate_exam_timetable(
+    *,
+    start_date: date,
+    end_date: date,
+    session_type: str = ExamSession.TYPE_REGULAR,
+    slot_times: Iterable = DEFAULT_SLOT_TIMES,
+    include_weekends: bool = False,
+    excluded_dates: Iterable[date] = (),
+    venue_ids: list[int] | None = None,
+    invigilator_ids: list[int] = (),
+    invigilators_per_session: int = 1,
+    candidates_per_invigilator: int | None = None,
+    program_batch_ids: list[int] | None = None,
+    semester_id: int | None = None,
+    course_unit_ids: list[int] | None = None,
+    time_budget_seconds: float = 60,
+    run: ExamTimetableRun | None = None,
+    user=None,
+) -> dict[str, Any]:
+    """Draft sessions for every unscheduled course unit with candidates; return the quality report."""
+    from admissions.faculty_scope import filter_course_units_for_user
+
+    slots = build_slots(
+        start_date, end_date, slot_times, include_weekends=include_weekends, excluded_dates=excluded_dates
+    )
+
+    units = CourseUnit.objects.filter(is_active=True)
+    if program_batch_ids:
+        units = units.filter(program_batch_id__in=program_batch_ids)
+    if semester_id:
+        units = units.filter(semester_id=semester_id)
+    if course_unit_ids:
+        units = units.filter(pk__in=course_unit_ids)
+    if user is not None:
+        units = filter_course_units_for_user(units, user)
+    units = list(units.only("id", "code").order_by("code", "id"))
+
+    already = set(
+        ExamSession.objects.filter(
+            course_unit_id__in=[cu.id for cu in units], session_type=session_type
+        ).values_list("course_unit_id", flat=True)
+    )
+    index = ExamClashIndex.for_period(
+        start_date, end_date, extra_keys=[(cu.id, session_type) for cu in units if cu.id not in already]
+    )
+    skipped = []
+    to_schedule = []
+    for cu in units:
+        if cu.id in already:
+            skipped.append({"course_unit_id": cu.id, "course_code": cu.code, "reason": f"Already has a {session_type} session"})
+        elif not index.candidate_count(cu.id, session_type):
+            skipped.append({"course_unit_id": cu.id, "course_code": cu.code, "reason": "No candidates"})
+        else:
+            to_schedule.append(cu)
+
+    venue_qs = Venue.objects.filter(is_active=True)
+    if venue_ids:
+        venue_qs = venue_qs.filter(pk__in=venue_ids)
+    venues = [
+        VenueOption(v.pk, v.capacity, v.allows_parallel_sessions)
+        for v in venue_qs.only("id", "capacity", "allows_parallel_sessions").order_by("id")
+    ]
+    matrix = index.matrix
+    fixed = [
+        FixedSession(
+            key_index=matrix.index[index.key_for(s.course_unit_id, s.session_type)],
+            exam_date=s.exam_date,
+            start_time=s.start_time,
+            end_time=s.end_time,
+            venue_id=s.venue_id,
+            candidates=index.candidate_count(s.course_unit_id, s.session_type),
+            invigilator_ids=index.invigilators_for(s.pk),
+        )
+        for s in index.sessions
+    ]
+    solver = TimetableSolver(
+        matrix,
+        [matrix.index[index.key_for(cu.id, session_type)] for cu in to_schedule],
+        slots,
+        venues=venues,
+        fixed=fixed,
+        invigilator_ids=list(invigilator_ids),
+        invigilators_per_session=invigilators_per_session if invigilator_ids else 0,
+        candidates_per_invigilator=candidates_per_invigilator,
+    )
+    stats = solver.solve(time_budget_seconds)
+
+    sessions = []
+    for u, cu in enumerate(to_schedule):
+        slot = slots[int(solver.slot_of[u])]
+        venue = int(solver.venue_of[u])
+        sessions.append(
+            ExamSession(
+                course_unit=cu,
+                session_type=session_type,
+                title=f"{cu.code} Examination",
+                exam_date=slot.exam_date,
+                start_time=slot.start_time,
+                end_time=slot.end_time,
+                venue_id=venues[venue].id if venue >= 0 else None,
+                is_published=False,
+                timetable_run=run,
+                created_by=user,
+            )
+        )
+    through = ExamSession.invigilators.through
+    source, target = ExamSession.invigilators.field.m2m_field_name(), ExamSession.invigilators.field.m2m_reverse_field_name()
+    with transaction.atomic():
+        created = ExamSession.objects.bulk_create(sessions, batch_size=500)
+        through.objects.bulk_create(
+            [
+                through(**{f"{source}_id": session.pk, f"{target}_id": staff_id})
+                for u, session in enumerate(created)
+                for staff_id in solver.staff_of[u]
+            ],
+            batch_size=1000,
+        )
+
+    for u, session in enumerate(created):
+        index.add_session(session, solver.staff_of[u])
+    quality = index.period_report(sessions=created)
+    return {
+        "start_date": str(start_date),
+        "end_date": str(end_date),
+        "session_type": session_type,
+        "slots": len(slots),
+        "course_units": len(units),
+        "scheduled": len(created),
+        "skipped": skipped,
+        "solver": stats,
+        "clash_counts": quality["clash_counts"],
+        "students_with_clashes": quality["students_with_clashes"],
+        "clashes": _jsonable(quality["clashes"][:REPORT_CLASH_LIMIT]),
+        "capacity": _jsonable(quality["capacity"][:REPORT_CLASH_LIMIT]),
+    }
+
+
+def _jsonable(rows: list[dict]) -> list[dict]:
+    return [{k: str(v) if isinstance(v, date) else v for k, v in row.items()} for row in rows]
+
+
+def start_exam_timetable_run(*, user, start_date, end_date, session_type, options, time_budget_seconds) -> ExamTimetableRun:
+    """Record the request and generate on a worker after commit."""
+    run = ExamTimetableRun.objects.create(
+        session_type=session_type,
+        start_date=start_date,
+        end_date=end_date,
+        options=options,
+        time_budget_seconds=time_budget_seconds,
+        created_by=user if getattr(user, "is_authenticated", False) else None,
+    )
+
+    def _enqueue():
+        from examinations.tasks import generate_exam_timetable_task
+
+        generate_exam_timetable_task.delay(run.pk)
+
+    transaction.on_commit(_enqueue)
+    return run
+
+
+def run_exam_timetable_job(run_id: int) -> dict:
+    """Generate draft sessions for one stored run (worker side)."""
+    run = ExamTimetableRun.objects.select_related("created_by").get(pk=run_id)
+    runs = ExamTimetableRun.objects.filter(pk=run.pk)
+    runs.update(status=ExamTimetableRun.STATUS_RUNNING, started_at=timezone.now(), error="")
+    options = run.options or {}
+    try:
+        report = generate_exam_timetable(
+            start_date=run.start_date,
+            end_date=run.end_date,
+            session_type=run.session_type,
+            slot_times=[(s["start_time"], s["end_time"]) for s in options.get("slots") or []] or DEFAULT_SLOT_TIMES,
+            include_weekends=bool(options.get("include_weekends")),
+            excluded_dates=[date.fromisoformat(d) for d in options.get("excluded_dates") or []],
+            venue_ids=options.get("venue_ids") or None,
+            invigilator_ids=options.get("invigilator_ids") or [],
+            invigilators_per_session=int(options.get("invigilators_per_session", 1) or 0),
+            candidates_per_invigilator=options.get("candidates_per_invigilator") or None,
+            program_batch_ids=options.get("program_batch_ids") or None,
+            semester_id=options.get("semester_id") or None,
+            course_unit_ids=options.get("course_unit_ids") or None,
+            time_budget_seconds=run.time_budget_seconds,
+            run=run,
+            user=run.created_by,
+        )
+    except Exception as exc:
+        if not isinstance(exc, ValueError):
+            logger.exception("exam timetable run %s failed", run.pk)
+        runs.update(status=ExamTimetableRun.STATUS_FAILED, error=str(exc)[:2000], finished_at=timezone.now())
+        return {"run_id": run.pk, "status": ExamTimetableRun.STATUS_FAILED}
+
+    runs.update(
+        status=ExamTimetableRun.STATUS_DONE,
+        sessions_created=report["scheduled"],
+        report=report,
+        finished_at=timezone.now(),
+    )
+    return {"run_id": run.pk, "status": ExamTimetableRun.STATUS_DONE}
@@ -4,6 +4,7 @@ from admissions.models import AdmittedStudent
 from ..models import CourseUnitResult
 from .graduation_status import get_transcript_document_meta
 from .program_display import program_award_display_name
+from .standing import get_student_standings, overall_standing
 
 TRANSCRIPT_REQUIRES_PUBLISHED_MARKS = (
     "Transcript / provisional results can only be downloaded after marks have been published."
@@ -35,9 +36,9 @@ def build_student_transcript(student: AdmittedStudent) -> dict:
         )
     )
 
+    standings = get_student_standings(student)
+    gpa_by_semester = {s.semester_id: s.gpa for s in standings}
     semesters: dict[str, dict] = {}
-    total_credits = 0
-    weighted_gp = 0
 
     for r in results:
         cu = r.enrollment.course_unit
@@ -47,11 +48,10 @@ def build_student_transcript(student: AdmittedStudent) -> dict:
             sem_key,
             {"name": sem_key, "courses": [], "semester_gpa": None},
         )
+        sem_gpa = gpa_by_semester.get(sem.pk if sem else None)
+        if sem_gpa is not None:
+            block["semester_gpa"] = float(sem_gpa)
         credits = float(cu.credit_units) if cu.credit_units else 0
-        gp = float(r.grade_point) if r.grade_point is not None else None
-        if credits and gp is not None:
-            total_credits += credits
-            weighted_gp += credits * gp
 
         block["courses"].append(
             {
@@ -67,7 +67,9 @@ def build_student_transcript(student: AdmittedStudent) -> dict:
             }
         )
 
-    cgpa = round(weighted_gp / total_credits, 2) if total_credits else None
+    overall = overall_standing(standings)
+    cgpa = float(overall.cgpa) if overall and overall.cgpa is not None else None
+    total_credits = float(overall.cumulative_credits_graded) if overall else 0
 
     document = get_transcript_document_meta(student)
     published_count = results.count()
@@ -0,0 +1,79 @@
+"""Keep materialized standings in step with writes outside the publish views."""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from admissions.models import AdmittedStudent
+from Programs.models import CourseUnit, Program, StudentProgrammeEnrollment
+
+from .models import CourseUnitResult
+from .services.standing import queue_standing_refresh
+
+
+def _fields_changed(sender, instance, fields) -> bool:
+    if instance.pk is None:
+        return False
+    old = sender.objects.filter(pk=instance.pk).values(*fields).first()
+    return old is not None and any(old[f] != getattr(instance, f) for f in fields)
+
+
+def _students_with_published_results(**filters):
+    return CourseUnitResult.objects.filter(status=CourseUnitResult.STATUS_PUBLISHED, **filters).values_list(
+        "enrollment__student_id", flat=True
+    )
+
+
+# results (admin edits, deletes; enrollment deletes cascade here)
+@receiver(pre_save, sender=CourseUnitResult)
+def remember_result_was_published(sender, instance, **kwargs):
+    instance._standing_was_published = bool(
+        instance.pk
+        and instance.status != CourseUnitResult.STATUS_PUBLISHED
+        and sender.objects.filter(pk=instance.pk, status=CourseUnitResult.STATUS_PUBLISHED).exists()
+    )
+
+
+@receiver(post_save, sender=CourseUnitResult)
+@receiver(post_delete, sender=CourseUnitResult)
+def refresh_standing_on_result_change(sender, instance, **kwargs):
+    if instance.status == CourseUnitResult.STATUS_PUBLISHED or getattr(instance, "_standing_was_published", False):
+        queue_standing_refresh([instance.enrollment.student_id])
+
+
+# credit units / semester feed GPA weights and semester grouping
+@receiver(pre_save, sender=CourseUnit)
+def remember_course_unit_change(sender, instance, **kwargs):
+    instance._standing_inputs_changed = _fields_changed(sender, instance, ("credit_units", "semester_id"))
+
+
+@receiver(post_save, sender=CourseUnit)
+def refresh_standing_on_course_unit_change(sender, instance, created, **kwargs):
+    if not created and getattr(instance, "_standing_inputs_changed", False):
+        queue_standing_refresh(_students_with_published_results(enrollment__course_unit_id=instance.pk))
+
+
+# programme / academic level decide the award class scheme
+@receiver(pre_save, sender=StudentProgrammeEnrollment)
+def remember_enrollment_programme_change(sender, instance, **kwargs):
+    instance._standing_inputs_changed = _fields_changed(sender, instance, ("program_id",))
+
+
+@receiver(post_save, sender=StudentProgrammeEnrollment)
+def refresh_standing_on_enrollment_programme_change(sender, instance, created, **kwargs):
+    if created or getattr(instance, "_standing_inputs_changed", False):
+        queue_standing_refresh([instance.student_id])
+
+
+@receiver(pre_save, sender=Program)
+def remember_program_level_change(sender, instance, **kwargs):
+    instance._standing_inputs_changed = _fields_changed(sender, instance, ("academic_level_id",))
+
+
+@receiver(post_save, sender=Program)
+def refresh_standing_on_program_level_change(sender, instance, created, **kwargs):
+    if not created and getattr(instance, "_standing_inputs_changed", False):
+        queue_standing_refresh(
+            AdmittedStudent.objects.filter(
+                programme_enrollment__program_id=instance.pk,
+                semester_standings__isnull=False,
+            ).values_list("id", flat=True)
+        )
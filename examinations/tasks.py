@@ -1,4 +1,4 @@
-"""Celery tasks for examinations notifications."""
+"""Celery tasks for examinations notifications, standings and timetable generation."""
 import logging
 
 from celery import shared_task
@@ -86,3 +86,22 @@ def notify_exam_session_published(self, session_id):
                 send_configurable_email(email, title, body)
             except Exception:
                 logger.exception("Exam publish email failed for %s", email)
+
+
+@shared_task(bind=True, max_retries=0)
+def generate_exam_timetable_task(self, run_id):
+    """Draft exam sessions for a stored ``ExamTimetableRun``."""
+    from .services.timetable_generator import run_exam_timetable_job
+
+    return run_exam_timetable_job(run_id)
+
+
+@shared_task
+def celery_refresh_student_standings(student_ids):
+    """Rebuild GPA / CGPA standings for these students in chunks."""
+    from .services.standing import refresh_student_standings
+
+    student_ids = list(student_ids)
+    for start in range(0, len(student_ids), 500):
+        refresh_student_standings(student_ids[start : start + 500])
+    return len(student_ids)
@@ -0,0 +1,200 @@
+"""Bulk publish — sorted-array grade band lookup and parity with ``publish_result``."""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from accounts.models import Campus
+from admissions.models import AcademicLevel, AdmittedStudent, Application, Batch
+from audit.models import AuditLog
+from examinations.models import (
+    AssessmentPolicy,
+    CourseUnitResult,
+    GradeBand,
+    GradeScale,
+    StudentSemesterStanding,
+)
+from examinations.services.bulk_publish import GradeBandTable, bulk_publish_results
+from examinations.services.publish import publish_result
+from examinations.services.scoring import lookup_grade_band
+from Programs.models import CourseUnit, Program, ProgramBatch, Semester, StudentCourseUnitEnrollment
+
+User = get_user_model()
+
+
+def _band(letter, low, high, gp):
+    return GradeBand(letter=letter, min_mark=Decimal(low), max_mark=Decimal(high), grade_point=Decimal(gp))
+
+
+MARKS = [None] + [Decimal(m) / 100 for m in range(0, 10001, 3)]
+
+
+class GradeBandTableTests(SimpleTestCase):
+    def test_matches_scalar_lookup_with_gaps(self):
+        bands = [
+            _band("A", "80", "100", "5.0"),
+            _band("B", "70", "79.9", "4.0"),
+            _band("C", "60", "69.9", "3.0"),
+            _band("F", "0", "49.9", "0"),  # 49.91-59.99 is not covered
+        ]
+        grades = GradeBandTable(bands).lookup(MARKS)
+
+        self.assertEqual(grades, [lookup_grade_band(m, bands) for m in MARKS])
+        self.assertEqual(GradeBandTable(bands).lookup([Decimal("79.95"), Decimal("80.00")]), [("", None), ("A", Decimal("5.0"))])
+
+    def test_overlapping_bands_keep_scale_order(self):
+        bands = [_band("A", "60", "100", "5.0"), _band("B", "50", "70", "4.0")]
+        self.assertEqual(GradeBandTable(bands).lookup(MARKS), [lookup_grade_band(m, bands) for m in MARKS])
+        self.assertEqual(GradeBandTable([]).lookup([Decimal("50")]), [("", None)])
+
+
+class BulkPublishResultsTests(TestCase):
+    """
+    ``bulk_publish_results`` leaves results, enrollments and standings as
+    ``publish_result`` would, for a course with draft and verified results.
+    """
+
+    MARKS = [("30", "80"), ("20", "45"), ("10", None)]  # B pass / F fail / not allowed to sit
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="registrar@example.com", email="registrar@example.com", password="x")
+        campus = Campus.objects.create(name="Main Campus", code="MAIN")
+        today = timezone.now().date()
+        batch = Batch.objects.create(
+            name="Results Intake 2026",
+            code="RES2026",
+            application_start_date=today,
+            application_end_date=today + timedelta(days=90),
+            admission_start_date=today,
+            admission_end_date=today + timedelta(days=120),
+            created_by=self.user,
+        )
+        level = AcademicLevel.objects.create(name="Undergraduate")
+        program = Program.objects.create(
+            name="Bachelor of Nursing", short_form="BNS", code="BNS", academic_level=level, min_years=3, max_years=5
+        )
+        program_batch = ProgramBatch.objects.create(program=program, name="BNS 2026", start_date=today)
+        semester = Semester.objects.create(
+            program_batch=program_batch, name="Year 1 Sem 1", start_date=today, end_date=today + timedelta(days=120)
+        )
+        self.policy = AssessmentPolicy.objects.create(name="Default", is_default=True)
+        scale = GradeScale.objects.create(name="Undergraduate", academic_level=level)
+        for order, (letter, low, high, gp) in enumerate(
+            [("A", "80", "100", "5.0"), ("B", "70", "79.9", "4.0"), ("C", "50", "69.9", "3.0"), ("F", "0", "49.9", "0")]
+        ):
+            GradeBand.objects.create(
+                grade_scale=scale, letter=letter, min_mark=Decimal(low), max_mark=Decimal(high),
+                grade_point=Decimal(gp), order=order,
+            )
+        self.bulk_unit, self.single_unit = (
+            CourseUnit.objects.create(
+                name=f"Anatomy {n}", code=f"BNS10{n}", semester=semester, program_batch=program_batch,
+                credit_units=Decimal("3"),
+            )
+            for n in (1, 2)
+        )
+        self.students = [
+            self._admit(campus, batch, level, program, i) for i in range(len(self.MARKS))
+        ]
+
+    def _admit(self, campus, batch, level, program, i):
+        applicant = User.objects.create_user(username=f"student{i}@example.com", email=f"student{i}@example.com", password="x")
+        application = Application.objects.create(
+            applicant=applicant,
+            batch=batch,
+            campus=campus,
+            academic_level=level,
+            first_name="Student",
+            last_name=f"Number{i}",
+            date_of_birth=date(2000, 1, 1),
+            gender="female",
+            nationality="Ugandan",
+            phone=f"25670000000{i}",
+            email=f"student{i}@example.com",
+            next_of_kin_name="Kin",
+            next_of_kin_contact="256700000100",
+            next_of_kin_relationship="Parent",
+            status="accepted",
+        )
+        return AdmittedStudent.objects.create(
+            application=application,
+            study_mode="day",
+            reg_no=f"NDU/2026/RES/00{i}",
+            admitted_program=program,
+            admitted_batch=batch,
+            admitted_campus=campus,
+        )
+
+    def _results(self, course_unit):
+        # Every other student's result is already verified; the rest are drafts.
+        results = []
+        for i, (student, (ca, exam)) in enumerate(zip(self.students, self.MARKS)):
+            enrollment = StudentCourseUnitEnrollment.objects.create(student=student, course_unit=course_unit)
+            results.append(
+                CourseUnitResult.objects.create(
+                    enrollment=enrollment,
+                    policy=self.policy,
+                    ca_mark=Decimal(ca),
+                    exam_mark=Decimal(exam) if exam is not None else None,
+                    status=CourseUnitResult.STATUS_VERIFIED if i % 2 else CourseUnitResult.STATUS_DRAFT,
+                )
+            )
+        return results
+
+    def _published(self, course_unit):
+        return list(
+            CourseUnitResult.objects.filter(enrollment__course_unit=course_unit)
+            .select_related("enrollment")
+            .order_by("enrollment__student_id")
+        )
+
+    def test_matches_publish_result(self):
+        bulk_drafts = [r.pk for r in self._results(self.bulk_unit) if r.status == CourseUnitResult.STATUS_DRAFT]
+        for result in self._results(self.single_unit):
+            with self.captureOnCommitCallbacks(execute=True):
+                publish_result(result, user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            count = bulk_publish_results(
+                CourseUnitResult.objects.filter(enrollment__course_unit=self.bulk_unit), user=self.user
+            )
+
+        self.assertEqual(count, len(self.MARKS))
+        fields = ("final_mark", "exam_sitting_allowed", "is_pass", "paper_outcome", "grade_letter", "grade_point",
+                  "status", "published_by_id", "edit_unlocked")
+        for bulk, single in zip(self._published(self.bulk_unit), self._published(self.single_unit)):
+            self.assertEqual([getattr(bulk, f) for f in fields], [getattr(single, f) for f in fields])
+            self.assertEqual(
+                (bulk.enrollment.grade, bulk.enrollment.status), (single.enrollment.grade, single.enrollment.status)
+            )
+            self.assertIsNotNone(bulk.published_at)
+        self.assertEqual(
+            [(r.enrollment.grade, r.enrollment.status) for r in self._published(self.bulk_unit)],
+            [("B", "completed"), ("F", "failed"), ("F", "enrolled")],
+        )
+
+        drafts = CourseUnitResult.objects.filter(pk__in=bulk_drafts)
+        self.assertFalse(drafts.filter(verified_at__isnull=True).exists())
+        self.assertEqual(set(drafts.values_list("verified_by", flat=True)), {self.user.pk})
+
+    def test_refreshes_standings_and_audits_on_commit(self):
+        self._results(self.bulk_unit)
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_publish_results(CourseUnitResult.objects.filter(enrollment__course_unit=self.bulk_unit), user=self.user)
+            self.assertFalse(AuditLog.objects.exists())
+
+        standings = StudentSemesterStanding.objects.filter(student__in=self.students)
+        self.assertEqual(
+            sorted(standings.values_list("published_count", "failed_count")), [(1, 0), (1, 0), (1, 1)]
+        )
+        log = AuditLog.objects.get()
+        self.assertEqual((log.action, log.user_id), ("results_publish", self.user.pk))
+        self.assertIn(f"Published {len(self.MARKS)} result(s) across 1 course unit(s)", log.description)
+
+        for result in self._results(self.single_unit):
+            with self.captureOnCommitCallbacks(execute=True):
+                publish_result(result, user=self.user)
+        self.assertEqual(
+            sorted(standings.values_list("published_count", "failed_count")), [(2, 0), (2, 0), (2, 2)]
+        )
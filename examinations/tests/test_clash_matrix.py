@@ -0,0 +1,73 @@
+"""Exam period clash index — co-enrolment counts, session warnings and period report."""
+from datetime import date, time
+
+from django.test import SimpleTestCase
+
+from examinations.models import ExamSession
+from examinations.services.clash_matrix import CoEnrollmentMatrix, ExamClashIndex
+from Programs.models import CourseUnit, Venue
+
+EXAM_DAY = date(2026, 12, 1)
+KEYS = [(1, "regular"), (2, "regular"), (3, "regular"), (1, "resit")]
+
+
+def _matrix():
+    # Students 10/11 sit courses 1 and 2, student 11 also sits 3; 12 resits 1.
+    memberships = [(10, 0), (10, 1), (11, 0), (11, 1), (11, 2), (12, 3), (10, 0)]
+    return CoEnrollmentMatrix(KEYS, memberships)
+
+
+def _session(pk, course_unit_id, start, end, *, venue=None, session_type=ExamSession.TYPE_REGULAR):
+    return ExamSession(
+        pk=pk,
+        course_unit=CourseUnit(pk=course_unit_id, code=f"CU{course_unit_id}"),
+        session_type=session_type,
+        exam_date=EXAM_DAY,
+        start_time=start,
+        end_time=end,
+        venue=venue,
+    )
+
+
+class CoEnrollmentMatrixTests(SimpleTestCase):
+    def test_counts_and_overlaps(self):
+        matrix = _matrix()
+        self.assertEqual(matrix.candidate_count((1, "regular")), 2)
+        self.assertEqual(matrix.overlap((1, "regular"), (2, "regular")), 2)
+        self.assertEqual(matrix.overlap((3, "regular"), (2, "regular")), 1)
+        self.assertEqual(matrix.overlap((1, "resit"), (1, "regular")), 0)
+        self.assertEqual(matrix.overlap((9, "regular"), (1, "regular")), 0)
+        self.assertEqual(matrix.candidate_ids((2, "regular")), {10, 11})
+        self.assertEqual(matrix.shared_ids((3, "regular"), (1, "regular")).tolist(), [11])
+
+
+class ExamClashIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.hall = Venue(pk=5, name="Main Hall", capacity=1)
+        sessions = [
+            _session(100, 2, time(9), time(12), venue=self.hall),
+            _session(101, 3, time(14), None),
+        ]
+        self.index = ExamClashIndex(sessions, invigilators={100: {7}}, matrix=_matrix())
+
+    def test_issues_for_matches_session_warnings(self):
+        issues = self.index.issues_for(
+            course_unit=CourseUnit(pk=1, code="CU1"),
+            exam_date=EXAM_DAY,
+            start_time=time(11),
+            end_time=time(13),
+            venue=self.hall,
+            invigilator_ids=[7, 8],
+        )
+        self.assertEqual([i["type"] for i in issues], ["room", "student", "invigilator", "capacity"])
+        self.assertEqual(issues[1]["message"], "2 student(s) also scheduled for CU2 at overlapping time")
+        self.assertEqual(issues[3]["message"], "Candidate count (2) exceeds effective capacity (1)")
+
+    def test_added_sessions_appear_in_period_report(self):
+        self.index.add_session(_session(102, 1, time(10), time(11), venue=self.hall), invigilator_ids=[7])
+        report = self.index.period_report()
+
+        self.assertEqual(report["clash_counts"], {"room": 1, "student": 1, "invigilator": 1, "capacity": 2})
+        self.assertEqual(report["students_with_clashes"], 2)
+        student = next(c for c in report["clashes"] if c["type"] == "student")
+        self.assertEqual((student["session_ids"], student["overlap_count"]), ([100, 102], 2))
@@ -0,0 +1,102 @@
+"""Set-based course marks import — per-row errors and bulk writes."""
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from admissions.models import AdmittedStudent, Application
+from examinations.models import AssessmentPolicy, CourseUnitResult, GradeBand
+from examinations.services import import_marks
+from Programs.models import StudentCourseUnitEnrollment
+
+REGISTERED_AT = datetime(2026, 9, 1, tzinfo=dt_timezone.utc)
+
+
+def _enrollment(pk, reg_no, *, result=None, revoked=False, registered=True):
+    student = AdmittedStudent(pk=pk, reg_no=reg_no)
+    student.application = Application(pk=pk, is_revoked=revoked)
+    enrollment = StudentCourseUnitEnrollment(
+        pk=pk, student=student, registration_date=REGISTERED_AT if registered else None
+    )
+    if result is None:
+        enrollment._state.fields_cache["course_result"] = None
+    else:
+        result.enrollment = enrollment
+        enrollment._state.fields_cache["course_result"] = result
+    return enrollment
+
+
+class ImportMarksForCourseTests(SimpleTestCase):
+    def setUp(self):
+        self.policy = AssessmentPolicy(pk=1, name="Undergraduate")
+        bands = [
+            GradeBand(letter="A", min_mark=Decimal("80"), max_mark=Decimal("100"), grade_point=Decimal("5")),
+            GradeBand(letter="C", min_mark=Decimal("50"), max_mark=Decimal("79.9"), grade_point=Decimal("3")),
+            GradeBand(letter="F", min_mark=Decimal("0"), max_mark=Decimal("49.9"), grade_point=Decimal("0")),
+        ]
+        self.grade_scale = SimpleNamespace(bands=SimpleNamespace(all=lambda: bands))
+
+    def _import(self, enrollments, rows):
+        by_reg = {e.student.reg_no.lower(): e for e in enrollments}
+        with mock.patch.object(import_marks, "resolve_assessment_policy", return_value=self.policy), \
+                mock.patch.object(import_marks, "resolve_grade_scale", return_value=self.grade_scale), \
+                mock.patch.object(import_marks, "prefetch_related_objects"), \
+                mock.patch.object(import_marks, "_enrollments_by_reg_no", return_value=by_reg), \
+                mock.patch.object(import_marks.transaction, "atomic"), \
+                mock.patch.object(CourseUnitResult.objects, "bulk_create") as bulk_create, \
+                mock.patch.object(CourseUnitResult.objects, "bulk_update") as bulk_update:
+            outcome = import_marks.import_marks_for_course(object(), rows, user=None)
+        return outcome, bulk_create.call_args.args[0], bulk_update.call_args.args[0]
+
+    def test_new_and_existing_results_written_in_bulk(self):
+        existing = CourseUnitResult(pk=50, policy=self.policy, ca_mark=Decimal("25"), status="verified")
+        locked = CourseUnitResult(pk=51, policy=self.policy, status=CourseUnitResult.STATUS_PUBLISHED)
+        enrollments = [
+            _enrollment(1, "2026/BCS/001"),
+            _enrollment(2, "2026/BCS/002", result=existing),
+            _enrollment(3, "2026/BCS/003", result=locked),
+            _enrollment(4, "2026/BCS/004", revoked=True),
+            _enrollment(5, "2026/BCS/005", registered=False),
+        ]
+        rows = [
+            {"reg_no": "2026/bcs/001", "ca_mark": Decimal("35"), "exam_mark": Decimal("80")},
+            {"reg_no": "2026/BCS/002", "ca_mark": None, "exam_mark": Decimal("70")},
+            {"reg_no": "2026/BCS/003", "ca_mark": Decimal("20"), "exam_mark": None},
+            {"reg_no": "2026/BCS/004", "ca_mark": Decimal("20"), "exam_mark": None},
+            {"reg_no": "2026/BCS/005", "ca_mark": Decimal("20"), "exam_mark": None},
+            {"reg_no": "2026/BCS/999", "ca_mark": Decimal("20"), "exam_mark": None},
+        ]
+        outcome, created, updated = self._import(enrollments, rows)
+
+        self.assertEqual(outcome["saved"], ["2026/bcs/001", "2026/BCS/002"])
+        self.assertEqual(
+            [e["detail"] for e in outcome["errors"]],
+            [
+                "Published — request a grade change or unlock first.",
+                "Admission revoked.",
+                "Student has not registered for this course.",
+                "Student not enrolled on this course.",
+            ],
+        )
+        (new,) = created
+        self.assertEqual((new.enrollment_id, new.final_mark, new.grade_letter), (1, Decimal("83.00"), "A"))
+        self.assertEqual(new.status, CourseUnitResult.STATUS_DRAFT)
+        (changed,) = updated
+        self.assertEqual((changed.pk, changed.ca_mark, changed.final_mark), (50, Decimal("25"), Decimal("67.00")))
+        self.assertEqual(changed.status, CourseUnitResult.STATUS_VERIFIED)
+
+    def test_invalid_repeat_row_keeps_earlier_marks(self):
+        rows = [
+            {"reg_no": "2026/BCS/001", "ca_mark": Decimal("30"), "exam_mark": Decimal("60")},
+            {"reg_no": "2026/BCS/001", "ca_mark": Decimal("55"), "exam_mark": None},
+        ]
+        outcome, created, updated = self._import([_enrollment(1, "2026/BCS/001")], rows)
+
+        self.assertEqual(outcome["saved_count"], 1)
+        self.assertEqual(len(outcome["errors"]), 1)
+        self.assertIn("CA must be between 0 and 40", outcome["errors"][0]["detail"])
+        (result,) = created
+        self.assertEqual((result.ca_mark, result.exam_mark), (Decimal("30"), Decimal("60")))
+        self.assertEqual(updated, [])
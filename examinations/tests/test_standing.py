@@ -0,0 +1,66 @@
+"""Materialized academic standing — semester GPA and running CGPA from published results."""
+from decimal import Decimal
+from unittest import mock
+
+from django.db.models.signals import post_delete, post_save
+from django.test import SimpleTestCase
+
+from examinations.models import CourseUnitResult
+from examinations.services.standing import build_standings
+from Programs.models import StudentCourseUnitEnrollment
+
+
+class BuildStandingsTests(SimpleTestCase):
+    def test_semester_and_cumulative_totals(self):
+        rows = [
+            # (student, semester, semester order, credit units, grade point, is_pass)
+            (1, 20, 2, Decimal("4"), Decimal("3.0"), True),
+            (1, 10, 1, Decimal("3"), Decimal("4.3"), True),
+            (1, 10, 1, Decimal("2"), Decimal("1.0"), False),
+            (1, 10, 1, None, Decimal("5.0"), True),  # no credit units: not graded
+            (1, None, None, Decimal("3"), None, None),  # no semester, no grade point
+            (2, 10, 1, Decimal("3"), Decimal("5.0"), True),
+        ]
+        standings = build_standings(rows, lambda sid, cgpa: "First" if cgpa and cgpa >= Decimal("4.4") else "")
+
+        first, second, other = standings[1]
+        self.assertEqual([s.semester_id for s in standings[1]], [10, 20, None])
+        self.assertEqual((first.published_count, first.failed_count), (3, 1))
+        self.assertEqual((first.credits_graded, first.credits_earned, first.weighted_points), (5, 3, Decimal("14.9")))
+        self.assertEqual(first.gpa, Decimal("2.98"))
+        self.assertEqual(second.gpa, Decimal("3.00"))
+        # (14.9 + 12) / 9 = 2.9888…
+        self.assertEqual((second.cgpa, second.cumulative_credits_graded, second.cumulative_failed_count), (Decimal("2.99"), 9, 1))
+        self.assertIsNone(other.gpa)
+        self.assertEqual((other.cgpa, other.credits_attempted, other.sequence), (Decimal("2.99"), 3, 3))
+        self.assertEqual(other.award_class, "")
+        self.assertEqual((standings[2][0].cgpa, standings[2][0].award_class), (Decimal("5.00"), "First"))
+
+
+class StandingRefreshSignalTests(SimpleTestCase):
+    def _result(self, status, was_published=False):
+        result = CourseUnitResult(enrollment=StudentCourseUnitEnrollment(student_id=7), status=status)
+        result._standing_was_published = was_published
+        return result
+
+    def _saved(self, result):
+        post_save.send(
+            sender=CourseUnitResult, instance=result, created=False, raw=False, using="default", update_fields=None
+        )
+
+    def _deleted(self, result):
+        post_delete.send(sender=CourseUnitResult, instance=result, using="default", origin=result)
+
+    def test_published_edits_and_deletes_queue_the_student(self):
+        with mock.patch("examinations.signals.queue_standing_refresh") as queue:
+            self._saved(self._result(CourseUnitResult.STATUS_PUBLISHED))
+            self._deleted(self._result(CourseUnitResult.STATUS_PUBLISHED))
+            # unpublished through the admin: was published before the save
+            self._saved(self._result(CourseUnitResult.STATUS_VERIFIED, was_published=True))
+        self.assertEqual(queue.call_args_list, [mock.call([7])] * 3)
+
+    def test_unpublished_edits_do_not_queue(self):
+        with mock.patch("examinations.signals.queue_standing_refresh") as queue:
+            self._saved(self._result(CourseUnitResult.STATUS_DRAFT))
+            self._deleted(self._result(CourseUnitResult.STATUS_VERIFIED))
+        queue.assert_not_called()
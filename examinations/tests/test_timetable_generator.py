@@ -0,0 +1,68 @@
+"""Exam timetable generator — slot building, clash-free colouring and room fitting."""
+from datetime import date, time
+
+from django.test import SimpleTestCase
+
+from examinations.services.clash_matrix import CoEnrollmentMatrix
+from examinations.services.timetable_generator import (
+    FixedSession,
+    TimetableSolver,
+    VenueOption,
+    build_slots,
+)
+
+MONDAY = date(2026, 12, 7)
+
+
+def _triangle_matrix():
+    # Course units 0, 1 and 2 pairwise share students; unit 3 shares with nobody.
+    memberships = [(1, 0), (1, 1), (2, 1), (2, 2), (3, 0), (3, 2), (4, 3), (5, 3), (6, 3)]
+    return CoEnrollmentMatrix([(cu, "regular") for cu in range(4)], memberships)
+
+
+class BuildSlotsTests(SimpleTestCase):
+    def test_weekends_and_excluded_dates_skipped(self):
+        slots = build_slots(
+            MONDAY, date(2026, 12, 14), [("09:00", "12:00")], excluded_dates=[date(2026, 12, 9)]
+        )
+        self.assertEqual([s.exam_date.day for s in slots], [7, 8, 10, 11, 14])
+        with self.assertRaises(ValueError):
+            build_slots(MONDAY, MONDAY, [("12:00", "09:00")])
+
+
+class TimetableSolverTests(SimpleTestCase):
+    def test_clashing_units_get_distinct_slots_and_fitting_rooms(self):
+        slots = build_slots(MONDAY, date(2026, 12, 8), [("09:00", "12:00"), ("14:00", "17:00")])
+        solver = TimetableSolver(
+            _triangle_matrix(),
+            [0, 1, 2, 3],
+            slots,
+            venues=[VenueOption(1, 2), VenueOption(2, 3)],
+            invigilator_ids=[10, 11],
+            invigilators_per_session=1,
+        )
+        stats = solver.solve(time_budget_seconds=1)
+
+        self.assertEqual(len(set(solver.slot_of[:3].tolist())), 3)
+        self.assertEqual(stats["final"], {"student_clash_cost": 0, "seats_over_capacity": 0, "units_without_venue": 0})
+        # Unit 3 has three candidates, so only the 3-seat room fits it.
+        self.assertEqual(solver.venues[solver.venue_of[3]].id, 2)
+        self.assertEqual(stats["invigilator_shortfall"], 0)
+        self.assertTrue(all(len(staff) == 1 for staff in solver.staff_of))
+
+    def test_fixed_session_blocks_its_slot_for_shared_students(self):
+        slots = build_slots(MONDAY, MONDAY, [("09:00", "12:00"), ("14:00", "17:00")])
+        fixed = [FixedSession(key_index=0, exam_date=MONDAY, start_time=time(8), end_time=time(11))]
+        solver = TimetableSolver(_triangle_matrix(), [1], slots, fixed=fixed)
+        stats = solver.solve(time_budget_seconds=1)
+
+        self.assertEqual(solver.slot_of.tolist(), [1])
+        self.assertEqual(stats["final"]["student_clash_cost"], 0)
+
+    def test_overfull_period_reports_clashes(self):
+        slots = build_slots(MONDAY, MONDAY, [("09:00", "12:00")])
+        solver = TimetableSolver(_triangle_matrix(), [0, 1, 2], slots, venues=[VenueOption(1, 1)])
+        stats = solver.solve(time_budget_seconds=1)
+
+        self.assertEqual(stats["final"]["student_clash_cost"], 6)
+        self.assertEqual(stats["final"]["units_without_venue"], 2)
@@ -19,11 +19,14 @@ from .phase2_views import (
     CourseExamSessionsView,
     CourseRetakeRegistrationsView,
     CourseSittingListView,
+    ExamPeriodClashReportView,
     ExamRetakeDetailView,
     ExamSessionBulkGenerateView,
     ExamSessionDetailView,
     ExamSessionListView,
     ExamSessionSittingListView,
+    ExamTimetableRunDetailView,
+    ExamTimetableRunListCreateView,
     StudentMyExamScheduleView,
     StudentRetakeRequestView,
 )
@@ -185,6 +188,21 @@ urlpatterns = [
         ExamSessionBulkGenerateView.as_view(),
         name="exam-sessions-bulk-generate",
     ),
+    path(
+        "exam-sessions/clash-report/",
+        ExamPeriodClashReportView.as_view(),
+        name="exam-sessions-clash-report",
+    ),
+    path(
+        "exam-timetable-runs/",
+        ExamTimetableRunListCreateView.as_view(),
+        name="exam-timetable-runs",
+    ),
+    path(
+        "exam-timetable-runs/<int:run_id>/",
+        ExamTimetableRunDetailView.as_view(),
+        name="exam-timetable-run-detail",
+    ),
     path(
         "exam-sessions/",
         ExamSessionListView.as_view(),
@@ -28,7 +28,9 @@ from .permissions import (
 from .services.mark_completeness import collect_incomplete_results
 from .services.marks_window import assert_marks_entry_allowed, marks_entry_status
 from .services.policy_resolver import resolve_assessment_policy
-from .services.publish import publish_result, unpublish_result, verify_result
+from .services.bulk_publish import bulk_publish_results
+from .services.publish import unpublish_result
+from .services.standing import get_student_standings, overall_standing, refresh_student_standings
 from .serializers import (
     AssessmentPolicySerializer,
     CourseUnitResultSerializer,
@@ -39,6 +41,19 @@ from .serializers import (
 logger = logging.getLogger(__name__)
 
 
+def _decimal_str(value):
+    return str(value) if value is not None else None
+
+
+def _standing_payload(standing) -> dict:
+    """Semester GPA / running CGPA fields for a results block."""
+    return {
+        "semester_gpa": _decimal_str(standing.gpa) if standing else None,
+        "cgpa": _decimal_str(standing.cgpa) if standing else None,
+        "credits_earned": _decimal_str(standing.credits_earned) if standing else None,
+    }
+
+
 def _get_course_unit_or_404(course_unit_id):
     return CourseUnit.objects.select_related(
         "semester",
@@ -429,7 +444,6 @@ class PublishCourseMarksView(APIView):
         verified_n = base_qs.filter(status=CourseUnitResult.STATUS_VERIFIED).count()
         already_published_n = base_qs.filter(status=CourseUnitResult.STATUS_PUBLISHED).count()
 
-        published = 0
         with transaction.atomic():
             results = base_qs.filter(status__in=statuses).select_related(
                 "enrollment", "enrollment__student", "policy"
@@ -445,11 +459,9 @@ class PublishCourseMarksView(APIView):
                     status=400,
                 )
 
-            for result in results:
-                if result.status == CourseUnitResult.STATUS_DRAFT:
-                    verify_result(result, user=request.user)
-                publish_result(result, user=request.user)
-                published += 1
+            published = bulk_publish_results(
+                results, user=request.user, request=request, audit_obj=course_unit
+            )
 
         scope = "selected student(s)" if enrollment_ids is not None else "course"
         if published:
@@ -535,9 +547,12 @@ class UnpublishCourseMarksView(APIView):
 
         unpublished = 0
         with transaction.atomic():
+            student_ids = set()
             for result in qs.select_related("enrollment"):
-                unpublish_result(result, user=request.user)
+                unpublish_result(result, user=request.user, refresh_standing=False)
+                student_ids.add(result.enrollment.student_id)
                 unpublished += 1
+            refresh_student_standings(student_ids)
 
         scope = "selected student(s)" if enrollment_ids is not None else "course"
         if unpublished:
@@ -572,11 +587,19 @@ class StudentMyResultsView(APIView):
             .order_by("enrollment__course_unit__semester__order", "enrollment__course_unit__code")
         )
 
+        standing_rows = get_student_standings(student)
+        standings = {s.semester_id: s for s in standing_rows}
+        overall = overall_standing(standing_rows)
+
         by_semester = {}
         for result in results:
             sem = result.enrollment.course_unit.semester
             key = sem.name if sem else "Other"
-            by_semester.setdefault(key, []).append(CourseUnitResultSerializer(result).data)
+            block = by_semester.setdefault(
+                key,
+                {"name": key, "courses": [], **_standing_payload(standings.get(sem.pk if sem else None))},
+            )
+            block["courses"].append(CourseUnitResultSerializer(result).data)
 
         return Response(
             {
@@ -584,6 +607,11 @@ class StudentMyResultsView(APIView):
                     "reg_no": student.reg_no,
                     "name": student.full_name,
                 },
-                "semesters": [{"name": k, "courses": v} for k, v in by_semester.items()],
+                "semesters": list(by_semester.values()),
+                "summary": {
+                    "cgpa": _decimal_str(overall.cgpa) if overall else None,
+                    "credits_earned": _decimal_str(overall.cumulative_credits_earned) if overall else None,
+                    "award_class": overall.award_class if overall else "",
+                },
             }
         )
@@ -2,9 +2,8 @@
 from decimal import Decimal
 
 from admissions.models import AdmittedStudent
-from examinations.models import CourseUnitResult
-from examinations.services.award_classification import resolve_award_class
-from examinations.services.transcript import build_student_transcript
+from examinations.services.award_classification import AwardClassLookup, resolve_award_class
+from examinations.services.standing import get_student_standings, standings_for_students
 from Programs.models import StudentProgrammeEnrollment
 
 
@@ -30,8 +29,29 @@ def evaluate_student_graduation(
     Returns eligibility snapshot for one student based on published results.
     """
     min_cgpa = min_cgpa if min_cgpa is not None else DEFAULT_MIN_CGPA
+    enrollment, blockers = _enrollment_blockers(student)
+
+    st = _standing_totals(get_student_standings(student))
+
+    cgpa = st["cgpa"]
+    return _graduation_row(
+        student,
+        enrollment,
+        cgpa=cgpa,
+        total_cu=st["total_credit_units"],
+        published_count=st["published_count"],
+        failed_count=st["failed_count"],
+        award_class=resolve_award_class(
+            Decimal(str(cgpa)) if cgpa is not None else None, student=student
+        ),
+        already_assigned=student.graduation_assignments.exists(),
+        min_cgpa=min_cgpa,
+        blockers=blockers,
+    )
+
+
+def _enrollment_blockers(student: AdmittedStudent) -> tuple[StudentProgrammeEnrollment | None, list[str]]:
     blockers: list[str] = []
-    reasons: list[str] = []
 
     if student.application and student.application.is_revoked:
         blockers.append("Admission revoked.")
@@ -44,22 +64,26 @@ def evaluate_student_graduation(
 
     if enrollment and enrollment.status not in ("enrolled", "completed"):
         blockers.append(f"Programme status is '{enrollment.status}', not enrolled.")
+    return enrollment, blockers
 
-    transcript = build_student_transcript(student)
-    summary = transcript.get("summary") or {}
-    cgpa = summary.get("cgpa")
-    total_cu = summary.get("total_credit_units") or 0
-    published_count = summary.get("published_course_count") or 0
 
+def _graduation_row(
+    student: AdmittedStudent,
+    enrollment: StudentProgrammeEnrollment | None,
+    *,
+    cgpa,
+    total_cu,
+    published_count: int,
+    failed_count: int,
+    award_class: str,
+    already_assigned: bool,
+    min_cgpa: Decimal,
+    blockers: list[str],
+) -> dict:
+    reasons: list[str] = []
     cgpa_dec = Decimal(str(cgpa)) if cgpa is not None else None
     total_cu_dec = Decimal(str(total_cu))
 
-    failed_count = CourseUnitResult.objects.filter(
-        enrollment__student=student,
-        status=CourseUnitResult.STATUS_PUBLISHED,
-        is_pass=False,
-    ).count()
-
     min_load = _min_graduation_load(enrollment) if enrollment else Decimal("0")
 
     if published_count == 0:
@@ -84,7 +108,6 @@ def evaluate_student_graduation(
     if failed_count > 0:
         blockers.append(f"{failed_count} published failed course(s).")
 
-    already_assigned = student.graduation_assignments.exists()
     if already_assigned:
         reasons.append("Already assigned to a graduation session.")
 
@@ -104,7 +127,7 @@ def evaluate_student_graduation(
         "min_cgpa": str(min_cgpa),
         "failed_published_count": failed_count,
         "published_course_count": published_count,
-        "award_class": resolve_award_class(cgpa_dec, student=student),
+        "award_class": award_class,
         "qualified": qualified,
         "reasons": reasons,
         "blockers": blockers,
@@ -112,6 +135,59 @@ def evaluate_student_graduation(
     }
 
 
+def _standing_totals(standings) -> dict:
+    """CGPA, credit total and counts from a student's materialized standings."""
+    overall = standings[-1] if standings else None
+    return {
+        "cgpa": float(overall.cgpa) if overall and overall.cgpa is not None else None,
+        "total_credit_units": float(overall.cumulative_credits_graded) if overall else 0,
+        "published_count": sum(s.published_count for s in standings),
+        "failed_count": overall.cumulative_failed_count if overall else 0,
+    }
+
+
+def evaluate_cohort_graduation(students, *, min_cgpa: Decimal | None = None) -> list[dict]:
+    """
+    ``evaluate_student_graduation`` for many students at once.
+
+    CGPA and credit totals come from the materialized semester standings in
+    one query; award schemes resolve once per academic level and existing
+    graduation assignments in one query.
+    """
+    from ..models import GraduationAssignment
+
+    min_cgpa = min_cgpa if min_cgpa is not None else DEFAULT_MIN_CGPA
+    students = list(students)
+    student_ids = [s.id for s in students]
+    standings = standings_for_students(student_ids)
+    assigned = set(
+        GraduationAssignment.objects.filter(student_id__in=student_ids).values_list("student_id", flat=True)
+    )
+    award_class = AwardClassLookup()
+
+    out = []
+    for student in students:
+        enrollment, blockers = _enrollment_blockers(student)
+        level_id = enrollment.program.academic_level_id if enrollment and enrollment.program_id else None
+        st = _standing_totals(standings[student.id])
+        cgpa = st["cgpa"]
+        out.append(
+            _graduation_row(
+                student,
+                enrollment,
+                cgpa=cgpa,
+                total_cu=st["total_credit_units"],
+                published_count=st["published_count"],
+                failed_count=st["failed_count"],
+                award_class=award_class(Decimal(str(cgpa)) if cgpa is not None else None, level_id),
+                already_assigned=student.id in assigned,
+                min_cgpa=min_cgpa,
+                blockers=blockers,
+            )
+        )
+    return out
+
+
 def qualified_students_queryset(
     *,
     program_batch_id: int | None = None,
@@ -123,6 +199,7 @@ def qualified_students_queryset(
         "programme_enrollment",
         "programme_enrollment__program",
         "programme_enrollment__program_batch",
+        "programme_enrollment__curriculum_version",
         "application",
     )
     if program_batch_id:
@@ -132,8 +209,4 @@ def qualified_students_queryset(
 
     qs = qs.filter(programme_enrollment__status__in=("enrolled", "completed"))
 
-    rows = []
-    for student in qs.order_by("reg_no"):
-        row = evaluate_student_graduation(student, min_cgpa=min_cgpa)
-        rows.append(row)
-    return rows
+    return evaluate_cohort_graduation(qs.order_by("reg_no"), min_cgpa=min_cgpa)
@@ -0,0 +1,62 @@
+"""Cohort graduation evaluation — per-student rows from materialized standings."""
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from admissions.models import AdmittedStudent, Application
+from examinations.models import AwardClassBand, StudentSemesterStanding
+from graduation.services import qualification
+from Programs.models import Program, ProgramBatch, StudentProgrammeEnrollment
+
+
+class EvaluateCohortGraduationTests(SimpleTestCase):
+    def test_rows_use_shared_scheme_and_assignments(self):
+        program = Program(pk=4, name="BSc Computer Science", minimum_graduation_load=Decimal("6"))
+        students = []
+        for pk in (1, 2):
+            student = AdmittedStudent(pk=pk, reg_no=f"2022/BCS/00{pk}")
+            student.application = Application(pk=pk, is_revoked=False)
+            enrollment = StudentProgrammeEnrollment(
+                student=student, program=program, program_batch=ProgramBatch(pk=8, name="2022"), status="enrolled"
+            )
+            enrollment.curriculum_version = None
+            student._state.fields_cache["programme_enrollment"] = enrollment
+            students.append(student)
+        standings = {
+            1: [
+                StudentSemesterStanding(student_id=1, sequence=1, published_count=1, cgpa=Decimal("4.50"), cumulative_credits_graded=Decimal("3.0")),
+                StudentSemesterStanding(student_id=1, sequence=2, published_count=1, cgpa=Decimal("4.50"), cumulative_credits_graded=Decimal("7.0")),
+            ],
+            2: [
+                StudentSemesterStanding(
+                    student_id=2, sequence=1, published_count=1, failed_count=1, cumulative_failed_count=1,
+                    cgpa=Decimal("1.00"), cumulative_credits_graded=Decimal("3.0"),
+                ),
+            ],
+        }
+        bands = [AwardClassBand(title="First Class", min_cgpa=Decimal("4.40"), order=1)]
+        scheme = mock.Mock(**{"bands.all.return_value": bands})
+
+        queryset = mock.Mock(**{"values_list.return_value": [2]})
+        with mock.patch.object(qualification, "standings_for_students", return_value=standings), \
+                mock.patch("graduation.models.GraduationAssignment.objects.filter", return_value=queryset), \
+                mock.patch(
+                    "examinations.services.award_classification.resolve_award_classification_scheme",
+                    return_value=scheme,
+                ) as resolve:
+            first, second = qualification.evaluate_cohort_graduation(students)
+
+        resolve.assert_called_once()
+        self.assertTrue(first["qualified"])
+        self.assertEqual((first["cgpa"], first["total_credit_units"], first["award_class"]), ("4.5", "7.0", "First Class"))
+        self.assertFalse(second["qualified"])
+        self.assertTrue(second["already_assigned"])
+        self.assertEqual(
+            second["blockers"],
+            [
+                "Credit units 3.0 below minimum graduation load 6.",
+                "CGPA 1.0 below minimum 2.00.",
+                "1 published failed course(s).",
+            ],
+        )
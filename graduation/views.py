@@ -25,7 +25,7 @@ from .serializers import (
 )
 from .services.qualification import (
     DEFAULT_MIN_CGPA,
-    evaluate_student_graduation,
+    evaluate_cohort_graduation,
     qualified_students_queryset,
 )
 
@@ -206,11 +206,28 @@ class SessionAssignmentsView(APIView):
         created = []
         errors = []
 
+        # Evaluate the whole selection together rather than one transcript per student.
+        students = {
+            str(s.pk): s
+            for s in AdmittedStudent.objects.filter(
+                pk__in=[sid for sid in student_ids if str(sid).isdigit()], is_admitted=True
+            ).select_related(
+                "programme_enrollment",
+                "programme_enrollment__program",
+                "programme_enrollment__program_batch",
+                "programme_enrollment__curriculum_version",
+                "application",
+            )
+        }
+        evaluations = {
+            row["student_id"]: row
+            for row in evaluate_cohort_graduation(students.values(), min_cgpa=min_cgpa)
+        }
+
         with transaction.atomic():
             for sid in student_ids:
-                try:
-                    student = AdmittedStudent.objects.get(pk=sid, is_admitted=True)
-                except AdmittedStudent.DoesNotExist:
+                student = students.get(str(sid))
+                if student is None:
                     errors.append({"student_id": sid, "detail": "Student not found."})
                     continue
 
@@ -223,7 +240,7 @@ class SessionAssignmentsView(APIView):
                     )
                     continue
 
-                eval_row = evaluate_student_graduation(student, min_cgpa=min_cgpa)
+                eval_row = evaluations[student.id]
                 if require_qualified and not eval_row["qualified"]:
                     errors.append(
                         {
@@ -251,6 +251,30 @@ CELERY_BEAT_SCHEDULE = {
         "task": "admissions.tasks.celery_maybe_send_weekly_admissions_digest",
         "schedule": crontab(minute="*/15"),
     },
+    # Re-warm finance snapshots after midnight (billing dates roll daily)
+    "refresh-stale-finance-snapshots-nightly": {
+        "task": "payments.tasks.celery_refresh_stale_finance_snapshots",
+        "schedule": crontab(hour=2, minute=30),
+    },
+    # Admissions analytics rollup: signals keep it current; nightly full regroup
+    "rebuild-admissions-analytics-rollup-nightly": {
+        "task": "admissions.tasks.celery_rebuild_admissions_rollup",
+        "schedule": crontab(hour=2, minute=45),
+    },
+    # Student search documents: signals keep them current; nightly full rebuild
+    "rebuild-student-search-index-nightly": {
+        "task": "admissions.tasks.celery_refresh_student_search_documents",
+        "schedule": crontab(hour=3, minute=0),
+    },
+    # Application submission outbox: drained after each submit; sweep anything the broker missed
+    "drain-application-submission-outbox": {
+        "task": "admissions.tasks.celery_drain_submission_outbox",
+        "schedule": crontab(minute="*/1"),
+    },
+    "purge-application-submission-outbox-nightly": {
+        "task": "admissions.tasks.celery_purge_submission_outbox",
+        "schedule": crontab(hour=3, minute=15),
+    },
     "check-weekly-bursar-report": {
         "task": "payments.tasks.celery_maybe_send_bursar_weekly_report",
         "schedule": crontab(minute="*/15"),
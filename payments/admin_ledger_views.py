@@ -2,14 +2,22 @@
 from __future__ import annotations
 
 import logging
-import csv
 from datetime import datetime
 
-from decimal import Decimal
-
-from django.db.models import Count, DecimalField, F, Max, Q, Sum, Value
+from django.db.models import (
+    Count,
+    DecimalField,
+    F,
+    IntegerField,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+)
 from django.db.models.functions import Coalesce
-from django.http import HttpResponse, StreamingHttpResponse
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils.dateparse import parse_date
 from accounts.erp_drf_permissions import (
@@ -30,10 +38,10 @@ from .models import StudentTuitionPayment, TuitionLedger
 from .student_portal_finance import (
     COMMITMENT_FEE_THRESHOLD,
     payment_status_dict,
-    student_billing_lines,
     student_finance_totals,
 )
 
+from .report_exports import EXPORT_CHUNK_SIZE, ExportSpec, export_response, start_export_job
 from .tasks import queue_bulk_commitment_reminders
 
 logger = logging.getLogger(__name__)
@@ -91,6 +99,9 @@ def _ledger_cohort_params(request) -> dict[str, int | str | None]:
     }
 
 
+_COHORT_KEYS = ("batch_id", "program_id", "campus_id", "program_batch_id", "academic_year", "intake")
+
+
 def _apply_student_cohort_filters(qs, cohort: dict[str, int | str | None]):
     if cohort["batch_id"]:
         qs = qs.filter(admitted_batch_id=cohort["batch_id"])
@@ -188,19 +199,41 @@ def _student_last_paid_at(student: AdmittedStudent):
     )
 
 
+def annotate_student_payment_stats(qs):
+    """Completed / pending portal payment counts and last paid date as SQL subqueries."""
+    payments = StudentTuitionPayment.objects.filter(student_id=OuterRef("pk")).order_by()
+
+    def _count(status_value):
+        return Coalesce(
+            Subquery(
+                payments.filter(status=status_value)
+                .values("student_id")
+                .annotate(n=Count("id"))
+                .values("n")[:1],
+                output_field=IntegerField(),
+            ),
+            Value(0),
+        )
+
+    return qs.annotate(
+        completed_payment_count=_count("completed"),
+        pending_payment_count=_count("pending"),
+        last_paid_at=Subquery(
+            payments.filter(status="completed")
+            .order_by("-paid_at", "-created_at")
+            .values("paid_at")[:1]
+        ),
+    )
+
+
 def _cohort_finance_summary(students_qs) -> dict[str, float]:
-    billed = Decimal("0")
-    paid = Decimal("0")
-    balance = Decimal("0")
-    for student in students_qs.iterator(chunk_size=100):
-        totals = student_finance_totals(student)
-        billed += Decimal(str(totals["total_required"]))
-        paid += Decimal(str(totals["total_paid"]))
-        balance += Decimal(str(totals["balance"]))
+    from .cohort_finance_aggregates import cohort_finance_rollup
+
+    totals = cohort_finance_rollup(students_qs)["totals"]
     return {
-        "total_billed": float(billed),
-        "total_paid": float(paid),
-        "total_balance": float(balance),
+        "total_billed": float(totals["total_billed"]),
+        "total_paid": float(totals["total_paid"]),
+        "total_balance": float(totals["total_balance"]),
     }
 
 
@@ -313,13 +346,6 @@ def _commitment_students_queryset(
     return qs
 
 
-class _CsvEcho:
-    """Write CSV rows for StreamingHttpResponse."""
-
-    def write(self, value: str) -> str:
-        return value
-
-
 def _student_row(student: AdmittedStudent) -> dict:
     finance = student_finance_totals(student)
     completed_count, pending_count = _student_payment_counts(student)
@@ -545,15 +571,7 @@ class AdminTuitionLedgerStudentsView(APIView):
             if include_finance_summary:
                 try:
                     summary.update(
-                        _cohort_finance_summary(
-                            summary_qs.select_related(
-                                "admitted_program",
-                                "admitted_campus",
-                                "admitted_batch",
-                                "application",
-                                "programme_enrollment",
-                            )
-                        )
+                        _cohort_finance_summary(summary_qs)
                     )
                 except Exception:
                     summary.update(
@@ -576,77 +594,104 @@ class AdminTuitionLedgerStudentsView(APIView):
         )
 
 
+def commitment_students_export(params: dict) -> ExportSpec:
+    """Paid / unpaid commitment list (Tuition Ledger → Download); shared by sync + job exports."""
+    commitment_met = bool(params.get("commitment_met"))
+    cohort = {key: params.get(key) for key in _COHORT_KEYS}
+    qs = annotate_student_payment_stats(
+        annotate_commitment_ugx_paid(
+            _commitment_students_queryset(
+                search=params.get("search") or "",
+                cohort=cohort,
+                commitment_met=commitment_met,
+            )
+        )
+    )
+    threshold = float(COMMITMENT_FEE_THRESHOLD)
+
+    def rows():
+        for student in qs.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            pay = _payment_code_fields(student)
+            paid = float(student.commitment_paid_ugx or 0)
+            # The strict filter already decided the status; the annotation only supplies amounts.
+            balance = 0.0 if commitment_met else max(threshold - paid, 0.0)
+            last_paid = student.last_paid_at
+            yield [
+                pay["schoolpay_code"] or "",
+                student.reg_no or "",
+                "Yes" if pay["schoolpay_registered"] else "No",
+                _student_display_name(student),
+                student.admitted_program.name if student.admitted_program_id else "",
+                student.admitted_campus.name if student.admitted_campus_id else "",
+                _batch_intake_label(student.admitted_batch if student.admitted_batch_id else None)
+                or "",
+                paid,
+                balance,
+                "Paid" if commitment_met else "Not paid",
+                int(student.completed_payment_count or 0),
+                last_paid.strftime("%Y-%m-%d") if last_paid else "",
+            ]
+
+    return ExportSpec(
+        filename_stem=f"commitment_{'paid' if commitment_met else 'unpaid'}",
+        title="Commitment paid" if commitment_met else "Commitment unpaid",
+        headers=[
+            "Pay code (SchoolPay wallet)",
+            "Reg No",
+            "SchoolPay synced",
+            "Name",
+            "Program",
+            "Campus",
+            "Intake",
+            "Commitment Paid (UGX)",
+            "Commitment Balance (UGX)",
+            "Status",
+            "Completed portal payments",
+            "Last paid",
+        ],
+        rows=rows(),
+    )
+
+
+def _export_format(request) -> str:
+    # Not ``?format=``: DRF reserves it for renderer selection (404 on unknown renderers).
+    fmt = (request.query_params.get("export_format") or "csv").strip().lower()
+    return "xlsx" if fmt in ("xlsx", "excel") else "csv"
+
+
+def _queue_export_response(request, kind: str, params: dict, fmt: str) -> Response:
+    job = start_export_job(kind, params, fmt=fmt, user=request.user)
+    return Response(
+        {
+            "job_id": job.pk,
+            "status": job.status,
+            "status_url": f"/api/payments/admin/report_exports/{job.pk}",
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
 class AdminTuitionLedgerStudentsExportView(APIView):
-    """GET /api/payments/admin/tuition_ledger/students/export — CSV download."""
+    """
+    GET /api/payments/admin/tuition_ledger/students/export — CSV (or ?export_format=xlsx) download.
+
+    ``?background=1`` renders the file on a worker instead and returns a job id
+    to poll at ``admin/report_exports/<id>``.
+    """
 
     permission_classes = [FinanceModuleAdminPermission]
 
     def get(self, request):
-        search = request.query_params.get("search", "")
         commitment_met = _parse_bool(request.query_params.get("commitment_met"))
-        if commitment_met is None:
-            commitment_met = False
-        cohort = _ledger_cohort_params(request)
-        qs = _commitment_students_queryset(
-            search=search,
-            cohort=cohort,
-            commitment_met=commitment_met,
-        )
-
-        label = "paid" if commitment_met else "unpaid"
-        filename = f"commitment_{label}_{datetime.now().strftime('%Y-%m-%d')}.csv"
-
-        def stream_rows():
-            pseudo_buffer = _CsvEcho()
-            writer = csv.writer(pseudo_buffer)
-            yield writer.writerow(
-                [
-                    "Pay code (SchoolPay wallet)",
-                    "Reg No",
-                    "SchoolPay synced",
-                    "Name",
-                    "Program",
-                    "Campus",
-                    "Intake",
-                    "Commitment Paid (UGX)",
-                    "Commitment Balance (UGX)",
-                    "Status",
-                ]
-            )
-            for student in qs.iterator(chunk_size=500):
-                try:
-                    row = _commitment_student_row(student)
-                except Exception:
-                    pay = _payment_code_fields(student)
-                    row = {
-                        **pay,
-                        "reg_no": student.reg_no,
-                        "student_name": _student_display_name(student),
-                        "program": None,
-                        "campus": None,
-                        "intake": None,
-                        "commitment_paid_ugx": 0.0,
-                        "commitment_balance": float(COMMITMENT_FEE_THRESHOLD),
-                        "commitment_met": bool(student.admission_fee_paid),
-                    }
-                yield writer.writerow(
-                    [
-                        row.get("schoolpay_code") or "",
-                        row.get("reg_no") or "",
-                        "Yes" if row.get("schoolpay_registered") else "No",
-                        row.get("student_name") or "",
-                        row.get("program") or "",
-                        row.get("campus") or "",
-                        row.get("intake") or "",
-                        row.get("commitment_paid_ugx") or 0,
-                        row.get("commitment_balance") or 0,
-                        "Paid" if row.get("commitment_met") else "Not paid",
-                    ]
-                )
-
-        response = StreamingHttpResponse(stream_rows(), content_type="text/csv; charset=utf-8")
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return response
+        params = {
+            "search": request.query_params.get("search", ""),
+            "commitment_met": bool(commitment_met),
+            **_ledger_cohort_params(request),
+        }
+        fmt = _export_format(request)
+        if _parse_bool(request.query_params.get("background")):
+            return _queue_export_response(request, "commitment_students", params, fmt)
+        return export_response(commitment_students_export(params), fmt)
 
 
 class AdminTuitionLedgerStudentDetailView(APIView):
@@ -671,7 +716,7 @@ class AdminTuitionLedgerStudentDetailView(APIView):
             {
                 "student": _student_row(student),
                 "finance": finance,
-                "billing_lines": student_billing_lines(student),
+                "billing_lines": finance["billing_lines"],
             }
         )
 
@@ -1091,10 +1136,10 @@ class AdminManualBankPaymentsReportView(APIView):
 
     permission_classes = [CanViewDirectAllocationsReport]
 
-    def _bank_qs(self, request):
-        search = (request.query_params.get("search") or "").strip()
-        from_date = parse_date(request.query_params.get("from_date") or "")
-        to_date = parse_date(request.query_params.get("to_date") or "")
+    def _bank_qs(self, params):
+        search = (params.get("search") or "").strip()
+        from_date = parse_date(params.get("from_date") or "")
+        to_date = parse_date(params.get("to_date") or "")
         qs = (
             TuitionLedger.objects.filter(
                 Q(schoolpay_receipt_number__startswith="BANK-")
@@ -1125,12 +1170,12 @@ class AdminManualBankPaymentsReportView(APIView):
             qs = qs.filter(payment_date_time__date__lte=to_date)
         return qs
 
-    def _credit_qs(self, request):
+    def _credit_qs(self, params):
         from payments.models import StudentTuitionPayment
 
-        search = (request.query_params.get("search") or "").strip()
-        from_date = parse_date(request.query_params.get("from_date") or "")
-        to_date = parse_date(request.query_params.get("to_date") or "")
+        search = (params.get("search") or "").strip()
+        from_date = parse_date(params.get("from_date") or "")
+        to_date = parse_date(params.get("to_date") or "")
         qs = (
             StudentTuitionPayment.objects.filter(
                 status="completed",
@@ -1229,10 +1274,24 @@ class AdminManualBankPaymentsReportView(APIView):
         kind = (request.query_params.get("kind") or "bank").strip().lower()
         if kind not in ("bank", "credit"):
             kind = "bank"
-        qs = self._credit_qs(request) if kind == "credit" else self._bank_qs(request)
         export = (request.query_params.get("export") or "").strip().lower()
         if export in ("xlsx", "excel", "1", "true"):
-            return self._excel(kind, qs)
+            params = {
+                "kind": kind,
+                **{
+                    key: request.query_params.get(key) or ""
+                    for key in ("search", "from_date", "to_date")
+                },
+            }
+            if _parse_bool(request.query_params.get("background")):
+                return _queue_export_response(request, "manual_bank_payments", params, "xlsx")
+            params["max_rows"] = MANUAL_BANK_EXPORT_SYNC_MAX_ROWS
+            return export_response(manual_bank_payments_export(params), "xlsx")
+        qs = (
+            self._credit_qs(request.query_params)
+            if kind == "credit"
+            else self._bank_qs(request.query_params)
+        )
 
         page = _parse_page(request.query_params.get("page"))
         page_size = _parse_page_size(request.query_params.get("page_size"), default=50)
@@ -1250,112 +1309,83 @@ class AdminManualBankPaymentsReportView(APIView):
             }
         )
 
-    def _excel(self, kind: str, qs):
-        from datetime import datetime
-        from io import BytesIO
 
-        from openpyxl import Workbook
-        from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
-        from openpyxl.utils import get_column_letter
+# In-request downloads keep the old cap; background jobs export everything.
+MANUAL_BANK_EXPORT_SYNC_MAX_ROWS = 8000
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Bank payments" if kind == "bank" else "Direct credits"
-        if kind == "credit":
-            headers = [
-                "Paid at",
-                "Student",
-                "Student ID",
-                "Reg no",
-                "Programme",
-                "Amount",
-                "Label",
-                "Reference",
-                "Posted by",
-                "Posted at",
-                "Notes",
-            ]
-        else:
-            headers = [
-                "Payment date",
-                "Student",
-                "Student ID",
-                "Reg no",
-                "Programme",
-                "Amount",
-                "Bank reference",
-                "Bank",
-                "Receipt",
-                "Posted by",
-                "Posted at",
-                "Notes",
-            ]
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="1e1b4b", fill_type="solid")
-        thin = Border(
-            left=Side(style="thin", color="CBD5E1"),
-            right=Side(style="thin", color="CBD5E1"),
-            top=Side(style="thin", color="CBD5E1"),
-            bottom=Side(style="thin", color="CBD5E1"),
-        )
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal="center", wrap_text=True)
-            cell.border = thin
-            ws.column_dimensions[get_column_letter(col)].width = max(14, min(36, len(header) + 4))
-        for r_i, row in enumerate(qs[:8000], 2):
-            data = self._credit_row(row) if kind == "credit" else self._bank_row(row)
+
+def _export_dt(value) -> str:
+    return (value or "")[:19].replace("T", " ")
+
+
+def manual_bank_payments_export(params: dict) -> ExportSpec:
+    """Direct allocations report (bank postings or Student Charges credits) as an export spec."""
+    report = AdminManualBankPaymentsReportView()
+    kind = "credit" if params.get("kind") == "credit" else "bank"
+    qs = report._credit_qs(params) if kind == "credit" else report._bank_qs(params)
+    if params.get("max_rows"):
+        qs = qs[: int(params["max_rows"])]
+    if kind == "credit":
+        headers = [
+            "Paid at",
+            "Student",
+            "Student ID",
+            "Reg no",
+            "Programme",
+            "Amount",
+            "Label",
+            "Reference",
+            "Posted by",
+            "Posted at",
+            "Notes",
+        ]
+    else:
+        headers = [
+            "Payment date",
+            "Student",
+            "Student ID",
+            "Reg no",
+            "Programme",
+            "Amount",
+            "Bank reference",
+            "Bank",
+            "Receipt",
+            "Posted by",
+            "Posted at",
+            "Notes",
+        ]
+
+    def rows():
+        for row in qs.iterator(chunk_size=EXPORT_CHUNK_SIZE):
             if kind == "credit":
-                values = [
-                    (data.get("payment_date_time") or "")[:19].replace("T", " "),
-                    data.get("student_name") or "",
-                    data.get("student_id") or "",
-                    data.get("reg_no") or "",
-                    data.get("programme") or "",
-                    float(data.get("amount") or 0),
-                    data.get("label") or "",
-                    data.get("reference") or "",
-                    data.get("posted_by") or "",
-                    (data.get("created_at") or "")[:19].replace("T", " "),
-                    data.get("notes") or "",
-                ]
+                data = report._credit_row(row)
+                middle = [data.get("label") or "", data.get("reference") or ""]
             else:
-                values = [
-                    (data.get("payment_date_time") or "")[:19].replace("T", " "),
-                    data.get("student_name") or "",
-                    data.get("student_id") or "",
-                    data.get("reg_no") or "",
-                    data.get("programme") or "",
-                    float(data.get("amount") or 0),
+                data = report._bank_row(row)
+                middle = [
                     data.get("bank_reference") or "",
                     data.get("bank_name") or "",
                     data.get("receipt") or "",
-                    data.get("posted_by") or "",
-                    (data.get("created_at") or "")[:19].replace("T", " "),
-                    data.get("notes") or "",
                 ]
-            for c_i, value in enumerate(values, 1):
-                cell = ws.cell(row=r_i, column=c_i, value=value)
-                cell.border = thin
-        ws.freeze_panes = "A2"
-        ws.auto_filter.ref = ws.dimensions
-        buf = BytesIO()
-        wb.save(buf)
-        buf.seek(0)
-        from django.http import HttpResponse
+            yield [
+                _export_dt(data.get("payment_date_time")),
+                data.get("student_name") or "",
+                data.get("student_id") or "",
+                data.get("reg_no") or "",
+                data.get("programme") or "",
+                float(data.get("amount") or 0),
+                *middle,
+                data.get("posted_by") or "",
+                _export_dt(data.get("created_at")),
+                data.get("notes") or "",
+            ]
 
-        filename = (
-            f"direct_{'credits' if kind == 'credit' else 'bank_payments'}_"
-            f"{datetime.now().strftime('%Y-%m-%d')}.xlsx"
-        )
-        response = HttpResponse(
-            buf.getvalue(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return response
+    return ExportSpec(
+        filename_stem=f"direct_{'credits' if kind == 'credit' else 'bank_payments'}",
+        title="Direct credits" if kind == "credit" else "Bank payments",
+        headers=headers,
+        rows=rows(),
+    )
 
 
 def _staff_display(user) -> str:
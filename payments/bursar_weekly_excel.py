@@ -176,6 +176,48 @@ def render_bursar_weekly_excel(metrics: dict[str, Any]) -> tuple[bytes, str]:
         )
     autosize(ws_b)
 
+    # --- Balances (finance snapshots: billed / paid / arrears buckets) ---
+    ws_f = wb.create_sheet("Balances")
+    headers = [
+        "Dimension",
+        "Name",
+        "Students",
+        "Billed",
+        "Paid",
+        "Balance",
+        "Collection %",
+        "Cleared",
+        "75-99%",
+        "50-74%",
+        "25-49%",
+        "0-24%",
+    ]
+    ws_f.append(headers)
+    style_header(ws_f, 1, len(headers))
+    for dimension, key, label in (
+        ("Batch", "finance_by_batch", "name"),
+        ("Programme", "finance_by_programme", "name"),
+        ("Currency", "finance_by_currency", "currency"),
+    ):
+        for row in metrics.get(key) or []:
+            ws_f.append(
+                [
+                    dimension,
+                    row.get(label),
+                    row.get("students"),
+                    float(row.get("total_billed") or 0),
+                    float(row.get("total_paid") or 0),
+                    float(row.get("total_balance") or 0),
+                    row.get("collection_rate"),
+                    row.get("cleared"),
+                    row.get("pct_75_99"),
+                    row.get("pct_50_74"),
+                    row.get("pct_25_49"),
+                    row.get("pct_0_24"),
+                ]
+            )
+    autosize(ws_f)
+
     # --- Demographics ---
     ws_d = wb.create_sheet("Demographics")
     ws_d.append(["Dimension", "Name", "Count", "Pct %"])
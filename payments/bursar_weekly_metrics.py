@@ -12,6 +12,10 @@ from django.utils import timezone
 
 from admissions.models import AdmittedStudent, Application
 from accounts.portal_branding import get_university_display_name
+from payments.cohort_finance_aggregates import (
+    cohort_finance_rollup,
+    commitment_ugx_paid_by_student,
+)
 from payments.commitment_queryset import annotate_commitment_ugx_paid, filter_by_commitment_met
 from payments.models import BursarWeeklyReportSettings, TuitionLedger
 from payments.student_payment_allocation import COMMITMENT_FEE_THRESHOLD
@@ -172,11 +176,10 @@ def build_bursar_weekly_metrics(
 
     temporary_access_active_total = count_active_temporary_passes(admitted_qs)
 
-    annotated = annotate_commitment_ugx_paid(admitted_qs)
-    paid_filter = Q(pk__in=paid_id_set) if paid_id_set else Q(pk__in=[])
-    total_collected = (
-        annotated.filter(paid_filter).aggregate(s=Sum("commitment_paid_ugx"))["s"]
-        or Decimal("0")
+    # Commitment UGX per student as plain columns (no per-row correlated subqueries).
+    paid_by_student = commitment_ugx_paid_by_student(admitted_qs)
+    total_collected = sum(
+        (paid_by_student.get(sid, Decimal("0")) for sid in paid_id_set), Decimal("0")
     )
     flag_paid_total = admitted_qs.filter(admission_fee_paid=True).count()
     flag_without_ledger = admitted_qs.filter(admission_fee_paid=True).exclude(
@@ -204,14 +207,13 @@ def build_bursar_weekly_metrics(
             "batch_id": None,
         }
     )
-    for row in annotated.values(
+    for row in admitted_qs.values(
         "id",
         "admitted_program__faculty__name",
         "admitted_campus__name",
         "admitted_batch_id",
         "admitted_batch__name",
         "admitted_batch__academic_year",
-        "commitment_paid_ugx",
     ):
         fac = _safe_name(row["admitted_program__faculty__name"])
         camp = _safe_name(row["admitted_campus__name"])
@@ -222,7 +224,7 @@ def build_bursar_weekly_metrics(
         else:
             batch_key = "Unassigned batch"
         sid = row["id"]
-        amt = Decimal(row["commitment_paid_ugx"] or 0)
+        amt = paid_by_student.get(sid, Decimal("0"))
         faculty_totals[fac]["admitted"] += 1
         campus_totals[camp]["admitted"] += 1
         batch_totals[batch_key]["admitted"] += 1
@@ -297,6 +299,9 @@ def build_bursar_weekly_metrics(
             }
         )
 
+    # Billed / paid / balance and arrears buckets from finance snapshots (grouped SQL).
+    finance = cohort_finance_rollup(admitted_qs)
+
     # Demographics (admitted)
     gender_map: dict[str, int] = defaultdict(int)
     local = 0
@@ -555,6 +560,10 @@ def build_bursar_weekly_metrics(
         "by_faculty": by_faculty,
         "by_campus": by_campus,
         "by_batch": by_batch,
+        "finance_totals": finance["totals"],
+        "finance_by_batch": finance["by_batch"],
+        "finance_by_programme": finance["by_programme"],
+        "finance_by_currency": finance["by_currency"],
         "by_gender": by_gender,
         "by_level": by_level,
         "local_count": local,
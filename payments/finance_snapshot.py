@@ -0,0 +1,259 @@
+"""
+Materialized per-student finance snapshot (``StudentFinanceSnapshot``).
+
+Portal balance reads (``student_finance_totals``, ``student_billing_lines``,
+``student_finance_bundle`` and everything built on them) are served from one
+snapshot row instead of rebuilding the full ``FinanceAllocation``.
+
+Signals bump ``version`` when an input changes (SchoolPay ledger rows, portal
+payments and ad-hoc charges, fee exemptions, fee-plan rules, enrollment
+position). A stale row is recomputed lazily on the next read, and
+``celery_refresh_finance_snapshots`` rebuilds invalidated rows in the
+background with the cohort batch engine.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, time
+from decimal import Decimal
+from typing import Any, Iterable
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from admissions.models import AdmittedStudent
+from payments.models import StudentFinanceSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+def _json_safe(value: Any) -> Any:
+    """Decimals → float so payloads round-trip through JSONField unchanged for the API."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    return value
+
+
+def snapshot_is_fresh(snapshot: StudentFinanceSnapshot | None, today=None) -> bool:
+    """Current version and computed on today's local date (billing dates roll daily)."""
+    if snapshot is None or snapshot.computed_at is None:
+        return False
+    if snapshot.computed_version != snapshot.version:
+        return False
+    today = today or timezone.localdate()
+    return timezone.localtime(snapshot.computed_at).date() == today
+
+
+def _snapshot_fields(student: AdmittedStudent, alloc) -> dict[str, Any]:
+    from payments.student_portal_finance import (
+        _billing_lines_from_alloc,
+        _finance_totals_from_alloc,
+    )
+
+    totals = _json_safe(_finance_totals_from_alloc(alloc, student))
+    return {
+        "primary_currency": alloc.primary_currency,
+        "total_required": alloc.total_required,
+        "total_paid": alloc.total_paid,
+        "balance": alloc.balance,
+        "percentage_paid": float(totals.get("percentage_paid") or 0),
+        "commitment_paid_ugx": alloc.commitment_paid_ugx,
+        "commitment_met": bool(alloc.commitment_met),
+        "balance_carried_forward": alloc.balance_carried_forward or Decimal("0"),
+        "prepaid_credit": alloc.prepaid_credit or Decimal("0"),
+        "required_by_currency": totals["required_by_currency"],
+        "paid_by_currency": totals["paid_by_currency"],
+        "lifetime_paid_by_currency": totals["lifetime_paid_by_currency"],
+        "prepaid_credit_by_currency": totals["prepaid_credit_by_currency"],
+        "totals": totals,
+        "lines": _json_safe(_billing_lines_from_alloc(alloc)),
+    }
+
+
+def finance_versions(student_ids: list[int]) -> dict[int, int]:
+    """Ensure snapshot rows exist and return ``{student_id: version}``."""
+    existing = dict(
+        StudentFinanceSnapshot.objects.filter(student_id__in=student_ids).values_list(
+            "student_id", "version"
+        )
+    )
+    missing = [sid for sid in student_ids if sid not in existing]
+    if missing:
+        StudentFinanceSnapshot.objects.bulk_create(
+            [StudentFinanceSnapshot(student_id=sid) for sid in missing],
+            ignore_conflicts=True,
+        )
+        existing.update(
+            StudentFinanceSnapshot.objects.filter(student_id__in=missing).values_list(
+                "student_id", "version"
+            )
+        )
+    return existing
+
+
+def _store(student: AdmittedStudent, alloc, version: int) -> dict[str, Any]:
+    """
+    Write the computed payload stamped with the version read *before* computing,
+    so an invalidation that lands mid-computation keeps the row stale.
+    """
+    fields = _snapshot_fields(student, alloc)
+    fields["computed_version"] = version
+    fields["computed_at"] = timezone.now()
+    StudentFinanceSnapshot.objects.filter(student_id=student.pk).update(
+        updated_at=fields["computed_at"], **fields
+    )
+    return fields
+
+
+def get_finance_snapshot(student: AdmittedStudent) -> StudentFinanceSnapshot:
+    """Single-row read; recomputes in-request only when the row is missing or stale."""
+    from payments.student_payment_allocation import build_finance_allocation
+
+    snapshot = StudentFinanceSnapshot.objects.filter(student_id=student.pk).first()
+    if snapshot_is_fresh(snapshot):
+        return snapshot
+    if snapshot is None:
+        snapshot, _created = StudentFinanceSnapshot.objects.get_or_create(student_id=student.pk)
+    version = snapshot.version
+    fields = _store(student, build_finance_allocation(student), version)
+    for name, value in fields.items():
+        setattr(snapshot, name, value)
+    return snapshot
+
+
+def refresh_finance_snapshots(student_ids: Iterable[int]) -> int:
+    """Recompute snapshots for many students with cohort-level prefetching."""
+    from payments.student_payment_allocation import iter_finance_allocations
+
+    ids = list(dict.fromkeys(int(i) for i in student_ids if i is not None))
+    if not ids:
+        return 0
+    versions = finance_versions(ids)
+    refreshed = 0
+    for student, alloc in iter_finance_allocations(ids):
+        _store(student, alloc, versions.get(student.pk, 1))
+        refreshed += 1
+    return refreshed
+
+
+def _stale_snapshot_q(prefix: str = "") -> Q:
+    """Rows a reader would recompute (see ``snapshot_is_fresh``), relative to ``prefix``."""
+    start_of_day = timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+    return (
+        Q(**{f"{prefix}computed_at__isnull": True})
+        | Q(**{f"{prefix}computed_at__lt": start_of_day})
+        | ~Q(**{f"{prefix}computed_version": F(f"{prefix}version")})
+    )
+
+
+def refresh_stale_finance_snapshots(max_students: int | None = None) -> dict[str, int]:
+    """Rebuild every invalidated or out-of-date snapshot row (worker sweep)."""
+    qs = (
+        StudentFinanceSnapshot.objects.filter(_stale_snapshot_q())
+        .order_by("student_id")
+        .values_list("student_id", flat=True)
+    )
+    if max_students:
+        qs = qs[: int(max_students)]
+    ids = list(qs)
+    return {"stale": len(ids), "refreshed": refresh_finance_snapshots(ids)}
+
+
+def ensure_finance_snapshots(students_qs) -> int:
+    """
+    Bring snapshots for every student in ``students_qs`` up to date so cohort
+    aggregates can be read straight from the table. Returns rows rebuilt.
+    """
+    ids = list(
+        students_qs.filter(
+            Q(finance_snapshot__isnull=True) | _stale_snapshot_q("finance_snapshot__")
+        )
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    return refresh_finance_snapshots(ids)
+
+
+def _queue_refresh(student_ids: list[int]) -> None:
+    def _enqueue():
+        try:
+            from payments.tasks import celery_refresh_finance_snapshots
+
+            celery_refresh_finance_snapshots.delay(student_ids)
+        except Exception:
+            logger.exception("failed to queue finance snapshot refresh for %s", student_ids)
+
+    transaction.on_commit(_enqueue)
+
+
+def invalidate_finance_snapshots(student_ids: Iterable[int], *, requeue: bool = True) -> int:
+    """Bump snapshot versions for these students; optionally rebuild them after commit."""
+    ids = sorted({int(i) for i in student_ids if i})
+    if not ids:
+        return 0
+    n = StudentFinanceSnapshot.objects.filter(student_id__in=ids).update(
+        version=F("version") + 1
+    )
+    if n and requeue:
+        _queue_refresh(ids)
+    return n
+
+
+def ledger_owner_student_ids(ledger) -> set[int]:
+    """Students whose balance a SchoolPay ledger row can count towards (linked or by code)."""
+    ids: set[int] = set()
+    if getattr(ledger, "student_id", None):
+        ids.add(ledger.student_id)
+    code = (getattr(ledger, "student_payment_code", "") or "").strip()
+    reg = (getattr(ledger, "student_registration_number", "") or "").strip()
+    if code:
+        from payments.utils.payment_code_index import resolve_payment_codes
+
+        ids.update(resolve_payment_codes([code]).values())
+    q = Q()
+    if reg:
+        q |= Q(reg_no__iexact=reg)
+    if getattr(ledger, "user_id", None):
+        q |= Q(student_user_id=ledger.user_id)
+    if q:
+        ids.update(AdmittedStudent.objects.filter(q).values_list("id", flat=True))
+    return ids
+
+
+def invalidate_finance_snapshots_for_rule(rule) -> int:
+    """
+    Fee-plan rule edits can move every student of the programme (cohort
+    fallback) and of programmes that source their curriculum from it.
+    Rows are only marked stale here; readers / the sweep rebuild them.
+    """
+    from Programs.models import Program
+
+    program_ids = {
+        pid
+        for pid in (
+            getattr(rule, "program_id", None),
+            getattr(getattr(rule, "program_batch", None), "program_id", None),
+            getattr(getattr(rule, "fee_plan", None), "program_id", None),
+        )
+        if pid
+    }
+    if not program_ids:
+        return 0
+    names = list(Program.objects.filter(pk__in=program_ids).values_list("name", flat=True))
+    derived = [
+        f"{name}{suffix}"
+        for name in names
+        if name
+        for suffix in (" International", " INTL", " - International")
+    ]
+    q = Q(student__admitted_program_id__in=program_ids) | Q(
+        student__admitted_program__curriculum_source_program_id__in=program_ids
+    )
+    if derived:
+        q |= Q(student__admitted_program__name__in=derived)
+    return StudentFinanceSnapshot.objects.filter(q).update(version=F("version") + 1)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from payments.utils.payment_code_index import rebuild_payment_code_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild StudentPaymentCode (normalized student_id / schoolpay_code / reg_no "
+        "→ admitted student) used by SchoolPay reconciliation and ledger relinking."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="How many students to index per batch.",
+        )
+
+    def handle(self, *args, **options):
+        created = rebuild_payment_code_index(chunk_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Payment code index rebuilt: {created} code(s) indexed.")
+        )
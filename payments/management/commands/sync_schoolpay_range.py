@@ -6,44 +6,57 @@ from datetime import datetime, timedelta
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
-from payments.utils.Transaction_sync import pull_schoolpay_range
+from payments.utils.schoolpay_backfill import (
+    BACKFILL_MAX_WORKERS,
+    create_backfill_job,
+    run_backfill_job,
+)
 
 
 class Command(BaseCommand):
     help = (
-        "Fetch SchoolPay wallet payments for a date range (max 31 days per request) "
+        "Fetch SchoolPay wallet payments for a date range, one day per request, "
         "and save them to TuitionLedger. Use this when a student paid on SchoolPay "
-        "but Bonafide still shows no payment history."
+        "but Bonafide still shows no payment history. Finished days are checkpointed; "
+        "re-run with --resume JOB_ID after a crash or failed days."
     )
 
     def add_arguments(self, parser):
         parser.add_argument("--from", dest="from_date", help="YYYY-MM-DD (default: 90 days ago)")
         parser.add_argument("--to", dest="to_date", help="YYYY-MM-DD (default: today)")
+        parser.add_argument("--resume", type=int, help="Continue an existing backfill job id")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=BACKFILL_MAX_WORKERS,
+            help=f"Concurrent day downloads (default: {BACKFILL_MAX_WORKERS})",
+        )
 
     def handle(self, *args, **options):
-        today = timezone.now().date()
-        to_raw = (options.get("to_date") or "").strip()
-        from_raw = (options.get("from_date") or "").strip()
-        end = datetime.strptime(to_raw, "%Y-%m-%d").date() if to_raw else today
-        start = (
-            datetime.strptime(from_raw, "%Y-%m-%d").date()
-            if from_raw
-            else end - timedelta(days=90)
+        job_id = options.get("resume")
+        if not job_id:
+            today = timezone.now().date()
+            to_raw = (options.get("to_date") or "").strip()
+            from_raw = (options.get("from_date") or "").strip()
+            end = datetime.strptime(to_raw, "%Y-%m-%d").date() if to_raw else today
+            start = (
+                datetime.strptime(from_raw, "%Y-%m-%d").date()
+                if from_raw
+                else end - timedelta(days=90)
+            )
+            if start > end:
+                self.stderr.write("--from must be on or before --to")
+                return
+            job_id = create_backfill_job(start, end).pk
+            self.stdout.write(f"Backfill job {job_id}: {start} .. {end}")
+
+        result = run_backfill_job(job_id, max_workers=options["workers"])
+        self.stdout.write(
+            f"  {result['windows_done']} day(s) done, {result['windows_failed']} failed, "
+            f"{result['windows_remaining']} remaining"
         )
-        if start > end:
-            self.stderr.write("--from must be on or before --to")
-            return
-
-        total = 0
-        cursor = start
-        while cursor <= end:
-            chunk_end = min(cursor + timedelta(days=30), end)
-            from_s = cursor.strftime("%Y-%m-%d")
-            to_s = chunk_end.strftime("%Y-%m-%d")
-            self.stdout.write(f"Pulling {from_s} .. {to_s} ...")
-            n = pull_schoolpay_range(from_s, to_s)
-            total += n
-            self.stdout.write(f"  {n} new receipt(s)")
-            cursor = chunk_end + timedelta(days=1)
-
-        self.stdout.write(self.style.SUCCESS(f"Done. {total} new TuitionLedger row(s)."))
+        if result["windows_remaining"]:
+            self.stdout.write(
+                self.style.WARNING(f"Re-run with --resume {job_id} to retry the remaining days.")
+            )
+        self.stdout.write(self.style.SUCCESS(f"Done. {result['created']} new TuitionLedger row(s)."))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0068_student_id_card_walk_in'),
+        ('payments', '0018_exemption_form_fee_payment_proxy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentFinanceSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('computed_version', models.PositiveIntegerField(default=0)),
+                ('computed_at', models.DateTimeField(blank=True, null=True)),
+                ('primary_currency', models.CharField(default='UGX', max_length=3)),
+                ('total_required', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_paid', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('percentage_paid', models.FloatField(default=0)),
+                ('commitment_paid_ugx', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('commitment_met', models.BooleanField(default=False)),
+                ('balance_carried_forward', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('prepaid_credit', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('required_by_currency', models.JSONField(blank=True, default=dict)),
+                ('paid_by_currency', models.JSONField(blank=True, default=dict)),
+                ('lifetime_paid_by_currency', models.JSONField(blank=True, default=dict)),
+                ('prepaid_credit_by_currency', models.JSONField(blank=True, default=dict)),
+                ('totals', models.JSONField(blank=True, default=dict)),
+                ('lines', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='finance_snapshot', to='admissions.admittedstudent')),
+            ],
+            options={
+                'verbose_name': 'Student finance snapshot',
+                'verbose_name_plural': 'Student finance snapshots',
+            },
+        ),
+    ]
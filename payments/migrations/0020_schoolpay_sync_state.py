@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0019_student_finance_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchoolPaySyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_payment_at', models.DateTimeField(blank=True, null=True)),
+                ('last_receipt_number', models.CharField(blank=True, default='', max_length=100)),
+                ('last_synced_at', models.DateTimeField(blank=True, null=True)),
+                ('last_full_window_at', models.DateTimeField(blank=True, null=True)),
+                ('last_created_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'SchoolPay sync state',
+                'verbose_name_plural': 'SchoolPay sync state',
+            },
+        ),
+    ]
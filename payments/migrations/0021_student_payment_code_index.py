@@ -0,0 +1,70 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:31
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def backfill_payment_codes(apps, schema_editor):
+    AdmittedStudent = apps.get_model("admissions", "AdmittedStudent")
+    StudentPaymentCode = apps.get_model("payments", "StudentPaymentCode")
+    batch = []
+    rows = AdmittedStudent.objects.values_list(
+        "id", "student_id", "schoolpay_code", "reg_no", "updated_at"
+    ).iterator(chunk_size=2000)
+    for pk, student_id, schoolpay_code, reg_no, updated_at in rows:
+        seen = set()
+        for source, raw in (
+            ("student_id", student_id),
+            ("schoolpay_code", schoolpay_code),
+            ("reg_no", reg_no),
+        ):
+            code = (raw or "").strip().upper()
+            if not code or code in seen:
+                continue
+            seen.add(code)
+            batch.append(
+                StudentPaymentCode(
+                    code=code, student_id=pk, source=source, student_updated_at=updated_at
+                )
+            )
+        if len(batch) >= 2000:
+            StudentPaymentCode.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        StudentPaymentCode.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0068_student_id_card_walk_in'),
+        ('payments', '0020_schoolpay_sync_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentPaymentCode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=255)),
+                ('source', models.CharField(choices=[('student_id', 'Student ID / SchoolPay wallet'), ('schoolpay_code', 'SchoolPay code'), ('reg_no', 'Registration number')], max_length=20)),
+                ('student_updated_at', models.DateTimeField(blank=True, null=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payment_code_index', to='admissions.admittedstudent')),
+            ],
+            options={
+                'verbose_name': 'Student payment code',
+                'verbose_name_plural': 'Student payment codes',
+                'constraints': [models.UniqueConstraint(fields=('code', 'student'), name='spc_code_student_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_payment_codes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='tuitionledger',
+            index=models.Index(django.db.models.functions.text.Upper('student_payment_code'), name='tl_paycode_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tuitionledger',
+            index=models.Index(django.db.models.functions.text.Upper('student_registration_number'), name='tl_regno_upper_idx'),
+        ),
+    ]
@@ -2,6 +2,7 @@ from decimal import Decimal
 
 from django.conf import settings
 from django.db import models
+from django.db.models.functions import Upper
 
 from accounts.models import Campus, User
 from admissions.models import AcademicLevel, Batch, Program
@@ -318,11 +319,189 @@ class TuitionLedger(models.Model):
                 fields=['transaction_completion_status', 'student_payment_code'],
                 name='tl_status_paycode_idx',
             ),
+            # Case-insensitive code / reg. no. matching (UPPER(col) IN (...)) used
+            # by batch ledger linking.
+            models.Index(Upper('student_payment_code'), name='tl_paycode_upper_idx'),
+            models.Index(Upper('student_registration_number'), name='tl_regno_upper_idx'),
         ]
 
     def __str__(self):
         return f"{self.student_name} - {self.amount}"
 
+class StudentPaymentCode(models.Model):
+    """
+    Normalized SchoolPay identifier → admitted student (one row per identifier).
+
+    ``code`` is the stripped, upper-cased ``student_id`` / ``schoolpay_code`` /
+    ``reg_no`` so reconciliation can resolve codes with a plain indexed IN lookup
+    instead of case-insensitive scans over ``AdmittedStudent``. Maintained by
+    ``payments.signals``; rebuild with ``manage.py rebuild_payment_code_index``.
+    """
+
+    SOURCE_CHOICES = [
+        ("student_id", "Student ID / SchoolPay wallet"),
+        ("schoolpay_code", "SchoolPay code"),
+        ("reg_no", "Registration number"),
+    ]
+
+    code = models.CharField(max_length=255)
+    student = models.ForeignKey(
+        "admissions.AdmittedStudent",
+        on_delete=models.CASCADE,
+        related_name="payment_code_index",
+    )
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    # Copy of AdmittedStudent.updated_at: the most recently updated student wins shared codes.
+    student_updated_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Student payment code"
+        verbose_name_plural = "Student payment codes"
+        constraints = [
+            models.UniqueConstraint(fields=["code", "student"], name="spc_code_student_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.code} → {self.student_id} ({self.source})"
+
+
+class SchoolPaySyncState(models.Model):
+    """
+    Watermark for the incremental SchoolPay ledger sync (single row).
+
+    Minute ticks only ingest rows newer than ``last_payment_at`` (minus a small
+    overlap); the full look-back window is re-scanned at most hourly to pick up
+    late postings. See ``payments.utils.Transaction_sync``.
+    """
+
+    last_payment_at = models.DateTimeField(null=True, blank=True)
+    last_receipt_number = models.CharField(max_length=100, blank=True, default="")
+    last_synced_at = models.DateTimeField(null=True, blank=True)
+    last_full_window_at = models.DateTimeField(null=True, blank=True)
+    last_created_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "SchoolPay sync state"
+        verbose_name_plural = "SchoolPay sync state"
+
+    def __str__(self):
+        return f"SchoolPay sync @ {self.last_payment_at or '-'} ({self.last_receipt_number or '-'})"
+
+    @classmethod
+    def get_state(cls):
+        state, _ = cls.objects.get_or_create(pk=1)
+        return state
+
+
+class SchoolPayBackfillJob(models.Model):
+    """
+    Resumable historical SchoolPay ingest over a date range.
+
+    The range is split into one ``SchoolPayBackfillWindow`` per day; a window
+    is marked done in the same transaction that reconciles its receipts, so a
+    crashed or cancelled run resumes from the first unfinished day.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    from_date = models.DateField()
+    to_date = models.DateField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    created_count = models.PositiveIntegerField(default=0)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="schoolpay_backfill_jobs",
+    )
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"SchoolPay backfill {self.from_date}..{self.to_date} ({self.status})"
+
+
+class SchoolPayBackfillWindow(models.Model):
+    """One day of a ``SchoolPayBackfillJob`` (the checkpoint unit)."""
+
+    job = models.ForeignKey(SchoolPayBackfillJob, on_delete=models.CASCADE, related_name="windows")
+    day = models.DateField()
+    status = models.CharField(
+        max_length=20,
+        choices=SchoolPayBackfillJob.STATUS_CHOICES,
+        default=SchoolPayBackfillJob.STATUS_PENDING,
+    )
+    fetched_count = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["job", "day"]
+        constraints = [
+            models.UniqueConstraint(fields=["job", "day"], name="sp_backfill_window_job_day_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id}:{self.day} ({self.status})"
+
+
+class ReportExportJob(models.Model):
+    """Background CSV / XLSX export rendered by a worker (see ``payments.report_exports``)."""
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+    FORMAT_CHOICES = [("csv", "CSV"), ("xlsx", "Excel")]
+
+    kind = models.CharField(max_length=64)
+    export_format = models.CharField(max_length=8, choices=FORMAT_CHOICES, default="csv")
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    file = models.FileField(upload_to="report_exports/%Y/%m/", blank=True)
+    row_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="report_export_jobs",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.kind}.{self.export_format} ({self.status})"
+
+
 #student tution payment records (one per payment attempt, including failed/waived)  
 class StudentTuitionPayment(models.Model):
     PAYMENT_STATUS_CHOICES = [
@@ -612,6 +791,53 @@ class StudentFeeExemption(models.Model):
         return int(payable_term) == int(self.payable_term_number)
 
 
+class StudentFinanceSnapshot(models.Model):
+    """
+    Materialized ``FinanceAllocation`` totals for one student (portal balance reads).
+
+    ``version`` is bumped by payment / charge / exemption / fee-rule signals;
+    the row is current only while ``computed_version == version`` and it was
+    computed today (billing dates and curriculum milestones move with the
+    calendar). See ``payments.finance_snapshot``.
+    """
+
+    student = models.OneToOneField(
+        "admissions.AdmittedStudent",
+        on_delete=models.CASCADE,
+        related_name="finance_snapshot",
+    )
+    version = models.PositiveIntegerField(default=1)
+    computed_version = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField(null=True, blank=True)
+
+    primary_currency = models.CharField(max_length=3, default="UGX")
+    total_required = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_paid = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    balance = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    percentage_paid = models.FloatField(default=0)
+    commitment_paid_ugx = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    commitment_met = models.BooleanField(default=False)
+    balance_carried_forward = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    prepaid_credit = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    required_by_currency = models.JSONField(default=dict, blank=True)
+    paid_by_currency = models.JSONField(default=dict, blank=True)
+    lifetime_paid_by_currency = models.JSONField(default=dict, blank=True)
+    prepaid_credit_by_currency = models.JSONField(default=dict, blank=True)
+
+    # ``student_finance_totals`` / ``student_billing_lines`` payloads as served.
+    totals = models.JSONField(default=dict, blank=True)
+    lines = models.JSONField(default=list, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Student finance snapshot"
+        verbose_name_plural = "Student finance snapshots"
+
+    def __str__(self):
+        return f"{self.student_id} finance v{self.computed_version}/{self.version}"
+
+
 # ---------------------------------------------------------------------------
 # Scholarships (programmes, student awards, fee-head waivers → ledger credits)
 # ---------------------------------------------------------------------------
@@ -1,7 +1,12 @@
 """Course registration eligibility: tuition payment threshold + settings gates."""
 from __future__ import annotations
 
+import logging
 from decimal import Decimal, ROUND_HALF_UP
+from typing import Iterable
+
+from django.core.cache import cache
+from django.utils import timezone
 
 from admissions.models import AdmittedStudent
 
@@ -12,7 +17,15 @@ from .registration_gates import (
     settings_block_message,
 )
 from .student_fee_pricing import is_international_student, paid_by_currency
-from .student_payment_allocation import tuition_registration_totals
+from .student_payment_allocation import build_finance_allocation, tuition_registration_totals
+
+logger = logging.getLogger(__name__)
+
+# Tuition-gate results are cached per student under the finance snapshot version
+# (bumped by payment / charge / fee-plan signals), a global epoch bumped when
+# RegistrationSettings or fee rules change, and the local date (terms roll daily).
+ELIGIBILITY_CACHE_TTL = 60 * 60 * 24
+ELIGIBILITY_EPOCH_KEY = "reg_eligibility:epoch"
 
 
 def _rounded_payment_pct(paid: Decimal, required: Decimal) -> Decimal:
@@ -28,8 +41,15 @@ def _bucket_meets_threshold(paid: Decimal, required: Decimal, min_required_pct:
     return _rounded_payment_pct(paid, required) >= Decimal(str(min_required_pct))
 
 
-def _compute_tuition_eligibility(student: AdmittedStudent, settings: RegistrationSettings) -> dict:
-    """Tuition % gate only — independent of commitment / programme enrollment gates."""
+def _compute_tuition_eligibility(
+    student: AdmittedStudent,
+    settings: RegistrationSettings,
+    alloc=None,
+) -> dict:
+    """Tuition % gate only — independent of commitment / programme enrollment gates.
+
+    ``alloc`` lets batch callers pass a prebuilt FinanceAllocation.
+    """
     min_required_pct = float(settings.min_tuition_payment_percentage)
 
     if settings.skip_tuition_check:
@@ -50,7 +70,9 @@ def _compute_tuition_eligibility(student: AdmittedStudent, settings: Registratio
         }
 
     min_pct = Decimal(str(min_required_pct)) / Decimal("100")
-    totals = tuition_registration_totals(student, current_term_only=True)
+    if alloc is None:
+        alloc = build_finance_allocation(student)
+    totals = tuition_registration_totals(student, current_term_only=True, alloc=alloc)
 
     # No current-term tuition schedule (or zero required) ⇒ cannot compute a %.
     # If the student already paid beyond commitment, that money is prepaid credit.
@@ -58,9 +80,6 @@ def _compute_tuition_eligibility(student: AdmittedStudent, settings: Registratio
     if min_required_pct > 0 and (
         not totals["has_tuition_rules"] or totals["total_required"] <= 0
     ):
-        from payments.student_payment_allocation import build_finance_allocation
-
-        alloc = build_finance_allocation(student)
         prepaid = Decimal(str(getattr(alloc, "prepaid_credit", 0) or 0))
         lifetime = Decimal("0")
         for amt in (getattr(alloc, "lifetime_paid_by_currency", None) or {}).values():
@@ -155,16 +174,112 @@ def _compute_tuition_eligibility(student: AdmittedStudent, settings: Registratio
     }
 
 
-def student_tuition_eligible(student: AdmittedStudent) -> bool:
+def registration_eligibility_epoch() -> int:
+    return int(cache.get_or_set(ELIGIBILITY_EPOCH_KEY, 1, timeout=None))
+
+
+def bump_registration_eligibility_epoch() -> None:
+    """Drop every cached tuition-gate result (settings / fee rule changes)."""
+    try:
+        cache.incr(ELIGIBILITY_EPOCH_KEY)
+    except ValueError:
+        cache.set(ELIGIBILITY_EPOCH_KEY, 2, timeout=None)
+
+
+def _eligibility_cache_key(student_id: int, version: int, epoch: int, settings, today) -> str:
+    return (
+        f"reg_eligibility:{student_id}:{version}:{epoch}:"
+        f"{settings.min_tuition_payment_percentage}:{int(bool(settings.skip_tuition_check))}:"
+        f"{today.isoformat()}"
+    )
+
+
+def tuition_eligibility_for_students(
+    students: Iterable[AdmittedStudent | int],
+    settings: RegistrationSettings | None = None,
+) -> dict[int, dict]:
+    """
+    Cached ``_compute_tuition_eligibility`` for many students (one ``get_many``).
+
+    Misses are computed with cohort-prefetched allocations and written back with
+    ``set_many``. A student whose computation fails is logged and left out.
+    """
+    from .finance_snapshot import finance_versions
+    from .student_payment_allocation import iter_finance_allocations
+
+    settings = settings or RegistrationSettings.get_settings()
+    given: dict[int, AdmittedStudent | None] = {}
+    for item in students:
+        if isinstance(item, AdmittedStudent):
+            given[item.pk] = item
+        elif item is not None:
+            given.setdefault(int(item), None)
+    if not given:
+        return {}
+
+    today = timezone.localdate()
+    try:
+        versions = finance_versions(list(given))
+        epoch = registration_eligibility_epoch()
+        keys = {
+            sid: _eligibility_cache_key(sid, versions.get(sid, 0), epoch, settings, today)
+            for sid in given
+        }
+        hits = cache.get_many(list(keys.values()))
+    except Exception:
+        logger.exception("registration eligibility cache unavailable; computing directly")
+        keys, hits = {}, {}
+
+    results: dict[int, dict] = {}
+    misses: list[int] = []
+    for sid in given:
+        cached = hits.get(keys.get(sid))
+        if cached is not None:
+            results[sid] = cached
+        else:
+            misses.append(sid)
+
+    computed: dict[int, dict] = {}
+    if len(misses) == 1 and given[misses[0]] is not None:
+        computed[misses[0]] = _compute_tuition_eligibility(given[misses[0]], settings)
+    elif misses:
+        for student, alloc in iter_finance_allocations(misses):
+            try:
+                computed[student.pk] = _compute_tuition_eligibility(student, settings, alloc)
+            except Exception:
+                logger.exception("tuition eligibility failed for student id=%s", student.pk)
+
+    if computed and keys:
+        try:
+            cache.set_many(
+                {keys[sid]: value for sid, value in computed.items()},
+                timeout=ELIGIBILITY_CACHE_TTL,
+            )
+        except Exception:
+            logger.exception("failed to store registration eligibility cache")
+    results.update(computed)
+    return results
+
+
+def tuition_eligibility(
+    student: AdmittedStudent, settings: RegistrationSettings | None = None
+) -> dict:
+    """Cached tuition % gate for one student (same payload as ``_compute_tuition_eligibility``)."""
+    return tuition_eligibility_for_students([student], settings)[student.pk]
+
+
+def student_tuition_eligible(student: AdmittedStudent, *, alloc=None) -> bool:
     """True when current-term tuition payment meets RegistrationSettings minimum %."""
     settings = RegistrationSettings.get_settings()
-    return bool(_compute_tuition_eligibility(student, settings)["tuition_eligible"])
+    if alloc is not None:
+        return bool(_compute_tuition_eligibility(student, settings, alloc)["tuition_eligible"])
+    return bool(tuition_eligibility(student, settings)["tuition_eligible"])
 
 
 def build_registration_eligibility_payload(student: AdmittedStudent) -> dict:
     settings = RegistrationSettings.get_settings()
     enroll_info = get_programme_enrollment_status(student)
-    tuition = _compute_tuition_eligibility(student, settings)
+    tuition = tuition_eligibility(student, settings)
 
     block_messages: list[str] = []
     settings_msg = settings_block_message(settings)
@@ -0,0 +1,70 @@
+"""Status + download endpoints for background report exports (``ReportExportJob``)."""
+from __future__ import annotations
+
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.super_admin import user_is_super_admin
+
+from .models import ReportExportJob
+from .report_exports import XLSX_CONTENT_TYPE, export_permissions
+
+
+def _job_for_request(request, job_id: int) -> ReportExportJob | None:
+    job = get_object_or_404(ReportExportJob, pk=job_id)
+    if job.created_by_id != request.user.id and not user_is_super_admin(request.user):
+        return None
+    # Still needs the permission the export itself requires (roles can change).
+    view = APIView()
+    if not all(p.has_permission(request, view) for p in export_permissions(job.kind)):
+        return None
+    return job
+
+
+class ReportExportJobView(APIView):
+    """GET /api/payments/admin/report_exports/<job_id>"""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = _job_for_request(request, job_id)
+        if job is None:
+            return Response({"error": "Export not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(
+            {
+                "job_id": job.pk,
+                "kind": job.kind,
+                "format": job.export_format,
+                "status": job.status,
+                "row_count": job.row_count,
+                "error": job.error or None,
+                "created_at": job.created_at,
+                "finished_at": job.finished_at,
+                "download_url": (
+                    f"/api/payments/admin/report_exports/{job.pk}/download"
+                    if job.status == ReportExportJob.STATUS_DONE and job.file
+                    else None
+                ),
+            }
+        )
+
+
+class ReportExportDownloadView(APIView):
+    """GET /api/payments/admin/report_exports/<job_id>/download"""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = _job_for_request(request, job_id)
+        if job is None or job.status != ReportExportJob.STATUS_DONE or not job.file:
+            return Response({"error": "Export not available"}, status=status.HTTP_404_NOT_FOUND)
+        return FileResponse(
+            job.file.open("rb"),
+            as_attachment=True,
+            filename=job.file.name.rsplit("/", 1)[-1],
+            content_type=XLSX_CONTENT_TYPE if job.export_format == "xlsx" else "text/csv",
+        )
@@ -0,0 +1,192 @@
+"""
+Shared CSV / XLSX export engine for finance reports.
+
+An export is a builder ``(params) -> ExportSpec``: a header row plus a lazy
+row iterator (querysets read with ``.iterator(chunk_size=...)``). The same
+spec can be streamed straight to the browser (CSV via ``StreamingHttpResponse``,
+XLSX via an openpyxl write-only workbook spooled to disk) or rendered by a
+Celery worker into a ``ReportExportJob`` file that staff download later.
+
+Builders are registered by dotted path in ``EXPORT_REGISTRY`` so the worker
+does not have to import view modules up front.
+"""
+from __future__ import annotations
+
+import csv
+import logging
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Iterable, Sequence
+
+from django.core.files import File
+from django.db import transaction
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 1000
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+EXPORT_FORMATS = ("csv", "xlsx")
+
+# kind -> (builder dotted path, permission class dotted paths)
+EXPORT_REGISTRY: dict[str, tuple[str, tuple[str, ...]]] = {
+    "commitment_students": (
+        "payments.admin_ledger_views.commitment_students_export",
+        ("accounts.erp_drf_permissions.FinanceModuleAdminPermission",),
+    ),
+    "manual_bank_payments": (
+        "payments.admin_ledger_views.manual_bank_payments_export",
+        ("payments.admin_ledger_views.CanViewDirectAllocationsReport",),
+    ),
+}
+
+
+@dataclass
+class ExportSpec:
+    filename_stem: str
+    title: str
+    headers: Sequence[str]
+    rows: Iterable[Sequence[Any]]
+
+    def filename(self, fmt: str) -> str:
+        return f"{self.filename_stem}_{datetime.now().strftime('%Y-%m-%d')}.{fmt}"
+
+
+class _Echo:
+    """File-like sink: csv.writer returns each formatted row instead of buffering it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv(spec: ExportSpec) -> Iterable[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(list(spec.headers))
+    for row in spec.rows:
+        yield writer.writerow(list(row))
+
+
+def csv_response(spec: ExportSpec) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(iter_csv(spec), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{spec.filename("csv")}"'
+    return response
+
+
+def write_xlsx(spec: ExportSpec, fh) -> int:
+    """Write ``spec`` to ``fh`` with a write-only workbook (rows are not kept in memory)."""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=(spec.title or "Export")[:31])
+    ws.freeze_panes = "A2"
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="1e1b4b", fill_type="solid")
+    header = []
+    for text in spec.headers:
+        cell = WriteOnlyCell(ws, value=text)
+        cell.font = header_font
+        cell.fill = header_fill
+        header.append(cell)
+    ws.append(header)
+    count = 0
+    for row in spec.rows:
+        ws.append(list(row))
+        count += 1
+    wb.save(fh)
+    return count
+
+
+def xlsx_response(spec: ExportSpec) -> FileResponse:
+    # Spooled: small files stay in memory, large ones roll over to disk.
+    fh = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    write_xlsx(spec, fh)
+    fh.seek(0)
+    return FileResponse(
+        fh,
+        as_attachment=True,
+        filename=spec.filename("xlsx"),
+        content_type=XLSX_CONTENT_TYPE,
+    )
+
+
+def export_response(spec: ExportSpec, fmt: str):
+    return xlsx_response(spec) if fmt == "xlsx" else csv_response(spec)
+
+
+def _builder(kind: str) -> Callable[[dict], ExportSpec]:
+    try:
+        path, _permissions = EXPORT_REGISTRY[kind]
+    except KeyError:
+        raise ValueError(f"Unknown export kind: {kind}")
+    return import_string(path)
+
+
+def export_permissions(kind: str) -> list:
+    _path, permissions = EXPORT_REGISTRY[kind]
+    return [import_string(p)() for p in permissions]
+
+
+def start_export_job(kind: str, params: dict, *, fmt: str = "csv", user=None):
+    """Create a ``ReportExportJob`` and render it on a worker after commit."""
+    from payments.models import ReportExportJob
+
+    _builder(kind)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    job = ReportExportJob.objects.create(
+        kind=kind,
+        export_format=fmt,
+        params=params or {},
+        created_by=user if getattr(user, "is_authenticated", False) else None,
+    )
+
+    def _enqueue():
+        from payments.tasks import celery_run_report_export
+
+        celery_run_report_export.delay(job.pk)
+
+    transaction.on_commit(_enqueue)
+    return job
+
+
+def run_export_job(job_id: int) -> dict:
+    """Render one export job to its file (worker side)."""
+    from payments.models import ReportExportJob
+
+    job = ReportExportJob.objects.get(pk=job_id)
+    ReportExportJob.objects.filter(pk=job.pk).update(
+        status=ReportExportJob.STATUS_RUNNING, started_at=timezone.now(), error=""
+    )
+    try:
+        spec = _builder(job.kind)(job.params or {})
+        with tempfile.TemporaryFile() as fh:
+            if job.export_format == "xlsx":
+                count = write_xlsx(spec, fh)
+            else:
+                count = -1  # header row
+                for line in iter_csv(spec):
+                    fh.write(line.encode("utf-8"))
+                    count += 1
+            fh.seek(0)
+            job.file.save(spec.filename(job.export_format), File(fh), save=False)
+    except Exception as exc:
+        logger.exception("report export job %s (%s) failed", job.pk, job.kind)
+        ReportExportJob.objects.filter(pk=job.pk).update(
+            status=ReportExportJob.STATUS_FAILED,
+            error=str(exc)[:2000],
+            finished_at=timezone.now(),
+        )
+        return {"job_id": job.pk, "status": ReportExportJob.STATUS_FAILED}
+
+    ReportExportJob.objects.filter(pk=job.pk).update(
+        status=ReportExportJob.STATUS_DONE,
+        file=job.file.name,
+        row_count=count,
+        finished_at=timezone.now(),
+    )
+    return {"job_id": job.pk, "status": ReportExportJob.STATUS_DONE, "rows": count}
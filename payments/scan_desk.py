@@ -130,14 +130,18 @@ def resolve_student(lookup: str) -> AdmittedStudent | None:
     key = (lookup or "").strip()
     if not key:
         return None
-    return (
-        AdmittedStudent.objects.filter(
-            Q(student_id=key) | Q(reg_no=key) | Q(schoolpay_code=key),
-            is_admitted=True,
-        )
-        .select_related("admitted_program", "admitted_campus", "application")
-        .first()
+    qs = AdmittedStudent.objects.filter(is_admitted=True).select_related(
+        "admitted_program", "admitted_campus", "application"
     )
+    student = qs.filter(Q(student_id=key) | Q(reg_no=key) | Q(schoolpay_code=key)).first()
+    if student is None:
+        # Typed / lower-cased codes: case-insensitive match through the payment-code index.
+        from payments.utils.payment_code_index import resolve_payment_codes
+
+        student_pk = resolve_payment_codes([key]).get(key)
+        if student_pk:
+            student = qs.filter(pk=student_pk).first()
+    return student
 
 
 def _id_card_meta(student: AdmittedStudent) -> dict:
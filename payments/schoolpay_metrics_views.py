@@ -0,0 +1,24 @@
+"""Monitoring endpoint for the shared SchoolPay client (latency / error counters)."""
+from __future__ import annotations
+
+from django.utils.dateparse import parse_date
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.erp_drf_permissions import FinanceModuleAdminPermission
+
+from .utils.schoolpay import schoolpay_client_metrics
+
+
+class SchoolPayClientMetricsView(APIView):
+    """GET /api/payments/admin/schoolpay/metrics?day=YYYY-MM-DD (defaults to today)."""
+
+    permission_classes = [FinanceModuleAdminPermission]
+
+    def get(self, request):
+        raw = request.query_params.get("day")
+        day = parse_date(raw) if raw else None
+        if raw and day is None:
+            return Response({"error": "day must be YYYY-MM-DD"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(schoolpay_client_metrics(day))
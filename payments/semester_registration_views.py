@@ -367,6 +367,20 @@ class UpdateRegistrationSettings(APIView):
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class TuitionPctRebuildStatus(APIView):
+    """Progress of the chunked tuition-% cache rebuild (latest job unless ?job_id=)."""
+
+    permission_classes = [FeePlanConfigurationPermission]
+
+    def get(self, request):
+        from payments.tuition_pct_cache import tuition_pct_rebuild_progress
+
+        progress = tuition_pct_rebuild_progress(request.query_params.get("job_id") or None)
+        if progress is None:
+            return Response({"error": "No rebuild job found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(progress)
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def verify_registration_card_public(request, student_id: str):
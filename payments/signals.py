@@ -2,10 +2,14 @@ from django.core.cache import cache
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
+from admissions.models import AdmittedStudent
+from Programs.models import StudentCurriculumOverride, StudentProgrammeEnrollment
+
 from .models import (
     ApplicationFee,
     FeePlanRule,
     RegistrationSettings,
+    StudentFeeExemption,
     StudentTuitionPayment,
     TuitionLedger,
 )
@@ -33,6 +37,19 @@ def _refresh_tuition_pct_for_student_id(student_id: int | None) -> None:
         )
 
 
+def _invalidate_finance_snapshots(student_ids) -> None:
+    try:
+        from payments.finance_snapshot import invalidate_finance_snapshots
+
+        invalidate_finance_snapshots(student_ids)
+    except Exception:
+        import logging
+
+        logging.getLogger(__name__).exception(
+            "finance snapshot invalidation failed for student_ids=%s", student_ids
+        )
+
+
 @receiver([post_save, post_delete], sender=ApplicationFee)
 def invalidate_fee_plans_cache(sender, instance, **kwargs):
     cache.delete('all_fee_plans_list')
@@ -72,6 +89,22 @@ def invalidate_tuition_pct_cache_on_settings_change(sender, instance, **kwargs):
         )
 
 
+@receiver(post_save, sender=RegistrationSettings)
+@receiver([post_save, post_delete], sender=FeePlanRule)
+def invalidate_registration_eligibility_cache(sender, instance, **kwargs):
+    """Threshold / fee rule edits change every student's tuition gate."""
+    try:
+        from payments.registration_eligibility import bump_registration_eligibility_epoch
+
+        bump_registration_eligibility_epoch()
+    except Exception:
+        import logging
+
+        logging.getLogger(__name__).exception(
+            "failed to invalidate registration eligibility cache"
+        )
+
+
 @receiver([post_save, post_delete], sender=FeePlanRule)
 def invalidate_tuition_pct_cache_on_fee_plan_change(sender, instance, **kwargs):
     try:
@@ -86,3 +119,94 @@ def invalidate_tuition_pct_cache_on_fee_plan_change(sender, instance, **kwargs):
         logging.getLogger(__name__).exception(
             "failed to invalidate/requeue tuition %% cache after fee plan change"
         )
+
+
+# --- Finance snapshot invalidation (see payments.finance_snapshot) ---
+
+
+@receiver([post_save, post_delete], sender=StudentTuitionPayment)
+def invalidate_finance_snapshot_on_payment_change(sender, instance, **kwargs):
+    """Portal payments and ad-hoc charges (any status: pending charges are demand)."""
+    _invalidate_finance_snapshots([instance.student_id])
+
+
+@receiver([post_save, post_delete], sender=TuitionLedger)
+def invalidate_finance_snapshot_on_ledger_change(sender, instance, **kwargs):
+    """Ledger rows count towards every student they match by link or payment code."""
+    try:
+        from payments.finance_snapshot import ledger_owner_student_ids
+
+        student_ids = ledger_owner_student_ids(instance)
+    except Exception:
+        import logging
+
+        logging.getLogger(__name__).exception(
+            "finance snapshot owner lookup failed for ledger %s", instance.pk
+        )
+        student_ids = [instance.student_id]
+    _invalidate_finance_snapshots(student_ids)
+
+
+@receiver([post_save, post_delete], sender=StudentFeeExemption)
+def invalidate_finance_snapshot_on_exemption_change(sender, instance, **kwargs):
+    _invalidate_finance_snapshots([instance.student_id])
+
+
+@receiver(post_save, sender=AdmittedStudent)
+def sync_payment_code_index_on_student_change(sender, instance, **kwargs):
+    """Keep StudentPaymentCode in line with student_id / schoolpay_code / reg_no."""
+    try:
+        from payments.utils.payment_code_index import sync_student_payment_codes
+
+        sync_student_payment_codes(instance)
+    except Exception:
+        import logging
+
+        logging.getLogger(__name__).exception(
+            "payment code index sync failed for student_id=%s", instance.pk
+        )
+
+
+@receiver(post_save, sender=AdmittedStudent)
+def invalidate_finance_snapshot_on_student_change(sender, instance, **kwargs):
+    """Programme, cohort, nationality and payment codes all feed the allocation."""
+    _invalidate_finance_snapshots([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=StudentProgrammeEnrollment)
+def invalidate_finance_snapshot_on_enrollment_change(sender, instance, **kwargs):
+    """Curriculum position decides which milestone fees are due."""
+    _invalidate_finance_snapshots([instance.student_id])
+
+
+@receiver([post_save, post_delete], sender=StudentCurriculumOverride)
+def invalidate_finance_snapshot_on_override_change(sender, instance, **kwargs):
+    """Course exemptions prorate tuition."""
+    try:
+        student_id = (
+            StudentProgrammeEnrollment.objects.filter(pk=instance.enrollment_id)
+            .values_list("student_id", flat=True)
+            .first()
+        )
+    except Exception:
+        student_id = None
+    _invalidate_finance_snapshots([student_id])
+
+
+@receiver([post_save, post_delete], sender=FeePlanRule)
+def invalidate_finance_snapshots_on_fee_plan_change(sender, instance, **kwargs):
+    """Mark the affected programmes stale; the worker sweep rebuilds them."""
+    try:
+        from django.db import transaction
+
+        from payments.finance_snapshot import invalidate_finance_snapshots_for_rule
+        from payments.tasks import celery_refresh_stale_finance_snapshots
+
+        if invalidate_finance_snapshots_for_rule(instance):
+            transaction.on_commit(celery_refresh_stale_finance_snapshots.delay)
+    except Exception:
+        import logging
+
+        logging.getLogger(__name__).exception(
+            "failed to invalidate finance snapshots after fee plan change"
+        )
@@ -15,11 +15,12 @@ Commitment still uses the full UGX credit pool.
 """
 from __future__ import annotations
 
+import logging
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Any, Literal
+from typing import Any, Iterable, Iterator, Literal
 
 from django.utils import timezone
 
@@ -38,11 +39,18 @@ from payments.student_fee_pricing import effective_amount_currency, is_internati
 from payments.utils.tuition_ledger_linking import (
     completed_ledger_status_q,
     relink_tuition_ledgers_for_student,
+    relink_tuition_ledgers_for_students,
     tuition_ledger_queryset_for_student,
+    tuition_ledgers_for_students,
 )
 
+logger = logging.getLogger(__name__)
+
 COMMITMENT_FEE_THRESHOLD = Decimal("150000")
 
+# Students per prefetch round in build_finance_allocations (keeps IN lists bounded).
+FINANCE_BATCH_CHUNK_SIZE = 200
+
 
 @dataclass
 class DemandLine:
@@ -110,17 +118,20 @@ def _as_date(value) -> date | None:
         return None
 
 
-def payment_credits_by_currency(
-    student: AdmittedStudent,
+def _completed_tuition_payments_queryset():
+    return StudentTuitionPayment.objects.filter(
+        status="completed", is_waived=False
+    ).select_related("fee_head")
+
+
+def _credits_from_rows(
+    payments: Iterable[StudentTuitionPayment],
+    ledgers: Iterable[TuitionLedger],
     *,
     on_or_after: date | None = None,
     before: date | None = None,
 ) -> dict[str, Decimal]:
-    """Completed portal payments + SchoolPay ledger, deduplicated by receipt/reference.
-
-    ``on_or_after`` / ``before`` date-scope which payments enter the pool
-    (used to split prior-term history from current-term open demand).
-    """
+    """Pool already-loaded completed portal payments + ledger rows (see payment_credits_by_currency)."""
     out: defaultdict[str, Decimal] = defaultdict(Decimal)
     seen: set[str] = set()
 
@@ -133,9 +144,9 @@ def payment_credits_by_currency(
                 return False
         return True
 
-    for p in StudentTuitionPayment.objects.filter(
-        student=student, status="completed", is_waived=False
-    ):
+    from payments.credit_allocation import is_credit_reallocation_payment
+
+    for p in payments:
         paid_d = _as_date(p.paid_at) or _as_date(p.created_at)
         if not _in_window(paid_d):
             continue
@@ -148,8 +159,6 @@ def payment_credits_by_currency(
         amt = p.amount or Decimal("0")
         # Internal reallocation: do not treat as a new receipt; earmark against the pool
         # so tuition coverage drops by this amount and the other charge can be settled.
-        from payments.credit_allocation import is_credit_reallocation_payment
-
         if is_credit_reallocation_payment(p):
             out[ccy] -= amt
             continue
@@ -158,9 +167,7 @@ def payment_credits_by_currency(
             continue
         out[ccy] += amt
 
-    for row in tuition_ledger_queryset_for_student(student).filter(
-        completed_ledger_status_q()
-    ):
+    for row in ledgers:
         paid_d = _as_date(row.payment_date_time)
         if not _in_window(paid_d):
             continue
@@ -174,6 +181,25 @@ def payment_credits_by_currency(
     return dict(out)
 
 
+def payment_credits_by_currency(
+    student: AdmittedStudent,
+    *,
+    on_or_after: date | None = None,
+    before: date | None = None,
+) -> dict[str, Decimal]:
+    """Completed portal payments + SchoolPay ledger, deduplicated by receipt/reference.
+
+    ``on_or_after`` / ``before`` date-scope which payments enter the pool
+    (used to split prior-term history from current-term open demand).
+    """
+    return _credits_from_rows(
+        _completed_tuition_payments_queryset().filter(student=student),
+        tuition_ledger_queryset_for_student(student).filter(completed_ledger_status_q()),
+        on_or_after=on_or_after,
+        before=before,
+    )
+
+
 def _open_demand_credit_cutoff(lines: list[DemandLine]) -> date | None:
     """
     If prior curriculum terms were settled outside the portal, only payments from
@@ -260,7 +286,129 @@ def _line_is_billable(line: DemandLine) -> bool:
     return True
 
 
-def _build_demand_lines(student: AdmittedStudent, international: bool) -> list[DemandLine]:
+@dataclass
+class FinancePrefetch:
+    """
+    Cohort-wide inputs for ``build_finance_allocations``.
+
+    ``load()`` pulls payments, ledger rows, ad-hoc charges, fee exemptions and
+    course-exemption flags for a chunk of students with one query per table.
+    Fee-plan rules, semesters and billing dates depend only on the cohort, so
+    they are memoized by (programme, programme batch) across chunks.
+    """
+
+    payments: dict[int, list] = field(default_factory=dict)
+    ledgers: dict[int, list] = field(default_factory=dict)
+    adhoc_charges: dict[int, list] = field(default_factory=dict)
+    fee_exemptions: dict[int, list] = field(default_factory=dict)
+    course_exempted_enrollment_ids: set[int] = field(default_factory=set)
+    _program_batch_ids: dict[tuple, int | None] = field(default_factory=dict)
+    _tuition_rules: dict[tuple, list] = field(default_factory=dict)
+    _other_rules: dict[tuple, list] = field(default_factory=dict)
+    _semesters: dict[tuple, Any] = field(default_factory=dict)
+    _rule_billing: dict[int, tuple[bool, str | None]] = field(default_factory=dict)
+
+    def load(self, students: list[AdmittedStudent]) -> None:
+        from payments.models import StudentFeeExemption
+        from Programs.models import StudentCurriculumOverride
+
+        pks = [s.pk for s in students]
+        by_pk = {s.pk: s for s in students}
+
+        self.payments = defaultdict(list)
+        for p in _completed_tuition_payments_queryset().filter(student_id__in=pks):
+            self.payments[p.student_id].append(p)
+
+        self.ledgers = tuition_ledgers_for_students(students)
+
+        self.adhoc_charges = defaultdict(list)
+        for charge in (
+            StudentTuitionPayment.objects.filter(
+                student_id__in=pks, source="ad_hoc", is_waived=False
+            )
+            .select_related("fee_head", "charged_by", "semester__program_batch__program")
+            .order_by("-created_at")
+        ):
+            # adhoc_charge_billing_date falls back to charge.student.admitted_program.
+            charge.student = by_pk[charge.student_id]
+            self.adhoc_charges[charge.student_id].append(charge)
+
+        self.fee_exemptions = defaultdict(list)
+        for row in StudentFeeExemption.objects.filter(
+            student_id__in=pks, is_active=True
+        ).select_related("fee_head", "created_by", "revoked_by"):
+            self.fee_exemptions[row.student_id].append(row)
+
+        enrollment_ids = []
+        for s in students:
+            try:
+                enr = s.programme_enrollment
+            except Exception:
+                enr = None
+            if enr is not None:
+                enrollment_ids.append(enr.pk)
+        self.course_exempted_enrollment_ids = set(
+            StudentCurriculumOverride.objects.filter(
+                enrollment_id__in=enrollment_ids,
+                override_type="exempted",
+            ).values_list("enrollment_id", flat=True)
+        )
+
+    def program_batch_id(self, student: AdmittedStudent) -> int | None:
+        from payments.student_portal_finance import _student_program_batch_id
+
+        try:
+            enr = student.programme_enrollment
+        except Exception:
+            enr = None
+        if enr is not None and enr.program_batch_id:
+            return int(enr.program_batch_id)
+        if student.intended_program_batch_id:
+            return int(student.intended_program_batch_id)
+        key = (student.admitted_program_id, student.admitted_batch_id)
+        if key not in self._program_batch_ids:
+            self._program_batch_ids[key] = _student_program_batch_id(student)
+        return self._program_batch_ids[key]
+
+    def tuition_rules(self, student: AdmittedStudent) -> list[FeePlanRule]:
+        from payments.student_portal_finance import _rules_for_student
+
+        key = (student.admitted_program_id, self.program_batch_id(student))
+        if key not in self._tuition_rules:
+            self._tuition_rules[key] = list(_rules_for_student(student))
+        return self._tuition_rules[key]
+
+    def other_schedule_rules(self, student: AdmittedStudent) -> list[FeePlanRule]:
+        from payments.student_portal_finance import _applicable_other_schedule_rules
+
+        key = (student.admitted_program_id, self.program_batch_id(student))
+        if key not in self._other_rules:
+            self._other_rules[key] = _applicable_other_schedule_rules(student)
+        return self._other_rules[key]
+
+    def semester_for(self, program_batch_id: int | None, year: int, term: int):
+        from payments.billing_visibility import resolve_semester_for_year_term
+
+        key = (program_batch_id, year, term)
+        if key not in self._semesters:
+            self._semesters[key] = resolve_semester_for_year_term(
+                program_batch_id=program_batch_id,
+                year_of_study=year,
+                term_number=term,
+            )
+        return self._semesters[key]
+
+    def rule_billing(self, rule: FeePlanRule) -> tuple[bool, str | None]:
+        if rule.id not in self._rule_billing:
+            self._rule_billing[rule.id] = (billing_date_reached(rule), billing_date_iso(rule))
+        return self._rule_billing[rule.id]
+
+
+def _build_demand_lines(
+    student: AdmittedStudent,
+    international: bool,
+    prefetch: FinancePrefetch | None = None,
+) -> list[DemandLine]:
     from payments.billing_visibility import (
         curriculum_period_label,
         resolve_semester_for_year_term,
@@ -277,9 +425,22 @@ def _build_demand_lines(student: AdmittedStudent, international: bool) -> list[D
 
     lines: list[DemandLine] = []
     cy, ct = _student_curriculum_year_term(student)
-    exemptions = active_fee_exemptions_for_student(student)
+    if prefetch is not None:
+        exemptions = prefetch.fee_exemptions.get(student.pk, [])
+        student_pb_id = prefetch.program_batch_id(student)
+    else:
+        exemptions = active_fee_exemptions_for_student(student)
+        student_pb_id = _student_program_batch_id(student)
     program = getattr(student, "admitted_program", None)
-    student_pb_id = _student_program_batch_id(student)
+
+    rule_billing_cache: dict[int, tuple[bool, str | None]] = {}
+
+    def _rule_billing(rule) -> tuple[bool, str | None]:
+        if prefetch is not None:
+            return prefetch.rule_billing(rule)
+        if rule.id not in rule_billing_cache:
+            rule_billing_cache[rule.id] = (billing_date_reached(rule), billing_date_iso(rule))
+        return rule_billing_cache[rule.id]
 
     from admissions.exemption_services import (
         prorate_tuition_for_course_exemptions,
@@ -320,12 +481,15 @@ def _build_demand_lines(student: AdmittedStudent, international: bool) -> list[D
             et = int(enr.entry_term_number or 0)
             if ey >= 1 and et >= 1 and (ey, et) > (1, 1):
                 entry_pair = (ey, et)
-            from Programs.models import StudentCurriculumOverride
-
-            has_course_exemptions = StudentCurriculumOverride.objects.filter(
-                enrollment=enr,
-                override_type="exempted",
-            ).exists()
+            if prefetch is not None:
+                has_course_exemptions = enr.pk in prefetch.course_exempted_enrollment_ids
+            else:
+                from Programs.models import StudentCurriculumOverride
+
+                has_course_exemptions = StudentCurriculumOverride.objects.filter(
+                    enrollment=enr,
+                    override_type="exempted",
+                ).exists()
     except Exception:
         entry_pair = None
         has_course_exemptions = False
@@ -335,7 +499,10 @@ def _build_demand_lines(student: AdmittedStudent, international: bool) -> list[D
     # arrived yet. Curriculum position still gates future terms below.
     pick_structure_despite_billing_date = bool(entry_pair or has_course_exemptions)
 
-    tuition_rules = sorted(_rules_for_student(student), key=_tuition_rule_sort_key)
+    if prefetch is not None:
+        tuition_rules = sorted(prefetch.tuition_rules(student), key=_tuition_rule_sort_key)
+    else:
+        tuition_rules = sorted(_rules_for_student(student), key=_tuition_rule_sort_key)
     for rule in tuition_rules:
         amt, cur = effective_amount_currency(rule, international)
         if amt <= 0:
@@ -365,7 +532,7 @@ def _build_demand_lines(student: AdmittedStudent, international: bool) -> list[D
             # scheduled billing date is still in the future.
             billable = True
         else:
-            billable = billing_date_reached(rule)
+            billable = _rule_billing(rule)[0]
 
         if (
             (is_tuition_head or is_functional_head)
@@ -374,13 +541,15 @@ def _build_demand_lines(student: AdmittedStudent, international: bool) -> list[D
         ):
             if entry_pair is not None and (sem_year, sem_term) < entry_pair:
                 continue
-            if _year_fully_exempt(sem_year):
+            # No exempted papers ⇒ neither a full year nor a full term can be exempt.
+            if has_course_exemptions and _year_fully_exempt(sem_year):
                 continue
-            if _term_fully_exempt(sem_year, sem_term):
+            if has_course_exemptions and _term_fully_exempt(sem_year, sem_term):
                 continue
 
         if (
-            is_tuition_head
+            has_course_exemptions
+            and is_tuition_head
             and sem_year is not None
             and sem_term is not None
         ):
@@ -418,7 +587,7 @@ def _build_demand_lines(student: AdmittedStudent, international: bool) -> list[D
                 ),
                 "installment_number": rule.installment_number,
                 "due_date_days": rule.due_date_days,
-                "billing_date": billing_date_iso(rule),
+                "billing_date": _rule_billing(rule)[1],
                 "fee_head_id": rule.fee_head_id,
                 "calendar_type": (
                     getattr(program, "calendar_type", None) or "semester"
@@ -446,7 +615,11 @@ def _build_demand_lines(student: AdmittedStudent, international: bool) -> list[D
             line.billing_reached = False
         lines.append(line)
 
-    for rule in _applicable_other_schedule_rules(student):
+    if prefetch is not None:
+        other_rules = prefetch.other_schedule_rules(student)
+    else:
+        other_rules = _applicable_other_schedule_rules(student)
+    for rule in other_rules:
         py = int(rule.payable_year_of_study)
         pt = int(rule.payable_term_number)
         if is_fee_head_exempted(
@@ -457,16 +630,19 @@ def _build_demand_lines(student: AdmittedStudent, international: bool) -> list[D
         ):
             continue
         reached = _milestone_reached(cy, ct, py, pt)
-        billable = billing_date_reached(rule)
+        billable, billing_iso = _rule_billing(rule)
         amt, cur = effective_amount_currency(rule, international)
         if amt <= 0:
             continue
         pb_id = rule.program_batch_id or student_pb_id
-        sem = resolve_semester_for_year_term(
-            program_batch_id=pb_id,
-            year_of_study=py,
-            term_number=pt,
-        )
+        if prefetch is not None:
+            sem = prefetch.semester_for(pb_id, py, pt)
+        else:
+            sem = resolve_semester_for_year_term(
+                program_batch_id=pb_id,
+                year_of_study=py,
+                term_number=pt,
+            )
         period_label = curriculum_period_label(
             py,
             pt,
@@ -491,7 +667,7 @@ def _build_demand_lines(student: AdmittedStudent, international: bool) -> list[D
                     if rule.program_batch_id
                     else None
                 ),
-                "billing_date": billing_date_iso(rule),
+                "billing_date": billing_iso,
                 "fee_head_id": rule.fee_head_id,
                 # Align with tuition_structure so Room & Board groups under the same semester.
                 "semester_id": sem.id if sem else None,
@@ -516,7 +692,11 @@ def _build_demand_lines(student: AdmittedStudent, international: bool) -> list[D
             line.extra["prior_period_settled"] = True
         lines.append(line)
 
-    for charge in _adhoc_charges_for_student(student):
+    if prefetch is not None:
+        adhoc_charges = prefetch.adhoc_charges.get(student.pk, [])
+    else:
+        adhoc_charges = _adhoc_charges_for_student(student)
+    for charge in adhoc_charges:
         if charge.is_waived:
             continue
         # Only open (pending) charges are demand. Completed ad-hoc rows are already paid
@@ -692,13 +872,94 @@ def build_finance_allocation(student: AdmittedStudent) -> FinanceAllocation:
     except Exception:
         pass
     international = is_international_student(student)
-    credits_all = payment_credits_by_currency(student)
+    # Load payment rows once; the credit cutoff split below re-pools them in memory.
+    payments = list(_completed_tuition_payments_queryset().filter(student=student))
+    ledgers = list(
+        tuition_ledger_queryset_for_student(student).filter(completed_ledger_status_q())
+    )
     lines = _build_demand_lines(student, international)
+    return _allocate_finance(student, international, lines, payments, ledgers)
+
+
+def iter_finance_allocations(
+    student_ids: Iterable[int],
+    *,
+    relink: bool = True,
+    chunk_size: int = FINANCE_BATCH_CHUNK_SIZE,
+) -> Iterator[tuple[AdmittedStudent, FinanceAllocation]]:
+    """
+    Yield ``(student, allocation)`` for many students, prefetching per chunk.
+
+    Each chunk costs a fixed number of queries (students, payments, ledgers,
+    ad-hoc charges, exemptions, course-exemption flags, orphan-ledger check)
+    plus one rules/semester lookup per distinct programme batch. Students whose
+    allocation fails are logged and skipped; unknown ids are ignored.
+    """
+    from Programs.spe_queryset import prefetch_programme_enrollment_for_lists
+
+    ids = list(dict.fromkeys(int(i) for i in student_ids if i is not None))
+    prefetch = FinancePrefetch()
+    for i in range(0, len(ids), chunk_size):
+        students = list(
+            AdmittedStudent.objects.filter(id__in=ids[i : i + chunk_size])
+            .select_related(
+                "application",
+                "admitted_program",
+                "admitted_campus",
+                "admitted_batch",
+                "intended_program_batch",
+            )
+            .prefetch_related(prefetch_programme_enrollment_for_lists())
+            .order_by("id")
+        )
+        if relink:
+            try:
+                relink_tuition_ledgers_for_students(students)
+            except Exception:
+                logger.exception("batch ledger relink failed; continuing without relink")
+        prefetch.load(students)
+        for student in students:
+            try:
+                international = is_international_student(student)
+                lines = _build_demand_lines(student, international, prefetch=prefetch)
+                alloc = _allocate_finance(
+                    student,
+                    international,
+                    lines,
+                    prefetch.payments.get(student.pk, []),
+                    prefetch.ledgers.get(student.pk, []),
+                )
+            except Exception:
+                logger.exception("finance allocation failed for student id=%s", student.pk)
+                continue
+            yield student, alloc
+
+
+def build_finance_allocations(
+    student_ids: Iterable[int],
+    *,
+    relink: bool = True,
+) -> dict[int, FinanceAllocation]:
+    """Batch ``build_finance_allocation`` keyed by AdmittedStudent id (cohort lists / reports)."""
+    return {
+        student.pk: alloc
+        for student, alloc in iter_finance_allocations(student_ids, relink=relink)
+    }
+
+
+def _allocate_finance(
+    student: AdmittedStudent,
+    international: bool,
+    lines: list[DemandLine],
+    payments: list[StudentTuitionPayment],
+    ledgers: list[TuitionLedger],
+) -> FinanceAllocation:
+    credits_all = _credits_from_rows(payments, ledgers)
     cutoff = _open_demand_credit_cutoff(lines)
 
     if cutoff is not None:
-        credits_history = payment_credits_by_currency(student, before=cutoff)
-        credits_open = payment_credits_by_currency(student, on_or_after=cutoff)
+        credits_history = _credits_from_rows(payments, ledgers, before=cutoff)
+        credits_open = _credits_from_rows(payments, ledgers, on_or_after=cutoff)
         # Historical SchoolPay/portal payments → prior semester fee lines (oldest first).
         leftover_history = _allocate_pools_to_lines(lines, credits_history, target="prior")
         # Overpayment from earlier terms + current-term payments → open billable demand.
@@ -9,12 +9,14 @@ from django.db.models import Q
 from admissions.models import AdmittedStudent
 
 from payments.batch_semester_fee_helpers import get_or_create_tuition_fee_plan
+from payments.finance_snapshot import get_finance_snapshot
 from payments.models import FeePlanRule, StudentTuitionPayment, TuitionLedger
 from payments.other_fee_schedule_views import get_or_create_other_schedule_fee_plan
 from payments.student_payment_allocation import (
     COMMITMENT_FEE_THRESHOLD,
     _line_is_billable,
     build_finance_allocation,
+    iter_finance_allocations,
 )
 from payments.utils.tuition_ledger_linking import (
     completed_ledger_status_q,
@@ -626,13 +628,21 @@ def _adhoc_charges_for_student(student: AdmittedStudent):
     )
 
 
-def _exemption_pending_total(student: AdmittedStudent | None) -> Decimal:
+def _exemption_pending_total(student: AdmittedStudent | None, alloc=None) -> Decimal:
     """Pending EXEMPTION_FORM + EXEMPTION_COURSE amounts (for student-list display)."""
     if student is None:
         return Decimal("0")
     from payments.billing_visibility import is_exemption_adhoc_charge
 
     total = Decimal("0")
+    if alloc is not None:
+        # Pending ad-hoc charges are already demand lines on the allocation.
+        for line in alloc.demand_lines:
+            if line.kind != "ad_hoc" or line.extra.get("charge_status") != "pending":
+                continue
+            if line.extra.get("fee_head_code") in {"EXEMPTION_COURSE", "EXEMPTION_FORM"}:
+                total += line.amount
+        return total
     for charge in _adhoc_charges_for_student(student):
         if getattr(charge, "status", None) != "pending":
             continue
@@ -677,7 +687,7 @@ def _finance_totals_from_alloc(alloc, student: AdmittedStudent | None = None) ->
         "tuition_structure_total": float(alloc.tuition_structure_total),
         "ad_hoc_total": float(alloc.ad_hoc_total),
         "ad_hoc_not_yet_due_total": float(alloc.ad_hoc_not_yet_due_total),
-        "exemption_pending": float(_exemption_pending_total(student)),
+        "exemption_pending": float(_exemption_pending_total(student, alloc)),
         "scheduled_other_fees_due": float(alloc.scheduled_other_due),
         "required_by_currency": {k: float(v) for k, v in alloc.required_by_currency.items()},
         "paid_by_currency": alloc.paid_by_currency,
@@ -794,21 +804,28 @@ def _billing_lines_from_alloc(alloc) -> list[dict[str, Any]]:
 
 def student_finance_totals(student: AdmittedStudent) -> dict[str, Any]:
     """Programme billing totals (payments pooled; credit applied tuition → other → ad-hoc)."""
-    alloc = build_finance_allocation(student)
-    return _finance_totals_from_alloc(alloc, student)
+    return get_finance_snapshot(student).totals
+
+
+def student_finance_totals_for_students(student_ids) -> dict[int, dict[str, Any]]:
+    """``student_finance_totals`` for many students with cohort-level prefetching."""
+    return {
+        student.pk: _finance_totals_from_alloc(alloc, student)
+        for student, alloc in iter_finance_allocations(student_ids)
+    }
 
 
 def student_billing_lines(student: AdmittedStudent) -> list[dict[str, Any]]:
     """Fee lines with allocated paid/balance from the shared payment pool."""
-    return _billing_lines_from_alloc(build_finance_allocation(student))
+    return get_finance_snapshot(student).lines
 
 
 def student_finance_bundle(student: AdmittedStudent) -> dict[str, Any]:
     """Totals + fee lines from one allocation (Bonafide / admin snapshots)."""
-    alloc = build_finance_allocation(student)
+    snapshot = get_finance_snapshot(student)
     return {
-        "totals": _finance_totals_from_alloc(alloc, student),
-        "lines": _billing_lines_from_alloc(alloc),
+        "totals": snapshot.totals,
+        "lines": snapshot.lines,
     }
 
 
@@ -901,7 +918,8 @@ def registration_card_payment_history(
 
 
 def payment_status_dict(student: AdmittedStudent, request=None) -> dict:
-    totals = student_finance_totals(student)
+    snapshot = get_finance_snapshot(student)
+    totals = snapshot.totals
     other_fee_rows, _ = other_schedule_rows_and_due_by_currency(student)
     adhoc_charges = _adhoc_charges_for_student(student)
 
@@ -1002,7 +1020,7 @@ def payment_status_dict(student: AdmittedStudent, request=None) -> dict:
         "ad_hoc_charges": adhoc_list,
         "scheduled_other_fees": other_fee_rows,
         "scheduled_other_fees_total_due": totals["scheduled_other_fees_due"],
-        "billing_lines": student_billing_lines(student),
+        "billing_lines": snapshot.lines,
         "payment_code": student.student_id,
         "temporary_access": student_temporary_access(student, request=request),
         **offer_letter_portal_fields(student, request),
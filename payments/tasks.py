@@ -1,12 +1,9 @@
 from celery import shared_task
 from django.apps import apps
 from django.utils import timezone
-from datetime import timedelta
 from payments.models import ApplicationPayment
 
-from payments.utils.Transaction_sync import (
-    fetch_transactions_by_range, reconcile_transactions
-)
+from payments.utils.Transaction_sync import sync_schoolpay_incremental
 from payments.utils.application_payment_status import (
     reconcile_stale_pending_application_payments,
 )
@@ -69,23 +66,12 @@ def auto_delete_failed_payments(self):
     retry_kwargs={"max_retries": 5},
 )
 def celery_sync_schoolpay_transactions(self):
-    today = timezone.now().date()
-
-    from_date = (
-        today - timedelta(days=3)
-    ).strftime("%Y-%m-%d")
-
-    to_date = today.strftime("%Y-%m-%d")
-
-    data = fetch_transactions_by_range(
-        from_date=from_date,
-        to_date=to_date
-    )
-
-    total_synced = reconcile_transactions(data)
+    """Incremental SchoolPay ingest from the stored watermark (see SchoolPaySyncState)."""
+    result = sync_schoolpay_incremental()
 
     return (
-        f"{total_synced} transaction(s) synced"
+        f"{result['created']} transaction(s) synced "
+        f"({result['mode']} {result['from_date']}..{result['to_date']})"
     )
 
 @shared_task(bind=True, max_retries=5, default_retry_delay=30)
@@ -317,6 +303,22 @@ def celery_maybe_send_bursar_weekly_report():
     return send_bursar_weekly_report()
 
 
+@shared_task(bind=True, max_retries=0)
+def celery_run_report_export(self, job_id):
+    """Render a background CSV / XLSX report export."""
+    from payments.report_exports import run_export_job
+
+    return run_export_job(job_id)
+
+
+@shared_task(bind=True, max_retries=0)
+def celery_run_schoolpay_backfill(self, job_id):
+    """Run (or resume) a day-windowed SchoolPay backfill job."""
+    from payments.utils.schoolpay_backfill import run_backfill_job
+
+    return run_backfill_job(job_id)
+
+
 @shared_task(bind=True, max_retries=2, default_retry_delay=30)
 def celery_refresh_tuition_pct_cache(self, student_ids=None):
     """Refresh registration_tuition_pct_met for explicit student ids."""
@@ -327,7 +329,39 @@ def celery_refresh_tuition_pct_cache(self, student_ids=None):
 
 @shared_task(bind=True, max_retries=1, default_retry_delay=60)
 def celery_refresh_bonafide_tuition_pct_cache(self, max_students=None):
-    """Backfill / recompute tuition-% cache for bonafide students."""
-    from payments.tuition_pct_cache import backfill_bonafide_tuition_pct_cache
+    """Backfill / recompute tuition-% cache for bonafide students (chunked chord)."""
+    from payments.tuition_pct_cache import start_tuition_pct_rebuild
+
+    return start_tuition_pct_rebuild(max_students=max_students)
+
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=30)
+def celery_refresh_tuition_pct_range(self, first_id, last_id, job_id=None):
+    """One id-range chunk of a tuition-% rebuild."""
+    from payments.tuition_pct_cache import refresh_tuition_pct_id_range
+
+    return refresh_tuition_pct_id_range(first_id, last_id, job_id=job_id)
+
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=30)
+def celery_finish_tuition_pct_rebuild(self, results=None, job_id=None):
+    """Chord callback: mark the tuition-% basis current and close the job."""
+    from payments.tuition_pct_cache import finish_tuition_pct_rebuild
+
+    return finish_tuition_pct_rebuild(job_id)
+
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=30)
+def celery_refresh_finance_snapshots(self, student_ids=None):
+    """Rebuild StudentFinanceSnapshot rows for explicit student ids."""
+    from payments.finance_snapshot import refresh_finance_snapshots
+
+    return refresh_finance_snapshots(student_ids or [])
+
+
+@shared_task(bind=True, max_retries=1, default_retry_delay=60)
+def celery_refresh_stale_finance_snapshots(self, max_students=None):
+    """Sweep invalidated / previous-day finance snapshots (fee-rule edits, nightly warm-up)."""
+    from payments.finance_snapshot import refresh_stale_finance_snapshots
 
-    return backfill_bonafide_tuition_pct_cache(max_students=max_students)
+    return refresh_stale_finance_snapshots(max_students=max_students)
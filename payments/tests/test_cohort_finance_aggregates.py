@@ -0,0 +1,32 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from payments.cohort_finance_aggregates import (
+    ARREARS_BUCKET_KEYS,
+    _add,
+    _empty_group,
+    _finish,
+)
+
+
+class CohortRollupMathTests(SimpleTestCase):
+    def test_groups_add_up_and_report_collection_rate(self):
+        group = _empty_group()
+        for billed, paid, bucket in (("1000", "1000", "cleared"), ("3000", "600", "pct_0_24")):
+            row = {
+                "students": 1,
+                "total_billed": Decimal(billed),
+                "total_paid": Decimal(paid),
+                "total_balance": Decimal(billed) - Decimal(paid),
+                **{key: int(key == bucket) for key in ARREARS_BUCKET_KEYS},
+            }
+            _add(group, row)
+        result = _finish(group, name="BBA")
+        self.assertEqual(result["students"], 2)
+        self.assertEqual(result["total_balance"], Decimal("2400"))
+        self.assertEqual(result["collection_rate"], 40.0)
+        self.assertEqual((result["cleared"], result["pct_0_24"]), (1, 1))
+
+    def test_empty_cohort_has_zero_rate(self):
+        self.assertEqual(_finish(_empty_group())["collection_rate"], 0.0)
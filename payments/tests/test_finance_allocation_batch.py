@@ -0,0 +1,88 @@
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from payments.student_payment_allocation import _credits_from_rows
+from payments.utils.tuition_ledger_linking import _ledger_owner_index
+
+
+def _payment(pk, amount, paid_on, *, receipt="", currency="UGX", transaction_id=""):
+    return SimpleNamespace(
+        id=pk,
+        amount=Decimal(amount),
+        currency=currency,
+        paid_at=datetime.combine(paid_on, datetime.min.time()),
+        created_at=None,
+        receipt_number=receipt,
+        payment_reference="",
+        transaction_id=transaction_id,
+        fee_head=None,
+    )
+
+
+def _ledger(pk, amount, paid_on, *, receipt=""):
+    return SimpleNamespace(
+        id=pk,
+        amount=Decimal(amount),
+        payment_date_time=datetime.combine(paid_on, datetime.min.time()),
+        schoolpay_receipt_number=receipt,
+        source_channel_transaction_id="",
+    )
+
+
+class CreditsFromRowsTests(SimpleTestCase):
+    def setUp(self):
+        self.payments = [
+            _payment(1, "100000", date(2026, 1, 10), receipt="R1"),
+            _payment(2, "50", date(2026, 3, 1), receipt="U1", currency="usd"),
+            _payment(3, "20000", date(2026, 3, 2), transaction_id="CREDIT-9"),
+        ]
+        self.ledgers = [
+            _ledger(10, "300000", date(2026, 2, 1), receipt="SP1"),
+            _ledger(11, "300000", date(2026, 2, 1), receipt="SP1"),
+            _ledger(12, "40000", date(2026, 3, 5), receipt="SP2"),
+        ]
+
+    def test_pools_by_currency_and_dedupes_receipts(self):
+        credits = _credits_from_rows(self.payments, self.ledgers)
+        # 100k + 300k (SP1 once) + 40k − 20k internal reallocation
+        self.assertEqual(credits["UGX"], Decimal("420000"))
+        self.assertEqual(credits["USD"], Decimal("50"))
+
+    def test_cutoff_windows_split_the_same_rows(self):
+        cutoff = date(2026, 3, 1)
+        history = _credits_from_rows(self.payments, self.ledgers, before=cutoff)
+        current = _credits_from_rows(self.payments, self.ledgers, on_or_after=cutoff)
+        self.assertEqual(history, {"UGX": Decimal("400000")})
+        self.assertEqual(current["UGX"], Decimal("20000"))
+        self.assertEqual(current["USD"], Decimal("50"))
+
+
+class LedgerOwnerIndexTests(SimpleTestCase):
+    def test_indexes_codes_regs_and_users_case_insensitively(self):
+        students = [
+            SimpleNamespace(
+                pk=1,
+                student_id="1001",
+                schoolpay_code="",
+                reg_no="26/U/001",
+                effective_schoolpay_code="26/U/001",
+                student_user_id=7,
+            ),
+            SimpleNamespace(
+                pk=2,
+                student_id="1001",
+                schoolpay_code="abc",
+                reg_no="",
+                effective_schoolpay_code="",
+                student_user_id=None,
+            ),
+        ]
+        codes, regs, users = _ledger_owner_index(students)
+        self.assertEqual(codes["1001"], {1, 2})
+        self.assertEqual(codes["ABC"], {2})
+        self.assertEqual(codes["26U001"], {1})
+        self.assertEqual(regs, {"26/U/001": {1}})
+        self.assertEqual(users, {7: {1}})
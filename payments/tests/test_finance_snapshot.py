@@ -0,0 +1,42 @@
+from datetime import timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from payments.finance_snapshot import _json_safe, snapshot_is_fresh
+
+
+def _snapshot(*, version=3, computed_version=3, computed_at=None):
+    return SimpleNamespace(
+        version=version,
+        computed_version=computed_version,
+        computed_at=computed_at,
+    )
+
+
+class SnapshotFreshnessTests(SimpleTestCase):
+    def test_current_version_computed_today_is_fresh(self):
+        self.assertTrue(snapshot_is_fresh(_snapshot(computed_at=timezone.now())))
+
+    def test_missing_or_never_computed_is_stale(self):
+        self.assertFalse(snapshot_is_fresh(None))
+        self.assertFalse(snapshot_is_fresh(_snapshot(computed_at=None)))
+
+    def test_bumped_version_is_stale(self):
+        snap = _snapshot(version=4, computed_version=3, computed_at=timezone.now())
+        self.assertFalse(snapshot_is_fresh(snap))
+
+    def test_previous_day_is_stale(self):
+        yesterday = timezone.now() - timedelta(days=1)
+        self.assertFalse(snapshot_is_fresh(_snapshot(computed_at=yesterday)))
+
+
+class JsonSafeTests(SimpleTestCase):
+    def test_decimals_become_floats_recursively(self):
+        payload = {"paid_by_currency": {"UGX": Decimal("1500.50")}, "lines": [Decimal("2")]}
+        self.assertEqual(
+            _json_safe(payload),
+            {"paid_by_currency": {"UGX": 1500.5}, "lines": [2.0]},
+        )
@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from payments.utils.payment_code_index import _index_rows, normalize_payment_code
+
+
+class PaymentCodeIndexRowsTests(SimpleTestCase):
+    def test_normalizes_case_and_whitespace(self):
+        self.assertEqual(normalize_payment_code("  26/u/001 "), "26/U/001")
+        self.assertEqual(normalize_payment_code(None), "")
+
+    def test_one_row_per_distinct_identifier_in_priority_order(self):
+        student = SimpleNamespace(
+            pk=5,
+            student_id="1001",
+            schoolpay_code="1001",
+            reg_no="26/u/001",
+            updated_at=None,
+        )
+        rows = _index_rows(student)
+        self.assertEqual(
+            [(r.code, r.source) for r in rows],
+            [("1001", "student_id"), ("26/U/001", "reg_no")],
+        )
+        self.assertTrue(all(r.student_id == 5 for r in rows))
+
+    def test_blank_identifiers_are_skipped(self):
+        student = SimpleNamespace(
+            pk=6, student_id=None, schoolpay_code="", reg_no="REG1", updated_at=None
+        )
+        self.assertEqual([r.code for r in _index_rows(student)], ["REG1"])
@@ -0,0 +1,36 @@
+from datetime import date
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from payments.registration_eligibility import (
+    _eligibility_cache_key,
+    bump_registration_eligibility_epoch,
+    registration_eligibility_epoch,
+)
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM)
+class EligibilityCacheKeyTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.settings = SimpleNamespace(min_tuition_payment_percentage="60.00", skip_tuition_check=False)
+
+    def test_key_changes_with_every_input(self):
+        base = _eligibility_cache_key(7, 3, 1, self.settings, date(2026, 9, 1))
+        self.assertNotEqual(base, _eligibility_cache_key(7, 4, 1, self.settings, date(2026, 9, 1)))
+        self.assertNotEqual(base, _eligibility_cache_key(7, 3, 2, self.settings, date(2026, 9, 1)))
+        self.assertNotEqual(base, _eligibility_cache_key(7, 3, 1, self.settings, date(2026, 9, 2)))
+        self.settings.skip_tuition_check = True
+        self.assertNotEqual(base, _eligibility_cache_key(7, 3, 1, self.settings, date(2026, 9, 1)))
+
+    def test_epoch_bump(self):
+        self.assertEqual(registration_eligibility_epoch(), 1)
+        bump_registration_eligibility_epoch()
+        self.assertEqual(registration_eligibility_epoch(), 2)
+        cache.clear()
+        bump_registration_eligibility_epoch()
+        self.assertEqual(registration_eligibility_epoch(), 2)
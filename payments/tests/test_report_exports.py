@@ -0,0 +1,40 @@
+from io import BytesIO
+
+from django.test import SimpleTestCase
+from openpyxl import load_workbook
+
+from payments.report_exports import ExportSpec, iter_csv, write_xlsx
+
+
+def _spec(rows):
+    return ExportSpec(filename_stem="demo", title="Demo", headers=["Name", "Amount"], rows=rows)
+
+
+class ReportExportEngineTests(SimpleTestCase):
+    def test_csv_is_streamed_row_by_row(self):
+        consumed = []
+
+        def rows():
+            for i in range(3):
+                consumed.append(i)
+                yield [f"S{i}", i * 100]
+
+        lines = iter_csv(_spec(rows()))
+        self.assertEqual(next(lines), "Name,Amount\r\n")
+        self.assertEqual(consumed, [])
+        self.assertEqual(next(lines), "S0,0\r\n")
+        self.assertEqual(consumed, [0])
+        self.assertEqual(len(list(lines)), 2)
+
+    def test_xlsx_write_only_round_trip(self):
+        buf = BytesIO()
+        count = write_xlsx(_spec(iter([["A", 1.5], ["B", 2]])), buf)
+        self.assertEqual(count, 2)
+        buf.seek(0)
+        ws = load_workbook(buf).active
+        self.assertEqual(ws.title, "Demo")
+        self.assertEqual([list(r) for r in ws.iter_rows(values_only=True)], [["Name", "Amount"], ["A", 1.5], ["B", 2]])
+
+    def test_filename_has_format_suffix(self):
+        self.assertTrue(_spec([]).filename("xlsx").startswith("demo_"))
+        self.assertTrue(_spec([]).filename("xlsx").endswith(".xlsx"))
@@ -0,0 +1,58 @@
+import json
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import SimpleTestCase, override_settings
+
+from payments.utils.schoolpay_backfill import _day_windows, _fetch_day
+
+
+class _StubSchoolPay(BaseHTTPRequestHandler):
+    requests_seen: list[str] = []
+
+    def do_GET(self):
+        type(self).requests_seen.append(self.path)
+        # .../SchoolRangeTransactions/<code>/<from>/<to>/<hash>
+        day = self.path.rstrip("/").split("/")[-3]
+        body = json.dumps(
+            {"transactions": [{"schoolpayReceiptNumber": f"R-{day}", "amount": "1000"}]}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class SchoolPayBackfillFetchTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubSchoolPay)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.root = f"http://127.0.0.1:{cls.server.server_address[1]}/AndroidRS"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def test_day_windows_are_inclusive(self):
+        self.assertEqual(
+            _day_windows(date(2026, 2, 27), date(2026, 3, 1)),
+            [date(2026, 2, 27), date(2026, 2, 28), date(2026, 3, 1)],
+        )
+
+    def test_fetches_one_day_per_request(self):
+        _StubSchoolPay.requests_seen = []
+        with override_settings(
+            SCHOOLPAY_API_ROOT=self.root, SCHOOL_PAY_CODE="123", SCHOOL_PAY_PASSWORD="pw"
+        ):
+            data = _fetch_day(date(2026, 3, 4))
+        self.assertEqual(data["transactions"][0]["schoolpayReceiptNumber"], "R-2026-03-04")
+        self.assertIn("/SchoolRangeTransactions/123/2026-03-04/2026-03-04/", _StubSchoolPay.requests_seen[0])
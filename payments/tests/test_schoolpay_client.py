@@ -0,0 +1,58 @@
+from unittest import mock
+
+import requests
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from payments.utils import schoolpay
+
+
+def _response(status_code):
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp._content = b"{}"
+    return resp
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class SchoolPayClientTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.session = mock.Mock()
+        patches = [
+            mock.patch.object(schoolpay, "get_session", return_value=self.session),
+            mock.patch.object(schoolpay.time, "sleep"),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_get_retries_5xx_then_records_metrics(self):
+        self.session.request.side_effect = [_response(503), _response(200)]
+        resp = schoolpay.schoolpay_request("sync_day", "GET", "http://sp/x")
+        self.assertEqual(resp.status_code, 200)
+        row = schoolpay.schoolpay_client_metrics()["endpoints"]["sync_day"]
+        self.assertEqual((row["calls"], row["errors"], row["retries"]), (2, 1, 1))
+
+    def test_post_is_not_retried_after_read_timeout(self):
+        self.session.request.side_effect = requests.ReadTimeout("slow")
+        with self.assertRaises(requests.ReadTimeout):
+            schoolpay.schoolpay_request("adhoc_request", "POST", "http://sp/x")
+        self.assertEqual(self.session.request.call_count, 1)
+
+    def test_circuit_opens_after_consecutive_failures(self):
+        self.session.request.side_effect = requests.ConnectionError("down")
+        for _ in range(schoolpay.CIRCUIT_FAILURE_THRESHOLD):
+            with self.assertRaises(requests.ConnectionError):
+                schoolpay.schoolpay_request("sync_day", "GET", "http://sp/x", max_retries=0)
+        calls = self.session.request.call_count
+        with self.assertRaises(schoolpay.SchoolPayUnavailable):
+            schoolpay.schoolpay_request("sync_day", "GET", "http://sp/x")
+        self.assertEqual(self.session.request.call_count, calls)
+        self.assertTrue(schoolpay.schoolpay_client_metrics()["circuit_open"])
+
+    def test_client_keeps_value_error_contract(self):
+        self.session.request.side_effect = requests.ConnectionError("down")
+        with override_settings(SCHOOL_PAY_CODE="1", SCHOOL_PAY_PASSWORD="p"):
+            with self.assertRaises(ValueError):
+                schoolpay.SchoolPayClient().check_status("REF")
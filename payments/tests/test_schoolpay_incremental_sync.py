@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from admissions.models import AcademicLevel, AdmittedStudent, Application, Batch, Campus
+from payments.models import TuitionLedger
+from Programs.models import Program
+from payments.utils import Transaction_sync
+from payments.utils.Transaction_sync import _payload_watermark, reconcile_transactions
+
+
+User = get_user_model()
+
+
+def _tx(receipt, paid_at, payment_code="1001"):
+    return {
+        "schoolpayReceiptNumber": receipt,
+        "studentPaymentCode": payment_code,
+        "amount": "50000",
+        "paymentDateAndTime": paid_at.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+class PayloadWatermarkTests(SimpleTestCase):
+    def test_latest_row_wins_across_transactions_and_supplementary(self):
+        base = datetime(2026, 9, 1, 8, 0, 0)
+        data = {
+            "transactions": [_tx("R1", base), _tx("R2", base + timedelta(hours=2))],
+            "supplementaryFeePayments": [_tx("S1", base + timedelta(hours=1))],
+        }
+        paid_at, receipt = _payload_watermark(data)
+        self.assertEqual(receipt, "R2")
+        self.assertEqual(timezone.localtime(paid_at).hour, 10)
+
+    def test_empty_payload_has_no_watermark(self):
+        self.assertEqual(_payload_watermark({}), (None, ""))
+
+
+class IncrementalReconcileTests(SimpleTestCase):
+    @patch("payments.utils.Transaction_sync._existing_ledgers_by_receipt")
+    def test_rows_before_watermark_never_hit_the_database(self, mock_existing):
+        paid = timezone.make_aware(datetime(2026, 9, 1, 8, 0, 0))
+        data = {"transactions": [_tx("R1", timezone.localtime(paid).replace(tzinfo=None))]}
+        created = reconcile_transactions(data, since=paid + timedelta(minutes=5))
+        self.assertEqual(created, 0)
+        mock_existing.assert_not_called()
+
+
+class AfterLedgerChangeTests(SimpleTestCase):
+    @patch("payments.utils.Transaction_sync.try_activate_programme_enrollment_after_payment")
+    @patch("payments.utils.Transaction_sync.sync_admission_fee_paid_from_ledger")
+    @patch("payments.finance_snapshot.invalidate_finance_snapshots")
+    @patch("payments.tasks.celery_refresh_tuition_pct_cache.delay")
+    def test_cache_refresh_is_queued_on_commit(self, delay, *_):
+        callbacks = []
+        with patch.object(Transaction_sync.transaction, "on_commit", side_effect=callbacks.append):
+            Transaction_sync._after_ledger_change({2, 1}, {2: object(), 1: object()})
+        delay.assert_not_called()
+        callbacks[0]()
+        delay.assert_called_once_with(student_ids=[1, 2])
+
+
+class ConcurrentInsertReconcileTests(TestCase):
+    """Receipts another tick or webhook inserted first are not counted as new."""
+
+    def setUp(self):
+        user = User.objects.create_user(username="bursar@example.com", email="bursar@example.com", password="x")
+        campus = Campus.objects.create(name="Main Campus", code="MAIN")
+        today = timezone.now().date()
+        batch = Batch.objects.create(
+            name="Sync Intake 2026",
+            code="SYNC2026",
+            application_start_date=today,
+            application_end_date=today + timedelta(days=90),
+            admission_start_date=today,
+            admission_end_date=today + timedelta(days=120),
+            created_by=user,
+        )
+        level = AcademicLevel.objects.create(name="Undergraduate")
+        program = Program.objects.create(
+            name="Bachelor of Nursing", short_form="BNS", code="BNS", academic_level=level, min_years=3, max_years=5
+        )
+        self.students = {
+            code: self._admit(campus, batch, level, program, code) for code in ("1001", "1002")
+        }
+
+    def _admit(self, campus, batch, level, program, code):
+        applicant = User.objects.create_user(username=f"{code}@example.com", email=f"{code}@example.com", password="x")
+        application = Application.objects.create(
+            applicant=applicant,
+            batch=batch,
+            campus=campus,
+            academic_level=level,
+            first_name="Student",
+            last_name=code,
+            date_of_birth="2000-01-01",
+            gender="female",
+            nationality="Ugandan",
+            phone="256700000000",
+            email=f"{code}@example.com",
+            next_of_kin_name="Kin",
+            next_of_kin_contact="256700000001",
+            next_of_kin_relationship="Parent",
+            status="accepted",
+        )
+        return AdmittedStudent.objects.create(
+            application=application, study_mode="day", reg_no=f"NDU/2026/SYNC/{code}", admitted_program=program,
+            admitted_batch=batch,
+            admitted_campus=campus,
+        )
+
+    @patch("payments.utils.Transaction_sync._after_ledger_change")
+    def test_receipt_inserted_by_a_concurrent_writer_is_not_new(self, after_change):
+        paid = datetime(2026, 9, 1, 8, 0, 0)
+        data = {"transactions": [_tx("R1", paid, "1001"), _tx("R2", paid, "1002")]}
+        raced = self.students["1001"]
+        TuitionLedger.objects.create(
+            schoolpay_receipt_number="R1",
+            student=raced,
+            amount=50000,
+            payment_date_time=timezone.make_aware(paid),
+            source_channel_transaction_id="",
+            source_payment_channel="",
+            student_name="",
+            student_payment_code="1001",
+            transaction_completion_status="Completed",
+        )
+
+        # The other writer commits R1 after this call looked up existing receipts.
+        with patch("payments.utils.Transaction_sync._existing_ledgers_by_receipt", return_value={}), patch(
+            "payments.utils.Transaction_sync.find_admitted_students_by_payment_codes",
+            return_value={code: student for code, student in self.students.items()},
+        ):
+            created = reconcile_transactions(data)
+
+        self.assertEqual(created, 1)
+        new_student = self.students["1002"]
+        after_change.assert_called_once_with({new_student.pk}, {new_student.pk: new_student})
+        self.assertEqual(TuitionLedger.objects.get(schoolpay_receipt_number="R1").student_id, raced.pk)
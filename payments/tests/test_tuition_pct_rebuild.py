@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from payments.tuition_pct_cache import (
+    _id_ranges,
+    _rebuild_incr,
+    _rebuild_key,
+    _rebuild_set_meta,
+    tuition_pct_rebuild_progress,
+)
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class IdRangesTests(SimpleTestCase):
+    def test_splits_sorted_ids_into_inclusive_bounds(self):
+        self.assertEqual(
+            _id_ranges([9, 1, 4, 5, 12, 3, 40], 3),
+            [(1, 4), (5, 12), (40, 40)],
+        )
+
+    def test_empty(self):
+        self.assertEqual(_id_ranges([], 500), [])
+
+
+@override_settings(CACHES=LOCMEM)
+class RebuildProgressTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_counts_chunks_and_percent(self):
+        _rebuild_set_meta("job1", status="running", total_chunks=4)
+        _rebuild_incr("job1", "done_chunks", 1)
+        _rebuild_incr("job1", "scanned", 250)
+        _rebuild_incr("job1", "met", 100)
+        progress = tuition_pct_rebuild_progress("job1")
+        self.assertEqual(progress["status"], "running")
+        self.assertEqual(progress["done_chunks"], 1)
+        self.assertEqual(progress["scanned"], 250)
+        self.assertEqual(progress["unmet"], 0)
+        self.assertEqual(progress["percent"], 25.0)
+
+    def test_incr_recreates_evicted_counter(self):
+        _rebuild_set_meta("job2", status="running", total_chunks=1)
+        cache.delete(_rebuild_key("job2", "done_chunks"))
+        _rebuild_incr("job2", "done_chunks", 1)
+        self.assertEqual(tuition_pct_rebuild_progress("job2")["percent"], 100.0)
+
+    def test_unknown_job(self):
+        self.assertIsNone(tuition_pct_rebuild_progress("missing"))
@@ -35,11 +35,13 @@ def _has_tuition_credit_q() -> Q:
     return portal_paid | ledger_paid
 
 
-def compute_registration_tuition_pct_met(student, min_pct: float | None = None) -> bool:
+def compute_registration_tuition_pct_met(
+    student, min_pct: float | None = None, *, alloc=None
+) -> bool:
     """Same gate as registration eligibility / student_meets_tuition_pct."""
     from payments.tuition_pct_queryset import student_meets_tuition_pct
 
-    return bool(student_meets_tuition_pct(student, min_pct))
+    return bool(student_meets_tuition_pct(student, min_pct, alloc=alloc))
 
 
 def refresh_student_tuition_pct_cache(student, *, min_pct: float | None = None) -> bool:
@@ -61,51 +63,45 @@ def refresh_students_tuition_pct_cache(
     *,
     min_pct: float | None = None,
 ) -> dict:
-    """Recompute cache for explicit student ids (one finance eval each)."""
+    """Recompute cache for explicit student ids (finance inputs prefetched per chunk)."""
     from admissions.models import AdmittedStudent
 
     ids = [int(i) for i in student_ids if i is not None]
     if not ids:
         return {"scanned": 0, "met": 0, "unmet": 0}
 
-    scanned = met = unmet = 0
-    from Programs.spe_queryset import prefetch_programme_enrollment_for_lists
+    from payments.registration_eligibility import tuition_eligibility_for_students
 
-    select_related = (
-        "application",
-        "admitted_program",
-        "admitted_batch",
-        "intended_program_batch",
-    )
     now = timezone.now()
-    # Chunked loads — no QuerySet.iterator() (breaks behind PgBouncer).
-    chunk_size = 40
-    for i in range(0, len(ids), chunk_size):
-        chunk = ids[i : i + chunk_size]
-        students = (
-            AdmittedStudent.objects.filter(id__in=chunk)
-            .select_related(*select_related)
-            .prefetch_related(prefetch_programme_enrollment_for_lists())
-            .order_by("id")
+    # Same gate as registration (min_pct is ignored there too). Cached results are
+    # reused and misses are computed with per-chunk prefetched allocations, which
+    # also warms the eligibility cache for the registration pages.
+    met_ids = [
+        sid
+        for sid, tuition in tuition_eligibility_for_students(ids).items()
+        if tuition.get("tuition_eligible")
+    ]
+
+    # One bulk update per outcome; everyone else (including allocation / gate
+    # errors, which are logged) is stamped unmet, as before.
+    if met_ids:
+        AdmittedStudent.objects.filter(id__in=met_ids).update(
+            registration_tuition_pct_met=True,
+            registration_tuition_pct_at=now,
         )
-        for student in students:
-            scanned += 1
-            try:
-                meets = compute_registration_tuition_pct_met(student, min_pct=min_pct)
-            except Exception:
-                logger.exception(
-                    "tuition %% cache refresh failed for student id=%s", student.pk
-                )
-                meets = False
-            AdmittedStudent.objects.filter(pk=student.pk).update(
-                registration_tuition_pct_met=meets,
-                registration_tuition_pct_at=now,
-            )
-            if meets:
-                met += 1
-            else:
-                unmet += 1
-    return {"scanned": scanned, "met": met, "unmet": unmet}
+    unmet_count = (
+        AdmittedStudent.objects.filter(id__in=ids)
+        .exclude(id__in=met_ids)
+        .update(
+            registration_tuition_pct_met=False,
+            registration_tuition_pct_at=now,
+        )
+    )
+    return {
+        "scanned": len(met_ids) + unmet_count,
+        "met": len(met_ids),
+        "unmet": unmet_count,
+    }
 
 
 def mark_no_payment_activity_as_unmet(qs: QuerySet | None = None) -> int:
@@ -188,25 +184,33 @@ def ensure_tuition_pct_cache_for_queryset(
     }
 
 
-def backfill_bonafide_tuition_pct_cache(
-    *,
-    batch_size: int = 200,
-    max_students: int | None = None,
-) -> dict:
-    """Full backfill for bonafide (admitted + commitment-paid) students."""
+def _bonafide_queryset() -> QuerySet:
     from admissions.models import AdmittedStudent
 
-    qs = AdmittedStudent.objects.filter(
+    return AdmittedStudent.objects.filter(
         is_admitted=True,
         admission_fee_paid=True,
     ).order_by("id")
 
-    stamped = mark_no_payment_activity_as_unmet(qs)
 
-    # Remaining uncached rows with tuition credit need a real finance eval.
-    need = qs.filter(registration_tuition_pct_at__isnull=True).filter(
+def _rebuild_candidates(qs: QuerySet) -> QuerySet:
+    """Uncached rows with tuition credit — the ones that need a real finance eval."""
+    return qs.filter(registration_tuition_pct_at__isnull=True).filter(
         _has_tuition_credit_q()
     )
+
+
+def backfill_bonafide_tuition_pct_cache(
+    *,
+    batch_size: int = 200,
+    max_students: int | None = None,
+) -> dict:
+    """Full backfill for bonafide (admitted + commitment-paid) students, in-process."""
+    qs = _bonafide_queryset()
+
+    stamped = mark_no_payment_activity_as_unmet(qs)
+
+    need = _rebuild_candidates(qs)
     if max_students is not None:
         need_ids = list(need.values_list("id", flat=True)[:max_students])
     else:
@@ -231,6 +235,149 @@ def backfill_bonafide_tuition_pct_cache(
     }
 
 
+# --- Parallel rebuild (Celery chord of id-range chunks) with pollable progress ---
+
+TUITION_PCT_REBUILD_CHUNK_SIZE = 500
+TUITION_PCT_REBUILD_JOB_TTL = 60 * 60 * 24
+TUITION_PCT_REBUILD_LATEST_KEY = "tuition_pct_rebuild:latest"
+_REBUILD_COUNTERS = ("done_chunks", "failed_chunks", "scanned", "met", "unmet")
+
+
+def _rebuild_key(job_id: str, field: str = "meta") -> str:
+    return f"tuition_pct_rebuild:{job_id}:{field}"
+
+
+def _rebuild_incr(job_id: str, field: str, delta: int) -> None:
+    if not delta:
+        return
+    key = _rebuild_key(job_id, field)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # Counter evicted / never initialised: recreate (add() is a no-op if a
+        # concurrent chunk won the race) and retry once.
+        cache.add(key, 0, timeout=TUITION_PCT_REBUILD_JOB_TTL)
+        cache.incr(key, delta)
+
+
+def _rebuild_set_meta(job_id: str, **fields) -> dict:
+    meta = cache.get(_rebuild_key(job_id)) or {"job_id": job_id}
+    meta.update(fields)
+    cache.set(_rebuild_key(job_id), meta, timeout=TUITION_PCT_REBUILD_JOB_TTL)
+    return meta
+
+
+def _id_ranges(ids: list[int], chunk_size: int) -> list[tuple[int, int]]:
+    """Inclusive (first_id, last_id) bounds of consecutive ``chunk_size`` slices of sorted ids."""
+    ordered = sorted(ids)
+    return [
+        (ordered[i], ordered[min(i + chunk_size, len(ordered)) - 1])
+        for i in range(0, len(ordered), chunk_size)
+    ]
+
+
+def start_tuition_pct_rebuild(
+    *,
+    chunk_size: int = TUITION_PCT_REBUILD_CHUNK_SIZE,
+    max_students: int | None = None,
+) -> dict:
+    """
+    Fan the bonafide backfill out as a Celery chord of id-range chunks.
+
+    No-activity students are bulk-stamped here; each chunk task re-selects the
+    uncached candidates in its id range and writes results with bulk updates.
+    The chord callback marks the gate basis current. Poll progress with
+    ``tuition_pct_rebuild_progress(job_id)``.
+    """
+    import uuid
+
+    from celery import chord
+
+    from payments.tasks import (
+        celery_finish_tuition_pct_rebuild,
+        celery_refresh_tuition_pct_range,
+    )
+
+    qs = _bonafide_queryset()
+    stamped = mark_no_payment_activity_as_unmet(qs)
+    need = _rebuild_candidates(qs).values_list("id", flat=True)
+    need_ids = list(need[:max_students] if max_students is not None else need)
+    ranges = _id_ranges(need_ids, max(1, int(chunk_size)))
+
+    job_id = uuid.uuid4().hex
+    for field in _REBUILD_COUNTERS:
+        cache.set(_rebuild_key(job_id, field), 0, timeout=TUITION_PCT_REBUILD_JOB_TTL)
+    _rebuild_set_meta(
+        job_id,
+        status="running" if ranges else "done",
+        candidates=len(need_ids),
+        total_chunks=len(ranges),
+        stamped_no_activity=stamped,
+        started_at=timezone.now().isoformat(),
+        finished_at=None,
+    )
+    cache.set(TUITION_PCT_REBUILD_LATEST_KEY, job_id, timeout=TUITION_PCT_REBUILD_JOB_TTL)
+
+    if not ranges:
+        finish_tuition_pct_rebuild(job_id)
+    else:
+        chord(
+            celery_refresh_tuition_pct_range.s(lo, hi, job_id=job_id) for lo, hi in ranges
+        )(celery_finish_tuition_pct_rebuild.s(job_id=job_id))
+    return tuition_pct_rebuild_progress(job_id)
+
+
+def refresh_tuition_pct_id_range(first_id: int, last_id: int, *, job_id: str | None = None) -> dict:
+    """One chord chunk: recompute uncached bonafide candidates with first_id <= id <= last_id."""
+    ids = list(
+        _rebuild_candidates(_bonafide_queryset())
+        .filter(id__gte=first_id, id__lte=last_id)
+        .values_list("id", flat=True)
+    )
+    try:
+        result = refresh_students_tuition_pct_cache(ids)
+    except Exception:
+        logger.exception("tuition %% rebuild chunk %s-%s failed", first_id, last_id)
+        if job_id:
+            _rebuild_incr(job_id, "failed_chunks", 1)
+            _rebuild_incr(job_id, "done_chunks", 1)
+        return {"scanned": 0, "met": 0, "unmet": 0, "failed": True}
+
+    if job_id:
+        for field in ("scanned", "met", "unmet"):
+            _rebuild_incr(job_id, field, result[field])
+        _rebuild_incr(job_id, "done_chunks", 1)
+    return result
+
+
+def finish_tuition_pct_rebuild(job_id: str) -> dict:
+    """Chord callback: the new basis is current once every chunk has run."""
+    mark_tuition_pct_basis_current()
+    _rebuild_set_meta(
+        job_id,
+        status="done",
+        finished_at=timezone.now().isoformat(),
+        basis=current_tuition_pct_gate_basis(),
+    )
+    return tuition_pct_rebuild_progress(job_id)
+
+
+def tuition_pct_rebuild_progress(job_id: str | None = None) -> dict | None:
+    """Progress for ``job_id`` (default: most recent rebuild); None when unknown/expired."""
+    job_id = job_id or cache.get(TUITION_PCT_REBUILD_LATEST_KEY)
+    if not job_id:
+        return None
+    meta = cache.get(_rebuild_key(job_id))
+    if meta is None:
+        return None
+    out = dict(meta)
+    for field in _REBUILD_COUNTERS:
+        out[field] = int(cache.get(_rebuild_key(job_id, field)) or 0)
+    total = out.get("total_chunks") or 0
+    out["percent"] = 100.0 if not total else round(100.0 * out["done_chunks"] / total, 1)
+    return out
+
+
 def current_tuition_pct_gate_basis() -> str:
     """
     Identity of the rule used to compute registration_tuition_pct_met.
@@ -35,7 +35,7 @@ def _has_tuition_credit_q() -> Q:
     return portal_paid | ledger_paid
 
 
-def student_meets_tuition_pct(student, min_pct: float | None = None) -> bool:
+def student_meets_tuition_pct(student, min_pct: float | None = None, *, alloc=None) -> bool:
     """
     Same gate as course registration (student_tuition_eligible).
 
@@ -44,7 +44,7 @@ def student_meets_tuition_pct(student, min_pct: float | None = None) -> bool:
     """
     try:
         _ = min_pct
-        return bool(student_tuition_eligible(student))
+        return bool(student_tuition_eligible(student, alloc=alloc))
     except Exception:
         logger.exception(
             "tuition %% check failed for student id=%s", getattr(student, "pk", None)
@@ -58,7 +58,9 @@ from .registration_lookup_views import (
     AdminRegistrationLookupDetailView,
     AdminRegistrationLookupSearchView,
 )
+from .report_export_views import ReportExportDownloadView, ReportExportJobView
 from .scan_desk_views import StudentCardScanDeskView
+from .schoolpay_metrics_views import SchoolPayClientMetricsView
 from .semester_registration_views import (
     CheckRegistrationEligibility,
     DownloadStudentOfferLetterPdf,
@@ -67,6 +69,7 @@ from .semester_registration_views import (
     GetStudentPaymentStatus,
     GetStudentTuitionStructure,
     RegisterForCourses,
+    TuitionPctRebuildStatus,
     UpdateRegistrationSettings,
     verify_registration_card_public,
 )
@@ -129,6 +132,13 @@ urlpatterns = [
         AdminTuitionLedgerStudentsExportView.as_view(),
         name='admin_tuition_ledger_students_export',
     ),
+    path('admin/report_exports/<int:job_id>', ReportExportJobView.as_view(), name='admin_report_export_job'),
+    path(
+        'admin/report_exports/<int:job_id>/download',
+        ReportExportDownloadView.as_view(),
+        name='admin_report_export_download',
+    ),
+    path('admin/schoolpay/metrics', SchoolPayClientMetricsView.as_view(), name='admin_schoolpay_metrics'),
     path(
         'admin/tuition_ledger/students/<int:student_id>',
         AdminTuitionLedgerStudentDetailView.as_view(),
@@ -220,6 +230,7 @@ urlpatterns = [
     ),
     path('registration_settings', GetRegistrationSettings.as_view(), name='get_registration_settings'),
     path('registration_settings/update', UpdateRegistrationSettings.as_view(), name='update_registration_settings'),
+    path('registration_settings/tuition_pct_rebuild', TuitionPctRebuildStatus.as_view(), name='tuition_pct_rebuild_status'),
 
     # --- ad-hoc per-student charges (staff) ---
     path('fee_heads', FeeHeadListView.as_view(), name='fee_heads'),
@@ -1,22 +1,31 @@
+from datetime import timedelta
 from decimal import Decimal
 
+from django.db import transaction
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
-from payments.models import TuitionLedger
+from payments.models import SchoolPaySyncState, TuitionLedger
 from payments.programme_enrollment_activation import (
     try_activate_programme_enrollment_after_payment,
 )
 from payments.utils.tuition_ledger_linking import (
-    find_admitted_student_by_payment_code,
+    find_admitted_students_by_payment_codes,
     sync_admission_fee_paid_from_ledger,
 )
 
 import hashlib
-import requests
 from django.conf import settings
+from payments.utils.schoolpay import schoolpay_get_json
 from payments.utils.schoolpay_auth import schoolpay_api_root
 
+# Incremental sync: full look-back (the old per-tick range), how often it is
+# re-scanned, and how far before the watermark each tick re-reads.
+SYNC_LOOKBACK_DAYS = 3
+SYNC_FULL_WINDOW_INTERVAL = timedelta(hours=1)
+SYNC_WATERMARK_OVERLAP = timedelta(minutes=30)
+LEDGER_LOOKUP_CHUNK_SIZE = 500
+
 # request hash
 def generate_request_hash(date_string):
 
@@ -41,16 +50,14 @@ def fetch_transactions_by_date(date_string):
         f"{request_hash}"
     )
 
-    response = requests.get(url, timeout=60)
-
-    response.raise_for_status()
-
-    return response.json()
+    return schoolpay_get_json("sync_day", url, timeout=60)
 
 
 def fetch_transactions_by_range(
     from_date,
-    to_date
+    to_date,
+    *,
+    timeout=60,
 ):
     request_hash = generate_request_hash(
         from_date
@@ -65,11 +72,7 @@ def fetch_transactions_by_range(
         f"{request_hash}"
     )
 
-    response = requests.get(url, timeout=60)
-
-    response.raise_for_status()
-
-    return response.json()
+    return schoolpay_get_json("sync_range", url, timeout=timeout)
 
 def _schoolpay_payload_rows(data: dict | None) -> list[dict]:
     """Tuition rows plus supplementary / other-fee payments (SchoolPay splits these)."""
@@ -85,26 +88,135 @@ def _schoolpay_payload_rows(data: dict | None) -> list[dict]:
     return rows
 
 
-# Reconcile transactions with our database
-def reconcile_transactions(data):
+def _parse_paid_at(tx: dict):
+    paid_at = parse_datetime(tx.get("paymentDateAndTime") or "")
+    if paid_at is None:
+        return None
+    if timezone.is_naive(paid_at):
+        paid_at = timezone.make_aware(paid_at, timezone.get_current_timezone())
+    return paid_at
+
+
+def _existing_ledgers_by_receipt(receipts: list[str]) -> dict[str, TuitionLedger]:
+    found: dict[str, TuitionLedger] = {}
+    for i in range(0, len(receipts), LEDGER_LOOKUP_CHUNK_SIZE):
+        for ledger in TuitionLedger.objects.filter(
+            schoolpay_receipt_number__in=receipts[i : i + LEDGER_LOOKUP_CHUNK_SIZE]
+        ).only(
+            "id",
+            "schoolpay_receipt_number",
+            "student_id",
+            "user_id",
+            "transaction_completion_status",
+        ):
+            found[ledger.schoolpay_receipt_number] = ledger
+    return found
+
+
+def _inserted_receipts(ledgers: list[TuitionLedger]) -> set[str]:
+    """
+    Receipts of an ``ignore_conflicts`` insert that this call actually wrote.
 
-    transactions = _schoolpay_payload_rows(data)
+    A receipt a concurrent tick or webhook inserted first keeps that writer's
+    ``created_at``, so it does not match the stamp set on our unsaved row.
+    """
+    stamped = {ledger.schoolpay_receipt_number: ledger.created_at for ledger in ledgers}
+    receipts = list(stamped)
+    inserted: set[str] = set()
+    for i in range(0, len(receipts), LEDGER_LOOKUP_CHUNK_SIZE):
+        for receipt_number, created_at in TuitionLedger.objects.filter(
+            schoolpay_receipt_number__in=receipts[i : i + LEDGER_LOOKUP_CHUNK_SIZE]
+        ).values_list("schoolpay_receipt_number", "created_at"):
+            if created_at == stamped[receipt_number]:
+                inserted.add(receipt_number)
+    return inserted
 
-    created_count = 0
-    touched_student_ids: set[int] = set()
 
-    for tx in transactions:
+def _after_ledger_change(student_ids: set[int], changed_students: dict) -> None:
+    """Post-payment side effects for students whose ledger rows were added or relinked."""
+    from payments.finance_snapshot import invalidate_finance_snapshots
 
-        receipt_number = tx.get(
-            "schoolpayReceiptNumber"
-        )
-        if not receipt_number:
+    invalidate_finance_snapshots(student_ids)
+    for student in changed_students.values():
+        sync_admission_fee_paid_from_ledger(student)
+        try_activate_programme_enrollment_after_payment(student)
+
+    if changed_students:
+        ids = sorted(changed_students)
+
+        def _enqueue():
+            try:
+                from payments.tasks import celery_refresh_tuition_pct_cache
+
+                celery_refresh_tuition_pct_cache.delay(student_ids=ids)
+            except Exception:
+                # Never fail SchoolPay ingest if the cache-refresh queue is down.
+                pass
+
+        # The worker must see the committed ledger rows.
+        transaction.on_commit(_enqueue)
+
+
+# Reconcile transactions with our database
+def reconcile_transactions(data, *, since=None):
+    """
+    Upsert a SchoolPay payload into ``TuitionLedger``; returns the number of new receipts.
+
+    Set-based: existing receipts and payment codes are resolved with one query
+    each, new rows are bulk-inserted, and post-payment side effects (admission
+    fee flag, programme enrollment, tuition-% cache) run only for students whose
+    ledger actually changed. Rows paid before ``since`` are ignored (incremental
+    ticks; see ``sync_schoolpay_incremental``).
+    """
+    rows: dict[str, tuple[dict, object]] = {}
+    for tx in _schoolpay_payload_rows(data):
+        receipt_number = tx.get("schoolpayReceiptNumber")
+        if not receipt_number or receipt_number in rows:
             continue
+        paid_at = _parse_paid_at(tx)
+        if paid_at is None:
+            continue
+        if since is not None and paid_at < since:
+            continue
+        rows[receipt_number] = (tx, paid_at)
+    if not rows:
+        return 0
 
-        payment_code = (tx.get("studentPaymentCode") or "").strip()
+    existing = _existing_ledgers_by_receipt(list(rows))
+    students_by_code = find_admitted_students_by_payment_codes(
+        (tx.get("studentPaymentCode") or "") for tx, _paid_at in rows.values()
+    )
+
+    new_ledgers: list[TuitionLedger] = []
+    # Student and completion status per new receipt; applied once the insert
+    # shows which receipts this call actually wrote.
+    new_owners: dict[str, tuple[object, str]] = {}
+    relinked: list[TuitionLedger] = []
+    affected_ids: set[int] = set()
+    changed_students: dict[int, object] = {}
 
+    for receipt_number, (tx, paid_at) in rows.items():
+        payment_code = (tx.get("studentPaymentCode") or "").strip()
         # FIND STUDENT (payment code may match student_id, schoolpay_code, or reg_no)
-        student = find_admitted_student_by_payment_code(payment_code) if payment_code else None
+        student = students_by_code.get(payment_code.upper()) if payment_code else None
+        ledger = existing.get(receipt_number)
+
+        # Existing receipt: only relink when the owner changed (no per-tick side effects).
+        if ledger is not None:
+            if (
+                student
+                and ledger.transaction_completion_status == "Completed"
+                and ledger.student_id != student.pk
+            ):
+                if ledger.student_id:
+                    affected_ids.add(ledger.student_id)
+                ledger.student_id = student.pk
+                if student.student_user_id and ledger.user_id is None:
+                    ledger.user_id = student.student_user_id
+                relinked.append(ledger)
+                affected_ids.add(student.pk)
+                changed_students[student.pk] = student
+            continue
 
         # DB column is NOT NULL (CharField blank=True, null=False). SchoolPay often omits reg no.
         reg_no = (
@@ -112,123 +224,126 @@ def reconcile_transactions(data):
             or (getattr(student, "reg_no", None) or "").strip()
             or ""
         )
-
-        paid_at = parse_datetime(tx.get("paymentDateAndTime"))
-        if paid_at is None:
-            continue
-        if timezone.is_naive(paid_at):
-            paid_at = timezone.make_aware(paid_at, timezone.get_current_timezone())
-
-        # CREATE TRANSACTION SAFELY
-        ledger, created = (
-            TuitionLedger.objects.get_or_create(
-
+        completion_status = tx.get("transactionCompletionStatus") or "Completed"
+        new_ledgers.append(
+            TuitionLedger(
                 schoolpay_receipt_number=receipt_number,
-
-                defaults={
-
-                    "user":
-                        student.student_user if student else None,
-
-                    "student":
-                        student,
-
-                    "amount":
-                        Decimal(
-                            tx.get("amount", "0")
-                        ),
-
-                    "payment_date_time":
-                        paid_at,
-
-                    "settlement_bank_code":
-                        tx.get(
-                            "settlementBankCode"
-                        ),
-
-                    "source_channel_trans_detail":
-                        (
-                            tx.get("sourceChannelTransDetail")
-                            or tx.get("supplementaryFeeDescription")
-                            or ""
-                        ),
-
-                    "source_channel_transaction_id":
-                        tx.get(
-                            "sourceChannelTransactionId"
-                        ) or "",
-
-                    "source_payment_channel":
-                        tx.get(
-                            "sourcePaymentChannel"
-                        ) or "",
-
-                    "student_name":
-                        tx.get(
-                            "studentName"
-                        ) or "",
-
-                    "student_payment_code":
-                        payment_code,
-
-                    "student_registration_number":
-                        reg_no,
-
-                    "transaction_completion_status":
-                        tx.get(
-                            "transactionCompletionStatus"
-                        ) or "Completed",
-
-                    "raw_response":
-                        tx,
-                }
+                user=student.student_user if student else None,
+                student=student,
+                amount=Decimal(tx.get("amount", "0")),
+                payment_date_time=paid_at,
+                settlement_bank_code=tx.get("settlementBankCode"),
+                source_channel_trans_detail=(
+                    tx.get("sourceChannelTransDetail")
+                    or tx.get("supplementaryFeeDescription")
+                    or ""
+                ),
+                source_channel_transaction_id=tx.get("sourceChannelTransactionId") or "",
+                source_payment_channel=tx.get("sourcePaymentChannel") or "",
+                student_name=tx.get("studentName") or "",
+                student_payment_code=payment_code,
+                student_registration_number=reg_no,
+                transaction_completion_status=completion_status,
+                raw_response=tx,
+                # RECONCILIATION: matched completed rows are reconciled on insert.
+                reconciled=bool(student and completion_status == "Completed"),
             )
         )
-
-        # Existing receipt: relink, sync flags, and retry enrollment if needed.
-        if not created:
-            if student and ledger.transaction_completion_status == "Completed":
-                if ledger.student_id != student.pk:
-                    ledger.student = student
-                    if student.student_user_id and ledger.user_id is None:
-                        ledger.user = student.student_user
-                    ledger.save(update_fields=["student", "user"])
-                sync_admission_fee_paid_from_ledger(student)
-                try_activate_programme_enrollment_after_payment(student)
-                touched_student_ids.add(int(student.pk))
+        if student:
+            new_owners[receipt_number] = (student, completion_status)
+
+    inserted: set[str] = set()
+    if new_ledgers:
+        # Concurrent ticks / webhooks may insert the same receipt; the unique
+        # receipt number makes the loser a no-op, and only the rows this call
+        # wrote count as new or trigger side effects.
+        TuitionLedger.objects.bulk_create(
+            new_ledgers, batch_size=LEDGER_LOOKUP_CHUNK_SIZE, ignore_conflicts=True
+        )
+        inserted = _inserted_receipts(new_ledgers)
+        for receipt_number in inserted:
+            if receipt_number not in new_owners:
+                continue
+            student, completion_status = new_owners[receipt_number]
+            affected_ids.add(student.pk)
+            if completion_status == "Completed":
+                changed_students[student.pk] = student
+    if relinked:
+        TuitionLedger.objects.bulk_update(relinked, ["student", "user"])
+
+    if affected_ids or changed_students:
+        _after_ledger_change(affected_ids, changed_students)
+
+    return len(inserted)
+
+
+def _payload_watermark(data) -> tuple[object, str]:
+    """Latest (paid_at, receipt) in a payload."""
+    best_at, best_receipt = None, ""
+    for tx in _schoolpay_payload_rows(data):
+        receipt_number = tx.get("schoolpayReceiptNumber") or ""
+        paid_at = _parse_paid_at(tx)
+        if not receipt_number or paid_at is None:
             continue
+        if best_at is None or (paid_at, receipt_number) > (best_at, best_receipt):
+            best_at, best_receipt = paid_at, receipt_number
+    return best_at, best_receipt
 
-        # RECONCILIATION + academic enrollment when commitment is met
-        if student and ledger.transaction_completion_status == "Completed":
-            if ledger.student_id != student.pk:
-                ledger.student = student
-                if student.student_user_id and ledger.user_id is None:
-                    ledger.user = student.student_user
-                ledger.save(update_fields=["student", "user"])
-
-            sync_admission_fee_paid_from_ledger(student)
-
-            if not ledger.reconciled:
-                ledger.reconciled = True
-                ledger.save(update_fields=["reconciled"])
-
-            try_activate_programme_enrollment_after_payment(student)
-            touched_student_ids.add(int(student.pk))
 
-        created_count += 1
-
-    if touched_student_ids:
-        try:
-            from payments.tasks import celery_refresh_tuition_pct_cache
-
-            celery_refresh_tuition_pct_cache.delay(
-                student_ids=sorted(touched_student_ids)
-            )
-        except Exception:
-            # Never fail SchoolPay ingest if the cache-refresh queue is down.
-            pass
+def sync_schoolpay_incremental(*, now=None, force_full: bool = False) -> dict:
+    """
+    Watermark-driven SchoolPay ingest for the per-minute Celery tick.
 
-    return created_count
+    SchoolPay only serves whole days, so a tick still downloads the days since
+    the watermark, but rows paid before ``last_payment_at - SYNC_WATERMARK_OVERLAP``
+    are dropped before touching the database. Every ``SYNC_FULL_WINDOW_INTERVAL``
+    the last ``SYNC_LOOKBACK_DAYS`` days are re-scanned in full to catch receipts
+    SchoolPay posts late with an older timestamp.
+    """
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    state = SchoolPaySyncState.get_state()
+
+    full = (
+        force_full
+        or state.last_payment_at is None
+        or state.last_full_window_at is None
+        or now - state.last_full_window_at >= SYNC_FULL_WINDOW_INTERVAL
+    )
+    earliest = today - timedelta(days=SYNC_LOOKBACK_DAYS)
+    if full:
+        since = None
+        from_date = earliest
+    else:
+        since = state.last_payment_at - SYNC_WATERMARK_OVERLAP
+        from_date = max(timezone.localdate(since), earliest)
+
+    data = fetch_transactions_by_range(
+        from_date=from_date.strftime("%Y-%m-%d"),
+        to_date=today.strftime("%Y-%m-%d"),
+    )
+    created = reconcile_transactions(data, since=since)
+
+    latest_at, latest_receipt = _payload_watermark(data)
+    # Queryset update: a per-minute save() would also write an audit row every tick.
+    fields = {"last_synced_at": now, "last_created_count": created}
+    if latest_at is not None and (
+        state.last_payment_at is None or latest_at > state.last_payment_at
+    ):
+        fields["last_payment_at"] = latest_at
+        fields["last_receipt_number"] = latest_receipt
+    if full:
+        fields["last_full_window_at"] = now
+    SchoolPaySyncState.objects.filter(pk=state.pk).update(updated_at=now, **fields)
+    watermark = fields.get("last_payment_at", state.last_payment_at)
+
+    return {
+        "mode": "full" if full else "incremental",
+        "from_date": from_date.isoformat(),
+        "to_date": today.isoformat(),
+        "created": created,
+        "watermark": watermark.isoformat() if watermark else None,
+    }
 
 
 def pull_schoolpay_range(from_date: str, to_date: str) -> int:
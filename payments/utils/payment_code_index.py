@@ -0,0 +1,111 @@
+"""Normalized SchoolPay payment-code index (``StudentPaymentCode``)."""
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import F
+
+from admissions.models import AdmittedStudent
+from payments.models import StudentPaymentCode
+
+PAYMENT_CODE_CHUNK_SIZE = 1000
+
+# Same identifiers (and priority) as find_admitted_student_by_payment_code.
+_CODE_FIELDS = ("student_id", "schoolpay_code", "reg_no")
+
+
+def normalize_payment_code(code: str | None) -> str:
+    return (code or "").strip().upper()
+
+
+def _index_rows(student: AdmittedStudent) -> list[StudentPaymentCode]:
+    rows: list[StudentPaymentCode] = []
+    seen: set[str] = set()
+    for source in _CODE_FIELDS:
+        code = normalize_payment_code(getattr(student, source, None))
+        if not code or code in seen:
+            continue
+        seen.add(code)
+        rows.append(
+            StudentPaymentCode(
+                code=code,
+                student_id=student.pk,
+                source=source,
+                student_updated_at=getattr(student, "updated_at", None),
+            )
+        )
+    return rows
+
+
+def sync_student_payment_codes(student: AdmittedStudent) -> None:
+    """Bring one student's index rows in line with its current identifiers."""
+    wanted = {row.code: row for row in _index_rows(student)}
+    current = dict(
+        StudentPaymentCode.objects.filter(student_id=student.pk).values_list("code", "source")
+    )
+    stale = [
+        code
+        for code, source in current.items()
+        if code not in wanted or wanted[code].source != source
+    ]
+    if stale:
+        StudentPaymentCode.objects.filter(student_id=student.pk, code__in=stale).delete()
+    missing = [row for code, row in wanted.items() if current.get(code) != row.source]
+    if missing:
+        StudentPaymentCode.objects.bulk_create(missing, ignore_conflicts=True)
+    updated_at = getattr(student, "updated_at", None)
+    if updated_at is not None:
+        StudentPaymentCode.objects.filter(student_id=student.pk).exclude(
+            student_updated_at=updated_at
+        ).update(student_updated_at=updated_at)
+
+
+def rebuild_payment_code_index(*, chunk_size: int = PAYMENT_CODE_CHUNK_SIZE) -> int:
+    """Recreate the whole index from ``AdmittedStudent`` (repair / first deploy)."""
+    created = 0
+    batch: list[StudentPaymentCode] = []
+    qs = AdmittedStudent.objects.only("id", "updated_at", *_CODE_FIELDS).order_by("id")
+    with transaction.atomic():
+        StudentPaymentCode.objects.all().delete()
+        for student in qs.iterator(chunk_size=chunk_size):
+            batch.extend(_index_rows(student))
+            if len(batch) >= chunk_size:
+                StudentPaymentCode.objects.bulk_create(batch, ignore_conflicts=True)
+                created += len(batch)
+                batch = []
+        if batch:
+            StudentPaymentCode.objects.bulk_create(batch, ignore_conflicts=True)
+            created += len(batch)
+    return created
+
+
+def resolve_payment_codes(
+    codes: Iterable[str], *, chunk_size: int = PAYMENT_CODE_CHUNK_SIZE
+) -> dict[str, int]:
+    """
+    Map SchoolPay codes to admitted-student ids with one indexed query per chunk.
+
+    Keys are the codes as passed in (case and surrounding spaces are ignored for
+    matching); unknown codes are omitted. When several students share an
+    identifier the most recently updated one wins, as in
+    ``find_admitted_student_by_payment_code``.
+    """
+    by_norm: dict[str, list[str]] = {}
+    for raw in codes:
+        norm = normalize_payment_code(raw)
+        if norm:
+            by_norm.setdefault(norm, []).append(raw)
+    wanted = sorted(by_norm)
+
+    resolved: dict[str, int] = {}
+    for i in range(0, len(wanted), chunk_size):
+        rows = (
+            StudentPaymentCode.objects.filter(code__in=wanted[i : i + chunk_size])
+            .order_by("code", F("student_updated_at").desc(nulls_last=True), "-student_id")
+            .values_list("code", "student_id")
+        )
+        for code, student_id in rows:
+            for raw in by_norm[code]:
+                resolved.setdefault(raw, student_id)
+    return resolved
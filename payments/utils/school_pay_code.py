@@ -5,6 +5,7 @@ import requests
 from django.conf import settings
 
 from admissions.models import AdmittedStudent
+from .schoolpay import schoolpay_request
 from .schoolpay_auth import build_schoolpay_hash, schoolpay_api_root
 
 logger = logging.getLogger(__name__)
@@ -129,7 +130,9 @@ def register_student_with_schoolpay(admitted_student, *, guardian_phone: str | N
     }
 
     try:
-        response = requests.post(
+        response = schoolpay_request(
+            "student_sync",
+            "POST",
             url,
             json=payload,
             timeout=30,
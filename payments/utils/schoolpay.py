@@ -1,55 +1,263 @@
+"""
+Shared SchoolPay HTTP client.
+
+Every SchoolPay call (ad-hoc payment request / status check, student code
+sync, day and range transaction sync) goes through ``schoolpay_request``:
+
+* one keep-alive pooled ``requests.Session`` per process (no TLS handshake per
+  minute-tick sync);
+* bounded retries with full jitter — GETs on connection errors, timeouts, 429
+  and 5xx; POSTs only when the connection was never established, so a payment
+  prompt is never sent twice;
+* a circuit breaker shared through the Django cache: after
+  ``CIRCUIT_FAILURE_THRESHOLD`` consecutive failures calls fail fast with
+  ``SchoolPayUnavailable`` for ``CIRCUIT_OPEN_SECONDS``;
+* per-endpoint daily counters (calls, errors, retries, latency) read by
+  ``schoolpay_client_metrics`` for monitoring.
+"""
+import hashlib
+import logging
+import random
+import threading
+import time
+
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from django.conf import settings
-import hashlib
+from django.core.cache import cache
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
 
 from .schoolpay_auth import schoolpay_api_root
 
+logger = logging.getLogger(__name__)
+
+POOL_MAXSIZE = 10
+MAX_RETRIES = 2
+RETRY_BACKOFF_SECONDS = 0.5
+RETRY_BACKOFF_CAP_SECONDS = 8.0
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_OPEN_SECONDS = 60
+SLOW_CALL_SECONDS = 5.0
+METRICS_TTL = 60 * 60 * 24 * 8
+SCHOOLPAY_ENDPOINTS = ("adhoc_request", "adhoc_check", "student_sync", "sync_day", "sync_range")
+METRIC_FIELDS = ("calls", "errors", "retries", "latency_ms", "max_latency_ms", "circuit_rejected")
+
+_CIRCUIT_FAILURES_KEY = "schoolpay:circuit:failures"
+_CIRCUIT_OPEN_KEY = "schoolpay:circuit:open"
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class SchoolPayUnavailable(requests.ConnectionError):
+    """Raised without calling SchoolPay while the circuit breaker is open."""
+
+
+def get_session() -> requests.Session:
+    """Process-wide keep-alive session (connection reuse across calls and threads)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def _metric_key(endpoint: str, field: str, day=None) -> str:
+    day = day or timezone.localdate()
+    return f"schoolpay:metrics:{day.isoformat()}:{endpoint}:{field}"
+
+
+def _metric_incr(endpoint: str, field: str, delta: int = 1) -> None:
+    if not delta:
+        return
+    key = _metric_key(endpoint, field)
+    try:
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            if not cache.add(key, delta, timeout=METRICS_TTL):
+                cache.incr(key, delta)
+    except Exception:
+        # Metrics must never break a payment call.
+        logger.debug("schoolpay metric %s not recorded", key, exc_info=True)
+
+
+def _metric_max(endpoint: str, field: str, value: int) -> None:
+    key = _metric_key(endpoint, field)
+    try:
+        if value > int(cache.get(key) or 0):
+            cache.set(key, value, timeout=METRICS_TTL)
+    except Exception:
+        logger.debug("schoolpay metric %s not recorded", key, exc_info=True)
+
+
+def schoolpay_client_metrics(day=None) -> dict:
+    """``{endpoint: {calls, errors, retries, avg_latency_ms, ...}}`` for one local day."""
+    day = day or timezone.localdate()
+    out = {}
+    for endpoint in SCHOOLPAY_ENDPOINTS:
+        keys = {field: _metric_key(endpoint, field, day) for field in METRIC_FIELDS}
+        values = cache.get_many(list(keys.values()))
+        row = {field: int(values.get(key) or 0) for field, key in keys.items()}
+        row["avg_latency_ms"] = round(row["latency_ms"] / row["calls"], 1) if row["calls"] else 0.0
+        row["error_rate"] = round(row["errors"] / row["calls"] * 100.0, 1) if row["calls"] else 0.0
+        out[endpoint] = row
+    return {
+        "day": day.isoformat(),
+        "circuit_open": bool(cache.get(_CIRCUIT_OPEN_KEY)),
+        "consecutive_failures": int(cache.get(_CIRCUIT_FAILURES_KEY) or 0),
+        "endpoints": out,
+    }
+
+
+def _circuit_is_open() -> bool:
+    try:
+        return bool(cache.get(_CIRCUIT_OPEN_KEY))
+    except Exception:
+        return False
+
+
+def _record_success() -> None:
+    try:
+        cache.delete(_CIRCUIT_FAILURES_KEY)
+    except Exception:
+        pass
+
+
+def _record_failure(endpoint: str) -> None:
+    try:
+        cache.add(_CIRCUIT_FAILURES_KEY, 0, timeout=CIRCUIT_OPEN_SECONDS * 10)
+        failures = cache.incr(_CIRCUIT_FAILURES_KEY)
+    except Exception:
+        return
+    if failures >= CIRCUIT_FAILURE_THRESHOLD and cache.add(
+        _CIRCUIT_OPEN_KEY, endpoint, timeout=CIRCUIT_OPEN_SECONDS
+    ):
+        logger.warning(
+            "SchoolPay circuit opened after %s consecutive failures (last endpoint=%s)",
+            failures,
+            endpoint,
+        )
+        cache.delete(_CIRCUIT_FAILURES_KEY)
+
+
+def _retry_delay(attempt: int) -> float:
+    return random.uniform(0, min(RETRY_BACKOFF_CAP_SECONDS, RETRY_BACKOFF_SECONDS * 2**attempt))
+
+
+def _should_retry(method: str, *, exc=None, response=None) -> bool:
+    if exc is not None:
+        if method == "GET":
+            return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+        # Only when the request provably never reached SchoolPay.
+        return isinstance(exc, requests.ConnectTimeout)
+    return method == "GET" and response is not None and response.status_code in RETRY_STATUS_CODES
+
+
+def schoolpay_request(
+    endpoint: str,
+    method: str,
+    url: str,
+    *,
+    timeout=30,
+    max_retries: int = MAX_RETRIES,
+    **kwargs,
+) -> requests.Response:
+    """
+    Send one logical SchoolPay call through the shared session.
+
+    Returns the final response (status is not raised here, callers decide);
+    raises ``requests.RequestException`` (``SchoolPayUnavailable`` while the
+    circuit is open) when no response could be obtained.
+    """
+    method = method.upper()
+    if _circuit_is_open():
+        _metric_incr(endpoint, "circuit_rejected")
+        raise SchoolPayUnavailable(
+            f"SchoolPay is temporarily unavailable (circuit open); skipped {endpoint}"
+        )
+
+    session = get_session()
+    attempt = 0
+    while True:
+        started = time.monotonic()
+        exc = response = None
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except requests.RequestException as e:
+            exc = e
+        elapsed_ms = int((time.monotonic() - started) * 1000)
+        _metric_incr(endpoint, "calls")
+        _metric_incr(endpoint, "latency_ms", elapsed_ms)
+        _metric_max(endpoint, "max_latency_ms", elapsed_ms)
+        if elapsed_ms >= SLOW_CALL_SECONDS * 1000:
+            logger.warning("SchoolPay %s took %.1fs", endpoint, elapsed_ms / 1000)
+
+        failed = exc is not None or response.status_code >= 500
+        if failed:
+            _metric_incr(endpoint, "errors")
+            _record_failure(endpoint)
+        else:
+            _record_success()
+
+        if attempt < max_retries and _should_retry(method, exc=exc, response=response):
+            attempt += 1
+            _metric_incr(endpoint, "retries")
+            time.sleep(_retry_delay(attempt))
+            continue
+        if exc is not None:
+            raise exc
+        return response
+
+
+def schoolpay_get_json(endpoint: str, url: str, *, timeout=60):
+    response = schoolpay_request(endpoint, "GET", url, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
 class SchoolPayClient:
     def __init__(self):
         self.school_code = settings.SCHOOL_PAY_CODE
         self.password = settings.SCHOOL_PAY_PASSWORD
         self.base_url = f"{schoolpay_api_root()}/AdhocPayments"
-        
-        # Session with retries (3 attempts, backoff)
-        self.session = requests.Session()
-        retry = Retry(connect=3, backoff_factor=0.5)
-        adapter = HTTPAdapter(max_retries=retry)
-        self.session.mount('https://', adapter)
 
     def generate_hash(self, reference):
         raw_string = f"{self.school_code}{reference}{self.password}"
-        return hashlib.md5(raw_string.encode()).hexdigest().upper() 
+        return hashlib.md5(raw_string.encode()).hexdigest().upper()
 
     def request_payment(self, amount, phone, ext_ref, first_name, last_name, reason, callBackUrl):
         hash_val = self.generate_hash(ext_ref)
         url = f"{self.base_url}/Request/{self.school_code}/{hash_val}"
-        
+
         payload = {
             "amount": float(amount),
             "externalReference": ext_ref,
-            "phoneNumber": phone,  
+            "phoneNumber": phone,
             "firstName": first_name,
             "lastName": last_name,
             "reason": reason,
             "callBackUrl":callBackUrl
         }
-        
+
         try:
-            response = self.session.post(url, json=payload, timeout=10)
+            response = schoolpay_request("adhoc_request", "POST", url, json=payload, timeout=10)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
             raise ValueError(f"Payment request failed: {str(e)}")
 
     def check_status(self, payment_ref):
-        hash_val = self.generate_hash(payment_ref) 
+        hash_val = self.generate_hash(payment_ref)
         url = f"{self.base_url}/Check/{self.school_code}/{hash_val}/{payment_ref}"
-        
+
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return schoolpay_get_json("adhoc_check", url, timeout=10)
         except requests.RequestException as e:
-            raise ValueError(f"Status check failed: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Status check failed: {str(e)}")
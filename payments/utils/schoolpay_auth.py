@@ -8,6 +8,9 @@ def build_schoolpay_hash(school_code: str, reference: str, password: str) -> str
     return hashlib.md5(raw.encode("utf-8")).hexdigest().upper()
 
 def schoolpay_api_root() -> str:
+    override = getattr(settings, "SCHOOLPAY_API_ROOT", "")
+    if override:
+        return override.rstrip("/")
     if settings.DEBUG:
         return "https://schoolpaytest.servicecops.com/uatpaymentapi/AndroidRS"
     return "https://schoolpay.co.ug/paymentapi/AndroidRS"
@@ -0,0 +1,138 @@
+"""
+Resumable historical SchoolPay ingest (``SchoolPayBackfillJob``).
+
+A date range is split into day windows. Windows are downloaded by a small
+thread pool through the shared SchoolPay client (HTTP only; threads never
+touch the database), and each downloaded day is reconciled on the calling
+thread inside a transaction that also marks its window done. Re-running a job
+skips finished days, so a crash resumes where it stopped.
+"""
+from __future__ import annotations
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from payments.models import SchoolPayBackfillJob, SchoolPayBackfillWindow
+from payments.utils.Transaction_sync import (
+    _schoolpay_payload_rows,
+    fetch_transactions_by_range,
+    reconcile_transactions,
+)
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_MAX_WORKERS = 4
+# (connect, read) — one day of receipts is small compared to the old 31-day pulls.
+BACKFILL_HTTP_TIMEOUT = (10, 60)
+
+
+def _day_windows(from_date: date, to_date: date) -> list[date]:
+    return [from_date + timedelta(days=i) for i in range((to_date - from_date).days + 1)]
+
+
+def create_backfill_job(from_date: date, to_date: date, *, created_by=None) -> SchoolPayBackfillJob:
+    if from_date > to_date:
+        raise ValueError("from_date must be on or before to_date")
+    with transaction.atomic():
+        job = SchoolPayBackfillJob.objects.create(
+            from_date=from_date, to_date=to_date, created_by=created_by
+        )
+        SchoolPayBackfillWindow.objects.bulk_create(
+            [SchoolPayBackfillWindow(job=job, day=day) for day in _day_windows(from_date, to_date)]
+        )
+    return job
+
+
+def _fetch_day(day: date) -> dict:
+    day_s = day.strftime("%Y-%m-%d")
+    return fetch_transactions_by_range(from_date=day_s, to_date=day_s, timeout=BACKFILL_HTTP_TIMEOUT)
+
+
+def _reconcile_window(window: SchoolPayBackfillWindow, data) -> int:
+    with transaction.atomic():
+        created = reconcile_transactions(data)
+        SchoolPayBackfillWindow.objects.filter(pk=window.pk).update(
+            status=SchoolPayBackfillJob.STATUS_DONE,
+            fetched_count=len(_schoolpay_payload_rows(data)),
+            created_count=created,
+            error="",
+            completed_at=timezone.now(),
+        )
+    return created
+
+
+def _fail_window(window: SchoolPayBackfillWindow, exc: Exception) -> None:
+    logger.warning("SchoolPay backfill job=%s day=%s failed: %s", window.job_id, window.day, exc)
+    SchoolPayBackfillWindow.objects.filter(pk=window.pk).update(
+        status=SchoolPayBackfillJob.STATUS_FAILED, error=str(exc)[:2000]
+    )
+
+
+def run_backfill_job(
+    job: SchoolPayBackfillJob | int,
+    *,
+    max_workers: int = BACKFILL_MAX_WORKERS,
+) -> dict:
+    """
+    Fetch and reconcile every unfinished day of ``job``.
+
+    At most ``max_workers`` downloads are in flight; a failed day is recorded on
+    its window and retried by the next run. Returns a summary of this run.
+    """
+    if not isinstance(job, SchoolPayBackfillJob):
+        job = SchoolPayBackfillJob.objects.get(pk=job)
+    max_workers = max(1, int(max_workers))
+
+    SchoolPayBackfillJob.objects.filter(pk=job.pk).update(
+        status=SchoolPayBackfillJob.STATUS_RUNNING,
+        started_at=job.started_at or timezone.now(),
+        finished_at=None,
+    )
+    pending = list(
+        job.windows.exclude(status=SchoolPayBackfillJob.STATUS_DONE).order_by("day")
+    )
+    SchoolPayBackfillWindow.objects.filter(pk__in=[w.pk for w in pending]).update(
+        attempts=F("attempts") + 1
+    )
+
+    done = failed = created = 0
+    queue = iter(pending)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="schoolpay-backfill") as pool:
+        in_flight = {
+            pool.submit(_fetch_day, window.day): window
+            for window in islice(queue, max_workers)
+        }
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                window = in_flight.pop(future)
+                try:
+                    created += _reconcile_window(window, future.result())
+                    done += 1
+                except Exception as exc:
+                    _fail_window(window, exc)
+                    failed += 1
+                nxt = next(queue, None)
+                if nxt is not None:
+                    in_flight[pool.submit(_fetch_day, nxt.day)] = nxt
+
+    remaining = job.windows.exclude(status=SchoolPayBackfillJob.STATUS_DONE).count()
+    total_created = sum(job.windows.values_list("created_count", flat=True))
+    SchoolPayBackfillJob.objects.filter(pk=job.pk).update(
+        status=SchoolPayBackfillJob.STATUS_FAILED if remaining else SchoolPayBackfillJob.STATUS_DONE,
+        created_count=total_created,
+        finished_at=timezone.now(),
+    )
+    return {
+        "job_id": job.pk,
+        "windows_done": done,
+        "windows_failed": failed,
+        "windows_remaining": remaining,
+        "created": created,
+    }
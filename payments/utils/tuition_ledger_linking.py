@@ -1,13 +1,17 @@
 """Link SchoolPay tuition ledger rows to admitted students by payment code."""
 from __future__ import annotations
 
+from collections import defaultdict
 from decimal import Decimal
+from typing import Iterable
 
 from django.db.models import Q
+from django.db.models.functions import Upper
 from django.utils import timezone
 
 from admissions.models import AdmittedStudent
 from payments.models import TuitionLedger
+from payments.utils.payment_code_index import resolve_payment_codes
 
 ADMISSION_FEE_AMOUNT = Decimal("150000")
 
@@ -104,21 +108,108 @@ def tuition_ledger_queryset_for_student(student: AdmittedStudent):
     return TuitionLedger.objects.filter(q)
 
 
+def _ledger_owner_index(
+    students: Iterable[AdmittedStudent],
+) -> tuple[dict[str, set[int]], dict[str, set[int]], dict[int, set[int]]]:
+    """Upper-cased payment codes / reg. nos / user ids → owning student pks."""
+    code_owners: defaultdict[str, set[int]] = defaultdict(set)
+    reg_owners: defaultdict[str, set[int]] = defaultdict(set)
+    user_owners: defaultdict[int, set[int]] = defaultdict(set)
+    for student in students:
+        for code in payment_codes_for_student(student):
+            code_owners[code.upper()].add(student.pk)
+        reg = (student.reg_no or "").strip()
+        if reg:
+            reg_owners[reg.upper()].add(student.pk)
+        if getattr(student, "student_user_id", None):
+            user_owners[student.student_user_id].add(student.pk)
+    return dict(code_owners), dict(reg_owners), dict(user_owners)
+
+
+def _annotated_ledger_queryset():
+    return TuitionLedger.objects.annotate(
+        code_u=Upper("student_payment_code"),
+        reg_u=Upper("student_registration_number"),
+    )
+
+
+def tuition_ledgers_for_students(
+    students: list[AdmittedStudent],
+    *,
+    completed_only: bool = True,
+) -> dict[int, list[TuitionLedger]]:
+    """
+    Batch form of ``tuition_ledger_queryset_for_student``: one query for the
+    whole cohort, rows grouped per student pk (a row may belong to several
+    students when their payment codes overlap, same as the per-student query).
+    """
+    if not students:
+        return {}
+    code_owners, reg_owners, user_owners = _ledger_owner_index(students)
+    pks = {s.pk for s in students}
+    match = Q(student_id__in=pks)
+    if code_owners:
+        match |= Q(code_u__in=list(code_owners))
+    if reg_owners:
+        match |= Q(reg_u__in=list(reg_owners))
+    if user_owners:
+        match |= Q(user_id__in=list(user_owners))
+    qs = _annotated_ledger_queryset().filter(match)
+    if completed_only:
+        qs = qs.filter(completed_ledger_status_q())
+
+    out: dict[int, list[TuitionLedger]] = {pk: [] for pk in pks}
+    for row in qs:
+        owners: set[int] = set()
+        if row.student_id in pks:
+            owners.add(row.student_id)
+        owners |= code_owners.get(row.code_u or "", set())
+        owners |= reg_owners.get(row.reg_u or "", set())
+        if row.user_id:
+            owners |= user_owners.get(row.user_id, set())
+        for pk in owners:
+            out[pk].append(row)
+    return out
+
+
 def find_admitted_student_by_payment_code(code: str) -> AdmittedStudent | None:
     """Resolve an admitted student from a SchoolPay studentPaymentCode."""
     ident = (code or "").strip()
     if not ident:
         return None
-    return (
-        AdmittedStudent.objects.filter(
-            Q(student_id__iexact=ident)
-            | Q(schoolpay_code__iexact=ident)
-            | Q(reg_no__iexact=ident)
-        )
-        .select_related("student_user", "application")
-        .order_by("-updated_at")
-        .first()
+    return find_admitted_students_by_payment_codes([ident]).get(ident.upper())
+
+
+def find_admitted_students_by_payment_codes(codes: Iterable[str]) -> dict[str, AdmittedStudent]:
+    """
+    Batch form of ``find_admitted_student_by_payment_code`` via the payment-code
+    index: upper-cased code → student (two queries for the whole batch).
+    """
+    resolved = resolve_payment_codes(
+        {(c or "").strip().upper() for c in codes if (c or "").strip()}
+    )
+    if not resolved:
+        return {}
+    students = AdmittedStudent.objects.select_related("student_user", "application").in_bulk(
+        set(resolved.values())
     )
+    return {
+        code: students[student_pk]
+        for code, student_pk in resolved.items()
+        if student_pk in students
+    }
+
+
+def _invalidate_relinked_owners(ledgers, student: AdmittedStudent) -> None:
+    """
+    Finance snapshots of both the new and any previous owner are out of date.
+    Not requeued: relinking runs inside snapshot rebuilds, and students sharing
+    a code would otherwise bounce refresh jobs between each other.
+    """
+    from payments.finance_snapshot import invalidate_finance_snapshots
+
+    previous = {row.student_id for row in ledgers if row.student_id}
+    invalidate_finance_snapshots(previous | {student.pk}, requeue=False)
 
 
 def attach_extra_payment_codes_to_student(
@@ -139,6 +230,8 @@ def attach_extra_payment_codes_to_student(
         Q(student__isnull=True) | ~Q(student_id=student.pk)
     )
     ledgers = list(qs.only("id", "user_id", "student_id", "student_payment_code"))
+    if ledgers:
+        _invalidate_relinked_owners(ledgers, student)
     for ledger in ledgers:
         ledger.student_id = student.pk
         if student.student_user_id and ledger.user_id is None:
@@ -168,6 +261,22 @@ def attach_extra_payment_codes_to_student(
     return len(ledgers)
 
 
+def _claimable_ledgers(ledgers: list[TuitionLedger], student_pk: int) -> list[TuitionLedger]:
+    """
+    Drop rows whose payment code resolves to a different student in the code
+    index: a shared reg. no. / compact code must not pull another wallet's
+    payments over (and two students would otherwise keep swapping them).
+    """
+    resolved = resolve_payment_codes(
+        {row.student_payment_code for row in ledgers if row.student_payment_code}
+    )
+    return [
+        row
+        for row in ledgers
+        if resolved.get(row.student_payment_code or "", student_pk) == student_pk
+    ]
+
+
 def relink_tuition_ledgers_for_student(student: AdmittedStudent) -> int:
     """
     Attach orphan SchoolPay ledger rows to the student when payment codes or
@@ -189,10 +298,13 @@ def relink_tuition_ledgers_for_student(student: AdmittedStudent) -> int:
     qs = TuitionLedger.objects.filter(match).filter(
         Q(student__isnull=True) | ~Q(student_id=student.pk)
     )
-    ledgers = list(qs.only("id", "user_id", "student_id", "student_payment_code"))
+    ledgers = _claimable_ledgers(
+        list(qs.only("id", "user_id", "student_id", "student_payment_code")), student.pk
+    )
     if not ledgers:
         return 0
 
+    _invalidate_relinked_owners(ledgers, student)
     for ledger in ledgers:
         ledger.student_id = student.pk
         if student.student_user_id and ledger.user_id is None:
@@ -224,6 +336,47 @@ def relink_tuition_ledgers_for_student(student: AdmittedStudent) -> int:
     return len(ledgers)
 
 
+def relink_tuition_ledgers_for_students(students: list[AdmittedStudent]) -> int:
+    """
+    Batch form of ``relink_tuition_ledgers_for_student`` for cohort reports.
+
+    One query finds ledger rows whose code / reg. no. matches a student but are
+    linked elsewhere (or nowhere); only those students go through the
+    per-student relink, so an already-linked cohort costs a single query.
+    """
+    if not students:
+        return 0
+    code_owners, reg_owners, _ = _ledger_owner_index(students)
+    if not code_owners and not reg_owners:
+        return 0
+    match = Q()
+    if code_owners:
+        match |= Q(code_u__in=list(code_owners))
+    if reg_owners:
+        match |= Q(reg_u__in=list(reg_owners))
+
+    candidates = list(
+        _annotated_ledger_queryset()
+        .filter(match)
+        .values_list("student_id", "code_u", "reg_u")
+    )
+    resolved = resolve_payment_codes({code_u for _sid, code_u, _reg in candidates if code_u})
+
+    needs_relink: set[int] = set()
+    for student_id, code_u, reg_u in candidates:
+        owners = code_owners.get(code_u or "", set()) | reg_owners.get(reg_u or "", set())
+        canonical = resolved.get(code_u or "")
+        if canonical is not None:
+            owners = owners & {canonical}
+        needs_relink.update(pk for pk in owners if pk != student_id)
+
+    updated = 0
+    for student in students:
+        if student.pk in needs_relink:
+            updated += relink_tuition_ledgers_for_student(student)
+    return updated
+
+
 def sync_admission_fee_paid_from_ledger(student: AdmittedStudent) -> bool:
     """Set admission_fee_paid when completed ledger credits meet the commitment threshold."""
     if student.admission_fee_paid:
@@ -7,6 +7,7 @@ from datetime import timedelta
 from django.db import transaction
 from django.utils import timezone
 
+from payments.finance_snapshot import invalidate_finance_snapshots
 from payments.models import StudentTuitionPayment
 from payments.utils.schoolpay import SchoolPayClient
 
@@ -188,6 +189,9 @@ def reconcile_pending_tuition_payment(
         StudentTuitionPayment.objects.filter(pk=payment.pk, status="pending").update(
             status="failed"
         )
+        if payment.source == "ad_hoc":
+            # Failed ad-hoc charges drop out of the demand lines.
+            invalidate_finance_snapshots([payment.student_id])
         return "failed"
 
     return "pending"
@@ -266,6 +270,9 @@ def reconcile_stale_pending_tuition_payments(
         StudentTuitionPayment.objects.filter(pk=payment.pk, status="pending").update(
             status="failed"
         )
+        if payment.source == "ad_hoc":
+            # Failed ad-hoc charges drop out of the demand lines.
+            invalidate_finance_snapshots([payment.student_id])
         results["cleared"] += 1
 
     return results